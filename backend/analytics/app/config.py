@@ -57,6 +57,18 @@ class AppConfig:
 
     key_bindings: tuple[KeyBinding, ...]
 
+    # Tuning knobs; defaults match the env defaults in from_env().
+    ingest_batch_max_events: int = 500
+    mixpanel_import_concurrency: int = 4
+
+    dispatch_lease_seconds: int = 300
+    dispatch_workers: int = 1
+    dispatch_max_batches: int = 1
+
+    retention_days: int = 90
+    purge_batch_size: int = 2000
+    purge_max_batches: int = 50
+
     @staticmethod
     def from_env() -> "AppConfig":
         bindings = (
@@ -114,6 +126,7 @@ class AppConfig:
             collection_enabled=_bool_env("ANALYTICS_COLLECTION_ENABLED", True),
             mixpanel_export_enabled=_bool_env("ANALYTICS_MIXPANEL_EXPORT_ENABLED", False),
             allow_unknown_events=_bool_env("ANALYTICS_ALLOW_UNKNOWN_EVENTS", False),
+            ingest_batch_max_events=_int_env("ANALYTICS_INGEST_BATCH_MAX_EVENTS", 500),
             distinct_id_salt=_str_env("ANALYTICS_DISTINCT_ID_SALT", ""),
             sql_connection_string=_str_env("ANALYTICS_SQL_CONNECTION_STRING", ""),
             mixpanel_project_id=_str_env("MIXPANEL_PROJECT_ID", ""),
@@ -123,6 +136,13 @@ class AppConfig:
             mixpanel_strict=_bool_env("MIXPANEL_STRICT", True),
             mixpanel_batch_size=_int_env("MIXPANEL_BATCH_SIZE", 500),
             mixpanel_max_attempts=_int_env("MIXPANEL_MAX_ATTEMPTS", 8),
+            mixpanel_import_concurrency=max(1, _int_env("MIXPANEL_IMPORT_CONCURRENCY", 4)),
+            dispatch_lease_seconds=max(30, _int_env("ANALYTICS_DISPATCH_LEASE_SECONDS", 300)),
+            dispatch_workers=max(1, _int_env("ANALYTICS_DISPATCH_WORKERS", 1)),
+            dispatch_max_batches=max(1, _int_env("ANALYTICS_DISPATCH_MAX_BATCHES", 1)),
+            retention_days=max(7, _int_env("ANALYTICS_RETENTION_DAYS", 90)),
+            purge_batch_size=max(1, _int_env("ANALYTICS_PURGE_BATCH_SIZE", 2000)),
+            purge_max_batches=max(1, _int_env("ANALYTICS_PURGE_MAX_BATCHES", 50)),
             key_bindings=bindings,
         )
 
@@ -1,37 +1,122 @@
 from __future__ import annotations
 
 import json
+import threading
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
 import pyodbc
 
 from app.config import AppConfig
+from app.sql_instrumentation import InstrumentedConnection, instrument_connection
+from app.sql_pool import ConnectionPool, PooledConnection, pool_enabled, pool_settings_from_env
 
+_POOLS: dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
 
-def get_connection(config: AppConfig) -> pyodbc.Connection:
+
+def _pool_for(connection_string: str) -> ConnectionPool:
+    with _POOLS_LOCK:
+        pool = _POOLS.get(connection_string)
+        if pool is None:
+            pool = ConnectionPool(
+                lambda: pyodbc.connect(connection_string, timeout=10),
+                **pool_settings_from_env(),
+            )
+            _POOLS[connection_string] = pool
+        return pool
+
+
+def get_connection(config: AppConfig) -> pyodbc.Connection | PooledConnection | InstrumentedConnection:
+    """
+    Pooled connection; `with get_connection(config) as conn:` commits or rolls back
+    like pyodbc and then returns the connection to the pool.
+    Cursors are timed per statement (app/sql_instrumentation.py).
+    """
     if not config.sql_connection_string:
         raise RuntimeError("ANALYTICS_SQL_CONNECTION_STRING is not configured.")
-    return pyodbc.connect(config.sql_connection_string, timeout=10)
+    if not pool_enabled():
+        return instrument_connection(pyodbc.connect(config.sql_connection_string, timeout=10))
+    return instrument_connection(_pool_for(config.sql_connection_string).acquire())
+
+
+_INSERT_EVENT_SQL = """
+    INSERT INTO dbo.AnalyticsEvents (
+        EventId,
+        OccurredAtUtc,
+        ReceivedAtUtc,
+        SourceDomain,
+        SourceSurface,
+        UserId,
+        DistinctId,
+        EventName,
+        SubjectType,
+        SubjectId,
+        CorrelationId,
+        ProducerEventId,
+        SchemaVersion,
+        PropertiesJson
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_DISPATCH_SQL = """
+    INSERT INTO dbo.AnalyticsDispatch (
+        DispatchId,
+        EventId,
+        Sink,
+        Status,
+        AttemptCount,
+        NextAttemptAtUtc,
+        LastAttemptAtUtc,
+        SentAtUtc,
+        LastErrorCode,
+        LastErrorJson
+    )
+    VALUES (?, ?, 'mixpanel', 'pending', 0, ?, NULL, NULL, NULL, NULL)
+"""
 
 
-def insert_event_with_dispatch(
-    config: AppConfig,
+def _event_row(
+    event_id: str,
     event: dict[str, Any],
     distinct_id: str | None,
-) -> tuple[str, bool]:
-    """
-    Returns (event_id, was_duplicate).
-    Idempotency is based on the filtered unique index over (SourceDomain, ProducerEventId).
-    """
+    received_at_utc: datetime,
+) -> tuple:
     properties_json = json.dumps(
         event["properties"],
         ensure_ascii=False,
         sort_keys=True,
         separators=(",", ":"),
     )
+    return (
+        event_id,
+        event["occurredAtUtc"],
+        received_at_utc,
+        event["sourceDomain"],
+        event["sourceSurface"],
+        event["userId"],
+        distinct_id,
+        event["eventName"],
+        event["subjectType"],
+        event["subjectId"],
+        event["correlationId"],
+        event["producerEventId"],
+        event["schemaVersion"],
+        properties_json,
+    )
+
 
+def insert_event_with_dispatch(
+    config: AppConfig,
+    event: dict[str, Any],
+    distinct_id: str | None,
+) -> tuple[str, bool]:
+    """
+    Returns (event_id, was_duplicate).
+    Idempotency is based on the filtered unique index over (SourceDomain, ProducerEventId).
+    """
     event_id = str(uuid.uuid4())
     dispatch_id = str(uuid.uuid4())
     now_utc = datetime.utcnow()
@@ -50,62 +135,8 @@ def insert_event_with_dispatch(
                 return existing, True
 
         try:
-            cursor.execute(
-                """
-                INSERT INTO dbo.AnalyticsEvents (
-                    EventId,
-                    OccurredAtUtc,
-                    ReceivedAtUtc,
-                    SourceDomain,
-                    SourceSurface,
-                    UserId,
-                    DistinctId,
-                    EventName,
-                    SubjectType,
-                    SubjectId,
-                    CorrelationId,
-                    ProducerEventId,
-                    SchemaVersion,
-                    PropertiesJson
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                event_id,
-                event["occurredAtUtc"],
-                now_utc,
-                event["sourceDomain"],
-                event["sourceSurface"],
-                event["userId"],
-                distinct_id,
-                event["eventName"],
-                event["subjectType"],
-                event["subjectId"],
-                event["correlationId"],
-                event["producerEventId"],
-                event["schemaVersion"],
-                properties_json,
-            )
-
-            cursor.execute(
-                """
-                INSERT INTO dbo.AnalyticsDispatch (
-                    DispatchId,
-                    EventId,
-                    Sink,
-                    Status,
-                    AttemptCount,
-                    NextAttemptAtUtc,
-                    LastAttemptAtUtc,
-                    SentAtUtc,
-                    LastErrorCode,
-                    LastErrorJson
-                )
-                VALUES (?, ?, 'mixpanel', 'pending', 0, ?, NULL, NULL, NULL, NULL)
-                """,
-                dispatch_id,
-                event_id,
-                now_utc,
-            )
+            cursor.execute(_INSERT_EVENT_SQL, *_event_row(event_id, event, distinct_id, now_utc))
+            cursor.execute(_INSERT_DISPATCH_SQL, dispatch_id, event_id, now_utc)
 
             conn.commit()
             return event_id, False
@@ -129,6 +160,78 @@ def insert_event_with_dispatch(
                 return existing, True
 
 
+def insert_events_with_dispatch(
+    config: AppConfig,
+    items: list[tuple[dict[str, Any], str | None]],
+) -> list[tuple[str, bool]]:
+    """
+    Batch form of insert_event_with_dispatch for validated (event, distinct_id) pairs.
+    Returns (event_id, was_duplicate) per item, in input order.
+
+    One connection and one transaction: a single duplicate lookup per source domain,
+    then events and their dispatch rows are inserted with fast_executemany.
+    An item repeating an earlier item's ProducerEventId in the same batch is reported
+    as a duplicate of that item.
+    """
+    if not items:
+        return []
+
+    try:
+        return _insert_events_once(config, items)
+    except pyodbc.IntegrityError:
+        # A concurrent request stored one of these ProducerEventIds between lookup and
+        # insert; the transaction rolled back, and the second lookup will see that row.
+        return _insert_events_once(config, items)
+
+
+def _insert_events_once(
+    config: AppConfig,
+    items: list[tuple[dict[str, Any], str | None]],
+) -> list[tuple[str, bool]]:
+    now_utc = datetime.utcnow()
+    results: list[tuple[str, bool]] = []
+    event_rows = []
+    dispatch_rows = []
+
+    with get_connection(config) as conn:
+        cursor = conn.cursor()
+
+        known = _find_existing_event_ids(
+            cursor,
+            [
+                (event["sourceDomain"], event["producerEventId"])
+                for event, _ in items
+                if event["producerEventId"]
+            ],
+        )
+
+        for event, distinct_id in items:
+            # Keys are lower-cased to match the case-insensitive unique index
+            key = (event["sourceDomain"], event["producerEventId"].lower()) if event["producerEventId"] else None
+            if key and key in known:
+                results.append((known[key], True))
+                continue
+
+            event_id = str(uuid.uuid4())
+            if key:
+                known[key] = event_id
+            event_rows.append(_event_row(event_id, event, distinct_id, now_utc))
+            dispatch_rows.append((str(uuid.uuid4()), event_id, now_utc))
+            results.append((event_id, False))
+
+        if event_rows:
+            cursor.fast_executemany = True
+            try:
+                cursor.executemany(_INSERT_EVENT_SQL, event_rows)
+                cursor.executemany(_INSERT_DISPATCH_SQL, dispatch_rows)
+            finally:
+                cursor.fast_executemany = False
+
+        conn.commit()
+
+    return results
+
+
 def get_dispatch_status(config: AppConfig) -> dict[str, Any]:
     with get_connection(config) as conn:
         cursor = conn.cursor()
@@ -180,6 +283,35 @@ def _find_existing_event_id(
     return str(row.EventId)
 
 
+def _find_existing_event_ids(
+    cursor: pyodbc.Cursor,
+    keys: list[tuple[str, str]],
+) -> dict[tuple[str, str], str]:
+    """EventId per (SourceDomain, ProducerEventId); one query per source domain in the batch."""
+    by_domain: dict[str, set[str]] = {}
+    for source_domain, producer_event_id in keys:
+        by_domain.setdefault(source_domain, set()).add(producer_event_id)
+
+    found: dict[tuple[str, str], str] = {}
+    for source_domain, producer_event_ids in by_domain.items():
+        ids = sorted(producer_event_ids)
+        placeholders = ",".join("?" for _ in ids)
+        rows = cursor.execute(
+            f"""
+            SELECT ProducerEventId, EventId
+            FROM dbo.AnalyticsEvents
+            WHERE SourceDomain = ?
+              AND ProducerEventId IN ({placeholders})
+            """,
+            source_domain,
+            *ids,
+        ).fetchall()
+        for row in rows:
+            found[(source_domain, str(row.ProducerEventId).lower())] = str(row.EventId)
+
+    return found
+
+
 def _format_utc(value: Any) -> str | None:
     if value is None:
         return None
@@ -187,36 +319,77 @@ def _format_utc(value: Any) -> str | None:
         return value.isoformat(timespec="seconds") + "Z"
     return str(value)
 
-def fetch_due_dispatch_rows(config: AppConfig, limit: int) -> list[dict[str, Any]]:
+
+_CLAIM_DUE_DISPATCH_SQL = """
+    SET NOCOUNT ON;
+
+    DECLARE @claimed TABLE (DispatchId uniqueidentifier PRIMARY KEY);
+
+    WITH due AS (
+        SELECT TOP (?) *
+        FROM dbo.AnalyticsDispatch WITH (READPAST, UPDLOCK, ROWLOCK)
+        WHERE Sink = 'mixpanel'
+          AND Status IN ('pending', 'retry', 'sending')
+          AND NextAttemptAtUtc <= SYSUTCDATETIME()
+        ORDER BY NextAttemptAtUtc ASC
+    )
+    UPDATE due
+    SET AttemptCount = AttemptCount + CASE WHEN Status = 'sending' THEN 1 ELSE 0 END,
+        Status = 'sending',
+        ClaimToken = ?,
+        LastAttemptAtUtc = SYSUTCDATETIME(),
+        NextAttemptAtUtc = DATEADD(second, ?, SYSUTCDATETIME())
+    OUTPUT inserted.DispatchId INTO @claimed;
+
+    SELECT
+        d.DispatchId,
+        d.EventId,
+        d.Sink,
+        d.Status,
+        d.AttemptCount,
+        e.OccurredAtUtc,
+        e.SourceDomain,
+        e.SourceSurface,
+        e.DistinctId,
+        e.EventName,
+        e.SubjectType,
+        e.SubjectId,
+        e.SchemaVersion,
+        e.PropertiesJson
+    FROM @claimed c
+    INNER JOIN dbo.AnalyticsDispatch d
+        ON d.DispatchId = c.DispatchId
+    INNER JOIN dbo.AnalyticsEvents e
+        ON e.EventId = d.EventId
+    ORDER BY e.OccurredAtUtc ASC;
+
+    SET NOCOUNT OFF;
+"""
+
+
+def claim_due_dispatch_rows(
+    config: AppConfig,
+    claim_token: str,
+    limit: int,
+    lease_seconds: int,
+) -> list[dict[str, Any]]:
+    """
+    Atomically claim up to `limit` due Mixpanel dispatch rows for one dispatcher run.
+
+    Due means pending/retry rows whose NextAttemptAtUtc passed, and 'sending' rows whose
+    lease (NextAttemptAtUtc while sending) expired; a reclaimed row counts one attempt.
+    READPAST skips rows another run is claiming, so concurrent runs get disjoint rows.
+    The claim commits immediately; the lease, not a held lock, protects the rows.
+    """
     with get_connection(config) as conn:
         cursor = conn.cursor()
         rows = cursor.execute(
-            """
-            SELECT TOP (?)
-                d.DispatchId,
-                d.EventId,
-                d.Sink,
-                d.Status,
-                d.AttemptCount,
-                e.OccurredAtUtc,
-                e.SourceDomain,
-                e.SourceSurface,
-                e.DistinctId,
-                e.EventName,
-                e.SubjectType,
-                e.SubjectId,
-                e.SchemaVersion,
-                e.PropertiesJson
-            FROM dbo.AnalyticsDispatch d
-            INNER JOIN dbo.AnalyticsEvents e
-                ON e.EventId = d.EventId
-            WHERE d.Sink = 'mixpanel'
-              AND d.Status IN ('pending', 'retry')
-              AND d.NextAttemptAtUtc <= SYSUTCDATETIME()
-            ORDER BY e.OccurredAtUtc ASC
-            """,
+            _CLAIM_DUE_DISPATCH_SQL,
             int(limit),
+            claim_token,
+            int(lease_seconds),
         ).fetchall()
+        _drain_results(cursor)
 
         conn.commit()
 
@@ -244,32 +417,32 @@ def fetch_due_dispatch_rows(config: AppConfig, limit: int) -> list[dict[str, Any
     return result
 
 
-def mark_dispatch_sending(config: AppConfig, dispatch_ids: list[str]) -> None:
-    if not dispatch_ids:
-        return
+def _drain_results(cursor: pyodbc.Cursor) -> None:
+    """
+    Run the statements after a batch's result set. NOCOUNT is session-scoped and pooled
+    connections keep it, so batches that set it ON end with SET NOCOUNT OFF.
+    """
+    while cursor.nextset():
+        pass
 
-    placeholders = ",".join("?" for _ in dispatch_ids)
 
-    with get_connection(config) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            f"""
-            UPDATE dbo.AnalyticsDispatch
-            SET Status = 'sending',
-                LastAttemptAtUtc = SYSUTCDATETIME()
-            WHERE DispatchId IN ({placeholders})
-              AND Status IN ('pending', 'retry')
-            """,
-            *dispatch_ids,
-        )
-        conn.commit()
+def _claim_filter(claim_token: str | None) -> tuple[str, tuple]:
+    """Extra WHERE clause that keeps a run from updating rows whose lease it lost."""
+    if claim_token is None:
+        return "", ()
+    return "AND ClaimToken = ?", (claim_token,)
 
 
-def mark_dispatch_sent(config: AppConfig, dispatch_ids: list[str]) -> None:
+def mark_dispatch_sent(
+    config: AppConfig,
+    dispatch_ids: list[str],
+    claim_token: str | None = None,
+) -> int:
     if not dispatch_ids:
-        return
+        return 0
 
     placeholders = ",".join("?" for _ in dispatch_ids)
+    claim_sql, claim_params = _claim_filter(claim_token)
 
     with get_connection(config) as conn:
         cursor = conn.cursor()
@@ -278,13 +451,18 @@ def mark_dispatch_sent(config: AppConfig, dispatch_ids: list[str]) -> None:
             UPDATE dbo.AnalyticsDispatch
             SET Status = 'sent',
                 SentAtUtc = SYSUTCDATETIME(),
+                ClaimToken = NULL,
                 LastErrorCode = NULL,
                 LastErrorJson = NULL
             WHERE DispatchId IN ({placeholders})
+              {claim_sql}
             """,
             *dispatch_ids,
+            *claim_params,
         )
+        updated = cursor.rowcount
         conn.commit()
+    return updated
 
 
 def mark_dispatch_dead(
@@ -292,11 +470,13 @@ def mark_dispatch_dead(
     dispatch_ids: list[str],
     error_code: str,
     error_json: str,
-) -> None:
+    claim_token: str | None = None,
+) -> int:
     if not dispatch_ids:
-        return
+        return 0
 
     placeholders = ",".join("?" for _ in dispatch_ids)
+    claim_sql, claim_params = _claim_filter(claim_token)
 
     with get_connection(config) as conn:
         cursor = conn.cursor()
@@ -304,16 +484,21 @@ def mark_dispatch_dead(
             f"""
             UPDATE dbo.AnalyticsDispatch
             SET Status = 'dead',
+                ClaimToken = NULL,
                 LastAttemptAtUtc = COALESCE(LastAttemptAtUtc, SYSUTCDATETIME()),
                 LastErrorCode = ?,
                 LastErrorJson = ?
             WHERE DispatchId IN ({placeholders})
+              {claim_sql}
             """,
             error_code[:80],
             error_json[:4000],
             *dispatch_ids,
+            *claim_params,
         )
+        updated = cursor.rowcount
         conn.commit()
+    return updated
 
 
 def mark_dispatch_retry(
@@ -322,11 +507,13 @@ def mark_dispatch_retry(
     error_code: str,
     error_json: str,
     delay_seconds: int,
-) -> None:
+    claim_token: str | None = None,
+) -> int:
     if not dispatch_ids:
-        return
+        return 0
 
     placeholders = ",".join("?" for _ in dispatch_ids)
+    claim_sql, claim_params = _claim_filter(claim_token)
 
     with get_connection(config) as conn:
         cursor = conn.cursor()
@@ -334,17 +521,166 @@ def mark_dispatch_retry(
             f"""
             UPDATE dbo.AnalyticsDispatch
             SET Status = 'retry',
+                ClaimToken = NULL,
                 AttemptCount = AttemptCount + 1,
                 LastAttemptAtUtc = COALESCE(LastAttemptAtUtc, SYSUTCDATETIME()),
                 NextAttemptAtUtc = DATEADD(second, ?, SYSUTCDATETIME()),
                 LastErrorCode = ?,
                 LastErrorJson = ?
             WHERE DispatchId IN ({placeholders})
+              {claim_sql}
             """,
             int(delay_seconds),
             error_code[:80],
             error_json[:4000],
             *dispatch_ids,
+            *claim_params,
         )
+        updated = cursor.rowcount
         conn.commit()
-        
\ No newline at end of file
+    return updated
+        
+
+def get_rollup_start_day(config: AppConfig) -> date | None:
+    """
+    First day the next rollup refresh recomputes: two days before the newest rollup
+    (late producer events land there), or the oldest raw event on the first run.
+    """
+    with get_connection(config) as conn:
+        cursor = conn.cursor()
+        row = cursor.execute(
+            """
+            SELECT COALESCE(
+                (SELECT DATEADD(day, -2, MAX(Day)) FROM dbo.AnalyticsEventDailyRollups),
+                (SELECT CAST(MIN(OccurredAtUtc) AS date) FROM dbo.AnalyticsEvents)
+            ) AS StartDay
+            """
+        ).fetchone()
+        conn.commit()
+
+    return row.StartDay if row else None
+
+
+_REFRESH_DAILY_ROLLUPS_SQL = """
+    MERGE dbo.AnalyticsEventDailyRollups WITH (HOLDLOCK) AS target
+    USING (
+        SELECT
+            CAST(OccurredAtUtc AS date) AS Day,
+            EventName,
+            SourceDomain,
+            SourceSurface,
+            COUNT_BIG(*) AS EventCount,
+            COUNT(DISTINCT UserId) AS UserCount
+        FROM dbo.AnalyticsEvents
+        WHERE OccurredAtUtc >= ?
+          AND OccurredAtUtc < ?
+        GROUP BY CAST(OccurredAtUtc AS date), EventName, SourceDomain, SourceSurface
+    ) AS source
+    ON target.Day = source.Day
+       AND target.EventName = source.EventName
+       AND target.SourceDomain = source.SourceDomain
+       AND target.SourceSurface = source.SourceSurface
+    WHEN MATCHED AND (target.EventCount <> source.EventCount OR target.UserCount <> source.UserCount) THEN
+        UPDATE SET
+            EventCount = source.EventCount,
+            UserCount = source.UserCount,
+            UpdatedAtUtc = SYSUTCDATETIME()
+    WHEN NOT MATCHED BY TARGET THEN
+        INSERT (Day, EventName, SourceDomain, SourceSurface, EventCount, UserCount)
+        VALUES (source.Day, source.EventName, source.SourceDomain, source.SourceSurface,
+                source.EventCount, source.UserCount);
+"""
+
+
+def refresh_daily_rollups(config: AppConfig, from_day: date, to_day: date) -> int:
+    """
+    Recompute rollups for [from_day, to_day) from the raw events. Rows are never
+    deleted here: days whose raw events were purged keep their last counts.
+    """
+    with get_connection(config) as conn:
+        cursor = conn.cursor()
+        cursor.execute(_REFRESH_DAILY_ROLLUPS_SQL, from_day, to_day)
+        updated = cursor.rowcount
+        conn.commit()
+    return max(0, updated)
+
+
+_PURGE_EVENTS_BATCH_SQL = """
+    SET NOCOUNT ON;
+
+    DECLARE @batch TABLE (EventId uniqueidentifier PRIMARY KEY);
+
+    INSERT INTO @batch (EventId)
+    SELECT TOP (?) e.EventId
+    FROM dbo.AnalyticsEvents e WITH (READPAST)
+    WHERE e.OccurredAtUtc < ?
+      AND NOT EXISTS (
+          SELECT 1
+          FROM dbo.AnalyticsDispatch d
+          WHERE d.EventId = e.EventId
+            AND d.Status NOT IN ('sent', 'dead')
+      )
+    ORDER BY e.OccurredAtUtc;
+
+    DELETE d
+    FROM dbo.AnalyticsDispatch d
+    INNER JOIN @batch b ON b.EventId = d.EventId;
+
+    DELETE e
+    FROM dbo.AnalyticsEvents e
+    INNER JOIN @batch b ON b.EventId = e.EventId;
+
+    SELECT @@ROWCOUNT AS DeletedCount;
+
+    SET NOCOUNT OFF;
+"""
+
+
+def purge_events_batch(config: AppConfig, cutoff_utc: datetime, batch_size: int) -> int:
+    """
+    Delete up to `batch_size` raw events that occurred before `cutoff_utc` and whose
+    dispatch rows are finished, together with those dispatch rows. One short
+    transaction per call, so ingestion and dispatch are not blocked for long.
+    """
+    with get_connection(config) as conn:
+        cursor = conn.cursor()
+        row = cursor.execute(_PURGE_EVENTS_BATCH_SQL, int(batch_size), cutoff_utc).fetchone()
+        _drain_results(cursor)
+        conn.commit()
+
+    return int(row.DeletedCount or 0) if row else 0
+
+
+def fetch_daily_rollups(
+    config: AppConfig,
+    from_day: date,
+    event_name: str | None = None,
+) -> list[dict[str, Any]]:
+    event_sql = "AND EventName = ?" if event_name else ""
+    params: tuple = (from_day, event_name) if event_name else (from_day,)
+
+    with get_connection(config) as conn:
+        cursor = conn.cursor()
+        rows = cursor.execute(
+            f"""
+            SELECT Day, EventName, SourceDomain, SourceSurface, EventCount, UserCount
+            FROM dbo.AnalyticsEventDailyRollups
+            WHERE Day >= ?
+              {event_sql}
+            ORDER BY Day DESC, EventName, SourceDomain, SourceSurface
+            """,
+            *params,
+        ).fetchall()
+        conn.commit()
+
+    return [
+        {
+            "day": row.Day.isoformat() if isinstance(row.Day, date) else str(row.Day),
+            "eventName": row.EventName,
+            "sourceDomain": row.SourceDomain,
+            "sourceSurface": row.SourceSurface,
+            "events": int(row.EventCount or 0),
+            "users": int(row.UserCount or 0),
+        }
+        for row in rows
+    ]
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import json
 import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 import logging
@@ -9,13 +12,12 @@ import requests
 
 from app.config import AppConfig
 from app.db import (
-    fetch_due_dispatch_rows,
+    claim_due_dispatch_rows,
     mark_dispatch_dead,
     mark_dispatch_retry,
-    mark_dispatch_sending,
     mark_dispatch_sent,
 )
-from app.mixpanel_client import MixpanelClient
+from app.mixpanel_client import ChunkResult, MixpanelClient, failed_record_indexes, import_in_chunks
 from app.mixpanel_mapper import MappingError, map_event_to_mixpanel
 
 logger = logging.getLogger(__name__)
@@ -39,6 +41,50 @@ class DispatchCounters:
             "exportEnabled": self.export_enabled,
         }
 
+    @property
+    def claimed(self) -> int:
+        return self.attempted + self.dead
+
+
+def run_dispatch(config: AppConfig) -> DispatchCounters:
+    """
+    One scheduler/operator dispatch request: up to `dispatch_max_batches` claims spread
+    over `dispatch_workers` threads. A worker stops when its claim comes back empty or
+    Mixpanel asks for a retry; other instances running at the same time claim other rows.
+    """
+    if config.dispatch_workers <= 1 and config.dispatch_max_batches <= 1:
+        return run_dispatch_once(config)
+
+    lock = threading.Lock()
+    remaining = [config.dispatch_max_batches]
+    results: list[DispatchCounters] = []
+
+    def worker() -> None:
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            counters = run_dispatch_once(config)
+            with lock:
+                results.append(counters)
+            if not counters.export_enabled or counters.claimed == 0 or counters.retry:
+                return
+
+    workers = min(config.dispatch_workers, config.dispatch_max_batches)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analytics-dispatch") as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            future.result()
+
+    return DispatchCounters(
+        attempted=sum(c.attempted for c in results),
+        sent=sum(c.sent for c in results),
+        retry=sum(c.retry for c in results),
+        dead=sum(c.dead for c in results),
+        skipped=sum(c.skipped for c in results),
+        export_enabled=all(c.export_enabled for c in results),
+    )
+
 
 def run_dispatch_once(config: AppConfig) -> DispatchCounters:
     if not config.mixpanel_export_enabled:
@@ -52,12 +98,19 @@ def run_dispatch_once(config: AppConfig) -> DispatchCounters:
             export_enabled=False,
         )
 
-    rows = fetch_due_dispatch_rows(config, limit=config.mixpanel_batch_size)
+    claim_token = str(uuid.uuid4())
+    rows = claim_due_dispatch_rows(
+        config,
+        claim_token,
+        limit=config.mixpanel_batch_size,
+        lease_seconds=config.dispatch_lease_seconds,
+    )
     logger.info(
-        "analytics_dispatch_due_rows count=%s batch_size=%s",
+        "analytics_dispatch_claimed count=%s batch_size=%s claim=%s",
         len(rows),
         config.mixpanel_batch_size,
-    )    
+        claim_token,
+    )
     if not rows:
         return DispatchCounters(
             attempted=0,
@@ -69,20 +122,21 @@ def run_dispatch_once(config: AppConfig) -> DispatchCounters:
         )
 
     mapped_events = []
-    mapped_dispatch_ids = []
+    mapped_rows = []
     dead = 0
 
     for row in rows:
         dispatch_id = row["DispatchId"]
         try:
             mapped_events.append(map_event_to_mixpanel(row))
-            mapped_dispatch_ids.append(dispatch_id)
+            mapped_rows.append(row)
         except (MappingError, ValueError, TypeError, json.JSONDecodeError) as exc:
             mark_dispatch_dead(
                 config,
                 [dispatch_id],
                 error_code=f"mapping:{type(exc).__name__}",
                 error_json=str(exc),
+                claim_token=claim_token,
             )
             dead += 1
 
@@ -102,114 +156,153 @@ def run_dispatch_once(config: AppConfig) -> DispatchCounters:
         dead,
     )
 
-    mark_dispatch_sending(config, mapped_dispatch_ids)
-
     client = MixpanelClient(config)
+    chunk_results = import_in_chunks(
+        client,
+        mapped_events,
+        concurrency=config.mixpanel_import_concurrency,
+    )
+
+    sent = 0
+    retry = 0
+    unexpected: Exception | None = None
+
+    for chunk in chunk_results:
+        chunk_rows = [mapped_rows[i] for i in chunk.indexes]
+        if chunk.error is not None and not isinstance(chunk.error, (requests.Timeout, requests.ConnectionError)):
+            # Rows stay 'sending'; the next run reclaims them once the lease expires.
+            unexpected = unexpected or chunk.error
+            continue
+
+        chunk_sent, chunk_retry, chunk_dead = _apply_chunk_result(config, claim_token, chunk, chunk_rows)
+        sent += chunk_sent
+        retry += chunk_retry
+        dead += chunk_dead
+
+    if unexpected is not None:
+        raise unexpected
 
-    try:
-        response = client.import_events(mapped_events)
-    except (requests.Timeout, requests.ConnectionError) as exc:
+    return DispatchCounters(
+        attempted=len(mapped_events),
+        sent=sent,
+        retry=retry,
+        dead=dead,
+        skipped=0,
+        export_enabled=True,
+    )
+
+
+def _apply_chunk_result(
+    config: AppConfig,
+    claim_token: str,
+    chunk: ChunkResult,
+    rows: list[dict[str, Any]],
+) -> tuple[int, int, int]:
+    """Mark the rows of one /import request; returns (sent, retry, dead)."""
+    dispatch_ids = [row["DispatchId"] for row in rows]
+
+    if chunk.error is not None:
+        exc = chunk.error
         logger.warning(
             "analytics_mixpanel_import_transport_error type=%s message=%s",
             type(exc).__name__,
             str(exc)[:500],
-        )        
-        delay = _retry_delay_seconds(_max_attempt_count(rows))
+        )
         mark_dispatch_retry(
             config,
-            mapped_dispatch_ids,
+            dispatch_ids,
             error_code=type(exc).__name__,
             error_json=str(exc),
-            delay_seconds=delay,
-        )
-        return DispatchCounters(
-            attempted=len(mapped_events),
-            sent=0,
-            retry=len(mapped_events),
-            dead=dead,
-            skipped=0,
-            export_enabled=True,
+            delay_seconds=_retry_delay_seconds(_max_attempt_count(rows)),
+            claim_token=claim_token,
         )
+        return 0, len(dispatch_ids), 0
 
+    response = chunk.response
     response_text = response.text or json.dumps(response.json_body, default=str)
 
     logger.info(
-        "analytics_mixpanel_import_response status_code=%s body_snippet=%s",
+        "analytics_mixpanel_import_response status_code=%s events=%s body_snippet=%s",
         response.status_code,
+        len(dispatch_ids),
         (response.text or "")[:500],
     )
 
     if 200 <= response.status_code < 300:
-        mark_dispatch_sent(config, mapped_dispatch_ids)
-        logger.info("analytics_dispatch_mark_sent count=%s", len(mapped_dispatch_ids))
-        return DispatchCounters(
-            attempted=len(mapped_events),
-            sent=len(mapped_events),
-            retry=0,
-            dead=dead,
-            skipped=0,
-            export_enabled=True,
-        )
+        updated = mark_dispatch_sent(config, dispatch_ids, claim_token=claim_token)
+        _log_lost_claims(claim_token, len(dispatch_ids), updated)
+        logger.info("analytics_dispatch_mark_sent count=%s", len(dispatch_ids))
+        return len(dispatch_ids), 0, 0
+
+    if response.status_code == 400:
+        failed = failed_record_indexes(response, len(dispatch_ids))
+        if failed is not None:
+            # Strict mode imported everything except the listed records
+            sent_ids = [dispatch_id for i, dispatch_id in enumerate(dispatch_ids) if i not in failed]
+            for index, record in sorted(failed.items()):
+                mark_dispatch_dead(
+                    config,
+                    [dispatch_ids[index]],
+                    error_code="http_400",
+                    error_json=json.dumps(record, default=str),
+                    claim_token=claim_token,
+                )
+            if sent_ids:
+                updated = mark_dispatch_sent(config, sent_ids, claim_token=claim_token)
+                _log_lost_claims(claim_token, len(sent_ids), updated)
+            logger.warning(
+                "analytics_dispatch_partial_import sent=%s dead=%s",
+                len(sent_ids),
+                len(failed),
+            )
+            return len(sent_ids), 0, len(failed)
 
     if response.status_code == 400 or 400 <= response.status_code < 500 and response.status_code not in {401, 403, 429}:
         logger.warning(
             "analytics_dispatch_mark_dead count=%s status_code=%s",
-            len(mapped_dispatch_ids),
+            len(dispatch_ids),
             response.status_code,
         )
         mark_dispatch_dead(
             config,
-            mapped_dispatch_ids,
+            dispatch_ids,
             error_code=f"http_{response.status_code}",
             error_json=response_text,
+            claim_token=claim_token,
         )
-        return DispatchCounters(
-            attempted=len(mapped_events),
-            sent=0,
-            retry=0,
-            dead=dead + len(mapped_events),
-            skipped=0,
-            export_enabled=True,
-        )
+        return 0, 0, len(dispatch_ids)
 
     if response.status_code in {401, 403, 429, 500, 502, 503, 504}:
         logger.warning(
             "analytics_dispatch_mark_retry count=%s status_code=%s",
-            len(mapped_dispatch_ids),
+            len(dispatch_ids),
             response.status_code,
         )
         delay = _retry_delay_seconds(_max_attempt_count(rows), auth_error=response.status_code in {401, 403})
-        mark_dispatch_retry(
-            config,
-            mapped_dispatch_ids,
-            error_code=f"http_{response.status_code}",
-            error_json=response_text,
-            delay_seconds=delay,
-        )
-        return DispatchCounters(
-            attempted=len(mapped_events),
-            sent=0,
-            retry=len(mapped_events),
-            dead=dead,
-            skipped=0,
-            export_enabled=True,
-        )
+    else:
+        delay = _retry_delay_seconds(_max_attempt_count(rows))
 
     mark_dispatch_retry(
         config,
-        mapped_dispatch_ids,
+        dispatch_ids,
         error_code=f"http_{response.status_code}",
         error_json=response_text,
-        delay_seconds=_retry_delay_seconds(_max_attempt_count(rows)),
-    )
-    return DispatchCounters(
-        attempted=len(mapped_events),
-        sent=0,
-        retry=len(mapped_events),
-        dead=dead,
-        skipped=0,
-        export_enabled=True,
+        delay_seconds=delay,
+        claim_token=claim_token,
     )
+    return 0, len(dispatch_ids), 0
+
+
+def _log_lost_claims(claim_token: str, expected: int, updated: Any) -> None:
+    # Rows whose lease expired mid-send were reclaimed by another run; that run owns
+    # them now and Mixpanel de-duplicates the resend by $insert_id.
+    if isinstance(updated, int) and 0 <= updated < expected:
+        logger.warning(
+            "analytics_dispatch_claim_lost claim=%s expected=%s updated=%s",
+            claim_token,
+            expected,
+            updated,
+        )
 
 
 def _max_attempt_count(rows: list[dict[str, Any]]) -> int:
@@ -8,6 +8,8 @@ from app.config import AppConfig
 from app.routes.diagnostics import bp as diagnostics_bp
 from app.routes.events import bp as events_bp
 from app.routes.dispatch import bp as dispatch_bp
+from app.routes.retention import bp as retention_bp
+from app.sql_instrumentation import install_request_tracking
 
 def create_app() -> Flask:
     app = Flask(__name__)
@@ -18,9 +20,12 @@ def create_app() -> Flask:
     config.validate_startup()
     app.config["APP_CONFIG"] = config
 
+    install_request_tracking(app)
+
     app.register_blueprint(events_bp)
     app.register_blueprint(diagnostics_bp)
     app.register_blueprint(dispatch_bp)
+    app.register_blueprint(retention_bp)
 
     @app.get("/ping")
     def ping():
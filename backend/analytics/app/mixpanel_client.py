@@ -1,14 +1,41 @@
 from __future__ import annotations
 
+import gzip
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 
 from app.config import AppConfig
 
 logger = logging.getLogger(__name__)
 
+# Mixpanel /import limits per request (events, uncompressed JSON bytes); the byte
+# bound keeps some headroom under the documented 10 MB.
+MIXPANEL_IMPORT_MAX_EVENTS = 2000
+MIXPANEL_IMPORT_MAX_BYTES = 9 * 1024 * 1024
+
+_SESSION: requests.Session | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session(pool_size: int) -> requests.Session:
+    """Process-wide keep-alive session; created lazily so pre-fork workers get their own."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(4, pool_size))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
 @dataclass(frozen=True)
 class MixpanelResponse:
     status_code: int
@@ -16,11 +43,20 @@ class MixpanelResponse:
     json_body: Any | None
 
 
+@dataclass(frozen=True)
+class ChunkResult:
+    """One /import request: positions of its events in the dispatch batch and the outcome."""
+    indexes: list[int]
+    response: MixpanelResponse | None
+    error: Exception | None = None
+
+
 class MixpanelClient:
     def __init__(self, config: AppConfig):
         self._config = config
 
     def import_events(self, events: list[dict[str, Any]]) -> MixpanelResponse:
+        """One gzip-compressed /import request; callers keep it within the import limits."""
         if not events:
             return MixpanelResponse(status_code=200, text="", json_body=None)
 
@@ -29,23 +65,33 @@ class MixpanelClient:
             "strict": "1" if self._config.mixpanel_strict else "0",
             "project_id": self._config.mixpanel_project_id,
         }
+        raw = json.dumps(events, separators=(",", ":"), default=str).encode("utf-8")
+        body = gzip.compress(raw, compresslevel=5)
 
         logger.info(
-            "mixpanel_import_request base_url=%s project_id_set=%s event_count=%s strict=%s",
+            "mixpanel_import_request base_url=%s project_id_set=%s event_count=%s bytes=%s gzip_bytes=%s strict=%s",
             self._config.mixpanel_api_base_url.rstrip("/"),
             bool(self._config.mixpanel_project_id),
             len(events),
+            len(raw),
+            len(body),
             self._config.mixpanel_strict,
         )
 
-        response = requests.post(
+        pool_size = self._config.mixpanel_import_concurrency * self._config.dispatch_workers
+        response = _session(pool_size).post(
             url,
             params=params,
             auth=(
                 self._config.mixpanel_service_account_username,
                 self._config.mixpanel_service_account_password,
             ),
-            json=events,
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+                "Accept": "application/json",
+            },
             timeout=20,
         )
 
@@ -59,4 +105,79 @@ class MixpanelClient:
             text=response.text[:4000],
             json_body=json_body,
         )
-        
\ No newline at end of file
+
+
+def chunk_events(
+    events: list[dict[str, Any]],
+    max_events: int = MIXPANEL_IMPORT_MAX_EVENTS,
+    max_bytes: int = MIXPANEL_IMPORT_MAX_BYTES,
+) -> list[list[int]]:
+    """
+    Split a batch into index lists that respect the per-request event and byte limits.
+    An event larger than max_bytes goes alone; Mixpanel rejects it without
+    affecting the others.
+    """
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    current_bytes = 2  # "[" and "]"
+
+    for index, event in enumerate(events):
+        size = len(json.dumps(event, separators=(",", ":"), default=str).encode("utf-8")) + 1
+        if current and (len(current) >= max_events or current_bytes + size > max_bytes):
+            chunks.append(current)
+            current = []
+            current_bytes = 2
+        current.append(index)
+        current_bytes += size
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def import_in_chunks(
+    client: MixpanelClient,
+    events: list[dict[str, Any]],
+    concurrency: int = 1,
+    max_events: int = MIXPANEL_IMPORT_MAX_EVENTS,
+    max_bytes: int = MIXPANEL_IMPORT_MAX_BYTES,
+) -> list[ChunkResult]:
+    """
+    Send a dispatch batch as size-bounded /import requests, up to `concurrency` at a
+    time. Results come back in chunk order; a chunk that raised carries the exception.
+    """
+    chunks = chunk_events(events, max_events=max_events, max_bytes=max_bytes)
+
+    def send(indexes: list[int]) -> ChunkResult:
+        try:
+            return ChunkResult(indexes=indexes, response=client.import_events([events[i] for i in indexes]))
+        except Exception as exc:
+            return ChunkResult(indexes=indexes, response=None, error=exc)
+
+    if len(chunks) <= 1 or concurrency <= 1:
+        return [send(indexes) for indexes in chunks]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks)), thread_name_prefix="mixpanel-import") as pool:
+        return list(pool.map(send, chunks))
+
+
+def failed_record_indexes(response: MixpanelResponse, chunk_size: int) -> dict[int, Any] | None:
+    """
+    Strict-mode 400 responses list the rejected records (`failed_records[].index`,
+    relative to the request); the rest of the request was imported. Returns
+    {index: record} or None when the body does not describe a partial failure.
+    """
+    body = response.json_body
+    if not isinstance(body, dict):
+        return None
+    records = body.get("failed_records")
+    if not isinstance(records, list) or not records:
+        return None
+
+    failed: dict[int, Any] = {}
+    for record in records:
+        index = record.get("index") if isinstance(record, dict) else None
+        if not isinstance(index, int) or not 0 <= index < chunk_size:
+            return None
+        failed[index] = record
+    return failed
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from app.config import AppConfig
+from app.db import get_rollup_start_day, purge_events_batch, refresh_daily_rollups
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetentionCounters:
+    rollup_from: date | None
+    rollup_rows: int
+    cutoff_utc: datetime
+    purged: int
+    batches: int
+    complete: bool
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rollupFrom": self.rollup_from.isoformat() if self.rollup_from else None,
+            "rollupRows": self.rollup_rows,
+            "cutoffUtc": self.cutoff_utc.isoformat(timespec="seconds") + "Z",
+            "purged": self.purged,
+            "batches": self.batches,
+            "complete": self.complete,
+        }
+
+
+def retention_cutoff(config: AppConfig, now: datetime | None = None) -> datetime:
+    """Midnight UTC `retention_days` ago (naive, like the datetime2 columns)."""
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    today = datetime(now.year, now.month, now.day)
+    return today - timedelta(days=config.retention_days)
+
+
+def run_retention_once(config: AppConfig, now: datetime | None = None) -> RetentionCounters:
+    """
+    One scheduler/operator retention request: refresh the daily rollups up to today,
+    then purge raw events older than the retention window in batches of
+    `purge_batch_size`, at most `purge_max_batches` per request. Rollups run first so
+    purged days are always counted; `complete` is False when the batch limit was hit
+    and the next run should continue.
+    """
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    tomorrow = now.date() + timedelta(days=1)
+
+    rollup_from = get_rollup_start_day(config)
+    rollup_rows = 0
+    if rollup_from is not None:
+        rollup_rows = refresh_daily_rollups(config, rollup_from, tomorrow)
+
+    cutoff = retention_cutoff(config, now)
+    purged = 0
+    batches = 0
+    complete = False
+
+    while batches < config.purge_max_batches:
+        deleted = purge_events_batch(config, cutoff, config.purge_batch_size)
+        batches += 1
+        purged += deleted
+        if deleted < config.purge_batch_size:
+            complete = True
+            break
+
+    counters = RetentionCounters(
+        rollup_from=rollup_from,
+        rollup_rows=rollup_rows,
+        cutoff_utc=cutoff,
+        purged=purged,
+        batches=batches,
+        complete=complete,
+    )
+    logger.info(
+        "analytics_retention_done rollup_from=%s rollup_rows=%s cutoff=%s purged=%s batches=%s complete=%s",
+        counters.rollup_from,
+        counters.rollup_rows,
+        counters.cutoff_utc,
+        counters.purged,
+        counters.batches,
+        counters.complete,
+    )
+    return counters
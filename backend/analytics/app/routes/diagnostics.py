@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+
 from flask import Blueprint, current_app, jsonify, request
 
 from app.auth import AuthError, authenticate_request
-from app.db import get_dispatch_status
+from app.db import fetch_daily_rollups, get_dispatch_status
 
 
 bp = Blueprint("diagnostics", __name__)
@@ -34,3 +36,38 @@ def dispatch_status():
             **counters,
         }
     )
+
+
+@bp.get("/analytics/diagnostics/daily")
+def daily_rollups():
+    config = current_app.config["APP_CONFIG"]
+
+    try:
+        auth_context = authenticate_request(request, config)
+        if not auth_context.can_status:
+            return jsonify({"error": "forbidden_key"}), 403
+
+        try:
+            days = int(request.args.get("days", "14"))
+        except ValueError:
+            return jsonify({"error": "invalid_days"}), 400
+        days = max(1, min(days, 366))
+        event_name = (request.args.get("eventName") or "").strip() or None
+
+        from_day = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        rows = fetch_daily_rollups(config, from_day, event_name)
+
+    except AuthError as exc:
+        return jsonify({"error": str(exc)}), 401
+
+    except Exception:
+        current_app.logger.exception("analytics_daily_rollups_failed")
+        return jsonify({"error": "internal_error"}), 500
+
+    return jsonify(
+        {
+            "fromDay": from_day.isoformat(),
+            "eventName": event_name,
+            "rows": rows,
+        }
+    )
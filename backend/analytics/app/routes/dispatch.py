@@ -3,7 +3,7 @@ from __future__ import annotations
 from flask import Blueprint, current_app, jsonify, request
 import logging
 from app.auth import AuthError, authenticate_request
-from app.dispatch import run_dispatch_once
+from app.dispatch import run_dispatch
 
 logger = logging.getLogger(__name__)
 bp = Blueprint("dispatch", __name__)
@@ -19,7 +19,7 @@ def dispatch_run():
         if not auth_context.can_dispatch and auth_context.key_name != "operator":
             return jsonify({"error": "forbidden_key"}), 403
 
-        counters = run_dispatch_once(config)
+        counters = run_dispatch(config)
 
     except AuthError as exc:
         return jsonify({"error": str(exc)}), 401
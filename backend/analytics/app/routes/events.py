@@ -3,7 +3,7 @@ from __future__ import annotations
 from flask import Blueprint, current_app, jsonify, request
 
 from app.auth import AuthError, authenticate_request
-from app.db import insert_event_with_dispatch
+from app.db import insert_event_with_dispatch, insert_events_with_dispatch
 from app.distinct_id import build_distinct_id
 from app.validation import ValidationError, validate_event_payload
 
@@ -45,3 +45,69 @@ def ingest_event():
             "idempotent": duplicate,
         }
     ), 200 if duplicate else 202
+
+
+@bp.post("/analytics/events:batch")
+def ingest_event_batch():
+    """
+    Body: {"events": [<event>, ...]}. Each event is validated like POST /analytics/events;
+    the response lists one result per input position: accepted, duplicate or invalid.
+    """
+    config = current_app.config["APP_CONFIG"]
+
+    try:
+        auth_context = authenticate_request(request, config)
+    except AuthError as exc:
+        return jsonify({"error": str(exc)}), 401
+
+    if not config.collection_enabled:
+        return jsonify({"error": "collection_disabled", "message": "Analytics collection is disabled."}), 503
+
+    if not auth_context.can_ingest:
+        return jsonify({"error": "forbidden_key", "message": "Presented key is not allowed to ingest events."}), 403
+
+    body = request.get_json(silent=True)
+    events = body.get("events") if isinstance(body, dict) else None
+    if not isinstance(events, list):
+        return jsonify({"error": "invalid_json", "message": "Request body must be a JSON object with an events array."}), 400
+    if not events:
+        return jsonify({"error": "empty_batch", "message": "events must not be empty."}), 400
+    if len(events) > config.ingest_batch_max_events:
+        return jsonify(
+            {
+                "error": "batch_too_large",
+                "message": f"At most {config.ingest_batch_max_events} events per batch.",
+            }
+        ), 413
+
+    results: list[dict] = [{} for _ in events]
+    valid = []
+    valid_positions = []
+
+    for index, payload in enumerate(events):
+        try:
+            event = validate_event_payload(payload, auth_context, config)
+        except ValidationError as exc:
+            results[index] = {"index": index, "status": "invalid", "error": exc.code, "message": exc.message}
+            continue
+        valid.append((event, build_distinct_id(event["userId"], config.distinct_id_salt)))
+        valid_positions.append(index)
+
+    try:
+        stored = insert_events_with_dispatch(config, valid)
+    except Exception:
+        current_app.logger.exception("analytics_batch_ingest_failed events=%d", len(valid))
+        return jsonify({"error": "internal_error"}), 500
+
+    for index, (event_id, duplicate) in zip(valid_positions, stored):
+        results[index] = {
+            "index": index,
+            "eventId": event_id,
+            "status": "duplicate" if duplicate else "accepted",
+        }
+
+    counts = {"accepted": 0, "duplicate": 0, "invalid": 0}
+    for result in results:
+        counts[result["status"]] += 1
+
+    return jsonify({**counts, "results": results}), 200
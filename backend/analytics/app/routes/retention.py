@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from flask import Blueprint, current_app, jsonify, request
+
+from app.auth import AuthError, authenticate_request
+from app.retention import run_retention_once
+
+bp = Blueprint("retention", __name__)
+
+
+@bp.post("/analytics/retention/run")
+def retention_run():
+    config = current_app.config["APP_CONFIG"]
+
+    try:
+        auth_context = authenticate_request(request, config)
+        if not auth_context.can_dispatch and auth_context.key_name != "operator":
+            return jsonify({"error": "forbidden_key"}), 403
+
+        counters = run_retention_once(config)
+
+    except AuthError as exc:
+        return jsonify({"error": str(exc)}), 401
+
+    except Exception:
+        current_app.logger.exception("analytics_retention_failed")
+        return jsonify({"error": "internal_error"}), 500
+
+    return jsonify(counters.as_dict())
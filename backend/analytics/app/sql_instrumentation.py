@@ -0,0 +1,340 @@
+# app/sql_instrumentation.py
+# Per-statement SQL timing, slow-query log and per-request summaries.
+#
+# get_connection() hands out connections whose cursors are InstrumentedCursor
+# proxies. Every execute()/executemany() becomes a StatementRecord: a normalized
+# fingerprint of the SQL text, the time spent executing and fetching, and the rows
+# fetched (or affected, for DML). A record is closed when its cursor runs the next
+# statement, is closed, or the request ends; closed records slower than
+# SQL_SLOW_QUERY_MS are logged with their fingerprint.
+#
+# install_request_tracking() opens a scope per Flask request; at the end one
+# 'sql_summary' line is logged and the response gets a Server-Timing header
+# (sql count/time, total time).
+#
+# SQL_INSTRUMENTATION_ENABLED=0 hands out the plain connections again.
+#
+# Canonical copy: backend/jobs/helpers/sql_instrumentation.py. The Users, Enrichers and
+# Analytics copies are checked against it by backend/jobs/tests/test_shared_module_copies.py;
+# change the Jobs copy first, then copy it over.
+import contextvars
+import hashlib
+import logging
+import os
+import re
+import time
+from typing import Any, Optional
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def instrumentation_enabled() -> bool:
+    return os.getenv("SQL_INSTRUMENTATION_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def slow_query_ms() -> float:
+    return max(0.0, _env_float("SQL_SLOW_QUERY_MS", 500))
+
+
+# ----------------------------
+# Fingerprints
+# ----------------------------
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w@#.])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_VALUES_ROWS_RE = re.compile(r"\(\s*\?\s*\)(?:\s*,\s*\(\s*\?\s*\))+")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    SQL text with comments, literals and whitespace normalized, so statements that
+    differ only in values (or in the length of IN/VALUES lists) compare equal.
+    """
+    s = _COMMENT_RE.sub(" ", sql or "")
+    s = _STRING_RE.sub("?", s)
+    s = _NUMBER_RE.sub("?", s)
+    s = _PLACEHOLDER_LIST_RE.sub("?", s)
+    s = _VALUES_ROWS_RE.sub("(?)", s)
+    return _WS_RE.sub(" ", s).strip()
+
+
+def sql_fingerprint(sql: str) -> tuple[str, str]:
+    """(short hash, normalized text) of a statement."""
+    normalized = normalize_sql(sql)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12], normalized
+
+
+# ----------------------------
+# Records and request scope
+# ----------------------------
+class StatementRecord:
+    def __init__(self, sql: str, many: bool = False):
+        self.fingerprint, self.normalized = sql_fingerprint(sql)
+        self.many = many
+        self.elapsed_ms = 0.0
+        self.rows = 0
+        self.finished = False
+
+    def add(self, elapsed_s: float, rows: int = 0) -> None:
+        self.elapsed_ms += elapsed_s * 1000.0
+        self.rows += max(0, rows)
+
+    def finish(self) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        threshold = slow_query_ms()
+        if threshold and self.elapsed_ms >= threshold:
+            logging.warning(
+                "sql_slow ms=%.1f rows=%d fp=%s many=%s sql=%s",
+                self.elapsed_ms, self.rows, self.fingerprint, self.many, self.normalized[:500],
+            )
+
+
+class RequestSqlStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.records: list[StatementRecord] = []
+        self.final_total_ms: Optional[float] = None
+
+    @property
+    def sql_count(self) -> int:
+        return len(self.records)
+
+    @property
+    def sql_ms(self) -> float:
+        return sum(r.elapsed_ms for r in self.records)
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def top(self, n: int = 3) -> list[tuple[str, int, float]]:
+        """Slowest fingerprints as (fingerprint, count, total ms)."""
+        by_fp: dict[str, list] = {}
+        for r in self.records:
+            agg = by_fp.setdefault(r.fingerprint, [0, 0.0])
+            agg[0] += 1
+            agg[1] += r.elapsed_ms
+        ranked = sorted(by_fp.items(), key=lambda kv: kv[1][1], reverse=True)[:n]
+        return [(fp, count, ms) for fp, (count, ms) in ranked]
+
+
+_CURRENT: contextvars.ContextVar[Optional[RequestSqlStats]] = contextvars.ContextVar(
+    "sql_request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestSqlStats]:
+    return _CURRENT.get()
+
+
+def begin_request(name: str):
+    """Open a request scope; pass the returned token to end_request()."""
+    return _CURRENT.set(RequestSqlStats(name))
+
+
+def end_request(token) -> Optional[RequestSqlStats]:
+    """Close the scope opened by begin_request(), log its summary and return it."""
+    stats = _CURRENT.get()
+    _CURRENT.reset(token)
+    if stats is None:
+        return None
+    for r in stats.records:
+        r.finish()
+    total_ms = stats.total_ms()
+    logging.info(
+        "sql_summary route=%s sql_count=%d sql_ms=%.1f total_ms=%.1f top=%s",
+        stats.name, stats.sql_count, stats.sql_ms, total_ms,
+        ",".join(f"{fp}x{count}:{ms:.1f}" for fp, count, ms in stats.top()),
+    )
+    stats.final_total_ms = total_ms
+    return stats
+
+
+def server_timing_value(stats: RequestSqlStats) -> str:
+    total_ms = stats.final_total_ms if stats.final_total_ms is not None else stats.total_ms()
+    return (
+        f'sql;dur={stats.sql_ms:.1f};desc="{stats.sql_count} statements", '
+        f"total;dur={total_ms:.1f}"
+    )
+
+
+# ----------------------------
+# Cursor / connection proxies
+# ----------------------------
+class InstrumentedCursor:
+    """
+    Proxy around a DB-API cursor. execute()/executemany() return the proxy so
+    pyodbc-style chaining (cursor.execute(...).fetchone()) keeps working; anything
+    else (description, rowcount, fast_executemany, nextset, ...) goes to the raw cursor.
+    """
+
+    def __init__(self, raw: Any):
+        object.__setattr__(self, "_raw", raw)
+        object.__setattr__(self, "_record", None)
+
+    def _begin(self, sql: str, many: bool) -> StatementRecord:
+        self._finish()
+        record = StatementRecord(sql, many=many)
+        object.__setattr__(self, "_record", record)
+        stats = _CURRENT.get()
+        if stats is not None:
+            stats.records.append(record)
+        return record
+
+    def _finish(self) -> None:
+        record = self._record
+        if record is not None:
+            record.finish()
+            object.__setattr__(self, "_record", None)
+
+    def _affected(self) -> int:
+        try:
+            count = self._raw.rowcount
+        except Exception:
+            return 0
+        return count if isinstance(count, int) and count > 0 else 0
+
+    def execute(self, sql, *params):
+        record = self._begin(sql, many=False)
+        started = time.perf_counter()
+        try:
+            self._raw.execute(sql, *params)
+        finally:
+            # SELECTs report -1 here; their rows are counted as they are fetched
+            record.add(time.perf_counter() - started, self._affected())
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        record = self._begin(sql, many=True)
+        started = time.perf_counter()
+        try:
+            self._raw.executemany(sql, seq_of_params)
+        finally:
+            record.add(time.perf_counter() - started, self._affected())
+        return self
+
+    def _timed_fetch(self, fetch, *args):
+        started = time.perf_counter()
+        result = fetch(*args)
+        record = self._record
+        if record is not None:
+            if isinstance(result, list):
+                rows = len(result)
+            else:
+                rows = 0 if result is None else 1
+            record.add(time.perf_counter() - started, rows)
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(self._raw.fetchone)
+
+    def fetchall(self):
+        return self._timed_fetch(self._raw.fetchall)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(self._raw.fetchmany, *args)
+
+    def fetchval(self):
+        return self._timed_fetch(self._raw.fetchval)
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self) -> None:
+        self._finish()
+        self._raw.close()
+
+    def __enter__(self) -> "InstrumentedCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._raw, name, value)
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection:
+    """Proxy around a (pooled or raw) connection whose cursors are instrumented."""
+
+    def __init__(self, raw: Any):
+        object.__setattr__(self, "_raw", raw)
+
+    def cursor(self) -> InstrumentedCursor:
+        return InstrumentedCursor(self._raw.cursor())
+
+    def execute(self, sql, *params) -> InstrumentedCursor:
+        return self.cursor().execute(sql, *params)
+
+    def __enter__(self) -> "InstrumentedConnection":
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    def __getattr__(self, name: str):
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        # autocommit and friends belong to the wrapped connection
+        setattr(self._raw, name, value)
+
+
+def instrument_connection(conn: Any) -> Any:
+    if not instrumentation_enabled():
+        return conn
+    return InstrumentedConnection(conn)
+
+
+# ----------------------------
+# Flask integration
+# ----------------------------
+def install_request_tracking(app: Any) -> None:
+    """Per-request scope for every Flask request: summary log line + Server-Timing."""
+    if not instrumentation_enabled():
+        return
+
+    from flask import g, request
+
+    @app.before_request
+    def _sql_begin_request():
+        g._sql_stats_token = begin_request(f"{request.method} {request.path}")
+
+    @app.after_request
+    def _sql_end_request(response):
+        token = g.pop("_sql_stats_token", None)
+        if token is not None:
+            stats = end_request(token)
+            if stats is not None:
+                response.headers["Server-Timing"] = server_timing_value(stats)
+        return response
+
+    @app.teardown_request
+    def _sql_teardown_request(exc):
+        # after_request is skipped on unhandled errors; still close the scope
+        token = g.pop("_sql_stats_token", None)
+        if token is not None:
+            end_request(token)
@@ -0,0 +1,252 @@
+# app/sql_pool.py
+# Small in-process pool for pyodbc connections.
+#
+# The Flask worker lives across requests, so keeping a few
+# authenticated connections around saves the TLS + login handshake on every request.
+# The pool knows nothing about pyodbc: it is given a zero-argument ``connect`` callable
+# and only relies on cursor()/commit()/rollback()/close()/autocommit.
+#
+# - checkout: most recently used idle connection first; connections idle longer than
+#   ``idle_timeout`` are closed, connections idle longer than ``ping_after`` are checked
+#   with SELECT 1 and dropped if broken.
+# - return:   open transaction is rolled back, autocommit reset and the session reset
+#   (SESSION_RESET_SQL: SET options back to defaults, the session's #temp tables
+#   dropped) before the connection goes back to the idle list, so callers need not
+#   clean up session state; a connection that fails this is discarded. At most
+#   ``max_size`` idle connections are kept.
+# - callers keep the old contract: conn.close() (or garbage collection of a connection
+#   that was never closed) hands the connection back instead of closing it.
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+# Runs on every return. SET options a caller may change go back to the driver
+# defaults; the session's own #temp tables are dropped (tempdb names them
+# '#name____...<suffix>', and OBJECT_ID('tempdb..#name') only resolves this session's).
+SESSION_RESET_SQL = """
+SET NOCOUNT OFF;
+SET XACT_ABORT OFF;
+SET LOCK_TIMEOUT -1;
+SET TRANSACTION ISOLATION LEVEL READ COMMITTED;
+
+DECLARE @drop nvarchar(max) = N'';
+SELECT @drop = @drop + N'DROP TABLE ' + QUOTENAME(t.ShortName) + N';'
+FROM (
+    SELECT LEFT(name, CHARINDEX(N'_____', name + N'_____') - 1) AS ShortName, object_id
+    FROM tempdb.sys.tables
+    WHERE name LIKE N'#%' AND name NOT LIKE N'##%'
+) t
+WHERE OBJECT_ID(N'tempdb..' + t.ShortName) = t.object_id;
+
+IF @drop <> N'' EXEC sp_executesql @drop;
+"""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def pool_enabled() -> bool:
+    return os.getenv("SQL_POOL_ENABLED", "1").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def pool_settings_from_env() -> dict:
+    return {
+        "max_size": max(0, _env_int("SQL_POOL_MAX_SIZE", 5)),
+        "idle_timeout": max(1, _env_int("SQL_POOL_IDLE_TIMEOUT_SECONDS", 300)),
+        "ping_after": max(0, _env_int("SQL_POOL_PING_AFTER_SECONDS", 30)),
+    }
+
+
+class PooledConnection:
+    """
+    Proxy around a raw connection checked out from a ConnectionPool.
+    close() returns the connection to the pool; `with conn:` commits on success,
+    rolls back on error and then returns it.
+    """
+
+    def __init__(self, pool: "ConnectionPool", raw: Any):
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+
+    @property
+    def raw(self) -> Any:
+        if self._released:
+            raise RuntimeError("Connection has already been returned to the pool.")
+        return self._raw
+
+    @property
+    def autocommit(self) -> bool:
+        return self.raw.autocommit
+
+    @autocommit.setter
+    def autocommit(self, value: bool) -> None:
+        self.raw.autocommit = value
+
+    @property
+    def closed(self) -> bool:
+        return self._released
+
+    def cursor(self):
+        return self.raw.cursor()
+
+    def execute(self, *args, **kwargs):
+        return self.raw.execute(*args, **kwargs)
+
+    def commit(self) -> None:
+        self.raw.commit()
+
+    def rollback(self) -> None:
+        self.raw.rollback()
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._raw)
+
+    def discard(self) -> None:
+        """Drop the underlying connection instead of returning it (e.g. after a transport error)."""
+        if self._released:
+            return
+        self._released = True
+        self._pool.discard(self._raw)
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not defined above (getinfo, timeout, add_output_converter, ...).
+        return getattr(self.raw, name)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if not self._released and not self._raw.autocommit:
+                if exc_type is None:
+                    self._raw.commit()
+                else:
+                    self._raw.rollback()
+        finally:
+            self.close()
+
+    def __del__(self):
+        # Safety net for callers that never close the connection.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int = 5,
+        idle_timeout: float = 300,
+        ping_after: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+        reset_sql: Optional[str] = SESSION_RESET_SQL,
+    ):
+        self._connect = connect
+        self.reset_sql = reset_sql
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self._clock = clock
+        self._idle: list[tuple[Any, float]] = []
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def acquire(self) -> PooledConnection:
+        while True:
+            with self._lock:
+                item = self._idle.pop() if self._idle else None
+            if item is None:
+                break
+
+            raw, last_used = item
+            idle_for = self._clock() - last_used
+            if idle_for > self.idle_timeout:
+                self._close_quietly(raw)
+                continue
+            if idle_for > self.ping_after and not self._ping(raw):
+                self._close_quietly(raw)
+                continue
+
+            self.stats["reused"] += 1
+            return PooledConnection(self, raw)
+
+        raw = self._connect()
+        self.stats["created"] += 1
+        return PooledConnection(self, raw)
+
+    def release(self, raw: Any) -> None:
+        try:
+            if not raw.autocommit:
+                raw.rollback()
+            else:
+                raw.autocommit = False
+            if self.reset_sql:
+                cur = raw.cursor()
+                cur.execute(self.reset_sql)
+                cur.close()
+                raw.commit()
+        except Exception:
+            logging.warning("sql_pool: dropping connection that failed reset on return", exc_info=True)
+            self._close_quietly(raw)
+            return
+
+        with self._lock:
+            self._evict_expired_locked()
+            if len(self._idle) < self.max_size:
+                self._idle.append((raw, self._clock()))
+                return
+        self._close_quietly(raw)
+
+    def discard(self, raw: Any) -> None:
+        self._close_quietly(raw)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    def _evict_expired_locked(self) -> None:
+        now = self._clock()
+        keep = []
+        for raw, last_used in self._idle:
+            if now - last_used > self.idle_timeout:
+                self._close_quietly(raw)
+            else:
+                keep.append((raw, last_used))
+        self._idle = keep
+
+    def _ping(self, raw: Any) -> bool:
+        try:
+            cur = raw.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            return True
+        except Exception:
+            logging.info("sql_pool: idle connection failed health check, reconnecting")
+            return False
+
+    def _close_quietly(self, raw: Any) -> None:
+        self.stats["discarded"] += 1
+        try:
+            raw.close()
+        except Exception:
+            pass
@@ -0,0 +1,170 @@
+"""
+Local stand-in for the Mixpanel /import endpoint.
+
+Used by the client unit tests and for dispatcher throughput runs without touching
+the real project:
+
+    python tests/mixpanel_standin.py --port 8099 --latency-ms 80
+    MIXPANEL_API_BASE_URL=http://127.0.0.1:8099 (Analytics env) + POST /analytics/dispatch/run
+
+Behaves like strict-mode /import: gzip or plain JSON array bodies, per-request event
+and byte limits, and 400 responses with `failed_records` for invalid records (missing
+event/time/distinct_id/$insert_id, or a `standin_fail: true` property). Counters are
+printed on exit.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+MAX_EVENTS = 2000
+MAX_BYTES = 10 * 1024 * 1024
+
+
+class StandinStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.gzip_requests = 0
+        self.events_received = 0
+        self.events_imported = 0
+        self.max_events_per_request = 0
+        self.max_concurrent = 0
+        self._in_flight = 0
+
+    def enter(self) -> None:
+        with self.lock:
+            self._in_flight += 1
+            self.max_concurrent = max(self.max_concurrent, self._in_flight)
+
+    def leave(self) -> None:
+        with self.lock:
+            self._in_flight -= 1
+
+    def as_dict(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "gzipRequests": self.gzip_requests,
+                "eventsReceived": self.events_received,
+                "eventsImported": self.events_imported,
+                "maxEventsPerRequest": self.max_events_per_request,
+                "maxConcurrent": self.max_concurrent,
+            }
+
+
+def _record_failure(index: int, event: Any) -> dict[str, Any] | None:
+    if not isinstance(event, dict):
+        return {"index": index, "field": "event", "message": "record is not an object"}
+    properties = event.get("properties")
+    if not event.get("event") or not isinstance(properties, dict):
+        return {"index": index, "field": "event", "message": "missing event or properties"}
+    for field in ("time", "distinct_id", "$insert_id"):
+        if properties.get(field) in (None, ""):
+            return {"index": index, "$insert_id": properties.get("$insert_id"), "field": f"properties.{field}", "message": "required"}
+    if properties.get("standin_fail") is True:
+        return {"index": index, "$insert_id": properties["$insert_id"], "field": "properties", "message": "rejected by stand-in"}
+    return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    stats: StandinStats
+    latency_s: float = 0.0
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def do_POST(self):
+        self.stats.enter()
+        try:
+            self._handle_import()
+        finally:
+            self.stats.leave()
+
+    def _handle_import(self):
+        if self.path.split("?", 1)[0] != "/import":
+            return self._reply(404, {"error": "not found"})
+        if not self.headers.get("Authorization"):
+            return self._reply(401, {"error": "missing credentials"})
+
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        compressed = (self.headers.get("Content-Encoding") or "").lower() == "gzip"
+        if compressed:
+            body = gzip.decompress(body)
+        if len(body) > MAX_BYTES:
+            return self._reply(413, {"error": "payload too large"})
+
+        try:
+            events = json.loads(body)
+        except ValueError:
+            return self._reply(400, {"error": "invalid json"})
+        if not isinstance(events, list):
+            return self._reply(400, {"error": "body must be an array"})
+        if len(events) > MAX_EVENTS:
+            return self._reply(400, {"error": f"max {MAX_EVENTS} events per request"})
+
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+        failed = [f for f in (_record_failure(i, e) for i, e in enumerate(events)) if f]
+        imported = len(events) - len(failed)
+
+        with self.stats.lock:
+            self.stats.requests += 1
+            self.stats.gzip_requests += 1 if compressed else 0
+            self.stats.events_received += len(events)
+            self.stats.events_imported += imported
+            self.stats.max_events_per_request = max(self.stats.max_events_per_request, len(events))
+
+        if failed:
+            return self._reply(
+                400,
+                {"code": 400, "status": "Bad Request", "num_records_imported": imported, "failed_records": failed},
+            )
+        return self._reply(200, {"code": 200, "status": "OK", "num_records_imported": imported})
+
+    def _reply(self, status: int, payload: dict[str, Any]) -> None:
+        raw = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_standin(port: int = 0, latency_ms: float = 0) -> tuple[ThreadingHTTPServer, StandinStats, str]:
+    """Start the stand-in on a daemon thread; returns (server, stats, base_url)."""
+    stats = StandinStats()
+    handler = type("BoundStandinHandler", (StandinHandler,), {"stats": stats, "latency_s": latency_ms / 1000.0})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mixpanel-standin", daemon=True).start()
+    return server, stats, f"http://127.0.0.1:{server.server_port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    server, stats, base_url = start_standin(args.port, args.latency_ms)
+    print(f"Mixpanel stand-in listening on {base_url}/import (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(json.dumps(stats.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
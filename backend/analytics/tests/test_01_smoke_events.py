@@ -280,4 +280,58 @@ def test_users_key_can_emit_cv_updated(
     body = r.json()
     assert body["status"] == "accepted"
     assert uuid.UUID(body["eventId"])
-    
\ No newline at end of file
+    
+
+def test_jobs_event_batch_reports_per_event_results(
+    base_url,
+    jobs_headers,
+    analytics_target,
+):
+    producer_event_id = _pytest_producer_event_id("jobs-batch")
+    first = _job_status_payload(producer_event_id, analytics_target)
+    unknown = {**_job_status_payload(_pytest_producer_event_id("jobs-batch"), analytics_target)}
+    unknown["eventName"] = "Totally Unknown Event"
+
+    r = requests.post(
+        f"{base_url}/analytics/events:batch",
+        headers={**jobs_headers, "content-type": "application/json"},
+        json={"events": [first, unknown, first]},
+        timeout=15,
+    )
+    print("BATCH INGEST:", r.status_code, r.text)
+    assert r.status_code == 200, r.text
+
+    body = r.json()
+    assert (body["accepted"], body["duplicate"], body["invalid"]) == (1, 1, 1)
+    results = body["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert results[0]["status"] == "accepted"
+    assert results[1]["status"] == "invalid"
+    assert results[1]["error"] == "unknown_event_name"
+    assert results[2]["status"] == "duplicate"
+    assert results[2]["eventId"].lower() == results[0]["eventId"].lower()
+
+    r_again = requests.post(
+        f"{base_url}/analytics/events:batch",
+        headers={**jobs_headers, "content-type": "application/json"},
+        json={"events": [first]},
+        timeout=15,
+    )
+    assert r_again.status_code == 200, r_again.text
+    assert r_again.json()["results"][0]["status"] == "duplicate"
+    assert r_again.json()["results"][0]["eventId"].lower() == results[0]["eventId"].lower()
+
+
+def test_event_batch_rejects_empty_body(
+    base_url,
+    jobs_headers,
+):
+    r = requests.post(
+        f"{base_url}/analytics/events:batch",
+        headers={**jobs_headers, "content-type": "application/json"},
+        json={"events": []},
+        timeout=10,
+    )
+    print("EMPTY BATCH:", r.status_code, r.text)
+    assert r.status_code == 400, r.text
+    assert r.json()["error"] == "empty_batch"
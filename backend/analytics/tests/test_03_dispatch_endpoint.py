@@ -27,4 +27,58 @@ def test_dispatch_run_requires_scheduler_or_operator(
     body = r_ok.json()
     for key in ("attempted", "sent", "retry", "dead", "skipped", "exportEnabled"):
         assert key in body, body
-        
\ No newline at end of file
+        
+
+def test_retention_run_requires_scheduler_or_operator(
+    base_url,
+    jobs_headers,
+    operator_headers,
+):
+    r_forbidden = requests.post(
+        f"{base_url}/analytics/retention/run",
+        headers=jobs_headers,
+        timeout=10,
+    )
+    print("RETENTION with jobs key:", r_forbidden.status_code, r_forbidden.text)
+    assert r_forbidden.status_code == 403, r_forbidden.text
+
+    r_ok = requests.post(
+        f"{base_url}/analytics/retention/run",
+        headers=operator_headers,
+        timeout=60,
+    )
+    print("RETENTION with operator key:", r_ok.status_code, r_ok.text)
+    assert r_ok.status_code == 200, r_ok.text
+
+    body = r_ok.json()
+    for key in ("rollupFrom", "rollupRows", "cutoffUtc", "purged", "batches", "complete"):
+        assert key in body, body
+
+
+def test_daily_diagnostics_reads_rollups(
+    base_url,
+    jobs_headers,
+    operator_headers,
+):
+    r_forbidden = requests.get(
+        f"{base_url}/analytics/diagnostics/daily",
+        headers=jobs_headers,
+        timeout=10,
+    )
+    assert r_forbidden.status_code == 403, r_forbidden.text
+
+    r_ok = requests.get(
+        f"{base_url}/analytics/diagnostics/daily",
+        params={"days": 7},
+        headers=operator_headers,
+        timeout=10,
+    )
+    print("DAILY with operator key:", r_ok.status_code, r_ok.text[:500])
+    assert r_ok.status_code == 200, r_ok.text
+
+    body = r_ok.json()
+    assert isinstance(body["rows"], list), body
+    for row in body["rows"]:
+        assert row["day"] >= body["fromDay"], row
+        for key in ("eventName", "sourceDomain", "sourceSurface", "events", "users"):
+            assert key in row, row
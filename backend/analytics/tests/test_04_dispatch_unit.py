@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime
 from types import SimpleNamespace
 
 from app.config import AppConfig
-from app.dispatch import run_dispatch_once
+from app.dispatch import run_dispatch, run_dispatch_once
 
 
 def _config(export_enabled: bool = True) -> AppConfig:
@@ -49,43 +50,53 @@ def _row(**overrides):
     return row
 
 
+def _patch_claim(monkeypatch, calls, rows):
+    def claim(config, claim_token, limit, lease_seconds):
+        calls["claims"].append(claim_token)
+        return rows
+
+    monkeypatch.setattr("app.dispatch.claim_due_dispatch_rows", claim)
+
+
 def _patch_noop_db_markers(monkeypatch, calls):
-    monkeypatch.setattr(
-        "app.dispatch.mark_dispatch_sending",
-        lambda config, ids: calls["sending"].extend(ids),
-    )
-    monkeypatch.setattr(
-        "app.dispatch.mark_dispatch_sent",
-        lambda config, ids: calls["sent"].extend(ids),
-    )
-    monkeypatch.setattr(
-        "app.dispatch.mark_dispatch_dead",
-        lambda config, ids, error_code, error_json: calls["dead"].append(
+    def sent(config, ids, claim_token=None):
+        calls["sent"].extend(ids)
+        calls["marker_claims"].append(claim_token)
+        return len(ids)
+
+    def dead(config, ids, error_code, error_json, claim_token=None):
+        calls["dead"].append(
             {
                 "ids": ids,
                 "error_code": error_code,
                 "error_json": error_json,
             }
-        ),
-    )
-    monkeypatch.setattr(
-        "app.dispatch.mark_dispatch_retry",
-        lambda config, ids, error_code, error_json, delay_seconds: calls["retry"].append(
+        )
+        calls["marker_claims"].append(claim_token)
+        return len(ids)
+
+    def retry(config, ids, error_code, error_json, delay_seconds, claim_token=None):
+        calls["retry"].append(
             {
                 "ids": ids,
                 "error_code": error_code,
                 "error_json": error_json,
                 "delay_seconds": delay_seconds,
             }
-        ),
-    )
+        )
+        calls["marker_claims"].append(claim_token)
+        return len(ids)
+
+    monkeypatch.setattr("app.dispatch.mark_dispatch_sent", sent)
+    monkeypatch.setattr("app.dispatch.mark_dispatch_dead", dead)
+    monkeypatch.setattr("app.dispatch.mark_dispatch_retry", retry)
 
 
 def test_dispatch_disabled_does_not_touch_db_or_mixpanel(monkeypatch):
     def fail_if_called(*args, **kwargs):
         raise AssertionError("This dependency should not be called when export is disabled.")
 
-    monkeypatch.setattr("app.dispatch.fetch_due_dispatch_rows", fail_if_called)
+    monkeypatch.setattr("app.dispatch.claim_due_dispatch_rows", fail_if_called)
     monkeypatch.setattr("app.dispatch.MixpanelClient", fail_if_called)
 
     counters = run_dispatch_once(_config(export_enabled=False))
@@ -102,17 +113,15 @@ def test_dispatch_disabled_does_not_touch_db_or_mixpanel(monkeypatch):
 
 def test_dispatch_200_marks_rows_sent(monkeypatch):
     calls = {
-        "sending": [],
+        "claims": [],
+        "marker_claims": [],
         "sent": [],
         "dead": [],
         "retry": [],
         "mixpanel_events": None,
     }
 
-    monkeypatch.setattr(
-        "app.dispatch.fetch_due_dispatch_rows",
-        lambda config, limit: [_row()],
-    )
+    _patch_claim(monkeypatch, calls, [_row()])
     _patch_noop_db_markers(monkeypatch, calls)
 
     class FakeMixpanelClient:
@@ -132,8 +141,9 @@ def test_dispatch_200_marks_rows_sent(monkeypatch):
     assert counters.retry == 0
     assert counters.dead == 0
 
-    assert calls["sending"] == ["11111111-1111-1111-1111-111111111111"]
+    assert len(calls["claims"]) == 1
     assert calls["sent"] == ["11111111-1111-1111-1111-111111111111"]
+    assert calls["marker_claims"] == calls["claims"]
     assert calls["dead"] == []
     assert calls["retry"] == []
 
@@ -148,16 +158,14 @@ def test_dispatch_200_marks_rows_sent(monkeypatch):
 
 def test_dispatch_400_marks_rows_dead(monkeypatch):
     calls = {
-        "sending": [],
+        "claims": [],
+        "marker_claims": [],
         "sent": [],
         "dead": [],
         "retry": [],
     }
 
-    monkeypatch.setattr(
-        "app.dispatch.fetch_due_dispatch_rows",
-        lambda config, limit: [_row()],
-    )
+    _patch_claim(monkeypatch, calls, [_row()])
     _patch_noop_db_markers(monkeypatch, calls)
 
     class FakeMixpanelClient:
@@ -189,16 +197,14 @@ def test_dispatch_400_marks_rows_dead(monkeypatch):
 
 def test_dispatch_429_marks_rows_retry(monkeypatch):
     calls = {
-        "sending": [],
+        "claims": [],
+        "marker_claims": [],
         "sent": [],
         "dead": [],
         "retry": [],
     }
 
-    monkeypatch.setattr(
-        "app.dispatch.fetch_due_dispatch_rows",
-        lambda config, limit: [_row(AttemptCount=2)],
-    )
+    _patch_claim(monkeypatch, calls, [_row(AttemptCount=2)])
     _patch_noop_db_markers(monkeypatch, calls)
 
     class FakeMixpanelClient:
@@ -231,16 +237,14 @@ def test_dispatch_429_marks_rows_retry(monkeypatch):
 
 def test_missing_distinct_id_marks_row_dead_without_mixpanel_call(monkeypatch):
     calls = {
-        "sending": [],
+        "claims": [],
+        "marker_claims": [],
         "sent": [],
         "dead": [],
         "retry": [],
     }
 
-    monkeypatch.setattr(
-        "app.dispatch.fetch_due_dispatch_rows",
-        lambda config, limit: [_row(DistinctId=None)],
-    )
+    _patch_claim(monkeypatch, calls, [_row(DistinctId=None)])
     _patch_noop_db_markers(monkeypatch, calls)
 
     class FakeMixpanelClient:
@@ -259,10 +263,86 @@ def test_missing_distinct_id_marks_row_dead_without_mixpanel_call(monkeypatch):
     assert counters.retry == 0
     assert counters.dead == 1
 
-    assert calls["sending"] == []
+    assert calls["marker_claims"] == calls["claims"]
     assert calls["sent"] == []
     assert calls["retry"] == []
     assert len(calls["dead"]) == 1
     assert calls["dead"][0]["ids"] == ["11111111-1111-1111-1111-111111111111"]
     assert calls["dead"][0]["error_code"].startswith("mapping:")
-    
\ No newline at end of file
+    
+
+def test_run_dispatch_drains_batches_until_claim_is_empty(monkeypatch):
+    calls = {
+        "claims": [],
+        "marker_claims": [],
+        "sent": [],
+        "dead": [],
+        "retry": [],
+    }
+    backlog = [[_row(DispatchId=f"00000000-0000-0000-0000-00000000000{i}")] for i in range(1, 4)]
+
+    def claim(config, claim_token, limit, lease_seconds):
+        calls["claims"].append(claim_token)
+        return backlog.pop() if backlog else []
+
+    monkeypatch.setattr("app.dispatch.claim_due_dispatch_rows", claim)
+    _patch_noop_db_markers(monkeypatch, calls)
+
+    class FakeMixpanelClient:
+        def __init__(self, config):
+            pass
+
+        def import_events(self, events):
+            return SimpleNamespace(status_code=200, text='{"status":"ok"}', json_body={"status": "ok"})
+
+    monkeypatch.setattr("app.dispatch.MixpanelClient", FakeMixpanelClient)
+
+    config = replace(_config(export_enabled=True), dispatch_workers=2, dispatch_max_batches=10)
+    counters = run_dispatch(config)
+
+    assert counters.sent == 3
+    assert counters.attempted == 3
+    assert sorted(calls["sent"]) == [
+        "00000000-0000-0000-0000-000000000001",
+        "00000000-0000-0000-0000-000000000002",
+        "00000000-0000-0000-0000-000000000003",
+    ]
+    # every worker stops after its first empty claim
+    assert 4 <= len(calls["claims"]) <= 5
+    assert len(set(calls["claims"])) == len(calls["claims"])
+
+
+def test_strict_partial_failure_marks_only_failed_records_dead(monkeypatch):
+    calls = {
+        "claims": [],
+        "marker_claims": [],
+        "sent": [],
+        "dead": [],
+        "retry": [],
+    }
+    first = "00000000-0000-0000-0000-000000000001"
+    second = "00000000-0000-0000-0000-000000000002"
+    _patch_claim(monkeypatch, calls, [_row(DispatchId=first), _row(DispatchId=second)])
+    _patch_noop_db_markers(monkeypatch, calls)
+
+    class FakeMixpanelClient:
+        def __init__(self, config):
+            pass
+
+        def import_events(self, events):
+            body = {
+                "code": 400,
+                "num_records_imported": 1,
+                "failed_records": [{"index": 1, "field": "properties.time", "message": "too old"}],
+            }
+            return SimpleNamespace(status_code=400, text=str(body), json_body=body)
+
+    monkeypatch.setattr("app.dispatch.MixpanelClient", FakeMixpanelClient)
+
+    counters = run_dispatch_once(_config(export_enabled=True))
+
+    assert (counters.attempted, counters.sent, counters.retry, counters.dead) == (2, 1, 0, 1)
+    assert calls["sent"] == [first]
+    assert [d["ids"] for d in calls["dead"]] == [[second]]
+    assert calls["dead"][0]["error_code"] == "http_400"
+    assert "too old" in calls["dead"][0]["error_json"]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.config import AppConfig
+from app.mixpanel_client import (
+    MixpanelClient,
+    chunk_events,
+    failed_record_indexes,
+    import_in_chunks,
+)
+from mixpanel_standin import start_standin
+
+
+def _config(base_url: str) -> AppConfig:
+    return AppConfig(
+        collection_enabled=True,
+        mixpanel_export_enabled=True,
+        allow_unknown_events=False,
+        distinct_id_salt="test-salt",
+        sql_connection_string="not-used",
+        mixpanel_project_id="12345",
+        mixpanel_api_base_url=base_url,
+        mixpanel_service_account_username="standin",
+        mixpanel_service_account_password="standin",
+        mixpanel_strict=True,
+        mixpanel_batch_size=500,
+        mixpanel_max_attempts=8,
+        mixpanel_import_concurrency=4,
+        key_bindings=(),
+    )
+
+
+def _event(n: int, **extra) -> dict:
+    return {
+        "event": "Job Status Changed",
+        "properties": {
+            "time": 1782822600,
+            "distinct_id": "u_test_distinct_id",
+            "$insert_id": f"00000000-0000-0000-0000-{n:012d}",
+            "new_status": "Applied",
+            **extra,
+        },
+    }
+
+
+@pytest.fixture
+def standin():
+    server, stats, base_url = start_standin(latency_ms=30)
+    yield stats, base_url
+    server.shutdown()
+
+
+def test_chunk_events_respects_event_and_byte_limits():
+    events = [_event(n) for n in range(7)]
+
+    assert chunk_events(events, max_events=3) == [[0, 1, 2], [3, 4, 5], [6]]
+
+    big = _event(99, padding="x" * 5000)
+    chunks = chunk_events([events[0], big, events[1]], max_events=100, max_bytes=2000)
+    assert chunks == [[0], [1], [2]]
+
+
+def test_import_in_chunks_sends_gzip_chunks_concurrently(standin):
+    stats, base_url = standin
+    client = MixpanelClient(_config(base_url))
+    events = [_event(n) for n in range(25)]
+
+    results = import_in_chunks(client, events, concurrency=3, max_events=10)
+
+    assert [r.indexes for r in results] == [list(range(0, 10)), list(range(10, 20)), list(range(20, 25))]
+    assert all(r.error is None and r.response.status_code == 200 for r in results)
+    snapshot = stats.as_dict()
+    assert snapshot["requests"] == 3
+    assert snapshot["gzipRequests"] == 3
+    assert snapshot["eventsImported"] == 25
+    assert snapshot["maxEventsPerRequest"] == 10
+    assert snapshot["maxConcurrent"] >= 2
+
+
+def test_partial_failure_maps_back_to_chunk_positions(standin):
+    _, base_url = standin
+    client = MixpanelClient(_config(base_url))
+    events = [_event(n) for n in range(6)]
+    events[4] = _event(4, standin_fail=True)
+
+    results = import_in_chunks(client, events, concurrency=2, max_events=3)
+
+    ok, partial = results
+    assert ok.response.status_code == 200
+    assert partial.indexes == [3, 4, 5]
+    assert partial.response.status_code == 400
+    failed = failed_record_indexes(partial.response, len(partial.indexes))
+    assert list(failed) == [1]
+    assert partial.indexes[1] == 4
+
+
+def test_failed_record_indexes_ignores_bodies_without_records():
+    class Response:
+        json_body = {"error": "validation failed"}
+
+    assert failed_record_indexes(Response(), 3) is None
+
+
+def test_standin_throughput(standin):
+    stats, base_url = standin
+    client = MixpanelClient(_config(base_url))
+    events = [_event(n) for n in range(5000)]
+
+    started = time.perf_counter()
+    results = import_in_chunks(client, events, concurrency=4, max_events=500)
+    elapsed = time.perf_counter() - started
+
+    print(f"STAND-IN THROUGHPUT: {len(events) / elapsed:.0f} events/s over {len(results)} requests")
+    assert all(r.response.status_code == 200 for r in results)
+    assert stats.as_dict()["eventsImported"] == 5000
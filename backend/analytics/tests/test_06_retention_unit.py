@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date, datetime
+
+from app.config import AppConfig
+from app.retention import retention_cutoff, run_retention_once
+
+NOW = datetime(2026, 10, 17, 15, 45, 0)
+
+
+def _config(**overrides) -> AppConfig:
+    config = AppConfig(
+        collection_enabled=True,
+        mixpanel_export_enabled=True,
+        allow_unknown_events=False,
+        distinct_id_salt="test-salt",
+        sql_connection_string="not-used-in-monkeypatch-tests",
+        mixpanel_project_id="12345",
+        mixpanel_api_base_url="https://api-eu.mixpanel.com",
+        mixpanel_service_account_username="not-used",
+        mixpanel_service_account_password="not-used",
+        mixpanel_strict=True,
+        mixpanel_batch_size=500,
+        mixpanel_max_attempts=8,
+        retention_days=30,
+        purge_batch_size=100,
+        purge_max_batches=3,
+        key_bindings=(),
+    )
+    return replace(config, **overrides)
+
+
+def _patch_db(monkeypatch, calls, start_day, purge_results):
+    results = iter(purge_results)
+
+    def start(config):
+        calls.append(("start",))
+        return start_day
+
+    def refresh(config, from_day, to_day):
+        calls.append(("refresh", from_day, to_day))
+        return 4
+
+    def purge(config, cutoff_utc, batch_size):
+        calls.append(("purge", cutoff_utc, batch_size))
+        return next(results)
+
+    monkeypatch.setattr("app.retention.get_rollup_start_day", start)
+    monkeypatch.setattr("app.retention.refresh_daily_rollups", refresh)
+    monkeypatch.setattr("app.retention.purge_events_batch", purge)
+
+
+def test_cutoff_is_midnight_utc_retention_days_ago():
+    assert retention_cutoff(_config(retention_days=30), NOW) == datetime(2026, 9, 17)
+
+
+def test_rollups_refresh_before_purge_and_purge_stops_on_short_batch(monkeypatch):
+    calls = []
+    _patch_db(monkeypatch, calls, date(2026, 10, 14), [100, 37])
+
+    counters = run_retention_once(_config(), NOW)
+
+    assert calls == [
+        ("start",),
+        ("refresh", date(2026, 10, 14), date(2026, 10, 18)),
+        ("purge", datetime(2026, 9, 17), 100),
+        ("purge", datetime(2026, 9, 17), 100),
+    ]
+    assert counters.as_dict() == {
+        "rollupFrom": "2026-10-14",
+        "rollupRows": 4,
+        "cutoffUtc": "2026-09-17T00:00:00Z",
+        "purged": 137,
+        "batches": 2,
+        "complete": True,
+    }
+
+
+def test_purge_stops_at_max_batches_and_reports_incomplete(monkeypatch):
+    calls = []
+    _patch_db(monkeypatch, calls, date(2026, 10, 14), [100, 100, 100, 100])
+
+    counters = run_retention_once(_config(), NOW)
+
+    assert counters.batches == 3
+    assert counters.purged == 300
+    assert counters.complete is False
+
+
+def test_empty_tables_skip_rollup_refresh(monkeypatch):
+    calls = []
+    _patch_db(monkeypatch, calls, None, [0])
+
+    counters = run_retention_once(_config(), NOW)
+
+    assert [c[0] for c in calls] == ["start", "purge"]
+    assert counters.rollup_from is None
+    assert counters.as_dict()["rollupFrom"] is None
+    assert counters.complete is True
@@ -6,9 +6,10 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Mapping
 
-import requests
 from flask import session
 
+from helpers.analytics_emitter import get_emitter
+
 
 logger = logging.getLogger(__name__)
 
@@ -95,7 +96,8 @@ def emit_core_event(
 
     Design rules:
     - server-side only;
-    - short timeout;
+    - never waits on Analytics: the payload is queued and sent in
+      batches by helpers.analytics_emitter; True means queued;
     - no exception escapes to product routes;
     - never logs function keys or full payloads;
     - skips user-attributable web events when canonical user id is unavailable,
@@ -141,83 +143,7 @@ def emit_core_event(
         "producerEventId": _optional_str(producer_event_id),
     }
 
-    timeout = _analytics_timeout_seconds()
-
-    try:
-        response = requests.post(
-            f"{base_url}/analytics/events",
-            headers={
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "x-functions-key": function_key,
-            },
-            json=payload,
-            timeout=timeout,
-        )
-
-        if response.status_code >= 400:
-            error_code = None
-            try:
-                error_body = response.json()
-                if isinstance(error_body, dict):
-                    error_code = error_body.get("error")
-            except Exception:
-                pass
-
-            logger.warning(
-                "analytics_emit_failed event=%s status=%s error=%s subject_type=%s subject_id=%s",
-                event_name,
-                response.status_code,
-                error_code,
-                subject_type,
-                subject_id,
-            )
-            return False
-
-        return True
-
-    except requests.Timeout:
-        logger.warning(
-            "analytics_emit_timeout event=%s timeout_seconds=%s subject_type=%s subject_id=%s",
-            event_name,
-            timeout,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-    except requests.RequestException as exc:
-        logger.warning(
-            "analytics_emit_request_failed event=%s error_type=%s subject_type=%s subject_id=%s",
-            event_name,
-            type(exc).__name__,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-    except Exception as exc:
-        logger.warning(
-            "analytics_emit_unexpected_failed event=%s error_type=%s subject_type=%s subject_id=%s",
-            event_name,
-            type(exc).__name__,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-
-def _analytics_timeout_seconds() -> float:
-    raw = os.getenv("ANALYTICS_EMIT_TIMEOUT_SECONDS", "2").strip()
-    try:
-        value = float(raw)
-    except ValueError:
-        return 2.0
-
-    if value <= 0:
-        return 2.0
-
-    return min(value, 10.0)
+    return get_emitter("analytics").enqueue(payload)
 
 
 def _utc_now_iso() -> str:
@@ -0,0 +1,329 @@
+# helpers/analytics_emitter.py
+# In-process, non-blocking delivery of analytics events to the Analytics service.
+#
+# Product routes only build the payload and enqueue it; a daemon thread sends the
+# queue in batches, so analytics never adds a cross-cloud round-trip to a request.
+#
+# - bounded queue (ANALYTICS_EMIT_QUEUE_MAX, default 1000); when full the oldest
+#   event is dropped so the newest activity survives bursts;
+# - a batch is sent when ANALYTICS_EMIT_BATCH_SIZE (default 50) events are waiting
+#   or ANALYTICS_EMIT_FLUSH_INTERVAL_SECONDS (default 1) passed since the first one;
+# - a batch is one POST /analytics/events:batch (falls back to per-event POSTs
+#   when Analytics answers 404/405);
+# - best effort: no retry, failures are logged without payloads or keys;
+# - the queue is flushed at interpreter exit (atexit), bounded by the send timeout;
+# - the thread starts lazily, so pre-fork servers (gunicorn) start one per worker.
+#
+# Kept stdlib-only so every app can carry the same copy. Canonical copy:
+# backend/jobs/helpers/analytics_emitter.py; backend/jobs/tests/test_shared_module_copies.py
+# fails when the Users, Enrichers or Core copy differs from it.
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from urllib import error, request
+
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, str(default))))
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float, minimum: float, maximum: float) -> float:
+    try:
+        value = float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+    if value <= 0:
+        return default
+    return min(max(value, minimum), maximum)
+
+
+def emit_timeout_seconds() -> float:
+    return _env_float("ANALYTICS_EMIT_TIMEOUT_SECONDS", 2.0, 0.1, 10.0)
+
+
+def post_events(events: list[dict], log_prefix: str) -> int:
+    """
+    Send one batch to Analytics (POST /analytics/events:batch); returns how many
+    events were stored or recognised as duplicates. Runs on the emitter thread only.
+    """
+    base_url = os.getenv("ANALYTICS_BASE_URL", "").rstrip("/")
+    function_key = os.getenv("ANALYTICS_FUNCTION_KEY", "")
+    if not base_url or not function_key:
+        logging.warning("%s_not_configured dropped=%d", log_prefix, len(events))
+        return 0
+
+    try:
+        status, body = _post_json(f"{base_url}/analytics/events:batch", {"events": events}, function_key)
+    except error.HTTPError as exc:
+        if exc.code in (404, 405):
+            # Analytics without the batch route: fall back to one request per event
+            return sum(_post_single(payload, base_url, function_key, log_prefix) for payload in events)
+        logging.warning(
+            "%s_emit_http_failed events=%d status=%s error=%s",
+            log_prefix, len(events), exc.code, _try_read_error_code(exc),
+        )
+        return 0
+    except (error.URLError, socket.timeout, TimeoutError) as exc:
+        logging.warning(
+            "%s_emit_request_failed events=%d error_type=%s",
+            log_prefix, len(events), type(exc).__name__,
+        )
+        return 0
+    except Exception as exc:
+        logging.warning(
+            "%s_emit_unexpected_failed events=%d error_type=%s",
+            log_prefix, len(events), type(exc).__name__,
+        )
+        return 0
+
+    results = body.get("results") if isinstance(body, dict) else None
+    if not isinstance(results, list):
+        logging.warning("%s_emit_unexpected_response events=%d status=%s", log_prefix, len(events), status)
+        return 0
+
+    sent = 0
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        if result.get("status") in ("accepted", "duplicate"):
+            sent += 1
+            continue
+        index = result.get("index")
+        event_name = events[index].get("eventName") if isinstance(index, int) and 0 <= index < len(events) else None
+        logging.warning(
+            "%s_emit_rejected event=%s error=%s",
+            log_prefix, event_name, result.get("error"),
+        )
+    return sent
+
+
+def _post_json(url: str, payload: dict, function_key: str) -> tuple[int, object]:
+    analytics_req = request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        method="POST",
+        headers={
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "x-functions-key": function_key,
+        },
+    )
+    with request.urlopen(analytics_req, timeout=emit_timeout_seconds()) as response:
+        status = getattr(response, "status", 200)
+        raw = response.read()
+    try:
+        return status, json.loads(raw.decode("utf-8")) if raw else None
+    except ValueError:
+        return status, None
+
+
+def _post_single(payload: dict, base_url: str, function_key: str, log_prefix: str) -> int:
+    event_name = payload.get("eventName")
+    try:
+        _post_json(f"{base_url}/analytics/events", payload, function_key)
+        return 1
+    except error.HTTPError as exc:
+        logging.warning(
+            "%s_emit_http_failed event=%s status=%s error=%s",
+            log_prefix, event_name, exc.code, _try_read_error_code(exc),
+        )
+    except Exception as exc:
+        logging.warning(
+            "%s_emit_request_failed event=%s error_type=%s",
+            log_prefix, event_name, type(exc).__name__,
+        )
+    return 0
+
+
+def _try_read_error_code(exc: error.HTTPError) -> Optional[str]:
+    try:
+        raw = exc.read(600).decode("utf-8", errors="replace")
+        data = json.loads(raw)
+        if isinstance(data, dict):
+            value = data.get("error")
+            return str(value) if value else None
+    except Exception:
+        return None
+    return None
+
+
+class AnalyticsEmitter:
+    def __init__(
+        self,
+        send: Callable[[list[dict]], int],
+        *,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        log_prefix: str = "analytics",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._send = send
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.log_prefix = log_prefix
+        self._clock = clock
+        self._queue: deque = deque()
+        self._oldest_at: Optional[float] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"enqueued": 0, "sent": 0, "failed": 0, "dropped": 0}
+
+    def enqueue(self, payload: dict) -> bool:
+        """Queue one event for background delivery. Never blocks on I/O, never raises."""
+        try:
+            with self._cond:
+                if self._closed:
+                    return False
+                if len(self._queue) >= self.max_queue:
+                    self._queue.popleft()
+                    self.stats["dropped"] += 1
+                    if self.stats["dropped"] == 1 or self.stats["dropped"] % 100 == 0:
+                        logging.warning(
+                            "%s_queue_full dropped_total=%d max_queue=%d",
+                            self.log_prefix, self.stats["dropped"], self.max_queue,
+                        )
+                if not self._queue:
+                    self._oldest_at = self._clock()
+                self._queue.append(payload)
+                self.stats["enqueued"] += 1
+                self._ensure_thread_locked()
+                if len(self._queue) >= self.batch_size:
+                    self._cond.notify()
+            return True
+        except Exception as exc:
+            logging.warning("%s_enqueue_failed error_type=%s", self.log_prefix, type(exc).__name__)
+            return False
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def flush(self) -> int:
+        """Send everything queued right now on the calling thread; returns events sent."""
+        sent = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return sent
+            sent += self._deliver(batch)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting events, let the thread drain the queue, wait up to timeout."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        else:
+            self.flush()
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.log_prefix}-emitter", daemon=True
+        )
+        self._thread.start()
+
+    def _take_batch(self) -> list:
+        with self._cond:
+            return self._pop_batch_locked()
+
+    def _pop_batch_locked(self) -> list:
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft())
+        self._oldest_at = self._clock() if self._queue else None
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed and not self._queue:
+                        return
+                    if len(self._queue) >= self.batch_size or (self._closed and self._queue):
+                        break
+                    if self._queue:
+                        remaining = self.flush_interval - (self._clock() - self._oldest_at)
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                batch = self._pop_batch_locked()
+            self._deliver(batch)
+
+    def _deliver(self, batch: list) -> int:
+        try:
+            sent = int(self._send(batch) or 0)
+        except Exception as exc:
+            logging.warning("%s_flush_failed error_type=%s", self.log_prefix, type(exc).__name__)
+            sent = 0
+        with self._cond:
+            self.stats["sent"] += sent
+            self.stats["failed"] += len(batch) - sent
+        return sent
+
+    def _reset_after_fork(self) -> None:
+        # A forked child inherits the queue but not the thread; start clean.
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._oldest_at = None
+        self._thread = None
+        self._closed = False
+
+
+_EMITTERS: dict = {}
+_EMITTERS_LOCK = threading.Lock()
+
+
+def get_emitter(log_prefix: str) -> AnalyticsEmitter:
+    """Process-wide emitter for one producer (log prefix), created on first use."""
+    with _EMITTERS_LOCK:
+        emitter = _EMITTERS.get(log_prefix)
+        if emitter is None:
+            emitter = AnalyticsEmitter(
+                lambda events: post_events(events, log_prefix),
+                max_queue=_env_int("ANALYTICS_EMIT_QUEUE_MAX", 1000, 1),
+                batch_size=_env_int("ANALYTICS_EMIT_BATCH_SIZE", 50, 1),
+                flush_interval=_env_float("ANALYTICS_EMIT_FLUSH_INTERVAL_SECONDS", 1.0, 0.05, 60.0),
+                log_prefix=log_prefix,
+            )
+            _EMITTERS[log_prefix] = emitter
+        return emitter
+
+
+def _close_all_emitters() -> None:
+    with _EMITTERS_LOCK:
+        emitters = list(_EMITTERS.values())
+    for emitter in emitters:
+        try:
+            emitter.close(timeout=emit_timeout_seconds() * 2)
+        except Exception:
+            pass
+
+
+def _reset_all_after_fork() -> None:
+    for emitter in list(_EMITTERS.values()):
+        emitter._reset_after_fork()
+
+
+atexit.register(_close_all_emitters)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_all_after_fork)
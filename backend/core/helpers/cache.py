@@ -10,6 +10,14 @@ def memo_get(key: str, ttl: float):
 def memo_put(key: str, data):
     _MEMO[key] = {"data": data, "ts": time.time()}
 
+def memo_get_stale(key: str):
+    """
+    Entry regardless of age, for revalidating upstream (e.g. via ETag) after the TTL.
+    Returns None if nothing was ever stored under key.
+    """
+    item = _MEMO.get(key)
+    return item["data"] if item else None
+
 # --- prefix invalidation helper for UI job lists ---
 try:
     _MEMO  # type: ignore[name-defined]
@@ -0,0 +1,16 @@
+from flask import jsonify, request
+from werkzeug.http import unquote_etag
+
+
+def conditional_json(data, etag: str | None):
+    """
+    JSON response carrying the upstream ETag; answers 304 when the browser's
+    If-None-Match matches. 'no-cache' makes browsers revalidate on every view.
+    """
+    resp = jsonify(data)
+    if etag:
+        value, weak = unquote_etag(etag)
+        if value:
+            resp.set_etag(value, weak=weak)
+            resp.headers["Cache-Control"] = "private, no-cache"
+    return resp.make_conditional(request)
@@ -78,6 +78,20 @@ def fx_get_json(url, headers, params=None, timeout=10):
     r.raise_for_status()
     return r.json()
 
+def fx_get_json_conditional(url, headers, params=None, etag=None, timeout=10):
+    """
+    GET with If-None-Match when an ETag is known.
+    Returns (data, etag); data is None when upstream answered 304 Not Modified.
+    """
+    h = dict(headers or {})
+    if etag:
+        h["If-None-Match"] = etag
+    r = requests.get(url, headers=h, params=params, timeout=timeout)
+    if r.status_code == 304:
+        return None, r.headers.get("ETag") or etag
+    r.raise_for_status()
+    return r.json(), r.headers.get("ETag")
+
 def fx_get_json_safe(url, headers, params=None, timeout=10):
     r = requests.get(url, headers=headers, params=params, timeout=timeout)
     # Do NOT raise; return response so caller can handle errors.
@@ -1,8 +1,9 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 
 from helpers.analytics import emit_core_event
-from helpers.cache import memo_get, memo_put
-from helpers.http import jobs_base, jobs_fx_headers, fx_get_json
+from helpers.cache import memo_get, memo_get_stale, memo_put
+from helpers.conditional import conditional_json
+from helpers.http import jobs_base, jobs_fx_headers, fx_get_json_conditional
 from helpers.retry import retry_until_ready
 from helpers.sanitize import sanitize_description_html
 from helpers.users import get_in_app_user_id
@@ -30,15 +31,25 @@ def create_blueprint(auth):
                 },
             )
 
+        # Memo entries are {"data", "etag"}; past the TTL they are revalidated upstream
         cache_key = f"job:{job_id}"
         cached = memo_get(cache_key, ttl=60)
         if cached:
             emit_success_event()
-            return jsonify(cached), 200
+            return conditional_json(cached["data"], cached["etag"])
+
+        stale = memo_get_stale(cache_key)
 
         def call():
             headers = jobs_fx_headers(context={"userId": uid}) if uid else jobs_fx_headers()
-            job = fx_get_json(f"{jobs_base()}/jobs/{job_id}", headers=headers)
+            job, etag = fx_get_json_conditional(
+                f"{jobs_base()}/jobs/{job_id}",
+                headers=headers,
+                etag=stale["etag"] if stale else None,
+            )
+            if job is None:
+                # 304: the sanitized copy we already hold is still current
+                return {"data": stale["data"], "etag": etag}
 
             desc = job.get("descriptionHtml") or job.get("DescriptionHtml") or job.get("Description") or ""
             if desc:
@@ -47,14 +58,15 @@ def create_blueprint(auth):
             if "locations" not in job or not isinstance(job["locations"], list):
                 job["locations"] = []
 
-            return job
+            return {"data": job, "etag": etag}
 
-        data = retry_until_ready(call, attempts=4, base_delay=0.75)
+        entry = retry_until_ready(call, attempts=4, base_delay=0.75)
+        data = entry["data"]
 
         if not data.get("error"):
-            memo_put(cache_key, data)
+            memo_put(cache_key, entry)
             emit_success_event()
 
-        return jsonify(data), 200
+        return conditional_json(data, entry["etag"])
 
     return bp
\ No newline at end of file
@@ -3,8 +3,9 @@ from urllib.parse import urlencode
 import hashlib
 
 from helpers.analytics import emit_core_event
-from helpers.cache import memo_get, memo_put
-from helpers.http import jobs_base, jobs_fx_headers, fx_get_json
+from helpers.cache import memo_get, memo_get_stale, memo_put
+from helpers.conditional import conditional_json
+from helpers.http import jobs_base, jobs_fx_headers, fx_get_json_conditional
 from helpers.retry import retry_until_ready
 from helpers.users import get_in_app_user_id
 
@@ -81,34 +82,41 @@ def create_blueprint(auth):
                     },
                 )
 
+        # Memo entries are {"data", "etag"}; past the TTL they are revalidated upstream
         cache_key = f"jobs:{uid}:{filter_key}:{limit}:{offset}"
         cached = memo_get(cache_key, ttl=30)
         if cached:
             emit_success_events()
-            return jsonify(cached), 200
+            return conditional_json(cached["data"], cached["etag"])
+
+        stale = memo_get_stale(cache_key)
 
         def call():
             params = {"limit": str(limit), "offset": str(offset), **forward_params}
             headers = jobs_fx_headers(context={"userId": uid}) if uid != "anon" else jobs_fx_headers()
 
-            envelope = fx_get_json(
+            envelope, etag = fx_get_json_conditional(
                 f"{jobs_base()}/jobs",
                 headers=headers,
-                params=params
+                params=params,
+                etag=stale["etag"] if stale else None,
             )
+            if envelope is None:
+                return {"data": stale["data"], "etag": etag}
 
             if isinstance(envelope, dict):
                 envelope.setdefault("limit", limit)
                 envelope.setdefault("offset", offset)
 
-            return envelope
+            return {"data": envelope, "etag": etag}
 
-        data = retry_until_ready(call, attempts=4, base_delay=0.75)
+        entry = retry_until_ready(call, attempts=4, base_delay=0.75)
+        data = entry["data"]
 
         if not data.get("error"):
-            memo_put(cache_key, data)
+            memo_put(cache_key, entry)
             emit_success_events()
 
-        return jsonify(data), 200
+        return conditional_json(data, entry["etag"])
 
     return bp
\ No newline at end of file
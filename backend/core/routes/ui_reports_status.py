@@ -3,6 +3,7 @@ from flask import Blueprint, request, Response, jsonify
 from datetime import datetime, timedelta, timezone
 from io import StringIO
 import csv
+import json
 import requests
 from zoneinfo import ZoneInfo  # py3.9+
 
@@ -104,59 +105,97 @@ def _merge_company(posting: str, hiring: str):
     # if hiring empty: show only posting (or Unknown if even posting is empty)
     return posting or hiring_disp
 
-def _to_csv(payload: dict, tzinfo) -> tuple[str, str]:
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_CHUNK_CHARS = 16 * 1024
+
+def _iter_ndjson_items(resp):
+    """Report items from a streamed Jobs NDJSON response, one line at a time."""
+    resp.encoding = "utf-8"
+    for line in resp.iter_lines(decode_unicode=True):
+        if line and line.strip():
+            yield json.loads(line)
+
+def _iter_report_pages(first, fetch_next):
+    """
+    Items from the first Jobs page and every page after it: Jobs returns bounded keyset
+    pages and sets X-Report-Next while more follow. fetch_next(cursor) returns the next
+    streamed response; each response is closed once read.
+    """
+    resp = first
+    while resp is not None:
+        try:
+            yield from _iter_ndjson_items(resp)
+            cursor = resp.headers.get("X-Report-Next")
+        finally:
+            resp.close()
+        resp = fetch_next(cursor) if cursor else None
+
+def _merge_split_groups(items):
+    """Aggregate mode: a job that filled a whole Jobs page continues on the next one; join it."""
+    group = None
+    for it in items:
+        if group is not None and it.get("jobId") == group.get("jobId"):
+            group["statuses"] = (group.get("statuses") or []) + (it.get("statuses") or [])
+            continue
+        if group is not None:
+            yield group
+        group = it
+    if group is not None:
+        yield group
+
+def _chunked(parts, size: int = STREAM_CHUNK_CHARS):
+    """Coalesce small text parts into ~size chunks so each write is worth a syscall."""
+    buf = []
+    buffered = 0
+    for part in parts:
+        buf.append(part)
+        buffered += len(part)
+        if buffered >= size:
+            yield "".join(buf)
+            buf = []
+            buffered = 0
+    if buf:
+        yield "".join(buf)
+
+def _when(ts_iso: str, tzinfo, now_local: datetime):
+    return _fmt_ui_like(_to_local_dt(ts_iso or "", tzinfo), now_local)
+
+def _iter_csv(items, aggregate: bool, tzinfo):
     """
     Columns (both modes):
       Position name, Company, History, Link to job description
+    Yields the header, then one CSV row per item.
     """
-    start = _parse_iso(payload.get("start"))
-    end   = _parse_iso(payload.get("end"))
-    aggregate = bool(payload.get("aggregate"))
-    items = payload.get("items", [])
-
     now_local = datetime.now(tzinfo)
 
     buf = StringIO()
     headers = ["Position name", "Company", "History", "Link to job description"]
     writer = csv.DictWriter(buf, fieldnames=headers)
+
+    def take():
+        text = buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        return text
+
     writer.writeheader()
+    yield take()
 
-    if not aggregate:
-        for it in items:
-            title = it.get("jobTitle","") or ""
-            posting = it.get("postingCompanyName","") or ""
-            hiring  = it.get("hiringCompanyName","") or ""
-            url     = it.get("url","") or ""
-            status  = it.get("status","") or ""
-            ts_iso  = it.get("timestamp","") or ""
-            dt_loc  = _to_local_dt(ts_iso, tzinfo)
-            when    = _fmt_ui_like(dt_loc, now_local)
-            company = _merge_company(posting, hiring)
-
-            writer.writerow({
-                "Position name": title,
-                "Company": company,
-                "History": f"{status} {when}".strip(),
-                "Link to job description": url,
-            })
-        fname = _filename("status_report", start or now_local, end, "csv")
-        return buf.getvalue(), fname
-
-    # aggregated
     for it in items:
         title = it.get("jobTitle","") or ""
         posting = it.get("postingCompanyName","") or ""
         hiring  = it.get("hiringCompanyName","") or ""
         url     = it.get("url","") or ""
-        sts     = it.get("statuses") or []
-        parts = []
-        for s in sts:
-            st = s.get("status","") or ""
-            ts_iso = s.get("timestamp","") or ""
-            dt_loc = _to_local_dt(ts_iso, tzinfo)
-            when   = _fmt_ui_like(dt_loc, now_local)
-            parts.append(f"{st} {when}".strip())
-        history = ", ".join(parts)
+
+        if not aggregate:
+            status  = it.get("status","") or ""
+            history = f"{status} {_when(it.get('timestamp'), tzinfo, now_local)}".strip()
+        else:
+            parts = []
+            for st in (it.get("statuses") or []):
+                label = st.get("status","") or ""
+                parts.append(f"{label} {_when(st.get('timestamp'), tzinfo, now_local)}".strip())
+            history = ", ".join(parts)
 
         writer.writerow({
             "Position name": title,
@@ -164,49 +203,29 @@ def _to_csv(payload: dict, tzinfo) -> tuple[str, str]:
             "History": history,
             "Link to job description": url,
         })
+        yield take()
 
-    fname = _filename("status_report_agg", start or now_local, end, "csv")
-    return buf.getvalue(), fname
-
-def _to_text(payload: dict, tzinfo) -> tuple[str, str]:
-    start = _parse_iso(payload.get("start"))
-    end   = _parse_iso(payload.get("end"))
-    aggregate = bool(payload.get("aggregate"))
-    items = payload.get("items", [])
+def _iter_text(items, aggregate: bool, tzinfo):
     now_local = datetime.now(tzinfo)
 
-    lines = []
-    if not aggregate:
-        for it in items:
-            title = it.get("jobTitle","") or ""
-            posting = it.get("postingCompanyName","") or ""
-            hiring  = it.get("hiringCompanyName","") or ""
-            url     = it.get("url","") or ""
-            status  = it.get("status","") or ""
-            ts_iso  = it.get("timestamp","") or ""
-            dt_loc  = _to_local_dt(ts_iso, tzinfo)
-            when    = _fmt_ui_like(dt_loc, now_local)
-            company = _merge_company(posting, hiring)
-            lines.append(f"- {title} | {company} | {status} at {when} | {url}")
-        fname = _filename("status_report", start or now_local, end, "txt")
-        return "\n".join(lines) + ("\n" if lines else ""), fname
-
     for it in items:
         title = it.get("jobTitle","") or ""
         posting = it.get("postingCompanyName","") or ""
         hiring  = it.get("hiringCompanyName","") or ""
         url     = it.get("url","") or ""
         company = _merge_company(posting, hiring)
-        lines.append(f"* {title} | {company}")
-        for s in (it.get("statuses") or []):
-            st = s.get("status","") or ""
-            ts_iso = s.get("timestamp","") or ""
-            dt_loc = _to_local_dt(ts_iso, tzinfo)
-            when   = _fmt_ui_like(dt_loc, now_local)
-            lines.append(f"  - {st} at {when}")
-        lines.append(f"  Link: {url}")
-    fname = _filename("status_report_agg", start or now_local, end, "txt")
-    return "\n".join(lines) + ("\n" if lines else ""), fname
+
+        if not aggregate:
+            status = it.get("status","") or ""
+            when   = _when(it.get("timestamp"), tzinfo, now_local)
+            yield f"- {title} | {company} | {status} at {when} | {url}\n"
+            continue
+
+        yield f"* {title} | {company}\n"
+        for st in (it.get("statuses") or []):
+            label = st.get("status","") or ""
+            yield f"  - {label} at {_when(st.get('timestamp'), tzinfo, now_local)}\n"
+        yield f"  Link: {url}\n"
 
 
 def create_blueprint(auth):
@@ -249,25 +268,53 @@ def create_blueprint(auth):
         params = {"start": start, "aggregate": "true" if aggregate else "false"}
         if end: params["end"] = end
 
-        r = requests.get(f"{jobs_base()}/jobs/reports/status", headers=headers, params=params, timeout=15)
+        # Jobs returns NDJSON in bounded keyset pages; rows are transformed and sent on as
+        # each page arrives, so memory on both sides stays bounded by one page.
+        headers["Accept"] = NDJSON_MIMETYPE
+        r = requests.get(f"{jobs_base()}/jobs/reports/status", headers=headers, params=params,
+                         timeout=15, stream=True)
         if not r.ok:
-            return r.text, r.status_code, {"Content-Type": r.headers.get("Content-Type","text/plain")}
+            try:
+                return r.text, r.status_code, {"Content-Type": r.headers.get("Content-Type","text/plain")}
+            finally:
+                r.close()
 
-        payload = r.json()
-
-        # Transform
         if fmt == "csv":
-            text, fname = _to_csv(payload, tzinfo)
-            resp = Response(text, mimetype="text/csv; charset=utf-8")
-            resp.headers["Content-Disposition"] = f'attachment; filename="{fname}"'
-            return resp
-
-        if fmt in ("txt","text"):
-            text, fname = _to_text(payload, tzinfo)
-            resp = Response(text, mimetype="text/plain; charset=utf-8")
-            resp.headers["Content-Disposition"] = f'attachment; filename="{fname}"'
-            return resp
-
-        return jsonify({"error":"bad_request","message":"Unsupported format"}), 400
+            ext, mimetype, render = "csv", "text/csv; charset=utf-8", _iter_csv
+        elif fmt in ("txt","text"):
+            ext, mimetype, render = "txt", "text/plain; charset=utf-8", _iter_text
+        else:
+            r.close()
+            return jsonify({"error":"bad_request","message":"Unsupported format"}), 400
+
+        # Filename from the window Jobs actually used ('end' defaults to now there)
+        report_start = _parse_iso(r.headers.get("X-Report-Start") or "") or start_dt
+        report_end = _parse_iso(r.headers.get("X-Report-End") or "")
+        prefix = "status_report_agg" if aggregate else "status_report"
+        fname = _filename(prefix, report_start, report_end, ext)
+
+        # Later pages must use the window Jobs resolved for the first one
+        page_params = {**params, "end": r.headers.get("X-Report-End") or end or ""}
+
+        def fetch_next(cursor):
+            nxt = requests.get(f"{jobs_base()}/jobs/reports/status", headers=headers,
+                               params={**page_params, "after": cursor}, timeout=15, stream=True)
+            if not nxt.ok:
+                nxt.close()
+                raise RuntimeError(f"Jobs report page failed: {nxt.status_code}")
+            return nxt
+
+        def generate():
+            items = _iter_report_pages(r, fetch_next)
+            if aggregate:
+                items = _merge_split_groups(items)
+            try:
+                yield from _chunked(render(items, aggregate, tzinfo))
+            finally:
+                r.close()
+
+        resp = Response(generate(), mimetype=mimetype)
+        resp.headers["Content-Disposition"] = f'attachment; filename="{fname}"'
+        return resp
 
     return bp
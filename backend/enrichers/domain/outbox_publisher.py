@@ -3,16 +3,50 @@ from __future__ import annotations
 
 import os
 import logging
+import threading
 from datetime import datetime, timezone
 from typing import Optional
 
 from helpers.db import get_connection
 
+# LastPublishError for a row whose message cannot fit even an empty Service Bus batch.
+# The payload never changes, so such rows are dead-lettered (DeadLetteredAt) instead of retried.
+MESSAGE_TOO_LARGE = "message_too_large"
+
 
 def _utcnow():
     return datetime.now(timezone.utc)
 
 
+# Process-wide Service Bus client/sender keyed by (connection string, queue), reused
+# across timer invocations instead of a new AMQP handshake per publish.
+_SENDERS_LOCK = threading.Lock()
+_SENDERS: dict = {}
+
+
+def _cached_sender(conn_str: str, queue_name: str):
+    from azure.servicebus import ServiceBusClient
+
+    key = (conn_str, queue_name)
+    entry = _SENDERS.get(key)
+    if entry is None:
+        client = ServiceBusClient.from_connection_string(conn_str)
+        entry = (client, client.get_queue_sender(queue_name=queue_name))
+        _SENDERS[key] = entry
+    return entry[1]
+
+
+def _drop_cached_sender(conn_str: str, queue_name: str) -> None:
+    entry = _SENDERS.pop((conn_str, queue_name), None)
+    if entry is None:
+        return
+    for closable in (entry[1], entry[0]):
+        try:
+            closable.close()
+        except Exception:
+            pass
+
+
 class OutboxPublisher:
     """
     Publishes EnrichmentOutbox events to Service Bus queue.
@@ -22,42 +56,105 @@ class OutboxPublisher:
     def __init__(self):
         self.sb_conn = os.getenv("SERVICEBUS_CONNECTION")  # or your naming
         self.queue_name = os.getenv("SB_EVENTS_QUEUE_NAME", "enrichment-events")
+        self.dead_lettered = 0  # rows dead-lettered by the last publish_batch call
 
     def publish_batch(self, max_items: int = 20) -> int:
         if not self.sb_conn:
             logging.info("SERVICEBUS_CONNECTION not set; skipping outbox publish (local dev ok).")
             return 0
 
+        self.dead_lettered = 0
+
         # Lazy import so missing packages don't break function indexing
-        from azure.servicebus import ServiceBusClient, ServiceBusMessage
+        from azure.servicebus import ServiceBusMessage
+        from azure.servicebus.exceptions import ServiceBusError
 
         items = self._load_unpublished(limit=max_items)
         if not items:
             return 0
 
-        published = 0
-        with ServiceBusClient.from_connection_string(self.sb_conn) as client:
-            sender = client.get_queue_sender(queue_name=self.queue_name)
-            with sender:
-                for (outbox_id, event_type, aggregate_id, payload_json) in items:
-                    try:
-                        # Keep message body small: payload_json should be small pointers/ids
-                        msg = ServiceBusMessage(
-                            body=payload_json,
-                            application_properties={
-                                "eventType": event_type,
-                                "aggregateId": str(aggregate_id),
-                                "outboxId": str(outbox_id),
-                            },
-                        )
-                        sender.send_messages(msg)
-                        self._mark_published(outbox_id)
-                        published += 1
-                    except Exception:
-                        logging.exception("Failed to publish outboxId=%s", outbox_id)
-                        self._mark_failed_attempt(outbox_id, "publish_failed")
-
-        return published
+        messages = [
+            (
+                outbox_id,
+                # Keep message body small: payload_json should be small pointers/ids
+                ServiceBusMessage(
+                    body=payload_json,
+                    application_properties={
+                        "eventType": event_type,
+                        "aggregateId": str(aggregate_id),
+                        "outboxId": str(outbox_id),
+                    },
+                ),
+            )
+            for (outbox_id, event_type, aggregate_id, payload_json) in items
+        ]
+
+        sent_ids: list = []
+        too_large: list = []
+        try:
+            with _SENDERS_LOCK:
+                try:
+                    self._send_batched(_cached_sender(self.sb_conn, self.queue_name), messages, sent_ids, too_large)
+                except ServiceBusError:
+                    logging.warning("Outbox send failed on cached sender; reconnecting", exc_info=True)
+                    _drop_cached_sender(self.sb_conn, self.queue_name)
+                    self._send_batched(_cached_sender(self.sb_conn, self.queue_name), messages, sent_ids, too_large)
+        except Exception:
+            logging.exception("Failed to publish outbox batch sent=%s of %s", len(sent_ids), len(messages))
+            done = set(sent_ids) | set(too_large)
+            for outbox_id, _ in messages:
+                if outbox_id not in done:
+                    self._mark_failed_attempt(outbox_id, "publish_failed")
+
+        if too_large:
+            by_id = {row[0]: row for row in items}
+            for outbox_id in too_large:
+                _, event_type, aggregate_id, payload_json = by_id[outbox_id]
+                self._mark_dead_lettered(outbox_id, MESSAGE_TOO_LARGE)
+                # Stable message for the Application Insights alert on lost enrichment events.
+                logging.error(
+                    "enrichment_outbox_dead_lettered outboxId=%s eventType=%s aggregateId=%s reason=%s payloadChars=%s",
+                    outbox_id, event_type, aggregate_id, MESSAGE_TOO_LARGE, len(payload_json or ""),
+                )
+            self.dead_lettered = len(too_large)
+
+        if sent_ids:
+            self._mark_published_many(sent_ids)
+        return len(sent_ids)
+
+    @staticmethod
+    def _send_batched(sender, messages: list, sent_ids: list, too_large: list) -> None:
+        """
+        Send messages not yet in sent_ids with as few ServiceBusMessageBatch sends as fit;
+        appends outbox ids to sent_ids as each batch goes out. A message too large for an
+        empty batch is appended to too_large and skipped so it cannot block the rest.
+        """
+        already = set(sent_ids) | set(too_large)
+        batch = sender.create_message_batch()
+        pending: list = []
+        for outbox_id, msg in messages:
+            if outbox_id in already:
+                continue
+            try:
+                batch.add_message(msg)
+            except ValueError:
+                # Batch is full (MessageSizeExceededError subclasses ValueError).
+                if not pending:
+                    too_large.append(outbox_id)
+                    continue
+                sender.send_messages(batch)
+                sent_ids.extend(pending)
+                batch = sender.create_message_batch()
+                pending = []
+                try:
+                    batch.add_message(msg)
+                except ValueError:
+                    too_large.append(outbox_id)
+                    continue
+            pending.append(outbox_id)
+        if pending:
+            sender.send_messages(batch)
+            sent_ids.extend(pending)
 
     def _load_unpublished(self, limit: int):
         conn = get_connection()
@@ -69,6 +166,7 @@ class OutboxPublisher:
                     OutboxId, EventType, AggregateId, PayloadJson
                 FROM dbo.EnrichmentOutbox
                 WHERE PublishedAt IS NULL
+                  AND DeadLetteredAt IS NULL
                 ORDER BY CreatedAt ASC
                 """,
                 limit,
@@ -80,21 +178,22 @@ class OutboxPublisher:
             except Exception:
                 pass
 
-    def _mark_published(self, outbox_id: str) -> None:
+    def _mark_published_many(self, outbox_ids: list) -> None:
         conn = get_connection()
         now = _utcnow()
         try:
             cur = conn.cursor()
+            placeholders = ", ".join("?" for _ in outbox_ids)
             cur.execute(
-                """
+                f"""
                 UPDATE dbo.EnrichmentOutbox
                 SET PublishedAt = ?,
                     PublishAttempts = PublishAttempts + 1,
                     LastPublishError = NULL
-                WHERE OutboxId = ?
+                WHERE OutboxId IN ({placeholders})
                 """,
                 now,
-                outbox_id,
+                *outbox_ids,
             )
             conn.commit()
         finally:
@@ -123,3 +222,26 @@ class OutboxPublisher:
                 conn.close()
             except Exception:
                 pass
+
+    def _mark_dead_lettered(self, outbox_id: str, msg: str) -> None:
+        conn = get_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                UPDATE dbo.EnrichmentOutbox
+                SET PublishAttempts = PublishAttempts + 1,
+                    LastPublishError = ?,
+                    DeadLetteredAt = ?
+                WHERE OutboxId = ?
+                """,
+                msg,
+                _utcnow(),
+                outbox_id,
+            )
+            conn.commit()
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
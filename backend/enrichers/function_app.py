@@ -1,6 +1,7 @@
 import azure.functions as func
 import logging
 from routes import register_all
+from helpers.sql_instrumentation import instrument_http_routes
 from timers.cleanup_runs import main as cleanup_runs_main
 from timers.dispatch_projections import main as dispatch_projections_main
 
@@ -11,7 +12,7 @@ def ping(req: func.HttpRequest) -> func.HttpResponse:
     logging.info("enrichers ping")
     return func.HttpResponse("pong", status_code=200)
 
-register_all(app)
+register_all(instrument_http_routes(app))
 
 @app.function_name(name="cleanup_runs")
 @app.schedule(schedule="0 0 18 * * *", arg_name="mytimer", run_on_startup=False, use_monitor=False)
@@ -6,8 +6,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Mapping
 
-import httpx
-
+from helpers.analytics_emitter import get_emitter
 from helpers.db import get_connection
 
 
@@ -105,7 +104,8 @@ def emit_enrichers_event(
     Design rules:
     - no exception escapes to product route;
     - no retry;
-    - short timeout;
+    - never waits on Analytics: the payload is queued and sent in
+      batches by helpers.analytics_emitter; True means queued;
     - no function keys or full payload in logs;
     - no prompt/CV/job description/job title/company/summary fields.
     """
@@ -156,70 +156,7 @@ def emit_enrichers_event(
         "producerEventId": _optional_str(producer_event_id),
     }
 
-    timeout = _analytics_timeout_seconds()
-
-    try:
-        with httpx.Client(timeout=timeout) as client:
-            response = client.post(
-                f"{base_url}/analytics/events",
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                    "x-functions-key": function_key,
-                },
-                json=payload,
-            )
-
-        if response.status_code >= 400:
-            error_code = None
-            try:
-                error_body = response.json()
-                if isinstance(error_body, dict):
-                    error_code = error_body.get("error")
-            except Exception:
-                pass
-
-            logging.warning(
-                "analytics_enrichers_emit_failed event=%s status=%s error=%s subject_type=%s subject_id=%s",
-                event_name,
-                response.status_code,
-                error_code,
-                subject_type,
-                subject_id,
-            )
-            return False
-
-        return True
-
-    except httpx.TimeoutException:
-        logging.warning(
-            "analytics_enrichers_emit_timeout event=%s timeout_seconds=%s subject_type=%s subject_id=%s",
-            event_name,
-            timeout,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-    except httpx.HTTPError as exc:
-        logging.warning(
-            "analytics_enrichers_emit_request_failed event=%s error_type=%s subject_type=%s subject_id=%s",
-            event_name,
-            type(exc).__name__,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-    except Exception as exc:
-        logging.warning(
-            "analytics_enrichers_emit_unexpected_failed event=%s error_type=%s subject_type=%s subject_id=%s",
-            event_name,
-            type(exc).__name__,
-            subject_type,
-            subject_id,
-        )
-        return False
+    return get_emitter("analytics_enrichers").enqueue(payload)
 
 
 def safe_failure_stage(value: Any) -> str | None:
@@ -266,19 +203,6 @@ def extract_score(result_json: Any) -> float | None:
     return value
 
 
-def _analytics_timeout_seconds() -> float:
-    raw = os.getenv("ANALYTICS_EMIT_TIMEOUT_SECONDS", "2").strip()
-    try:
-        value = float(raw)
-    except ValueError:
-        return 2.0
-
-    if value <= 0:
-        return 2.0
-
-    return min(value, 10.0)
-
-
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
 
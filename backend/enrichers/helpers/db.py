@@ -1,11 +1,15 @@
 # db.py
 import os
 import logging
+
 import pyodbc
 
+from helpers.sql_pool import ConnectionPool, pool_enabled, pool_settings_from_env
+from helpers.sql_instrumentation import instrument_connection
+
 SQL_CONN_STR = os.getenv("SQLConnectionString")
 
-def get_connection():
+def _connect():
     try:
         return pyodbc.connect(SQL_CONN_STR, timeout=5)
     except pyodbc.InterfaceError as e:
@@ -17,3 +21,16 @@ def get_connection():
     except Exception:
         logging.exception("Unhandled database connection error")
         raise Exception("Unexpected error while connecting to the database.")
+
+_POOL = ConnectionPool(_connect, **pool_settings_from_env())
+
+def get_connection():
+    """
+    Returns a connection checked out from the process-wide pool.
+    conn.close() hands it back (after rollback) instead of closing the socket.
+    Set SQL_POOL_ENABLED=0 to get a fresh pyodbc connection every time.
+    Cursors are timed per statement (helpers/sql_instrumentation.py).
+    """
+    if not pool_enabled():
+        return instrument_connection(_connect())
+    return instrument_connection(_POOL.acquire())
@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import Any, Optional
 
 from helpers.db import get_connection
+from helpers.result_cache import store_result_for_run
 
 
 TERMINAL_STATUSES = ("Succeeded", "Failed", "Superseded", "Expired")
@@ -326,6 +327,9 @@ def complete_run_transactionally(
             now=now,
         )
 
+        if status == "Succeeded" and result_json is not None:
+            store_result_for_run(cur, run.run_id, json_dumps_compact(result_json), now)
+
         dispatches = build_projection_dispatches(
             run=run,
             completion_status=status,
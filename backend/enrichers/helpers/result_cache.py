@@ -0,0 +1,186 @@
+# enrichers/helpers/result_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+
+CACHEABLE_ENRICHER_TYPES = frozenset({"compatibility.v1"})
+
+
+@dataclass(frozen=True)
+class ResultCacheKey:
+    enricher_type: str
+    cv_version_id: str
+    job_content_hash: str
+    model_id: str
+    prompt_version: str
+
+
+@dataclass
+class CachedResult:
+    result_json: str
+    source_run_id: str
+    created_at: Any
+
+
+def result_cache_identity() -> Optional[tuple[str, str]]:
+    """
+    (model id, prompt version) of the deployed worker, from env.
+
+    Both must be set for memoization to be active; bump
+    ENRICHMENT_RESULT_CACHE_PROMPT_VERSION whenever the worker prompt, prompt
+    layout or scoring changes so older results stop matching.
+    """
+    model_id = (os.getenv("ENRICHMENT_RESULT_CACHE_MODEL_ID") or "").strip()
+    prompt_version = (os.getenv("ENRICHMENT_RESULT_CACHE_PROMPT_VERSION") or "").strip()
+    if not model_id or not prompt_version:
+        return None
+    return model_id, prompt_version
+
+
+def job_content_hash(title: Any, description: Any) -> str:
+    """sha256 over exactly the job fields the worker's build_prompt reads."""
+    canonical = json.dumps(
+        {"title": title or "", "description": description or ""},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def build_cache_key(
+    enricher_type: str,
+    cv_version_id: Optional[str],
+    content_hash: Optional[str],
+) -> Optional[ResultCacheKey]:
+    if enricher_type not in CACHEABLE_ENRICHER_TYPES or not cv_version_id or not content_hash:
+        return None
+    identity = result_cache_identity()
+    if identity is None:
+        return None
+    model_id, prompt_version = identity
+    return ResultCacheKey(enricher_type, str(cv_version_id), content_hash, model_id, prompt_version)
+
+
+def invalidate_stale_entries(
+    cur,
+    key: ResultCacheKey,
+    *,
+    job_offering_id: str,
+    user_id: str,
+) -> int:
+    """
+    Drop entries for this job whose content changed and for this user whose CV changed.
+
+    Keys are content-addressed, so stale entries could never match again; removing
+    them here keeps the table bounded by live (job, CV) pairs.
+    """
+    cur.execute(
+        """
+        DELETE FROM dbo.EnrichmentResultCache
+        WHERE EnricherType = ?
+          AND (
+                (JobOfferingId = ? AND JobContentHash <> ?)
+             OR (UserId = ? AND CVVersionId <> ?)
+          )
+        """,
+        key.enricher_type,
+        job_offering_id, key.job_content_hash,
+        user_id, key.cv_version_id,
+    )
+    return cur.rowcount or 0
+
+
+def take_cached_result(cur, key: ResultCacheKey, now: datetime) -> Optional[CachedResult]:
+    """Look up a cached result and record the hit in the same statement."""
+    cur.execute(
+        """
+        UPDATE dbo.EnrichmentResultCache
+        SET HitCount = HitCount + 1,
+            LastHitAt = ?
+        OUTPUT inserted.ResultJson, inserted.SourceRunId, inserted.CreatedAt
+        WHERE EnricherType = ?
+          AND CVVersionId = ?
+          AND JobContentHash = ?
+          AND ModelId = ?
+          AND PromptVersion = ?
+        """,
+        now,
+        key.enricher_type,
+        key.cv_version_id,
+        key.job_content_hash,
+        key.model_id,
+        key.prompt_version,
+    )
+    row = cur.fetchone()
+    if not row:
+        return None
+    return CachedResult(result_json=row[0], source_run_id=str(row[1]), created_at=row[2])
+
+
+def store_result_for_run(cur, run_id: str, result_json: str, now: datetime) -> int:
+    """
+    Save a Succeeded run's result under the cache key the run was created with.
+
+    Runs created without a full key (memoization disabled, snapshot unavailable, no
+    CV version) are skipped. A newer result for the same key replaces the old one.
+    """
+    cur.execute(
+        """
+        MERGE dbo.EnrichmentResultCache WITH (HOLDLOCK) AS t
+        USING (
+            SELECT EnricherType, CVVersionId, JobContentHash, ModelId, PromptVersion,
+                   RunId, JobOfferingId, UserId
+            FROM dbo.EnrichmentRuns
+            WHERE RunId = ?
+              AND CVVersionId IS NOT NULL
+              AND JobContentHash IS NOT NULL
+              AND ModelId IS NOT NULL
+              AND PromptVersion IS NOT NULL
+        ) AS s
+        ON  t.EnricherType = s.EnricherType
+        AND t.CVVersionId = s.CVVersionId
+        AND t.JobContentHash = s.JobContentHash
+        AND t.ModelId = s.ModelId
+        AND t.PromptVersion = s.PromptVersion
+        WHEN MATCHED THEN
+            UPDATE SET ResultJson = ?,
+                       SourceRunId = s.RunId,
+                       JobOfferingId = s.JobOfferingId,
+                       UserId = s.UserId,
+                       CreatedAt = ?,
+                       LastHitAt = NULL,
+                       HitCount = 0
+        WHEN NOT MATCHED THEN
+            INSERT (EnricherType, CVVersionId, JobContentHash, ModelId, PromptVersion,
+                    ResultJson, SourceRunId, JobOfferingId, UserId, CreatedAt)
+            VALUES (s.EnricherType, s.CVVersionId, s.JobContentHash, s.ModelId, s.PromptVersion,
+                    ?, s.RunId, s.JobOfferingId, s.UserId, ?);
+        """,
+        run_id,
+        result_json, now,
+        result_json, now,
+    )
+    return cur.rowcount or 0
+
+
+def cache_provenance(key: ResultCacheKey, cached: CachedResult) -> dict:
+    """EnrichmentAttributesJson for a run completed from the cache."""
+    created_at = cached.created_at
+    return {
+        "resultCache": {
+            "hit": True,
+            "sourceRunId": cached.source_run_id,
+            "cachedAt": created_at.isoformat() if hasattr(created_at, "isoformat") else created_at,
+            "cvVersionId": key.cv_version_id,
+            "jobContentHash": key.job_content_hash,
+            "modelId": key.model_id,
+            "promptVersion": key.prompt_version,
+        }
+    }
@@ -1,5 +1,6 @@
 # enrichers/helpers/runs_create.py
 from __future__ import annotations
+import json
 import uuid
 from datetime import datetime, timezone
 from typing import Optional, Tuple, Any, Dict
@@ -8,6 +9,18 @@ import logging
 import requests
 
 from helpers.db import get_connection
+from helpers.enrichment_completion import (
+    CompletionRunRow,
+    build_projection_dispatches,
+    insert_projection_dispatches,
+    json_dumps_compact,
+)
+from helpers.result_cache import (
+    build_cache_key,
+    cache_provenance,
+    invalidate_stale_entries,
+    take_cached_result,
+)
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -65,16 +78,30 @@ def _selected_gateway_config() -> tuple[str, str, str]:
     )
 
 
-def create_run_db(job_offering_id: str, user_id: str, enricher_type: str) -> Dict[str, Any]:
+def create_run_db(
+    job_offering_id: str,
+    user_id: str,
+    enricher_type: str,
+    *,
+    job_content_hash: Optional[str] = None,
+    use_result_cache: bool = True,
+) -> Dict[str, Any]:
     """
     DB-only creation:
       - supersede existing active runs
       - insert new Pending run
       - returns minimal run dict (enough for snapshot + enqueue + response)
+
+    With result memoization configured and a known job_content_hash, a run whose
+    (CVVersionId, job content, model, prompt version) key already has a cached
+    result is inserted directly as Succeeded, with its projection dispatch, in the
+    same transaction. The returned dict then has status "Succeeded" and
+    resultCacheHit=True, and callers must not snapshot or dispatch it.
     """
     now = _utcnow()
     run_id = str(uuid.uuid4())
     subject_key = _subject_key(job_offering_id, user_id)
+    cache_hit = False
 
     conn = get_connection()
     try:
@@ -107,15 +134,68 @@ def create_run_db(job_offering_id: str, user_id: str, enricher_type: str) -> Dic
         if row:
             cv_version_id = row[0]
 
-        cur.execute(
-            """
-            INSERT INTO dbo.EnrichmentRuns
-            (RunId, EnricherType, SubjectKey, JobOfferingId, UserId,
-             Status, RequestedAt, CVVersionId, UpdatedAt)
-            VALUES (?, ?, ?, ?, ?, 'Pending', ?, ?, ?)
-            """,
-            run_id, enricher_type, subject_key, job_offering_id, user_id, now, cv_version_id, now
-        )
+        cache_key = build_cache_key(enricher_type, cv_version_id, job_content_hash)
+        cached = None
+        if cache_key is not None:
+            invalidate_stale_entries(cur, cache_key, job_offering_id=job_offering_id, user_id=user_id)
+            if use_result_cache:
+                cached = take_cached_result(cur, cache_key, now)
+
+        if cached is None:
+            cur.execute(
+                """
+                INSERT INTO dbo.EnrichmentRuns
+                (RunId, EnricherType, SubjectKey, JobOfferingId, UserId,
+                 Status, RequestedAt, CVVersionId, UpdatedAt,
+                 JobContentHash, ModelId, PromptVersion)
+                VALUES (?, ?, ?, ?, ?, 'Pending', ?, ?, ?, ?, ?, ?)
+                """,
+                run_id, enricher_type, subject_key, job_offering_id, user_id, now, cv_version_id, now,
+                job_content_hash if cache_key else None,
+                cache_key.model_id if cache_key else None,
+                cache_key.prompt_version if cache_key else None,
+            )
+        else:
+            cache_hit = True
+            cur.execute(
+                """
+                INSERT INTO dbo.EnrichmentRuns
+                (RunId, EnricherType, SubjectKey, JobOfferingId, UserId,
+                 Status, RequestedAt, CVVersionId, UpdatedAt,
+                 JobContentHash, ModelId, PromptVersion,
+                 ResultJson, EnrichmentAttributesJson, CompletedAt)
+                VALUES (?, ?, ?, ?, ?, 'Succeeded', ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                run_id, enricher_type, subject_key, job_offering_id, user_id, now, cv_version_id, now,
+                cache_key.job_content_hash, cache_key.model_id, cache_key.prompt_version,
+                cached.result_json,
+                json_dumps_compact(cache_provenance(cache_key, cached)),
+                now,
+            )
+
+            run_row = CompletionRunRow(
+                run_id=run_id,
+                enricher_type=enricher_type,
+                subject_key=subject_key,
+                job_offering_id=job_offering_id,
+                user_id=user_id,
+                status="Succeeded",
+                requested_at=now,
+                lease_token=None,
+                lease_until=None,
+            )
+            dispatches = build_projection_dispatches(
+                run=run_row,
+                completion_status="Succeeded",
+                result_json=json.loads(cached.result_json),
+                now=now,
+            )
+            insert_projection_dispatches(cur, dispatches)
+
+            logging.info(
+                "create_run_db result cache hit runId=%s sourceRunId=%s subjectKey=%s",
+                run_id, cached.source_run_id, subject_key,
+            )
 
         conn.commit()
     except Exception:
@@ -133,9 +213,10 @@ def create_run_db(job_offering_id: str, user_id: str, enricher_type: str) -> Dic
         "subjectKey": subject_key,
         "jobOfferingId": job_offering_id,
         "userId": user_id,
-        "status": "Pending",
+        "status": "Succeeded" if cache_hit else "Pending",
         "requestedAt": now.isoformat(),
         "cvVersionId": cv_version_id,
+        "resultCacheHit": cache_hit,
     }
 
 def mark_queued(run_id: str) -> None:
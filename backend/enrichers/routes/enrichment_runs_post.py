@@ -7,7 +7,8 @@ from helpers.enrichment_snapshot import write_input_snapshot
 from helpers.runs_create import create_run_db, mark_queued, dispatch_via_gateway
 from domain.runs_service import RunsService  # keep for get_run normalization
 from helpers.snapshot_clients import get_job_snapshot, get_user_cv_snapshot
-from helpers.analytics import emit_enrichers_event, source_surface_from_request
+from helpers.analytics import emit_enrichers_event, extract_score, source_surface_from_request
+from helpers.result_cache import job_content_hash
 
 def register(app: func.FunctionApp):
     svc = RunsService()
@@ -34,8 +35,24 @@ def register(app: func.FunctionApp):
             job_id, user_id, enricher_type, corr
         )
 
-        # 1) DB create (Pending)
-        run = create_run_db(job_id, user_id, enricher_type)
+        # 0) Job snapshot first: its prompt fields are part of the result cache key.
+        #    Best-effort; on failure the run is created uncached and step 2 retries.
+        job_snap = None
+        content_hash = None
+        try:
+            job_snap = get_job_snapshot(job_id)
+            content_hash = job_content_hash(job_snap.get("jobName"), job_snap.get("jobDescription"))
+        except Exception:
+            logging.warning("POST /enrichment/runs job snapshot prefetch failed corr=%s", corr, exc_info=True)
+
+        # 1) DB create (Pending, or Succeeded straight from the result cache)
+        run = create_run_db(
+            job_id,
+            user_id,
+            enricher_type,
+            job_content_hash=content_hash,
+            use_result_cache=not bool(body.get("bypassCache")),
+        )
 
         source_surface = source_surface_from_request(req)
         if source_surface == "web":
@@ -53,9 +70,33 @@ def register(app: func.FunctionApp):
                 },
             )
 
+        if run["resultCacheHit"]:
+            logging.info("POST /enrichment/runs served from result cache runId=%s corr=%s", run["runId"], corr)
+            run = svc.get_run(run["runId"])
+            props = {
+                "job_id": run["jobOfferingId"],
+                "run_id": run["runId"],
+                "enricher_type": run["enricherType"],
+                "result_cache_hit": True,
+            }
+            score = extract_score(run.get("resultJson"))
+            if score is not None:
+                props["score"] = score
+            emit_enrichers_event(
+                "Compatibility Completed",
+                user_id=user_id,
+                source_surface="system",
+                subject_type="enrichment_run",
+                subject_id=run["runId"],
+                correlation_id=corr,
+                properties=props,
+            )
+            return func.HttpResponse(json.dumps(run), mimetype="application/json", status_code=201)
+
         # 2) Fetch inputs + write snapshot (any failure => leave Pending and return 201)
         try:
-            job_snap = get_job_snapshot(job_id)
+            if job_snap is None:
+                job_snap = get_job_snapshot(job_id)
             cv_snap = get_user_cv_snapshot(user_id)
 
             job_title = job_snap.get("jobName")
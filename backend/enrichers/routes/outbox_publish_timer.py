@@ -8,4 +8,4 @@ def register(app: func.FunctionApp):
     def publish(timer: func.TimerRequest) -> None:
         pub = OutboxPublisher()
         n = pub.publish_batch(max_items=20)
-        logging.info("Outbox published: %s", n)
+        logging.info("Outbox published: %s dead_lettered: %s", n, pub.dead_lettered)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from timers.dispatch_projections import _chunk_by_items, _deliver_batch
+
+
+def _row(dispatch_id: str, attempt_count: int = 0):
+    return SimpleNamespace(DispatchId=dispatch_id, AttemptCount=attempt_count)
+
+
+def _item(job_id: str) -> dict:
+    return {"jobId": job_id, "userId": "u", "score": 7.0, "calculatedAt": "2026-03-17T10:00:00Z"}
+
+
+def _response(status_code: int, body: dict | None = None):
+    resp = Mock()
+    resp.status_code = status_code
+    resp.text = json.dumps(body or {})
+    resp.json.return_value = body or {}
+    return resp
+
+
+class DispatchProjectionsBatchTests(unittest.TestCase):
+    def test_all_rows_share_one_post_and_are_delivered(self):
+        rows = [(_row("d1"), [_item("j1")]), (_row("d2"), [_item("j2")])]
+
+        with patch("timers.dispatch_projections._post_jobs_projection", return_value=_response(200)) as post:
+            outcomes = _deliver_batch(Mock(), rows, max_attempts=8)
+
+        self.assertEqual(post.call_count, 1)
+        sent = json.loads(post.call_args[0][1])
+        self.assertEqual([i["jobId"] for i in sent["items"]], ["j1", "j2"])
+        self.assertEqual(outcomes, {"d1": ("delivered", None), "d2": ("delivered", None)})
+
+    def test_item_validation_error_deadletters_owner_and_resends_rest(self):
+        rows = [(_row("d1"), [_item("j1")]), (_row("d2"), [_item("j2")])]
+        rejected = _response(400, {"message": "Validation failed", "errors": [{"index": 1, "error": "bad"}]})
+
+        with patch(
+            "timers.dispatch_projections._post_jobs_projection",
+            side_effect=[rejected, _response(200)],
+        ) as post:
+            outcomes = _deliver_batch(Mock(), rows, max_attempts=8)
+
+        self.assertEqual(post.call_count, 2)
+        resent = json.loads(post.call_args[0][1])
+        self.assertEqual([i["jobId"] for i in resent["items"]], ["j1"])
+        self.assertEqual(outcomes["d1"], ("delivered", None))
+        self.assertEqual(outcomes["d2"][0], "deadletter")
+
+    def test_transient_failure_retries_until_each_rows_attempts_run_out(self):
+        rows = [(_row("d1", attempt_count=0), [_item("j1")]), (_row("d2", attempt_count=7), [_item("j2")])]
+
+        with patch("timers.dispatch_projections._post_jobs_projection", return_value=_response(503)):
+            outcomes = _deliver_batch(Mock(), rows, max_attempts=8)
+
+        self.assertEqual(outcomes["d1"][0], "retry")
+        self.assertEqual(outcomes["d2"][0], "deadletter")
+
+    def test_chunks_respect_item_limit(self):
+        rows = [(_row(f"d{i}"), [_item(f"j{i}")] * 2) for i in range(5)]
+
+        chunks = list(_chunk_by_items(rows, max_items=4))
+
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from helpers.result_cache import (
+    CachedResult,
+    build_cache_key,
+    cache_provenance,
+    job_content_hash,
+    take_cached_result,
+)
+
+
+_IDENTITY_ENV = {
+    "ENRICHMENT_RESULT_CACHE_MODEL_ID": "qwen3-8b-q4",
+    "ENRICHMENT_RESULT_CACHE_PROMPT_VERSION": "2026-10-cv-first",
+}
+
+
+class FakeCursor:
+    def __init__(self, row=None):
+        self.row = row
+        self.executions = []
+        self.rowcount = 1 if row else 0
+
+    def execute(self, sql, *params):
+        self.executions.append((sql, params))
+
+    def fetchone(self):
+        return self.row
+
+
+class ResultCacheTests(unittest.TestCase):
+    def test_job_content_hash_changes_only_with_prompt_fields(self):
+        base = job_content_hash("Backend Engineer", "Python, SQL")
+
+        self.assertEqual(base, job_content_hash("Backend Engineer", "Python, SQL"))
+        self.assertNotEqual(base, job_content_hash("Backend Engineer", "Python, SQL, Go"))
+        self.assertNotEqual(base, job_content_hash("Senior Backend Engineer", "Python, SQL"))
+        self.assertEqual(len(base), 64)
+
+    def test_key_requires_configured_identity(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(build_cache_key("compatibility.v1", "cv", "job"))
+
+        with patch.dict(os.environ, _IDENTITY_ENV, clear=True):
+            key = build_cache_key("compatibility.v1", "cv", "job")
+
+        self.assertEqual(
+            (key.cv_version_id, key.job_content_hash, key.model_id, key.prompt_version),
+            ("cv", "job", "qwen3-8b-q4", "2026-10-cv-first"),
+        )
+
+    def test_key_requires_cv_version_job_hash_and_cacheable_enricher(self):
+        with patch.dict(os.environ, _IDENTITY_ENV, clear=True):
+            self.assertIsNone(build_cache_key("compatibility.v1", None, "job"))
+            self.assertIsNone(build_cache_key("compatibility.v1", "cv", None))
+            self.assertIsNone(build_cache_key("other.v1", "cv", "job"))
+
+    def test_hit_is_recorded_and_returned(self):
+        created = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        cur = FakeCursor(('{"score":7.5,"summary":"ok"}', "RUN-1", created))
+        with patch.dict(os.environ, _IDENTITY_ENV, clear=True):
+            key = build_cache_key("compatibility.v1", "cv", "job")
+
+        cached = take_cached_result(cur, key, datetime(2026, 10, 2, tzinfo=timezone.utc))
+
+        self.assertEqual(cached.source_run_id, "RUN-1")
+        self.assertIn("HitCount = HitCount + 1", cur.executions[0][0])
+
+    def test_miss_returns_none(self):
+        with patch.dict(os.environ, _IDENTITY_ENV, clear=True):
+            key = build_cache_key("compatibility.v1", "cv", "job")
+
+        self.assertIsNone(take_cached_result(FakeCursor(), key, datetime.now(timezone.utc)))
+
+    def test_provenance_names_source_run_and_key(self):
+        with patch.dict(os.environ, _IDENTITY_ENV, clear=True):
+            key = build_cache_key("compatibility.v1", "cv", "job")
+        cached = CachedResult("{}", "RUN-1", datetime(2026, 10, 1, tzinfo=timezone.utc))
+
+        provenance = cache_provenance(key, cached)["resultCache"]
+
+        self.assertTrue(provenance["hit"])
+        self.assertEqual(provenance["sourceRunId"], "RUN-1")
+        self.assertEqual(provenance["cachedAt"], "2026-10-01T00:00:00+00:00")
+        self.assertEqual(provenance["promptVersion"], "2026-10-cv-first")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import unittest
+
+from helpers.sql_pool import SESSION_RESET_SQL, ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *params):
+        if self.conn.broken:
+            raise RuntimeError("communication link failure")
+        self.conn.executions.append(sql)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.autocommit = False
+        self.broken = False
+        self.closed = False
+        self.rollbacks = 0
+        self.executions = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        if self.broken:
+            raise RuntimeError("communication link failure")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.clock = FakeClock()
+
+    def _connect(self):
+        conn = FakeConnection()
+        self.created.append(conn)
+        return conn
+
+    def _pool(self, **kwargs):
+        kwargs.setdefault("max_size", 2)
+        kwargs.setdefault("idle_timeout", 300)
+        kwargs.setdefault("ping_after", 30)
+        return ConnectionPool(self._connect, clock=self.clock, **kwargs)
+
+    def test_close_returns_connection_for_reuse_after_rollback(self):
+        pool = self._pool()
+
+        conn = pool.acquire()
+        conn.close()
+        again = pool.acquire()
+
+        self.assertEqual(len(self.created), 1)
+        self.assertIs(again.raw, self.created[0])
+        self.assertEqual(self.created[0].rollbacks, 1)
+        self.assertFalse(self.created[0].closed)
+
+    def test_autocommit_is_reset_on_return(self):
+        pool = self._pool()
+
+        conn = pool.acquire()
+        conn.autocommit = True
+        conn.close()
+
+        self.assertFalse(pool.acquire().autocommit)
+
+    def test_idle_connections_are_capped_at_max_size(self):
+        pool = self._pool(max_size=1)
+
+        first, second = pool.acquire(), pool.acquire()
+        first.close()
+        second.close()
+
+        self.assertEqual(pool.idle_count(), 1)
+        self.assertTrue(self.created[1].closed)
+
+    def test_connection_idle_past_timeout_is_replaced(self):
+        pool = self._pool()
+
+        pool.acquire().close()
+        self.clock.now = 301
+        conn = pool.acquire()
+
+        self.assertEqual(len(self.created), 2)
+        self.assertIs(conn.raw, self.created[1])
+        self.assertTrue(self.created[0].closed)
+
+    def test_stale_connection_is_pinged_and_dropped_when_broken(self):
+        pool = self._pool()
+
+        pool.acquire().close()
+        self.created[0].broken = True
+        self.clock.now = 31
+        conn = pool.acquire()
+
+        self.assertIs(conn.raw, self.created[1])
+        self.assertTrue(self.created[0].closed)
+
+    def test_recent_connection_is_not_pinged(self):
+        pool = self._pool()
+
+        pool.acquire().close()
+        self.clock.now = 5
+        pool.acquire()
+
+        self.assertNotIn("SELECT 1", self.created[0].executions)
+
+    def test_connection_failing_rollback_on_return_is_discarded(self):
+        pool = self._pool()
+
+        conn = pool.acquire()
+        self.created[0].broken = True
+        conn.close()
+
+        self.assertEqual(pool.idle_count(), 0)
+        self.assertTrue(self.created[0].closed)
+
+    def test_session_is_reset_on_return(self):
+        pool = self._pool()
+
+        conn = pool.acquire()
+        conn.cursor().execute("SET NOCOUNT ON; CREATE TABLE #Stage (Id int);")
+        conn.close()
+
+        self.assertEqual(self.created[0].executions[-1], SESSION_RESET_SQL)
+        self.assertIn("SET NOCOUNT OFF", SESSION_RESET_SQL)
+        self.assertIn("DROP TABLE", SESSION_RESET_SQL)
+        self.assertEqual(pool.idle_count(), 1)
+
+    def test_connection_failing_session_reset_is_discarded(self):
+        pool = self._pool()
+
+        conn = pool.acquire()
+        self.created[0].rollback = lambda: None
+        self.created[0].broken = True
+        conn.close()
+
+        self.assertEqual(pool.idle_count(), 0)
+        self.assertTrue(self.created[0].closed)
+
+    def test_context_manager_commits_and_returns(self):
+        pool = self._pool()
+
+        with pool.acquire() as conn:
+            conn.cursor().execute("UPDATE x SET y = 1")
+
+        self.assertEqual(pool.idle_count(), 1)
+        with self.assertRaises(RuntimeError):
+            conn.cursor()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -86,6 +86,22 @@ def _fail_stuck_pending(cur, now: datetime, pending_fail_minutes: int) -> int:
     return cur.rowcount or 0
 
 
+def _purge_result_cache(cur, now: datetime, result_cache_ttl_days: int) -> int:
+    """Drop memoized results nobody has hit (or written) within the TTL."""
+    if result_cache_ttl_days <= 0:
+        return 0
+
+    cutoff = now - timedelta(days=result_cache_ttl_days)
+    cur.execute(
+        """
+        DELETE FROM dbo.EnrichmentResultCache
+        WHERE COALESCE(LastHitAt, CreatedAt) < ?
+        """,
+        cutoff
+    )
+    return cur.rowcount or 0
+
+
 def main(mytimer: func.TimerRequest) -> None:
     logging.info("cleanup_runs INVOKED past_due=%s", getattr(mytimer, "past_due", None))
     now = _utcnow()
@@ -95,10 +111,11 @@ def main(mytimer: func.TimerRequest) -> None:
     queued_ttl_days = _env_int("ENRICHERS_CLEANUP_QUEUED_TTL_DAYS", 14)
     lease_grace_min = _env_int("ENRICHERS_CLEANUP_LEASE_GRACE_MINUTES", 10)
     pending_fail_min = _env_int("ENRICHERS_CLEANUP_PENDING_FAIL_MINUTES", 0)  # disabled by default
+    result_cache_ttl_days = _env_int("ENRICHERS_CLEANUP_RESULT_CACHE_TTL_DAYS", 90)
 
     logging.info(
-        "cleanup_runs start now=%s queued_ttl_days=%s lease_grace_min=%s pending_fail_min=%s",
-        now.isoformat(), queued_ttl_days, lease_grace_min, pending_fail_min
+        "cleanup_runs start now=%s queued_ttl_days=%s lease_grace_min=%s pending_fail_min=%s result_cache_ttl_days=%s",
+        now.isoformat(), queued_ttl_days, lease_grace_min, pending_fail_min, result_cache_ttl_days
     )
 
     conn = get_connection()
@@ -134,12 +151,13 @@ def main(mytimer: func.TimerRequest) -> None:
         expired_queued = _expire_queued(cur, now, queued_ttl_days)
         expired_leased = _expire_leased(cur, now, lease_grace_min)
         failed_pending = _fail_stuck_pending(cur, now, pending_fail_min)
+        purged_cache = _purge_result_cache(cur, now, result_cache_ttl_days)
 
         conn.commit()
 
         logging.info(
-            "cleanup_runs done expired_queued=%s expired_leased=%s failed_pending=%s",
-            expired_queued, expired_leased, failed_pending
+            "cleanup_runs done expired_queued=%s expired_leased=%s failed_pending=%s purged_result_cache=%s",
+            expired_queued, expired_leased, failed_pending, purged_cache
         )
     except Exception:
         conn.rollback()
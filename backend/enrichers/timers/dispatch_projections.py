@@ -13,6 +13,14 @@ from helpers.db import get_connection
 
 logging.info("dispatch_projections module imported")
 
+COMPATIBILITY_PROJECTION_TYPE = "job-list.compatibility-score.v1"
+
+# Jobs rejects bulk-upsert requests above this many items (MAX_ITEMS there).
+JOBS_BULK_UPSERT_MAX_ITEMS = 500
+
+# 4 parameters per row plus 2 shared ones; stays well under SQL Server's 2100 limit.
+MARK_OUTCOMES_CHUNK = 400
+
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -64,53 +72,42 @@ def _select_due_dispatches(cur, now: datetime, batch_size: int):
     return cur.fetchall()
 
 
-def _mark_delivered(cur, dispatch_id: str, now: datetime):
-    cur.execute(
-        """
-        UPDATE dbo.EnrichmentProjectionDispatch
-        SET Status = 'Delivered',
-            AttemptCount = AttemptCount + 1,
-            LastAttemptAt = ?,
-            LastError = NULL,
-            UpdatedAt = ?
-        WHERE DispatchId = ?
-        """,
-        now, now, dispatch_id,
-    )
-
-
-def _mark_retryable_failure(cur, dispatch_id: str, now: datetime, next_attempt_at: datetime, last_error: str):
-    cur.execute(
-        """
-        UPDATE dbo.EnrichmentProjectionDispatch
-        SET Status = 'Failed',
-            AttemptCount = AttemptCount + 1,
-            LastAttemptAt = ?,
-            NextAttemptAt = ?,
-            LastError = ?,
-            UpdatedAt = ?
-        WHERE DispatchId = ?
-        """,
-        now, next_attempt_at, last_error[:2000], now, dispatch_id,
-    )
-
+def _mark_outcomes(cur, updates: list[tuple[str, str, datetime | None, str | None]], now: datetime):
+    """
+    Record delivery outcomes for many dispatch rows in one statement per chunk.
+    updates: [(dispatch_id, status, next_attempt_at, last_error), ...] where status is
+    'Delivered', 'Failed' or 'DeadLetter'; NextAttemptAt is only changed for 'Failed'.
+    """
+    for start in range(0, len(updates), MARK_OUTCOMES_CHUNK):
+        chunk = updates[start:start + MARK_OUTCOMES_CHUNK]
+        values_sql = ",\n".join(
+            "(CAST(? AS UNIQUEIDENTIFIER), CAST(? AS NVARCHAR(32)), CAST(? AS DATETIMEOFFSET), CAST(? AS NVARCHAR(2000)))"
+            for _ in chunk
+        )
+        params: list = [now, now]
+        for dispatch_id, status, next_attempt_at, last_error in chunk:
+            params.extend([dispatch_id, status, next_attempt_at, last_error[:2000] if last_error else None])
 
-def _mark_deadletter(cur, dispatch_id: str, now: datetime, last_error: str):
-    cur.execute(
-        """
-        UPDATE dbo.EnrichmentProjectionDispatch
-        SET Status = 'DeadLetter',
-            AttemptCount = AttemptCount + 1,
-            LastAttemptAt = ?,
-            LastError = ?,
-            UpdatedAt = ?
-        WHERE DispatchId = ?
-        """,
-        now, last_error[:2000], now, dispatch_id,
-    )
+        cur.execute(
+            f"""
+            UPDATE d
+            SET Status = v.Status,
+                AttemptCount = d.AttemptCount + 1,
+                LastAttemptAt = ?,
+                NextAttemptAt = CASE WHEN v.Status = 'Failed' THEN v.NextAttemptAt ELSE d.NextAttemptAt END,
+                LastError = v.LastError,
+                UpdatedAt = ?
+            FROM dbo.EnrichmentProjectionDispatch AS d
+            JOIN (VALUES
+            {values_sql}
+            ) AS v(DispatchId, Status, NextAttemptAt, LastError)
+                ON d.DispatchId = v.DispatchId
+            """,
+            params,
+        )
 
 
-def _post_jobs_projection(payload_json: str) -> requests.Response:
+def _post_jobs_projection(session: requests.Session, payload_json: str) -> requests.Response:
     base_url = _env_str("EHESTIFTER_JOBS_BASE_URL")
     function_key = _env_str("EHESTIFTER_JOBS_FUNCTION_KEY")
 
@@ -126,64 +123,118 @@ def _post_jobs_projection(payload_json: str) -> requests.Response:
         "x-functions-key": function_key,
     }
 
-    session = requests.Session()
     return session.post(url, headers=headers, data=payload_json, timeout=60)
 
 
-def _deliver_one(dispatch_row, max_attempts: int) -> tuple[str, str | None]:
-    """
-    Returns:
-      ("delivered", None)
-      ("retry", "...error...")
-      ("deadletter", "...error...")
-    """
-    target_domain = dispatch_row.TargetDomain
-    projection_type = dispatch_row.ProjectionType
+def _failure_outcome(dispatch_row, max_attempts: int, msg: str) -> tuple[str, str]:
     attempt_count = int(dispatch_row.AttemptCount or 0)
-    payload_json = dispatch_row.PayloadJson
-
+    if attempt_count + 1 >= max_attempts:
+        return ("deadletter", msg)
+    return ("retry", msg)
+
+
+def _payload_items(dispatch_row) -> list[dict]:
+    payload = json.loads(dispatch_row.PayloadJson)
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ValueError("PayloadJson must contain a non-empty 'items' array")
+    return items
+
+
+def _chunk_by_items(rows_with_items: list[tuple[object, list[dict]]], max_items: int):
+    """Group dispatch rows so each Jobs request stays within its item limit."""
+    chunk: list[tuple[object, list[dict]]] = []
+    count = 0
+    for row, items in rows_with_items:
+        if chunk and count + len(items) > max_items:
+            yield chunk
+            chunk, count = [], 0
+        chunk.append((row, items))
+        count += len(items)
+    if chunk:
+        yield chunk
+
+
+def _rejected_dispatch_ids(resp: requests.Response, owners: list) -> set[str]:
+    """Map Jobs per-item validation errors (by payload index) back to dispatch rows."""
     try:
-        if target_domain != "jobs":
-            return ("deadletter", f"Unsupported target domain: {target_domain}")
+        body = resp.json()
+    except Exception:
+        return set()
 
-        if projection_type != "job-list.compatibility-score.v1":
-            return ("deadletter", f"Unsupported projection type: {projection_type}")
+    errors = body.get("errors") if isinstance(body, dict) else None
+    if not isinstance(errors, list):
+        return set()
 
-        resp = _post_jobs_projection(payload_json)
+    rejected = set()
+    for err in errors:
+        idx = err.get("index") if isinstance(err, dict) else None
+        if isinstance(idx, int) and 0 <= idx < len(owners):
+            rejected.add(str(owners[idx].DispatchId))
+    return rejected
 
-        if 200 <= resp.status_code < 300:
-            logging.info(
-                "dispatch_projections: jobs API success status=%s body=%s",
-                resp.status_code,
-                resp.text[:1000],
-            )
-            return ("delivered", None)
 
-        logging.warning(
-            "dispatch_projections: jobs API failure status=%s body=%s",
-            resp.status_code,
-            resp.text[:1000],
-        )
+def _deliver_batch(
+    session: requests.Session,
+    rows_with_items: list[tuple[object, list[dict]]],
+    max_attempts: int,
+) -> dict[str, tuple[str, str | None]]:
+    """
+    POST the items of all given dispatch rows to Jobs in one request.
 
-        if resp.status_code in (408, 409, 425, 429, 500, 502, 503, 504):
-            msg = f"Jobs API transient failure {resp.status_code}: {resp.text[:1000]}"
-            if attempt_count + 1 >= max_attempts:
-                return ("deadletter", msg)
-            return ("retry", msg)
+    Returns {dispatch_id: ("delivered", None) | ("retry", error) | ("deadletter", error)}.
+    A 400 naming specific item indexes deadletters only the owning rows; the rest
+    are re-sent without them.
+    """
+    items: list[dict] = []
+    owners: list = []
+    for row, row_items in rows_with_items:
+        items.extend(row_items)
+        owners.extend([row] * len(row_items))
 
-        return ("deadletter", f"Jobs API non-retryable failure {resp.status_code}: {resp.text[:1000]}")
+    def _all(outcome_for) -> dict[str, tuple[str, str | None]]:
+        return {str(row.DispatchId): outcome_for(row) for row, _ in rows_with_items}
 
+    try:
+        resp = _post_jobs_projection(session, json.dumps({"items": items}, separators=(",", ":")))
     except requests.RequestException as ex:
         msg = f"HTTP error: {type(ex).__name__}: {str(ex)}"
-        if attempt_count + 1 >= max_attempts:
-            return ("deadletter", msg)
-        return ("retry", msg)
-
+        return _all(lambda row: _failure_outcome(row, max_attempts, msg))
     except Exception as ex:
         msg = f"Unexpected error: {type(ex).__name__}: {str(ex)}"
-        if attempt_count + 1 >= max_attempts:
-            return ("deadletter", msg)
-        return ("retry", msg)
+        return _all(lambda row: _failure_outcome(row, max_attempts, msg))
+
+    if 200 <= resp.status_code < 300:
+        logging.info(
+            "dispatch_projections: jobs API success status=%s items=%s body=%s",
+            resp.status_code,
+            len(items),
+            resp.text[:1000],
+        )
+        return _all(lambda row: ("delivered", None))
+
+    logging.warning(
+        "dispatch_projections: jobs API failure status=%s items=%s body=%s",
+        resp.status_code,
+        len(items),
+        resp.text[:1000],
+    )
+
+    if resp.status_code == 400:
+        rejected = _rejected_dispatch_ids(resp, owners)
+        if rejected and len(rejected) < len(rows_with_items):
+            msg = f"Jobs API rejected item {resp.status_code}: {resp.text[:1000]}"
+            outcomes = {dispatch_id: ("deadletter", msg) for dispatch_id in rejected}
+            remaining = [(row, row_items) for row, row_items in rows_with_items if str(row.DispatchId) not in rejected]
+            outcomes.update(_deliver_batch(session, remaining, max_attempts))
+            return outcomes
+
+    if resp.status_code in (408, 409, 425, 429, 500, 502, 503, 504):
+        msg = f"Jobs API transient failure {resp.status_code}: {resp.text[:1000]}"
+        return _all(lambda row: _failure_outcome(row, max_attempts, msg))
+
+    msg = f"Jobs API non-retryable failure {resp.status_code}: {resp.text[:1000]}"
+    return _all(lambda row: ("deadletter", msg))
 
 
 def main(mytimer: func.TimerRequest) -> None:
@@ -224,18 +275,42 @@ def main(mytimer: func.TimerRequest) -> None:
 
         logging.info("dispatch_projections: picked %s rows", len(rows))
 
+        outcomes: dict[str, tuple[str, str | None]] = {}
+        deliverable: list[tuple[object, list[dict]]] = []
+
+        for row in rows:
+            dispatch_id = str(row.DispatchId)
+            if row.TargetDomain != "jobs":
+                outcomes[dispatch_id] = ("deadletter", f"Unsupported target domain: {row.TargetDomain}")
+                continue
+            if row.ProjectionType != COMPATIBILITY_PROJECTION_TYPE:
+                outcomes[dispatch_id] = ("deadletter", f"Unsupported projection type: {row.ProjectionType}")
+                continue
+            try:
+                deliverable.append((row, _payload_items(row)))
+            except Exception as ex:
+                outcomes[dispatch_id] = ("deadletter", f"Invalid PayloadJson: {type(ex).__name__}: {str(ex)}")
+
+        session = requests.Session()
+        try:
+            for chunk in _chunk_by_items(deliverable, JOBS_BULK_UPSERT_MAX_ITEMS):
+                outcomes.update(_deliver_batch(session, chunk, max_attempts))
+        finally:
+            session.close()
+
+        step_now = _utcnow()
         delivered = 0
         retried = 0
         deadlettered = 0
+        updates = []
 
         for row in rows:
             dispatch_id = str(row.DispatchId)
-            status, error = _deliver_one(row, max_attempts)
-            step_now = _utcnow()
+            status, error = outcomes[dispatch_id]
 
             logging.info(
                 "dispatch_projections: dispatch_id=%s run_id=%s projection_type=%s target_domain=%s attempt_count=%s outcome=%s error=%s",
-                str(row.DispatchId),
+                dispatch_id,
                 str(row.RunId),
                 row.ProjectionType,
                 row.TargetDomain,
@@ -244,29 +319,20 @@ def main(mytimer: func.TimerRequest) -> None:
                 error,
             )
 
-            inner = get_connection()
-            try:
-                inner.autocommit = False
-                icur = inner.cursor()
-
-                if status == "delivered":
-                    _mark_delivered(icur, dispatch_id, step_now)
-                    delivered += 1
-                elif status == "retry":
-                    next_attempt = _compute_next_attempt(step_now, int(row.AttemptCount or 0) + 1)
-                    _mark_retryable_failure(icur, dispatch_id, step_now, next_attempt, error or "retry")
-                    retried += 1
-                else:
-                    _mark_deadletter(icur, dispatch_id, step_now, error or "deadletter")
-                    deadlettered += 1
-
-                inner.commit()
-            except Exception:
-                inner.rollback()
-                logging.exception("dispatch_projections: failed updating dispatch row %s", dispatch_id)
-                raise
-            finally:
-                inner.close()
+            if status == "delivered":
+                updates.append((dispatch_id, "Delivered", None, None))
+                delivered += 1
+            elif status == "retry":
+                next_attempt = _compute_next_attempt(step_now, int(row.AttemptCount or 0) + 1)
+                updates.append((dispatch_id, "Failed", next_attempt, error or "retry"))
+                retried += 1
+            else:
+                updates.append((dispatch_id, "DeadLetter", None, error or "deadletter"))
+                deadlettered += 1
+
+        if updates:
+            _mark_outcomes(cur, updates, step_now)
+            conn.commit()
 
         logging.info(
             "dispatch_projections done delivered=%s retried=%s deadlettered=%s",
@@ -3,7 +3,7 @@
 import logging
 from typing import Any, Mapping
 
-from helpers.sb_client import send_dispatch_message
+from helpers.sb_client import DispatchBatchError, send_dispatch_message, send_dispatch_messages
 from .common import (
     ResponseTuple,
     correlation_id,
@@ -12,6 +12,9 @@ from .common import (
 )
 
 
+MAX_BATCH_RUNS = 500
+
+
 def handle_gateway_dispatch(
     body: Any,
     headers: Mapping[str, Any] | None = None,
@@ -76,3 +79,68 @@ def handle_gateway_dispatch(
         202,
         response_headers,
     )
+
+
+def handle_gateway_dispatch_batch(
+    body: Any,
+    headers: Mapping[str, Any] | None = None,
+) -> ResponseTuple:
+    """
+    Bulk variant of /gateway/dispatch: {"runs": [<dispatch payload>, ...]}.
+    All runs go out through the cached sender in as few Service Bus batches as fit.
+    """
+    corr = correlation_id(headers)
+    response_headers = {"x-correlation-id": corr}
+
+    runs = body.get("runs") if isinstance(body, dict) else None
+    if not isinstance(runs, list) or not runs:
+        return text_result("Body must include non-empty 'runs' array", 400, response_headers)
+
+    if len(runs) > MAX_BATCH_RUNS:
+        return text_result(f"Too many runs (max {MAX_BATCH_RUNS})", 400, response_headers)
+
+    missing = [idx for idx, run in enumerate(runs) if not isinstance(run, dict) or not run.get("runId")]
+    if missing:
+        logging.warning(
+            "POST /gateway/dispatch:batch missing_runId corr=%s indexes=%s",
+            corr,
+            missing[:20],
+        )
+        return json_result(
+            {"code": "MISSING_RUN_ID", "indexes": missing, "corr": corr},
+            400,
+            response_headers,
+        )
+
+    run_ids = [str(run.get("runId")) for run in runs]
+    logging.info("POST /gateway/dispatch:batch start corr=%s count=%s", corr, len(runs))
+
+    try:
+        message_ids = send_dispatch_messages(runs, corr=corr)
+    except DispatchBatchError as e:
+        sent = len(e.sent_message_ids)
+        return json_result(
+            {
+                "code": "SB_DISPATCH_FAILED",
+                "message": str(e),
+                "dispatchedRunIds": run_ids[:sent],
+                "failedRunIds": run_ids[sent:],
+                "corr": corr,
+            },
+            502,
+            response_headers,
+        )
+
+    logging.info("POST /gateway/dispatch:batch ok corr=%s count=%s", corr, len(message_ids))
+
+    return json_result(
+        {
+            "results": [
+                {"runId": run_id, "messageId": message_id}
+                for run_id, message_id in zip(run_ids, message_ids)
+            ],
+            "corr": corr,
+        },
+        202,
+        response_headers,
+    )
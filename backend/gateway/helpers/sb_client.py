@@ -1,6 +1,7 @@
 # helpers/sb_client.py
 import json
 import logging
+import threading
 from typing import Optional
 
 from azure.servicebus import ServiceBusClient, ServiceBusMessage
@@ -8,7 +9,55 @@ from azure.servicebus.exceptions import ServiceBusError  # broad base
 from helpers.settings import SB_CONNECTION_STRING, SB_QUEUE_NAME
 
 
-def send_dispatch_message(payload: dict, corr: Optional[str] = None) -> str:
+class DispatchBatchError(Exception):
+    """A batch send failed part-way; `sent_message_ids` lists what was already enqueued."""
+
+    def __init__(self, message: str, sent_message_ids: list[str]):
+        super().__init__(message)
+        self.sent_message_ids = sent_message_ids
+
+
+# Process-wide client/sender: the AMQP connection and link are opened once per
+# instance instead of once per dispatched run. ServiceBusSender is not thread-safe,
+# so every send holds _SENDER_LOCK.
+_SENDER_LOCK = threading.RLock()
+_client: Optional[ServiceBusClient] = None
+_sender = None
+
+
+def _get_sender():
+    global _client, _sender
+    if _sender is None:
+        _client = ServiceBusClient.from_connection_string(SB_CONNECTION_STRING)
+        _sender = _client.get_queue_sender(queue_name=SB_QUEUE_NAME)
+    return _sender
+
+
+def _reset_sender() -> None:
+    global _client, _sender
+    sender, client = _sender, _client
+    _sender, _client = None, None
+    for closable in (sender, client):
+        if closable is None:
+            continue
+        try:
+            closable.close()
+        except Exception:
+            logging.warning("SB close failed during sender reset", exc_info=True)
+
+
+def _with_sender(action):
+    """Run action(sender) on the cached sender; on a Service Bus error reconnect once and retry."""
+    with _SENDER_LOCK:
+        try:
+            return action(_get_sender())
+        except ServiceBusError:
+            logging.warning("SB send failed on cached sender; reconnecting queue=%s", SB_QUEUE_NAME, exc_info=True)
+            _reset_sender()
+            return action(_get_sender())
+
+
+def _build_dispatch_message(payload: dict, corr: Optional[str]) -> ServiceBusMessage:
     run_id = str(payload.get("runId") or "")
 
     # Keep SB body minimal per design doc if you want; but right now you're sending full payload.
@@ -29,13 +78,17 @@ def send_dispatch_message(payload: dict, corr: Optional[str] = None) -> str:
     }
     if corr:
         msg.application_properties["corr"] = corr
+    return msg
+
+
+def send_dispatch_message(payload: dict, corr: Optional[str] = None) -> str:
+    run_id = str(payload.get("runId") or "")
+    msg = _build_dispatch_message(payload, corr)
 
     logging.info("SB send start queue=%s runId=%s corr=%s", SB_QUEUE_NAME, run_id, corr)
 
     try:
-        with ServiceBusClient.from_connection_string(SB_CONNECTION_STRING) as client:
-            with client.get_queue_sender(queue_name=SB_QUEUE_NAME) as sender:
-                sender.send_messages(msg)
+        _with_sender(lambda sender: sender.send_messages(msg))
     except ServiceBusError as e:
         logging.exception("SB send failed queue=%s runId=%s corr=%s", SB_QUEUE_NAME, run_id, corr)
         raise
@@ -44,4 +97,48 @@ def send_dispatch_message(payload: dict, corr: Optional[str] = None) -> str:
         raise
 
     logging.info("SB send ok queue=%s runId=%s messageId=%s corr=%s", SB_QUEUE_NAME, run_id, msg.message_id, corr)
-    return msg.message_id or ""
\ No newline at end of file
+    return msg.message_id or ""
+
+
+def send_dispatch_messages(payloads: list[dict], corr: Optional[str] = None) -> list[str]:
+    """
+    Enqueue many dispatch payloads using size-bounded ServiceBusMessageBatch sends.
+    Returns message ids in payload order. Raises DispatchBatchError if a batch fails
+    after earlier batches were already sent.
+    """
+    messages = [_build_dispatch_message(p, corr) for p in payloads]
+    sent: list[str] = []
+
+    logging.info("SB batch send start queue=%s count=%s corr=%s", SB_QUEUE_NAME, len(messages), corr)
+
+    def _send_all(sender):
+        batch = sender.create_message_batch()
+        pending: list[ServiceBusMessage] = []
+        for msg in messages[len(sent):]:
+            try:
+                batch.add_message(msg)
+            except ValueError:
+                # Batch is full (MessageSizeExceededError subclasses ValueError): flush and start a new one.
+                if not pending:
+                    raise
+                sender.send_messages(batch)
+                sent.extend(m.message_id or "" for m in pending)
+                batch = sender.create_message_batch()
+                pending = []
+                batch.add_message(msg)
+            pending.append(msg)
+        if pending:
+            sender.send_messages(batch)
+            sent.extend(m.message_id or "" for m in pending)
+
+    try:
+        _with_sender(_send_all)
+    except Exception as e:
+        logging.exception(
+            "SB batch send failed queue=%s sent=%s of %s corr=%s",
+            SB_QUEUE_NAME, len(sent), len(messages), corr,
+        )
+        raise DispatchBatchError(str(e), list(sent)) from e
+
+    logging.info("SB batch send ok queue=%s count=%s corr=%s", SB_QUEUE_NAME, len(sent), corr)
+    return sent
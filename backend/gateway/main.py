@@ -12,7 +12,7 @@ from handlers.common import require_gateway_key
 #load_dotenv()
 #####
 
-from handlers.gateway_dispatch import handle_gateway_dispatch
+from handlers.gateway_dispatch import handle_gateway_dispatch, handle_gateway_dispatch_batch
 from handlers.work_lease import handle_work_lease
 from handlers.work_complete import handle_work_complete
 
@@ -72,6 +72,24 @@ def create_app() -> Flask:
             )
         )
 
+    @app.post("/gateway/dispatch:batch")
+    def gateway_dispatch_batch():
+        #AUTH
+        auth_error = _require_cloudrun_key()
+        if auth_error:
+            return auth_error
+
+        body: Any = request.get_json(silent=True)
+        if body is None:
+            return Response("Invalid JSON body", status=400, mimetype="text/plain")
+
+        return _flask_response(
+            handle_gateway_dispatch_batch(
+                body=body,
+                headers=request.headers,
+            )
+        )
+
     @app.post("/work/lease")
     def work_lease():
         #AUTH
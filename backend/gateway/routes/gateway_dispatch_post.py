@@ -4,7 +4,7 @@ import json
 
 import azure.functions as func
 
-from handlers.gateway_dispatch import handle_gateway_dispatch
+from handlers.gateway_dispatch import handle_gateway_dispatch, handle_gateway_dispatch_batch
 from helpers.http_json import parse_json
 
 
@@ -38,4 +38,17 @@ def register(app: func.FunctionApp):
                 body=body,
                 headers=req.headers,
             )
-        )
\ No newline at end of file
+        )
+
+    @app.route(route="gateway/dispatch:batch", methods=["POST"])
+    def gateway_dispatch_batch(req: func.HttpRequest) -> func.HttpResponse:
+        ok, body, err = parse_json(req)
+        if not ok:
+            return err
+
+        return _to_http_response(
+            handle_gateway_dispatch_batch(
+                body=body,
+                headers=req.headers,
+            )
+        )
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+
+def test_21_dispatch_batch_rejects_empty_runs(gateway_base_url, gateway_auth_headers, post_json):
+    url = f"{gateway_base_url}/api/gateway/dispatch:batch"
+
+    r = post_json(url, gateway_auth_headers, {"runs": []}, label="DISPATCH_BATCH_EMPTY")
+    assert r.status_code == 400, f"Expected 400, got {r.status_code}: {r.text}"
+
+
+def test_21_dispatch_batch_reports_missing_run_ids(gateway_base_url, gateway_auth_headers, post_json):
+    url = f"{gateway_base_url}/api/gateway/dispatch:batch"
+
+    r = post_json(
+        url,
+        gateway_auth_headers,
+        {"runs": [{"runId": "00000000-0000-0000-0000-000000000001"}, {"enricherType": "compatibility.v1"}]},
+        label="DISPATCH_BATCH_MISSING_RUN_ID",
+    )
+    assert r.status_code == 400, f"Expected 400, got {r.status_code}: {r.text}"
+    assert r.json()["indexes"] == [1]
+
+
+def test_21_dispatch_batch_enqueues_messages(
+    gateway_base_url,
+    gateway_auth_headers,
+    post_json,
+    sb_helpers,
+    shared_state,
+):
+    run_id = shared_state["run_id"]
+
+    url = f"{gateway_base_url}/api/gateway/dispatch:batch"
+    payload = {
+        "runs": [
+            {
+                "runId": run_id,
+                "enricherType": shared_state["enricher_type"],
+                "subjectKey": shared_state["subject_key"],
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+                "suiteId": shared_state["suite_id"],
+            }
+        ]
+    }
+
+    r = post_json(url, gateway_auth_headers, payload, label="DISPATCH_BATCH")
+    assert r.status_code == 202, f"Expected 202, got {r.status_code}: {r.text}"
+
+    results = r.json()["results"]
+    assert len(results) == 1
+    assert results[0]["runId"].lower() == run_id.lower()
+
+    got = sb_helpers["peek_matching"](
+        predicate=lambda env: str(env.get("message_id") or "").lower() == run_id.lower(),
+        wait_seconds=10,
+    )
+    assert got is not None, "Did not observe batch-dispatched message in SB via peek"
@@ -1,6 +1,7 @@
 import azure.functions as func
 import logging
 from routes import register_all
+from helpers.sql_instrumentation import instrument_http_routes
 
 app = func.FunctionApp()
 
@@ -10,4 +11,4 @@ def ping(req: func.HttpRequest) -> func.HttpResponse:
     return func.HttpResponse("pong", status_code=200)
 
 # Register all routes from the routes/ package
-register_all(app)
+register_all(instrument_http_routes(app))
@@ -0,0 +1,258 @@
+# helpers/counters.py
+# Per-user job counters (dbo.UserJobCounters) behind GET /jobs/counts and the default
+# `total` of unfiltered GET /jobs pages.
+#
+# Counters are kept by membership deltas. A writer captures the list membership of the
+# (job, user) pairs it is about to touch, performs its write, then calls
+# apply_counter_deltas in the same transaction; only the difference is added to the
+# counters. The capture takes UPDLOCK/HOLDLOCK on the pairs' UserJobStatus and
+# CompatibilityScores rows (key ranges when missing), so concurrent writers on the same
+# pair serialize and the second one sees the first one's result as its "before".
+# Membership mirrors the category filters in routes/jobs_list.py:
+#   my          live job, (created by the user OR has a status) AND status not final
+#   open        live job, no status, not created by the user, compatibility > threshold
+#   status:<k>  live job with the user's StatusKey = k
+# A user without a 'my' row has never been counted; their counters are rebuilt from
+# scratch instead of receiving deltas. Rebuilds hold a per-user application lock until
+# the transaction ends, so concurrent first reads/writes for one user rebuild one after
+# the other instead of both inserting the same counter rows.
+from collections import Counter
+from typing import Iterable
+
+from helpers.domain_constants import OPEN_MIN_COMPATIBILITY_SCORE
+from helpers.ids import normalize_guid
+
+
+COUNTER_MY = "my"
+COUNTER_OPEN = "open"
+STATUS_COUNTER_PREFIX = "status:"
+
+_REBUILD_LOCK_TIMEOUT_MS = 10000
+_PAIR_CHUNK = 1000   # 2 params per pair, under SQL Server's 2100-parameter limit
+_DELTA_CHUNK = 600   # 3 params per row
+
+_MEMBERSHIP_SQL = """
+SELECT
+    p.JobOfferingId,
+    p.UserId,
+    CASE WHEN (j.CreatedByUserId = p.UserId OR us.UserId IS NOT NULL)
+          AND (us.UserId IS NULL OR us.IsFinal = 0)
+         THEN 1 ELSE 0 END AS InMy,
+    CASE WHEN us.UserId IS NULL
+          AND (j.CreatedByUserId IS NULL OR j.CreatedByUserId <> p.UserId)
+          AND cs.Score > ?
+         THEN 1 ELSE 0 END AS InOpen,
+    us.StatusKey
+FROM (VALUES {values}) AS p (JobOfferingId, UserId)
+JOIN dbo.JobOfferings j
+  ON j.Id = p.JobOfferingId
+ AND j.IsDeleted = 0
+LEFT JOIN dbo.UserJobStatus us WITH (UPDLOCK, HOLDLOCK)
+  ON us.JobOfferingId = p.JobOfferingId
+ AND us.UserId = p.UserId
+LEFT JOIN dbo.CompatibilityScores cs WITH (UPDLOCK, HOLDLOCK)
+  ON cs.JobOfferingId = p.JobOfferingId
+ AND cs.UserId = p.UserId
+"""
+
+_APPLY_DELTAS_SQL = """
+MERGE dbo.UserJobCounters WITH (HOLDLOCK) AS t
+USING (VALUES {values}) AS s (UserId, CounterKey, Delta)
+    ON t.UserId = s.UserId
+   AND t.CounterKey = s.CounterKey
+WHEN MATCHED THEN
+    UPDATE SET JobCount = t.JobCount + s.Delta, UpdatedAt = SYSDATETIME()
+WHEN NOT MATCHED THEN
+    INSERT (UserId, CounterKey, JobCount, UpdatedAt)
+    VALUES (s.UserId, s.CounterKey, s.Delta, SYSDATETIME());
+"""
+
+_REBUILD_LOCK_SQL = """
+DECLARE @res INT;
+EXEC @res = sp_getapplock
+    @Resource = ?,
+    @LockMode = 'Exclusive',
+    @LockOwner = 'Transaction',
+    @LockTimeout = ?;
+SELECT @res;
+"""
+
+# my = (non-final status rows on live jobs) + (live jobs I created without any status row)
+_REBUILD_SQL = """
+DELETE FROM dbo.UserJobCounters WHERE UserId = ?;
+
+INSERT INTO dbo.UserJobCounters (UserId, CounterKey, JobCount, UpdatedAt)
+SELECT ?, 'my', (
+    SELECT COUNT(*)
+    FROM dbo.UserJobStatus us
+    JOIN dbo.JobOfferings j ON j.Id = us.JobOfferingId AND j.IsDeleted = 0
+    WHERE us.UserId = ? AND us.IsFinal = 0
+) + (
+    SELECT COUNT(*)
+    FROM dbo.JobOfferings j
+    WHERE j.CreatedByUserId = ? AND j.IsDeleted = 0
+      AND NOT EXISTS (
+          SELECT 1 FROM dbo.UserJobStatus us
+          WHERE us.JobOfferingId = j.Id AND us.UserId = ?
+      )
+), SYSDATETIME()
+UNION ALL
+SELECT ?, 'open', (
+    SELECT COUNT(*)
+    FROM dbo.CompatibilityScores cs
+    JOIN dbo.JobOfferings j ON j.Id = cs.JobOfferingId AND j.IsDeleted = 0
+    LEFT JOIN dbo.UserJobStatus us ON us.JobOfferingId = cs.JobOfferingId AND us.UserId = cs.UserId
+    WHERE cs.UserId = ? AND cs.Score > ?
+      AND us.UserId IS NULL
+      AND (j.CreatedByUserId IS NULL OR j.CreatedByUserId <> ?)
+), SYSDATETIME()
+UNION ALL
+SELECT ?, CONCAT('status:', us.StatusKey), COUNT(*), SYSDATETIME()
+FROM dbo.UserJobStatus us
+JOIN dbo.JobOfferings j ON j.Id = us.JobOfferingId AND j.IsDeleted = 0
+WHERE us.UserId = ?
+GROUP BY us.StatusKey;
+"""
+
+
+def _pair_key(job_id, user_id) -> tuple[str, str]:
+    return normalize_guid(str(job_id)), normalize_guid(str(user_id))
+
+
+def _counter_keys(in_my, in_open, status_key) -> frozenset:
+    keys = set()
+    if in_my:
+        keys.add(COUNTER_MY)
+    if in_open:
+        keys.add(COUNTER_OPEN)
+    if status_key:
+        keys.add(STATUS_COUNTER_PREFIX + status_key)
+    return frozenset(keys)
+
+
+def capture_membership(cur, pairs: Iterable[tuple[str, str]]) -> dict:
+    """
+    (jobId, userId) -> frozenset of counter keys the pair currently contributes to.
+    Locks the pairs until the transaction ends; call it before the write it measures.
+    """
+    # Sorted so overlapping writers request their locks in the same order
+    unique = sorted(set(_pair_key(j, u) for j, u in pairs))
+    membership = {pair: frozenset() for pair in unique}
+    for start in range(0, len(unique), _PAIR_CHUNK):
+        chunk = unique[start:start + _PAIR_CHUNK]
+        values_sql = ",".join(["(CAST(? AS UNIQUEIDENTIFIER), CAST(? AS UNIQUEIDENTIFIER))"] * len(chunk))
+        params: list = [OPEN_MIN_COMPATIBILITY_SCORE]
+        for job_id, user_id in chunk:
+            params.extend([job_id, user_id])
+        cur.execute(_MEMBERSHIP_SQL.format(values=values_sql), params)
+        for job_id, user_id, in_my, in_open, status_key in cur.fetchall():
+            membership[_pair_key(job_id, user_id)] = _counter_keys(in_my, in_open, status_key)
+    return membership
+
+
+def rebuild_user_counters(cur, user_id: str) -> None:
+    """
+    Recount one user's counters from the base tables under the user's rebuild lock
+    (held until the caller commits or rolls back). Does not commit.
+    """
+    uid = normalize_guid(user_id)
+    cur.execute(_REBUILD_LOCK_SQL, (f"UserJobCounters:{uid}", _REBUILD_LOCK_TIMEOUT_MS))
+    lock_result = cur.fetchone()[0]
+    # sp_getapplock: 0/1 = granted, <0 = timeout/deadlock/error
+    if lock_result < 0:
+        raise RuntimeError(f"Could not lock counters rebuild for user {uid} (result={lock_result})")
+    cur.execute(_REBUILD_SQL, (
+        uid,
+        uid, uid, uid, uid,
+        uid, uid, OPEN_MIN_COMPATIBILITY_SCORE, uid,
+        uid, uid,
+    ))
+
+
+def _initialized_users(cur, user_ids: list[str]) -> set[str]:
+    placeholders = ",".join(["?"] * len(user_ids))
+    cur.execute(
+        f"SELECT UserId FROM dbo.UserJobCounters WHERE CounterKey = 'my' AND UserId IN ({placeholders})",
+        user_ids,
+    )
+    return {normalize_guid(str(row[0])) for row in cur.fetchall()}
+
+
+def apply_counter_deltas(cur, before: dict, pairs: Iterable[tuple[str, str]]) -> None:
+    """
+    Compare `before` (from capture_membership; missing pairs count as no membership)
+    with the membership now and add the difference to the counters. Does not commit.
+    """
+    after = capture_membership(cur, pairs)
+    deltas: Counter = Counter()
+    for pair, now_keys in after.items():
+        then_keys = before.get(pair, frozenset())
+        user_id = pair[1]
+        for key in now_keys - then_keys:
+            deltas[(user_id, key)] += 1
+        for key in then_keys - now_keys:
+            deltas[(user_id, key)] -= 1
+
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+
+    users = sorted({user_id for user_id, _ in deltas})
+    initialized = set()
+    for start in range(0, len(users), _PAIR_CHUNK):
+        initialized |= _initialized_users(cur, users[start:start + _PAIR_CHUNK])
+
+    for user_id in users:
+        if user_id not in initialized:
+            rebuild_user_counters(cur, user_id)
+
+    rows = [(u, k, d) for (u, k), d in deltas.items() if u in initialized]
+    for start in range(0, len(rows), _DELTA_CHUNK):
+        chunk = rows[start:start + _DELTA_CHUNK]
+        values_sql = ",".join(
+            ["(CAST(? AS UNIQUEIDENTIFIER), CAST(? AS VARCHAR(40)), CAST(? AS INT))"] * len(chunk)
+        )
+        params = [p for row in chunk for p in row]
+        cur.execute(_APPLY_DELTAS_SQL.format(values=values_sql), params)
+
+
+def pairs_for_job(cur, job_id: str) -> list[tuple[str, str]]:
+    """Every (job, user) pair whose membership a job-wide change (e.g. delete) can move."""
+    cur.execute(
+        """
+        SELECT CreatedByUserId FROM dbo.JobOfferings WHERE Id = ? AND CreatedByUserId IS NOT NULL
+        UNION
+        SELECT UserId FROM dbo.UserJobStatus WHERE JobOfferingId = ?
+        UNION
+        SELECT UserId FROM dbo.CompatibilityScores WHERE JobOfferingId = ?
+        """,
+        (job_id, job_id, job_id),
+    )
+    return [_pair_key(job_id, row[0]) for row in cur.fetchall()]
+
+
+def read_user_counters(cur, user_id: str) -> tuple[dict, bool]:
+    """
+    Return ({"my", "open", "statuses": {key: n}}, rebuilt). A never-counted user is
+    rebuilt first; the caller commits when `rebuilt` is True.
+    """
+    uid = normalize_guid(user_id)
+    rebuilt = False
+    for _ in range(2):
+        cur.execute("SELECT CounterKey, JobCount FROM dbo.UserJobCounters WHERE UserId = ?", uid)
+        rows = {key: int(count) for key, count in cur.fetchall()}
+        if COUNTER_MY in rows or rebuilt:
+            break
+        rebuild_user_counters(cur, uid)
+        rebuilt = True
+
+    statuses = {
+        key[len(STATUS_COUNTER_PREFIX):]: count
+        for key, count in rows.items()
+        if key.startswith(STATUS_COUNTER_PREFIX) and count > 0
+    }
+    return {
+        "my": rows.get(COUNTER_MY, 0),
+        "open": rows.get(COUNTER_OPEN, 0),
+        "statuses": statuses,
+    }, rebuilt
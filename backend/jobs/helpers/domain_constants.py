@@ -9,3 +9,13 @@ FINAL_STATUSES: tuple[str, ...] = (
     "Withdrew Applications",
     "Ignored",
 )
+
+# category='open' shows jobs scored strictly above this for the user
+OPEN_MIN_COMPATIBILITY_SCORE = 5.0
+
+_FINAL_STATUSES_LOWER = frozenset(s.lower() for s in FINAL_STATUSES)
+
+
+def is_final_status(status: str | None) -> bool:
+    """Case/spacing-insensitive FINAL_STATUSES check; persisted as UserJobStatus.IsFinal."""
+    return " ".join(str(status or "").split()).lower() in _FINAL_STATUSES_LOWER
@@ -0,0 +1,39 @@
+# helpers/etags.py
+# Strong ETags from rowversion columns (schema 33) and If-None-Match handling.
+import hashlib
+
+import azure.functions as func
+
+
+def rowversion_token(value) -> str:
+    """Hex form of a ROWVERSION value; NULL (no rows yet) becomes '0'."""
+    if value is None:
+        return "0"
+    return bytes(value).hex()
+
+
+def make_etag(*parts) -> str:
+    """Quoted strong ETag over the given parts (versions, user, canonical query)."""
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def if_none_match(req: func.HttpRequest, etag: str) -> bool:
+    """True when the request's If-None-Match names this ETag (or '*')."""
+    header = req.headers.get("If-None-Match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> func.HttpResponse:
+    return func.HttpResponse(status_code=304, headers={"ETag": etag})
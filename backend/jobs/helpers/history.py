@@ -3,18 +3,61 @@ import json
 import base64
 from datetime import datetime
 
+from helpers.status_normalize import status_key
+
 class DatetimeEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, datetime):
             return obj.isoformat()
         return super().default(obj)
 
-def insert_history(cursor, job_id: str, action: str, details_obj, actor_type: str, actor_id):
+def insert_history(cursor, job_id: str, action: str, details_obj, actor_type: str, actor_id,
+                   history_id: str = None):
     payload = {"v": 1, "kind": action, "data": details_obj or {}}
+    if history_id is None:
+        cursor.execute("""
+            INSERT INTO dbo.JobOfferingHistory (JobOfferingId, ActorType, ActorId, Action, Details, Timestamp)
+            VALUES (?, ?, ?, ?, ?, SYSDATETIME())
+        """, (job_id, actor_type, actor_id, action, json.dumps(payload, cls=DatetimeEncoder)))
+        return
+    cursor.execute("""
+        INSERT INTO dbo.JobOfferingHistory (Id, JobOfferingId, ActorType, ActorId, Action, Details, Timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, SYSDATETIME())
+    """, (history_id, job_id, actor_type, actor_id, action, json.dumps(payload, cls=DatetimeEncoder)))
+
+def insert_status_transition(cursor, history_id: str, job_id: str, user_id: str,
+                             from_status: str, to_status: str):
+    """
+    Mirror a 'status_changed' history row into dbo.UserStatusTransitions (schema 32).
+    Timestamp is copied from the history row so both stay identical.
+    """
     cursor.execute("""
-        INSERT INTO dbo.JobOfferingHistory (JobOfferingId, ActorType, ActorId, Action, Details, Timestamp)
-        VALUES (?, ?, ?, ?, ?, SYSDATETIME())
-    """, (job_id, actor_type, actor_id, action, json.dumps(payload, cls=DatetimeEncoder)))
+        INSERT INTO dbo.UserStatusTransitions (UserId, Timestamp, JobOfferingId, FromKey, ToKey, ToStatus, HistoryId)
+        SELECT ?, h.Timestamp, ?, ?, ?, ?, h.Id
+        FROM dbo.JobOfferingHistory h
+        WHERE h.Id = ?
+    """, (user_id, job_id, status_key(from_status), status_key(to_status), to_status, history_id))
+
+def insert_history_many(cursor, rows):
+    """
+    Bulk variant of insert_history in one fast_executemany round-trip.
+    rows: iterable of (job_id, action, details_obj, actor_type, actor_id).
+    """
+    params = [
+        (job_id, actor_type, actor_id, action,
+         json.dumps({"v": 1, "kind": action, "data": details_obj or {}}, cls=DatetimeEncoder))
+        for job_id, action, details_obj, actor_type, actor_id in rows
+    ]
+    if not params:
+        return
+    cursor.fast_executemany = True
+    try:
+        cursor.executemany("""
+            INSERT INTO dbo.JobOfferingHistory (JobOfferingId, ActorType, ActorId, Action, Details, Timestamp)
+            VALUES (?, ?, ?, ?, ?, SYSDATETIME())
+        """, params)
+    finally:
+        cursor.fast_executemany = False
 
 def make_history_cursor(ts: datetime, row_id: str) -> str:
     raw = f"{ts.isoformat()}|{row_id}"
@@ -0,0 +1,62 @@
+# helpers/list_cursor.py
+# Opaque keyset cursors for list endpoints (GET /jobs, NDJSON status-change reports).
+#
+# A cursor carries the sort name plus the sort-key values of the last row of a page
+# (the final value is always the row Id as tie-breaker). Datetime keys are carried as
+# ISO-8601 strings produced by SQL Server (CONVERT(..., 126)) so DATETIME2(7) precision
+# survives the round-trip and seeking never re-emits or skips a row.
+import base64
+import json
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def make_list_cursor(sort: str, keys: list) -> str:
+    raw = json.dumps({"s": sort, "k": list(keys)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def parse_list_cursor(cursor: str, expected_sort: str, expected_len: int) -> list:
+    """Decode a cursor and check it was issued for the same sort; raise InvalidCursorError otherwise."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception:
+        raise InvalidCursorError("Invalid cursor")
+
+    if not isinstance(data, dict) or data.get("s") != expected_sort:
+        raise InvalidCursorError("Cursor does not match 'sort'")
+
+    keys = data.get("k")
+    if not isinstance(keys, list) or len(keys) != expected_len:
+        raise InvalidCursorError("Invalid cursor")
+    return keys
+
+
+def keyset_seek_sql(columns: list[tuple[str, str, str]], values: list) -> tuple[str, list]:
+    """
+    Build the lexicographic "after this row" predicate for a multi-column ORDER BY.
+
+    columns: [(sql_expr, "ASC"|"DESC", placeholder_sql), ...] in ORDER BY order.
+             placeholder_sql is usually "?" or a typed wrapper such as
+             "CONVERT(datetime2, ?, 126)".
+    values:  cursor values aligned with columns.
+
+    Returns (sql, params), e.g. for (a DESC, id DESC):
+        ((a < ?) OR (a = ? AND id < ?))
+    """
+    if len(columns) != len(values):
+        raise ValueError("columns and values must have the same length")
+
+    ors: list[str] = []
+    params: list = []
+    for i, (expr, direction, placeholder) in enumerate(columns):
+        parts = [f"{prev_expr} = {prev_ph}" for prev_expr, _, prev_ph in columns[:i]]
+        op = "<" if direction.upper() == "DESC" else ">"
+        parts.append(f"{expr} {op} {placeholder}")
+        ors.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[: i + 1])
+
+    return "(" + " OR ".join(ors) + ")", params
@@ -0,0 +1,31 @@
+# helpers/locations.py
+# Denormalized location sort key on dbo.JobOfferings.
+#
+# PrimaryLocationKey is "<CountryName>|<CityName>" of the job's first location by
+# (CountryName, CityName), or '' when it has none. GET /jobs?sort=location_az orders
+# on the column (filtered index IX_JobOfferings_Live_PrimaryLocationKey) instead of a
+# correlated TOP 1 over JobOfferingLocations per row. Every location write must call
+# refresh_primary_location_key in the same transaction.
+
+
+def primary_location_key_sql(job_id_expr: str) -> str:
+    """T-SQL expression computing PrimaryLocationKey for the job whose Id is job_id_expr."""
+    return f"""COALESCE((
+        SELECT TOP 1 CONCAT(COALESCE(l.CountryName, N''), N'|', COALESCE(l.CityName, N''))
+        FROM dbo.JobOfferingLocations l
+        WHERE l.JobOfferingId = {job_id_expr}
+        ORDER BY l.CountryName, l.CityName
+    ), N'')"""
+
+
+def refresh_primary_location_key(cur, job_id: str) -> None:
+    """Recompute PrimaryLocationKey for one job. Does not commit."""
+    cur.execute(
+        f"""
+        UPDATE j
+        SET PrimaryLocationKey = {primary_location_key_sql("j.Id")}
+        FROM dbo.JobOfferings j
+        WHERE j.Id = ?
+        """,
+        job_id,
+    )
@@ -0,0 +1,37 @@
+# helpers/search.py
+# Full-text search support for GET /jobs.
+# Requires the full-text index from infrastucture/database/schema/26_job_offerings_fulltext.sql;
+# without it (or with the flag off) list search keeps using LIKE '%term%'.
+import os
+import re
+
+# search_field -> full-text column list passed to CONTAINSTABLE
+FULLTEXT_SEARCH_COLUMNS = {
+    "title_company": "(Title, HiringCompanyName, PostingCompanyName)",
+    "description": "(Description)",
+}
+
+MAX_FULLTEXT_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fulltext_search_enabled() -> bool:
+    return os.getenv("JOBS_FULLTEXT_SEARCH_ENABLED", "0").strip().lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+
+def build_fulltext_query(q: str) -> str | None:
+    """
+    Turn free user text into a CONTAINS search condition: every word must match as a prefix.
+        'Product Manager (Test)' -> '"Product*" AND "Manager*" AND "Test*"'
+    Returns None when the text has no word characters (caller falls back to LIKE).
+    """
+    terms = list(dict.fromkeys(_TERM_RE.findall(q or "")))[:MAX_FULLTEXT_TERMS]
+    if not terms:
+        return None
+    return " AND ".join(f'"{t}*"' for t in terms)
@@ -9,7 +9,11 @@ STATUS_OPTIONS = [
 ]
 
 def status_key(label: str) -> str:
-    """Map a human label (any case/spacing) to a compact key used for filtering."""
+    """
+    Map a human label (any case/spacing) to a compact key used for filtering.
+    Persisted as UserJobStatus.StatusKey on every status write; keep in sync with
+    status_key_case_sql (used by the schema 29 backfill).
+    """
     if not label:
         return "unset"
     s = str(label).strip().lower()
@@ -17,10 +21,10 @@ def status_key(label: str) -> str:
     if s == "applied": return "applied"
     if s == "screening booked":       return "booked-screen"
     if s == "hm interview booked":    return "booked-hm"
-    if s == "more interviews booked": return "booked-more"
+    if s in {"more interviews booked", "more interview booked"}: return "booked-more"
     if s == "screening done":         return "done-screen"
     if s == "hm interview done":      return "done-hm"
-    if s == "more interviews done":   return "done-more"
+    if s in {"more interviews done", "more interview done"}:     return "done-more"
     if s == "got offer":              return "offer"
     if s == "accepted offer":         return "accepted"
     if s in {
@@ -44,6 +48,7 @@ def status_key_case_sql(col_sql: str) -> str:
     base = f"LOWER(LTRIM(RTRIM({col_sql})))"
     return f"""
     CASE
+      WHEN {base} = 'unset' THEN 'unset'
       WHEN {base} = 'applied' THEN 'applied'
       WHEN {base} = 'screening booked' THEN 'booked-screen'
       WHEN {base} = 'hm interview booked' THEN 'booked-hm'
@@ -1,6 +1,9 @@
 # routes/__init__.py
 from .jobs_create import register as _reg_create
+from .jobs_create_batch import register as _reg_create_batch
 from .jobs_list import register as _reg_list
+from .jobs_facets import register as _reg_facets
+from .jobs_counts import register as _reg_counts
 from .jobs_get import register as _reg_get
 from .jobs_update import register as _reg_update
 from .jobs_delete import register as _reg_delete
@@ -18,7 +21,10 @@ from .job_compatibility_bulk import register as _reg_compatibility_bulk
 
 def register_all(app):
     _reg_create(app)
+    _reg_create_batch(app)
     _reg_list(app)
+    _reg_facets(app)
+    _reg_counts(app)
     _reg_list_with_statuses(app)
     _reg_get(app)
     _reg_update(app)
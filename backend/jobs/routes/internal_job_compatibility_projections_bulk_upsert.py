@@ -4,6 +4,7 @@ import logging
 
 import azure.functions as func
 
+from helpers.counters import apply_counter_deltas, capture_membership
 from helpers.db import get_connection
 from helpers.ids import normalize_guid, is_guid
 from helpers.datetime_utils import parse_required_iso_datetime_to_utc_naive
@@ -11,6 +12,47 @@ from helpers.datetime_utils import parse_required_iso_datetime_to_utc_naive
 
 MAX_ITEMS = 500
 
+# Session-scoped staging table, dropped before commit (the pool also drops a
+# session's #temp tables when the connection is returned).
+STAGE_CREATE_SQL = """
+IF OBJECT_ID('tempdb..#CompatibilityProjectionStage') IS NOT NULL
+    DROP TABLE #CompatibilityProjectionStage;
+
+CREATE TABLE #CompatibilityProjectionStage (
+    Ordinal INT NOT NULL PRIMARY KEY,
+    JobOfferingId UNIQUEIDENTIFIER NOT NULL,
+    UserId UNIQUEIDENTIFIER NOT NULL,
+    Score DECIMAL(4,1) NOT NULL,
+    Explanation NVARCHAR(MAX) NULL,
+    CalculatedAt DATETIME2 NOT NULL
+);
+"""
+
+STAGE_INSERT_SQL = """
+INSERT INTO #CompatibilityProjectionStage
+    (Ordinal, JobOfferingId, UserId, Score, Explanation, CalculatedAt)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Equal CalculatedAt is an idempotent overwrite; an older one is ignored as stale.
+MERGE_SQL = """
+MERGE dbo.CompatibilityScores WITH (HOLDLOCK) AS t
+USING #CompatibilityProjectionStage AS s
+    ON t.JobOfferingId = s.JobOfferingId
+   AND t.UserId = s.UserId
+WHEN MATCHED AND (t.CalculatedAt IS NULL OR t.CalculatedAt <= s.CalculatedAt) THEN
+    UPDATE SET
+        Score = s.Score,
+        Explanation = s.Explanation,
+        CalculatedAt = s.CalculatedAt
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (JobOfferingId, UserId, Score, Explanation, CalculatedAt)
+    VALUES (s.JobOfferingId, s.UserId, s.Score, s.Explanation, s.CalculatedAt)
+OUTPUT s.Ordinal, $action;
+"""
+
+STAGE_DROP_SQL = "DROP TABLE #CompatibilityProjectionStage;"
+
 def _validate_score(value):
     if not isinstance(value, (int, float)):
         raise ValueError("score must be a number")
@@ -138,83 +180,60 @@ def register(app: func.FunctionApp):
             conn = get_connection()
             cur = conn.cursor()
 
+            # Stage the whole batch in one round-trip, then apply it with a single MERGE.
+            cur.execute(STAGE_CREATE_SQL)
+            cur.fast_executemany = True
+            cur.executemany(
+                STAGE_INSERT_SQL,
+                [
+                    (
+                        ordinal,
+                        item["jobId"],
+                        item["userId"],
+                        item["score"],
+                        item["explanation"],
+                        item["calculatedAt"],
+                    )
+                    for ordinal, item in enumerate(effective_items)
+                ],
+            )
+            cur.fast_executemany = False
+
+            # A score crossing the 'open' threshold moves the user's open counter
+            counter_pairs = [(item["jobId"], item["userId"]) for item in effective_items]
+            counters_before = capture_membership(cur, counter_pairs)
+
+            # Pairs absent from OUTPUT matched an existing row with a newer CalculatedAt.
+            cur.execute(MERGE_SQL)
+            actions = {int(row[0]): row[1] for row in cur.fetchall()}
+            apply_counter_deltas(cur, counters_before, counter_pairs)
+            cur.execute(STAGE_DROP_SQL)
+
+            conn.commit()
+
             results = []
             upserted = 0
             ignored = 0
 
-            for item in effective_items:
-                job_id = item["jobId"]
-                user_id = item["userId"]
-                score = item["score"]
-                explanation = item["explanation"]
-                calculated_at = item["calculatedAt"]
-
-                # Read current row first, so we can ignore stale writes cleanly.
-                cur.execute(
-                    """
-                    SELECT Id, CalculatedAt
-                    FROM dbo.CompatibilityScores
-                    WHERE JobOfferingId = ? AND UserId = ?
-                    """,
-                    (job_id, user_id),
-                )
-                existing = cur.fetchone()
-
-                if existing:
-                    existing_id, existing_calculated_at = existing
-
-                    # Treat equal timestamp as idempotent overwrite.
-                    if existing_calculated_at is not None and existing_calculated_at > calculated_at:
-                        ignored += 1
-                        results.append(
-                            {
-                                "jobId": job_id,
-                                "userId": user_id,
-                                "status": "IgnoredStale",
-                            }
-                        )
-                        continue
-
-                    cur.execute(
-                        """
-                        UPDATE dbo.CompatibilityScores
-                        SET
-                            Score = ?,
-                            Explanation = ?,
-                            CalculatedAt = ?
-                        WHERE Id = ?
-                        """,
-                        (score, explanation, calculated_at, existing_id),
-                    )
-
+            for ordinal, item in enumerate(effective_items):
+                action = actions.get(ordinal)
+                if action == "INSERT":
+                    status = "Inserted"
                     upserted += 1
-                    results.append(
-                        {
-                            "jobId": job_id,
-                            "userId": user_id,
-                            "status": "Updated",
-                        }
-                    )
-                else:
-                    cur.execute(
-                        """
-                        INSERT INTO dbo.CompatibilityScores
-                            (JobOfferingId, UserId, Score, Explanation, CalculatedAt)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (job_id, user_id, score, explanation, calculated_at),
-                    )
-
+                elif action == "UPDATE":
+                    status = "Updated"
                     upserted += 1
-                    results.append(
-                        {
-                            "jobId": job_id,
-                            "userId": user_id,
-                            "status": "Inserted",
-                        }
-                    )
+                else:
+                    status = "IgnoredStale"
+                    ignored += 1
 
-            conn.commit()
+                results.append(
+                    {
+                        "jobId": item["jobId"],
+                        "userId": item["userId"],
+                        "status": status,
+                    }
+                )
 
             return func.HttpResponse(
                 json.dumps(
@@ -24,8 +24,17 @@ def _find_job_id(cur, provider: str, providerTenant: str, externalId: str):
     return normalize_guid(str(row[0])) if row else None
 
 
-def _identity_from_request(req: func.HttpRequest) -> tuple[dict | None, str | None]:
-    url = (req.params.get("url") or "").strip()
+def _identity_from_values(url, provider, provider_tenant, external_id) -> tuple[dict | None, str | None]:
+    for name, value in (
+        ("url", url),
+        ("provider", provider),
+        ("providerTenant", provider_tenant),
+        ("externalId", external_id),
+    ):
+        if value is not None and not isinstance(value, str):
+            return None, f"'{name}' must be a string"
+
+    url = (url or "").strip()
     if url:
         identity = deduce_from_url(url) or {}
         provider = (identity.get("provider") or "").strip()
@@ -41,9 +50,9 @@ def _identity_from_request(req: func.HttpRequest) -> tuple[dict | None, str | No
         identity["identitySource"] = "url"
         return identity, None
 
-    provider = (req.params.get("provider") or "").strip()
-    provider_tenant = (req.params.get("providerTenant") or "").strip()
-    external_id = (req.params.get("externalId") or "").strip()
+    provider = (provider or "").strip()
+    provider_tenant = (provider_tenant or "").strip()
+    external_id = (external_id or "").strip()
 
     if not provider or external_id == "":
         return None, "Missing required query params: url OR provider, providerTenant, externalId"
@@ -56,6 +65,64 @@ def _identity_from_request(req: func.HttpRequest) -> tuple[dict | None, str | No
     }, None
 
 
+def _identity_from_request(req: func.HttpRequest) -> tuple[dict | None, str | None]:
+    return _identity_from_values(
+        req.params.get("url"),
+        req.params.get("provider"),
+        req.params.get("providerTenant"),
+        req.params.get("externalId"),
+    )
+
+
+def _exists_payload(identity: dict, job_id) -> dict:
+    return {
+        "exists": bool(job_id),
+        "id": job_id,
+        "provider": identity["provider"],
+        "providerTenant": identity["providerTenant"],
+        "externalId": identity["externalId"],
+        "foundOn": identity.get("foundOn"),
+        "hiringCompanyName": identity.get("hiringCompanyName"),
+        "postingCompanyName": identity.get("postingCompanyName"),
+        "identitySource": identity.get("identitySource"),
+    }
+
+
+MAX_BATCH_ITEMS = 500
+
+
+def _find_job_ids(cur, identities: list[tuple[int, dict]]) -> dict[int, str]:
+    """
+    Resolve many identities in one statement: an inline VALUES table joined
+    against UX_JobOfferings_ProviderTenantExternalId (4 params per row, so
+    MAX_BATCH_ITEMS stays well under SQL Server's 2100-parameter limit).
+    """
+    if not identities:
+        return {}
+
+    values_sql = ",".join(
+        ["(CAST(? AS INT), CAST(? AS NVARCHAR(100)), CAST(? AS NVARCHAR(200)), CAST(? AS NVARCHAR(200)))"]
+        * len(identities)
+    )
+    params = []
+    for ordinal, identity in identities:
+        params.extend([ordinal, identity["provider"], identity["providerTenant"], identity["externalId"]])
+
+    cur.execute(
+        f"""
+        SELECT v.Ordinal, j.Id
+        FROM (VALUES {values_sql}) AS v (Ordinal, Provider, ProviderTenant, ExternalId)
+        JOIN dbo.JobOfferings j
+          ON j.Provider = v.Provider
+         AND j.ProviderTenant = v.ProviderTenant
+         AND j.ExternalId = v.ExternalId
+         AND j.IsDeleted = 0
+        """,
+        params,
+    )
+    return {int(row[0]): normalize_guid(str(row[1])) for row in cur.fetchall()}
+
+
 def register(app: func.FunctionApp):
     @app.route(route="jobs/exists", methods=["GET", "HEAD"])
     def job_exists(req: func.HttpRequest) -> func.HttpResponse:
@@ -79,17 +146,7 @@ def register(app: func.FunctionApp):
             if req.method == "HEAD":
                 return func.HttpResponse(status_code=200 if job_id else 404)
 
-            payload = {
-                "exists": bool(job_id),
-                "id": job_id,
-                "provider": provider,
-                "providerTenant": provider_tenant,
-                "externalId": external_id,
-                "foundOn": identity.get("foundOn"),
-                "hiringCompanyName": identity.get("hiringCompanyName"),
-                "postingCompanyName": identity.get("postingCompanyName"),
-                "identitySource": identity.get("identitySource"),
-            }
+            payload = _exists_payload(identity, job_id)
 
             headers = {}
             if job_id:
@@ -110,4 +167,64 @@ def register(app: func.FunctionApp):
                 if conn:
                     conn.close()
             except Exception:
-                pass
\ No newline at end of file
+                pass
+
+    @app.route(route="jobs/exists:batch", methods=["POST"])
+    def job_exists_batch(req: func.HttpRequest) -> func.HttpResponse:
+        logging.info("POST /jobs/exists:batch")
+
+        try:
+            body = req.get_json()
+        except ValueError:
+            return func.HttpResponse("Invalid JSON", status_code=400)
+
+        if not isinstance(body, dict) or not isinstance(body.get("items"), list):
+            return func.HttpResponse("Body must include 'items' array", status_code=400)
+
+        items = body["items"]
+        if len(items) > MAX_BATCH_ITEMS:
+            return func.HttpResponse(f"Too many items (max {MAX_BATCH_ITEMS})", status_code=400)
+
+        results = [None] * len(items)
+        resolvable = []
+        for idx, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[idx] = {"index": idx, "error": "Each item must be an object"}
+                continue
+            identity, error = _identity_from_values(
+                item.get("url"),
+                item.get("provider"),
+                item.get("providerTenant"),
+                item.get("externalId"),
+            )
+            if error:
+                results[idx] = {"index": idx, "error": error}
+                continue
+            resolvable.append((idx, identity))
+
+        conn = None
+        try:
+            job_ids = {}
+            if resolvable:
+                conn = get_connection()
+                cur = conn.cursor()
+                job_ids = _find_job_ids(cur, resolvable)
+
+            for idx, identity in resolvable:
+                results[idx] = {"index": idx, **_exists_payload(identity, job_ids.get(idx))}
+
+            return func.HttpResponse(
+                json.dumps({"results": results}),
+                mimetype="application/json",
+                status_code=200,
+            )
+
+        except Exception as e:
+            logging.exception("POST /jobs/exists:batch error")
+            return func.HttpResponse(f"Server error: {str(e)}", status_code=500)
+        finally:
+            try:
+                if conn:
+                    conn.close()
+            except Exception:
+                pass
@@ -7,7 +7,6 @@ import azure.functions as func
 from helpers.db import get_connection
 from helpers.history import DatetimeEncoder
 from helpers.ids import normalize_guid, is_guid
-from helpers.domain_constants import FINAL_STATUSES
 
 def register(app: func.FunctionApp):
 
@@ -69,15 +68,6 @@ def register(app: func.FunctionApp):
                     like = f"%{t}%"
                     search_params.extend([like, like, like, like])
 
-            # Exclude final statuses if any are defined
-            # Build NOT IN placeholders for final statuses (parameterized, deterministic order)
-            status_clause = ""
-            status_params: List[str] = []
-            if FINAL_STATUSES:
-                placeholders = ",".join(["?"] * len(FINAL_STATUSES))
-                status_clause = f" AND ujs.Status NOT IN ({placeholders})"
-                status_params = list(FINAL_STATUSES)
-
             conn = get_connection()
             cur = conn.cursor()
 
@@ -98,14 +88,14 @@ def register(app: func.FunctionApp):
                 INNER JOIN dbo.UserJobStatus ujs
                     ON ujs.JobOfferingId = jo.Id
                 WHERE   ujs.UserId = CONVERT(uniqueidentifier, ?)
+                    AND ujs.IsFinal = 0
                     AND jo.IsDeleted = 0
                     {search_clause}
-                    {status_clause}
                 ORDER BY jo.FirstSeenAt DESC
                 OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
             """
 
-            params: List = [user_id] + search_params + status_params + [offset, limit]
+            params: List = [user_id] + search_params + [offset, limit]
             logging.info("SQL (raw): %s", sql)
             logging.info("SQL params: %s", params)
 
@@ -5,9 +5,11 @@ import uuid
 from helpers.db import get_connection
 from helpers.auth import UnauthorizedError, get_current_user_id
 from helpers.ids import normalize_guid, is_guid
-from helpers.history import insert_history
+from helpers.history import insert_history, insert_status_transition
+from helpers.counters import apply_counter_deltas, capture_membership
 from helpers.analytics import emit_jobs_event
-from helpers.domain_constants import FINAL_STATUSES
+from helpers.domain_constants import is_final_status
+from helpers.status_normalize import status_key
 
 
 def upsert_user_status(cur, job_id: str, user_id: str, status: str) -> None:
@@ -21,6 +23,8 @@ def upsert_user_status(cur, job_id: str, user_id: str, status: str) -> None:
     if cur.fetchone() is None:
         raise ValueError("Job not found")
 
+    # Locks the (job, user) status row first so concurrent PUTs see each other's result
+    counters_before = capture_membership(cur, [(job_id, user_id)])
     cur.execute("""
         SELECT Status FROM dbo.UserJobStatus
         WHERE JobOfferingId = ? AND UserId = ?
@@ -28,20 +32,26 @@ def upsert_user_status(cur, job_id: str, user_id: str, status: str) -> None:
     row = cur.fetchone()
     prev_status = row[0] if row else "Unset"
 
+    # StatusKey/IsFinal are persisted so list filters can seek instead of normalizing Status per row
+    key = status_key(status)
+    is_final = 1 if is_final_status(status) else 0
     cur.execute("""
         MERGE dbo.UserJobStatus AS target
         USING (SELECT ? AS JobOfferingId, ? AS UserId) AS src
         ON target.JobOfferingId = src.JobOfferingId AND target.UserId = src.UserId
         WHEN MATCHED THEN
-          UPDATE SET Status = ?, LastUpdated = SYSDATETIME()
+          UPDATE SET Status = ?, StatusKey = ?, IsFinal = ?, LastUpdated = SYSDATETIME()
         WHEN NOT MATCHED THEN
-          INSERT (JobOfferingId, UserId, Status, LastUpdated)
-          VALUES (src.JobOfferingId, src.UserId, ?, SYSDATETIME());
-    """, (job_id, user_id, status, status))
+          INSERT (JobOfferingId, UserId, Status, StatusKey, IsFinal, LastUpdated)
+          VALUES (src.JobOfferingId, src.UserId, ?, ?, ?, SYSDATETIME());
+    """, (job_id, user_id, status, key, is_final, status, key, is_final))
+    apply_counter_deltas(cur, counters_before, [(job_id, user_id)])
 
+    history_id = str(uuid.uuid4())
     insert_history(cur, job_id, "status_changed",
                    {"userId": user_id, "from": prev_status, "to": status},
-                   "user", user_id)
+                   "user", user_id, history_id=history_id)
+    insert_status_transition(cur, history_id, job_id, user_id, prev_status, status)
 
 def register(app: func.FunctionApp):
 
@@ -86,7 +96,7 @@ def register(app: func.FunctionApp):
                 properties={
                     "job_id": job_id,
                     "new_status": status,
-                    "is_final_status": status in FINAL_STATUSES,
+                    "is_final_status": is_final_status(status),
                 },
             )
 
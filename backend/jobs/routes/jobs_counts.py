@@ -0,0 +1,47 @@
+# routes/jobs_counts.py
+import json
+import logging
+import azure.functions as func
+
+from helpers.auth import UnauthorizedError, get_current_user_id
+from helpers.counters import read_user_counters
+from helpers.db import get_connection
+
+
+def register(app: func.FunctionApp):
+
+    @app.route(route="jobs/counts", methods=["GET"])
+    def get_job_counts(req: func.HttpRequest) -> func.HttpResponse:
+        """
+        Per-user list counters from dbo.UserJobCounters (no COUNT over the list joins):
+          { "userId", "my", "open", "statuses": { "<statusKey>": n, ... } }
+        `my`/`open` equal the unfiltered totals of GET /jobs?category=my|open.
+        """
+        logging.info("GET /jobs/counts")
+        conn = None
+        try:
+            user_id = get_current_user_id(req)
+
+            conn = get_connection()
+            cur = conn.cursor()
+
+            counts, rebuilt = read_user_counters(cur, user_id)
+            if rebuilt:
+                conn.commit()
+
+            return func.HttpResponse(
+                json.dumps({"userId": user_id, **counts}),
+                mimetype="application/json",
+                status_code=200,
+            )
+
+        except UnauthorizedError as ue:
+            return func.HttpResponse(str(ue), status_code=401)
+        except Exception as e:
+            logging.exception("GET /jobs/counts error")
+            try:
+                if conn:
+                    conn.rollback()
+            except Exception:
+                pass
+            return func.HttpResponse(f"Error: {str(e)}", status_code=500)
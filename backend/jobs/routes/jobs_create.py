@@ -7,6 +7,8 @@ from helpers.db import get_connection
 from helpers.auth import detect_actor
 from helpers.ids import normalize_guid
 from helpers.history import insert_history
+from helpers.counters import apply_counter_deltas
+from helpers.locations import refresh_primary_location_key
 from helpers.validation import validate_job_payload
 from helpers.url_helpers import deduce_from_url
 from helpers.analytics import emit_jobs_event, correlation_id_from_request
@@ -174,10 +176,12 @@ def _insert_locations_idempotently(cur, job_id: str, locations: list[dict]) -> N
 
 
 
-def create_job_record(req: func.HttpRequest, cur, data: dict, analytics_meta: dict | None = None) -> str:
+def resolve_job_create_fields(data: dict) -> dict:
     """
-    Core create logic extracted so it can be reused (e.g., by /jobs/apply-by-url).
-    Accepts an open cursor and DOES NOT commit. Returns normalized job_id (str, canonical GUID).
+    Validate a create payload and resolve canonical identity and defaults
+    (URL heuristics for provider/tenant/externalId/company). Raises ValueError.
+    Shared by single and batch create; identity completeness is checked
+    separately by require_job_identity.
     """
     is_valid, error = validate_job_payload(data)
     if not is_valid:
@@ -185,26 +189,53 @@ def create_job_record(req: func.HttpRequest, cur, data: dict, analytics_meta: di
 
     url = data.get("url")
     heur = deduce_from_url(url) if url else {}
-    foundOn = data.get("foundOn") or heur.get("foundOn") or "corporate-site"
-    provider = data.get("provider") or heur.get("provider") or "corporate-site"
-    providerTenant = data.get("providerTenant") or heur.get("providerTenant") or ""
-    externalId = data.get("externalId") or heur.get("externalId")
-    hiringCompanyName = data.get("hiringCompanyName") or heur.get("hiringCompanyName")
-    postingCompanyName = data.get("postingCompanyName")
-    title = data.get("title")
-    remoteType = data.get("remoteType") or "Unknown"
-    description = data.get("description")
-    applyUrl = data.get("applyUrl")
-    locations = data.get("locations") or []
+    return {
+        "foundOn": data.get("foundOn") or heur.get("foundOn") or "corporate-site",
+        "provider": data.get("provider") or heur.get("provider") or "corporate-site",
+        "providerTenant": data.get("providerTenant") or heur.get("providerTenant") or "",
+        "externalId": data.get("externalId") or heur.get("externalId"),
+        "url": url,
+        "applyUrl": data.get("applyUrl"),
+        "hiringCompanyName": data.get("hiringCompanyName") or heur.get("hiringCompanyName"),
+        "postingCompanyName": data.get("postingCompanyName"),
+        "title": data.get("title"),
+        "remoteType": data.get("remoteType") or "Unknown",
+        "description": data.get("description"),
+        "locations": data.get("locations") or [],
+    }
+
+
+def require_job_identity(fields: dict) -> None:
+    if not fields["externalId"]:
+        raise ValueError("Could not deduce externalId from url; please provide externalId")
+    if not fields["hiringCompanyName"]:
+        raise ValueError("Could not deduce hiringCompanyName from url; please provide hiringCompanyName")
+
+
+def create_job_record(req: func.HttpRequest, cur, data: dict, analytics_meta: dict | None = None) -> str:
+    """
+    Core create logic extracted so it can be reused (e.g., by /jobs/apply-by-url).
+    Accepts an open cursor and DOES NOT commit. Returns normalized job_id (str, canonical GUID).
+    """
+    fields = resolve_job_create_fields(data)
+    foundOn = fields["foundOn"]
+    provider = fields["provider"]
+    providerTenant = fields["providerTenant"]
+    externalId = fields["externalId"]
+    url = fields["url"]
+    applyUrl = fields["applyUrl"]
+    hiringCompanyName = fields["hiringCompanyName"]
+    postingCompanyName = fields["postingCompanyName"]
+    title = fields["title"]
+    remoteType = fields["remoteType"]
+    description = fields["description"]
+    locations = fields["locations"]
     if analytics_meta is not None:
         analytics_meta["provider"] = provider
         analytics_meta["providerTenant"] = providerTenant
         analytics_meta["foundOn"] = foundOn
 
-    if not externalId:
-        raise ValueError("Could not deduce externalId from url; please provide externalId")
-    if not hiringCompanyName:
-        raise ValueError("Could not deduce hiringCompanyName from url; please provide hiringCompanyName")
+    require_job_identity(fields)
 
     actor_type, actor_id = detect_actor(req)
 
@@ -231,7 +262,10 @@ def create_job_record(req: func.HttpRequest, cur, data: dict, analytics_meta: di
         ))
         job_id = str(cur.fetchone()[0])
         if analytics_meta is not None:
-            analytics_meta["dedupe_result"] = "created"        
+            analytics_meta["dedupe_result"] = "created"
+        if actor_type == "user":
+            # A new row had no membership before; the creator's 'my' counter moves
+            apply_counter_deltas(cur, {}, [(job_id, actor_id)])
     except pyodbc.IntegrityError as exc:
         if not _is_job_identity_duplicate(exc):
             raise
@@ -260,6 +294,7 @@ def create_job_record(req: func.HttpRequest, cur, data: dict, analytics_meta: di
 
     if locations:
         _insert_locations_idempotently(cur, job_id, locations)
+        refresh_primary_location_key(cur, job_id)
 
     insert_history(cur, job_id, "job_created", {"jobId": job_id}, actor_type, actor_id)
     return normalize_guid(str(job_id))
@@ -0,0 +1,294 @@
+# routes/jobs_create_batch.py
+import json
+import logging
+
+import azure.functions as func
+
+from helpers.auth import detect_actor
+from helpers.db import get_connection
+from helpers.counters import apply_counter_deltas
+from helpers.history import insert_history_many
+from helpers.ids import normalize_guid
+from helpers.locations import primary_location_key_sql
+from routes.jobs_create import (
+    _normalize_unique_locations,
+    require_job_identity,
+    resolve_job_create_fields,
+)
+
+
+MAX_BATCH_JOBS = 500
+
+# Session-scoped staging tables, dropped before commit (the pool also drops a
+# session's #temp tables when the connection is returned). String columns use
+# DATABASE_DEFAULT so joins against dbo tables don't hit tempdb collation conflicts.
+STAGE_CREATE_SQL = """
+IF OBJECT_ID('tempdb..#JobCreateStage') IS NOT NULL
+    DROP TABLE #JobCreateStage;
+IF OBJECT_ID('tempdb..#JobLocationStage') IS NOT NULL
+    DROP TABLE #JobLocationStage;
+
+CREATE TABLE #JobCreateStage (
+    Ordinal INT NOT NULL PRIMARY KEY,
+    FoundOn NVARCHAR(100) COLLATE DATABASE_DEFAULT NOT NULL,
+    Provider NVARCHAR(100) COLLATE DATABASE_DEFAULT NOT NULL,
+    ProviderTenant NVARCHAR(200) COLLATE DATABASE_DEFAULT NOT NULL,
+    ExternalId NVARCHAR(200) COLLATE DATABASE_DEFAULT NOT NULL,
+    Url NVARCHAR(1000) COLLATE DATABASE_DEFAULT NOT NULL,
+    ApplyUrl NVARCHAR(1000) COLLATE DATABASE_DEFAULT NULL,
+    HiringCompanyName NVARCHAR(300) COLLATE DATABASE_DEFAULT NOT NULL,
+    PostingCompanyName NVARCHAR(300) COLLATE DATABASE_DEFAULT NULL,
+    Title NVARCHAR(300) COLLATE DATABASE_DEFAULT NULL,
+    RemoteType NVARCHAR(50) COLLATE DATABASE_DEFAULT NOT NULL,
+    Description NVARCHAR(MAX) COLLATE DATABASE_DEFAULT NULL
+);
+
+CREATE TABLE #JobLocationStage (
+    Ordinal INT NOT NULL,
+    CountryName NVARCHAR(100) COLLATE DATABASE_DEFAULT NOT NULL,
+    CountryCode CHAR(2) COLLATE DATABASE_DEFAULT NULL,
+    CityName NVARCHAR(300) COLLATE DATABASE_DEFAULT NULL,
+    Region NVARCHAR(100) COLLATE DATABASE_DEFAULT NULL
+);
+"""
+
+STAGE_JOBS_INSERT_SQL = """
+INSERT INTO #JobCreateStage (
+    Ordinal, FoundOn, Provider, ProviderTenant, ExternalId,
+    Url, ApplyUrl, HiringCompanyName, PostingCompanyName,
+    Title, RemoteType, Description
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+STAGE_LOCATIONS_INSERT_SQL = """
+INSERT INTO #JobLocationStage (Ordinal, CountryName, CountryCode, CityName, Region)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+# Identities already present stay unmatched-by-insert; HOLDLOCK keeps a concurrent
+# create of the same identity from slipping in between the match and the insert.
+MERGE_JOBS_SQL = """
+MERGE dbo.JobOfferings WITH (HOLDLOCK) AS t
+USING #JobCreateStage AS s
+    ON t.Provider = s.Provider
+   AND t.ProviderTenant = s.ProviderTenant
+   AND t.ExternalId = s.ExternalId
+   AND t.IsDeleted = 0
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (
+        FoundOn, Provider, ProviderTenant, ExternalId,
+        Url, ApplyUrl,
+        HiringCompanyName, PostingCompanyName,
+        Title, RemoteType, Description,
+        CreatedByUserId, CreatedByAgent,
+        FirstSeenAt, CreatedAt
+    )
+    VALUES (
+        s.FoundOn, s.Provider, s.ProviderTenant, s.ExternalId,
+        s.Url, s.ApplyUrl,
+        s.HiringCompanyName, s.PostingCompanyName,
+        s.Title, s.RemoteType, s.Description,
+        ?, ?,
+        SYSDATETIME(), SYSDATETIME()
+    )
+OUTPUT s.Ordinal;
+"""
+
+RESOLVE_IDS_SQL = """
+SELECT s.Ordinal, j.Id
+FROM #JobCreateStage s
+JOIN dbo.JobOfferings j
+  ON j.Provider = s.Provider
+ AND j.ProviderTenant = s.ProviderTenant
+ AND j.ExternalId = s.ExternalId
+ AND j.IsDeleted = 0;
+"""
+
+# Same append-only semantics as _insert_locations_idempotently, for the whole batch.
+INSERT_LOCATIONS_SQL = """
+INSERT INTO dbo.JobOfferingLocations (JobOfferingId, CountryName, CountryCode, CityName, Region)
+SELECT j.Id, ls.CountryName, ls.CountryCode, ls.CityName, ls.Region
+FROM #JobLocationStage ls
+JOIN #JobCreateStage s
+  ON s.Ordinal = ls.Ordinal
+JOIN dbo.JobOfferings j
+  ON j.Provider = s.Provider
+ AND j.ProviderTenant = s.ProviderTenant
+ AND j.ExternalId = s.ExternalId
+ AND j.IsDeleted = 0
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM dbo.JobOfferingLocations l WITH (UPDLOCK, HOLDLOCK)
+    WHERE l.JobOfferingId = j.Id
+      AND l.CountryName = ls.CountryName
+      AND (l.CityName = ls.CityName OR (l.CityName IS NULL AND ls.CityName IS NULL))
+);
+"""
+
+# Batch counterpart of refresh_primary_location_key: only jobs that received locations
+REFRESH_LOCATION_KEYS_SQL = f"""
+UPDATE j
+SET PrimaryLocationKey = {primary_location_key_sql("j.Id")}
+FROM dbo.JobOfferings j
+JOIN #JobCreateStage s
+  ON j.Provider = s.Provider
+ AND j.ProviderTenant = s.ProviderTenant
+ AND j.ExternalId = s.ExternalId
+ AND j.IsDeleted = 0
+WHERE EXISTS (SELECT 1 FROM #JobLocationStage ls WHERE ls.Ordinal = s.Ordinal);
+"""
+
+STAGE_DROP_SQL = "DROP TABLE #JobLocationStage; DROP TABLE #JobCreateStage;"
+
+
+def _identity_key(fields: dict) -> tuple:
+    return (
+        fields["provider"].casefold(),
+        fields["providerTenant"].casefold(),
+        fields["externalId"].casefold(),
+    )
+
+
+def _location_key(loc: tuple) -> tuple:
+    country_name, _country_code, city_name, _region = loc
+    return (country_name.casefold(), city_name.casefold() if city_name is not None else None)
+
+
+def register(app: func.FunctionApp):
+
+    @app.route(route="jobs:batch", methods=["POST"])
+    def create_jobs_batch(req: func.HttpRequest) -> func.HttpResponse:
+        logging.info("POST /jobs:batch")
+        conn = None
+
+        try:
+            try:
+                body = req.get_json()
+            except ValueError:
+                return func.HttpResponse("Invalid JSON", status_code=400)
+
+            if not isinstance(body, dict) or not isinstance(body.get("jobs"), list):
+                return func.HttpResponse("Body must include 'jobs' array", status_code=400)
+
+            jobs = body["jobs"]
+            if len(jobs) > MAX_BATCH_JOBS:
+                return func.HttpResponse(f"Too many jobs (max {MAX_BATCH_JOBS})", status_code=400)
+
+            actor_type, actor_id = detect_actor(req)
+
+            results = [None] * len(jobs)
+            staged = []          # one entry per distinct identity: (fields, [payload indexes])
+            staged_by_key = {}
+            staged_locations = []
+
+            for idx, data in enumerate(jobs):
+                try:
+                    if not isinstance(data, dict):
+                        raise ValueError("Each job must be an object")
+                    fields = resolve_job_create_fields(data)
+                    require_job_identity(fields)
+                except ValueError as ve:
+                    results[idx] = {"index": idx, "status": "invalid", "id": None, "error": str(ve)}
+                    continue
+
+                key = _identity_key(fields)
+                ordinal = staged_by_key.get(key)
+                if ordinal is None:
+                    ordinal = len(staged)
+                    staged_by_key[key] = ordinal
+                    staged.append((fields, [idx]))
+                else:
+                    # Repeated identity within the request: one row, locations merged.
+                    staged[ordinal][1].append(idx)
+                staged_locations.append((ordinal, fields["locations"]))
+
+            created_ordinals = set()
+            ids_by_ordinal = {}
+
+            if staged:
+                location_rows = []
+                seen_locations = set()
+                for ordinal, locations in staged_locations:
+                    for loc in _normalize_unique_locations(locations):
+                        loc_key = (ordinal, _location_key(loc))
+                        if loc_key in seen_locations:
+                            continue
+                        seen_locations.add(loc_key)
+                        location_rows.append((ordinal, *loc))
+
+                conn = get_connection()
+                cur = conn.cursor()
+
+                cur.execute(STAGE_CREATE_SQL)
+                cur.fast_executemany = True
+                cur.executemany(
+                    STAGE_JOBS_INSERT_SQL,
+                    [
+                        (
+                            ordinal,
+                            f["foundOn"], f["provider"], f["providerTenant"], f["externalId"],
+                            f["url"], f["applyUrl"], f["hiringCompanyName"], f["postingCompanyName"],
+                            f["title"], f["remoteType"], f["description"],
+                        )
+                        for ordinal, (f, _indexes) in enumerate(staged)
+                    ],
+                )
+                if location_rows:
+                    cur.executemany(STAGE_LOCATIONS_INSERT_SQL, location_rows)
+                cur.fast_executemany = False
+
+                cur.execute(
+                    MERGE_JOBS_SQL,
+                    actor_id if actor_type == "user" else None,
+                    actor_type if actor_type == "system" else None,
+                )
+                created_ordinals = {int(row[0]) for row in cur.fetchall()}
+
+                cur.execute(RESOLVE_IDS_SQL)
+                ids_by_ordinal = {int(row[0]): normalize_guid(str(row[1])) for row in cur.fetchall()}
+
+                if location_rows:
+                    cur.execute(INSERT_LOCATIONS_SQL)
+                    cur.execute(REFRESH_LOCATION_KEYS_SQL)
+
+                if actor_type == "user" and created_ordinals:
+                    apply_counter_deltas(cur, {}, [(ids_by_ordinal[o], actor_id) for o in created_ordinals])
+
+                # History only for rows this request actually created.
+                insert_history_many(
+                    cur,
+                    [
+                        (ids_by_ordinal[o], "job_created", {"jobId": ids_by_ordinal[o]}, actor_type, actor_id)
+                        for o in sorted(created_ordinals)
+                    ],
+                )
+
+                cur.execute(STAGE_DROP_SQL)
+                conn.commit()
+
+            counts = {"created": 0, "existing": 0, "invalid": 0}
+            for ordinal, (_fields, indexes) in enumerate(staged):
+                job_id = ids_by_ordinal.get(ordinal)
+                for position, idx in enumerate(indexes):
+                    # Only the first occurrence of an identity is reported as created.
+                    status = "created" if ordinal in created_ordinals and position == 0 else "existing"
+                    results[idx] = {"index": idx, "status": status, "id": job_id, "error": None}
+
+            for item in results:
+                counts[item["status"]] += 1
+
+            return func.HttpResponse(
+                json.dumps({**counts, "results": results}),
+                mimetype="application/json",
+                status_code=200,
+            )
+
+        except Exception as e:
+            logging.exception("POST /jobs:batch error")
+            try:
+                if conn:
+                    conn.rollback()
+            except Exception:
+                pass
+            return func.HttpResponse(f"Server error: {str(e)}", status_code=500)
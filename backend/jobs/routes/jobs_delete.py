@@ -3,6 +3,7 @@ import azure.functions as func
 from helpers.db import get_connection
 from helpers.auth import detect_actor
 from helpers.history import insert_history
+from helpers.counters import apply_counter_deltas, capture_membership, pairs_for_job
 from helpers.analytics import emit_jobs_event
 
 def register(app: func.FunctionApp):
@@ -17,6 +18,9 @@ def register(app: func.FunctionApp):
             cur = conn.cursor()
             actor_type, actor_id = detect_actor(req)
 
+            counter_pairs = pairs_for_job(cur, job_id)
+            counters_before = capture_membership(cur, counter_pairs)
+
             cur.execute("UPDATE dbo.JobOfferings SET IsDeleted = 1, UpdatedAt = SYSDATETIME() WHERE Id = ?", job_id)
             if cur.rowcount == 0:
                 conn.rollback()
@@ -26,6 +30,7 @@ def register(app: func.FunctionApp):
                 logging.error("DELETE /jobs affected >1 row")
                 return func.HttpResponse("Error: multiple jobs affected", status_code=500)
 
+            apply_counter_deltas(cur, counters_before, counter_pairs)
             insert_history(cur, job_id, "job_deleted", {"softDelete": True}, actor_type, actor_id)
             conn.commit()
 
@@ -0,0 +1,139 @@
+# routes/jobs_facets.py
+import json
+import logging
+import azure.functions as func
+
+from helpers.db import get_connection
+from routes.jobs_list import REMOTE_MAP, _parse_multi
+
+
+DEFAULT_CITY_LIMIT = 50
+MAX_CITY_LIMIT = 500
+
+
+def _location_filters(modes: list[str], countries: list[str], cities: list[str], skip: str) -> tuple[str, list]:
+    """
+    WHERE clause over dbo.JobLocationFacets for every dimension except `skip`,
+    so a facet still lists the alternatives to its own selected values.
+    """
+    where: list[str] = []
+    params: list = []
+
+    if modes and skip != "mode":
+        where.append(f"RemoteType IN ({','.join(['?'] * len(modes))})")
+        params += modes
+
+    if countries and skip != "country":
+        ccodes = [c for c in countries if len(c) == 2]
+        cnames = [c for c in countries if len(c) != 2]
+        parts = []
+        if ccodes:
+            parts.append(f"CountryCode IN ({','.join(['?'] * len(ccodes))})")
+        if cnames:
+            parts.append(f"CountryName IN ({','.join(['?'] * len(cnames))})")
+        where.append("(" + " OR ".join(parts) + ")")
+        params += ccodes + cnames
+
+    if cities and skip != "city":
+        where.append(f"CityName IN ({','.join(['?'] * len(cities))})")
+        params += cities
+
+    return ("WHERE " + " AND ".join(where)) if where else "", params
+
+
+def register(app: func.FunctionApp):
+
+    @app.route(route="jobs/facets", methods=["GET"])
+    def list_job_facets(req: func.HttpRequest) -> func.HttpResponse:
+        """
+        Query params (same spelling as GET /jobs, multi via repeated keys or commas):
+          - mode     (optional): remote/onsite/hybrid/...
+          - country  (optional): ISO-2 code or country name
+          - city     (optional)
+          - cityLimit (optional): max cities returned, default 50, max 500
+
+        Counts come from the indexed views in schema 30, never from JobOfferingLocations.
+        Country and city counts are live job locations (a job listed in two cities of one
+        country counts twice for that country); remote type counts are live jobs unless a
+        location filter is given.
+        """
+        logging.info("GET /jobs/facets")
+        conn = None
+        try:
+            modes = [REMOTE_MAP.get(m.lower(), m).title() for m in _parse_multi(req, "mode")]
+            countries = [c.strip() for c in _parse_multi(req, "country")]
+            cities = _parse_multi(req, "city")
+
+            try:
+                city_limit = int(req.params.get("cityLimit", DEFAULT_CITY_LIMIT))
+            except ValueError:
+                return func.HttpResponse("Invalid 'cityLimit'", status_code=400)
+            if city_limit < 1 or city_limit > MAX_CITY_LIMIT:
+                return func.HttpResponse(f"'cityLimit' must be between 1 and {MAX_CITY_LIMIT}", status_code=400)
+
+            conn = get_connection()
+            cur = conn.cursor()
+
+            where_sql, params = _location_filters(modes, countries, cities, skip="country")
+            cur.execute(f"""
+                SELECT CountryName, MAX(CountryCode) AS CountryCode, SUM(JobCount) AS JobCount
+                FROM dbo.JobLocationFacets WITH (NOEXPAND)
+                {where_sql}
+                GROUP BY CountryName
+                ORDER BY SUM(JobCount) DESC, CountryName
+            """, params)
+            country_facets = [
+                {"countryName": cn, "countryCode": cc, "count": int(n)}
+                for (cn, cc, n) in cur.fetchall()
+            ]
+
+            where_sql, params = _location_filters(modes, countries, cities, skip="city")
+            city_where = f"{where_sql} AND CityName IS NOT NULL" if where_sql else "WHERE CityName IS NOT NULL"
+            cur.execute(f"""
+                SELECT TOP (?) CountryName, CityName, SUM(JobCount) AS JobCount
+                FROM dbo.JobLocationFacets WITH (NOEXPAND)
+                {city_where}
+                GROUP BY CountryName, CityName
+                ORDER BY SUM(JobCount) DESC, CountryName, CityName
+            """, [city_limit] + params)
+            city_facets = [
+                {"countryName": cn, "cityName": city, "count": int(n)}
+                for (cn, city, n) in cur.fetchall()
+            ]
+
+            if countries or cities:
+                where_sql, params = _location_filters(modes, countries, cities, skip="mode")
+                cur.execute(f"""
+                    SELECT RemoteType, SUM(JobCount) AS JobCount
+                    FROM dbo.JobLocationFacets WITH (NOEXPAND)
+                    {where_sql}
+                    GROUP BY RemoteType
+                    ORDER BY SUM(JobCount) DESC, RemoteType
+                """, params)
+            else:
+                cur.execute("""
+                    SELECT RemoteType, JobCount
+                    FROM dbo.JobRemoteTypeFacets WITH (NOEXPAND)
+                    ORDER BY JobCount DESC, RemoteType
+                """)
+            remote_facets = [
+                {"remoteType": rt, "count": int(n)}
+                for (rt, n) in cur.fetchall()
+            ]
+
+            payload = {
+                "countries": country_facets,
+                "cities": city_facets,
+                "remoteTypes": remote_facets,
+            }
+            return func.HttpResponse(json.dumps(payload), mimetype="application/json")
+
+        except Exception as e:
+            logging.exception("GET /jobs/facets error")
+            return func.HttpResponse(f"Error: {str(e)}", status_code=500)
+        finally:
+            try:
+                if conn:
+                    conn.close()
+            except Exception:
+                pass
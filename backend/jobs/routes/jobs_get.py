@@ -2,6 +2,7 @@ import json
 import logging
 import azure.functions as func
 from helpers.db import get_connection
+from helpers.etags import if_none_match, make_etag, not_modified, rowversion_token
 from helpers.history import DatetimeEncoder
 from helpers.ids import normalize_guid, normalize_guid_in_dict
 
@@ -15,12 +16,24 @@ def register(app: func.FunctionApp):
             conn = get_connection()
             cur = conn.cursor()
 
+            # Revalidation checks only the version column (locations writes bump it too)
+            if req.headers.get("If-None-Match"):
+                cur.execute("SELECT RowVer FROM dbo.JobOfferings WHERE Id = ?", job_id)
+                row = cur.fetchone()
+                if not row:
+                    return func.HttpResponse("Not found", status_code=404)
+                etag = make_etag("job", job_id.lower(), rowversion_token(row[0]))
+                if if_none_match(req, etag):
+                    return not_modified(etag)
+
             cur.execute("SELECT * FROM dbo.JobOfferings WHERE Id = ?", job_id)
             row = cur.fetchone()
             if not row:
                 return func.HttpResponse("Not found", status_code=404)
             cols = [c[0] for c in cur.description]
             job = dict(zip(cols, row))
+            etag = make_etag("job", job_id.lower(), rowversion_token(job.pop("RowVer", None)))
+            job.pop("PrimaryLocationKey", None)  # internal list-filter column, not part of the payload
             normalize_guid_in_dict(job, ["Id", "CreatedByUserId"])  # CreatedByUserId may be NULL; handled safely
 
             cur.execute("""
@@ -34,7 +47,11 @@ def register(app: func.FunctionApp):
                 for r in cur.fetchall()
             ]
 
-            return func.HttpResponse(json.dumps(job, cls=DatetimeEncoder), mimetype="application/json")
+            return func.HttpResponse(
+                json.dumps(job, cls=DatetimeEncoder),
+                mimetype="application/json",
+                headers={"ETag": etag},
+            )
         except Exception as e:
             logging.exception("GET /jobs/{id} error")
             return func.HttpResponse(f"Error: {str(e)}", status_code=500)
@@ -1,13 +1,18 @@
 import json
 import logging
+import re
 import azure.functions as func
 from datetime import datetime, timedelta
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, parse_qsl
 from helpers.db import get_connection
+from helpers.etags import if_none_match, make_etag, not_modified, rowversion_token
 from helpers.history import DatetimeEncoder
-from helpers.ids import normalize_guid
-from helpers.domain_constants import FINAL_STATUSES
-from helpers.status_normalize import status_key, status_key_case_sql
+from helpers.ids import normalize_guid, is_guid
+from helpers.counters import read_user_counters
+from helpers.domain_constants import OPEN_MIN_COMPATIBILITY_SCORE
+from helpers.status_normalize import status_key
+from helpers.list_cursor import InvalidCursorError, make_list_cursor, parse_list_cursor, keyset_seek_sql
+from helpers.search import FULLTEXT_SEARCH_COLUMNS, build_fulltext_query, fulltext_search_enabled
 
 
 REMOTE_MAP = {
@@ -23,10 +28,65 @@ VALID_SORTS = {
     "updated_desc", "updated_asc",
     "status_progression",
     "location_az",
-    # "compat_desc"  # future
+    "relevance",  # full-text rank; falls back to created_desc when no full-text search applies
+    "compat_desc",  # this user's compatibility score, best first; default for category=open
 }
 
-OPEN_MIN_COMPATIBILITY_SCORE = 5.0
+# count=exact  -> full COUNT(*) (default for offset paging, keeps old envelope)
+# count=capped -> COUNT over TOP (COUNT_CAP + 1) rows; total is min(n, COUNT_CAP), totalCapped tells if more exist
+# count=none   -> no count query, total is null (default when paging with a cursor)
+VALID_COUNT_MODES = {"exact", "capped", "none"}
+COUNT_CAP = 1000
+
+UPDATED_EXPR = "COALESCE(us.LastUpdated, j.UpdatedAt, j.CreatedAt)"
+# Maintained on every location write (helpers.locations), so location_az reads an index
+LOCATION_KEY_EXPR = "j.PrimaryLocationKey"
+# Ranks on the persisted key (see helpers.status_normalize.status_key); NULL = no status row
+STATUS_RANK_EXPR = """CASE
+    WHEN us.StatusKey IN ('offer', 'accepted') THEN 6
+    WHEN us.StatusKey IN ('booked-hm', 'done-hm', 'booked-more', 'done-more') THEN 5
+    WHEN us.StatusKey IN ('booked-screen', 'done-screen') THEN 4
+    WHEN us.StatusKey = 'applied' THEN 3
+    WHEN us.StatusKey IS NULL THEN 2
+    ELSE 1
+END"""
+
+# Sort key per VALID_SORTS option: (sql_expr, direction, kind). The last key is always j.Id so
+# ordering is total and a cursor (values of the last row) identifies a unique seek position.
+SORT_KEYS = {
+    "created_desc": [("j.CreatedAt", "DESC", "dt"), ("j.Id", "DESC", "guid")],
+    "created_asc": [("j.CreatedAt", "ASC", "dt"), ("j.Id", "ASC", "guid")],
+    "updated_desc": [(UPDATED_EXPR, "DESC", "dt"), ("j.Id", "DESC", "guid")],
+    "updated_asc": [(UPDATED_EXPR, "ASC", "dt"), ("j.Id", "ASC", "guid")],
+    "location_az": [(LOCATION_KEY_EXPR, "ASC", "str"), ("j.CreatedAt", "DESC", "dt"), ("j.Id", "DESC", "guid")],
+    "status_progression": [(STATUS_RANK_EXPR, "DESC", "int"), (UPDATED_EXPR, "DESC", "dt"), ("j.Id", "DESC", "guid")],
+    "relevance": [("ft.[RANK]", "DESC", "int"), ("j.Id", "DESC", "guid")],
+    # Matches IX_CompatibilityScores_User_ScoreDesc (UserId, Score DESC, JobOfferingId), so the
+    # 'open' feed (INNER JOIN on cs) reads the top matches with one ordered index seek.
+    "compat_desc": [("cs.Score", "DESC", "dec"), ("cs.JobOfferingId", "ASC", "guid")],
+}
+
+# compat_desc for 'my'/'all': LEFT JOIN on cs, unscored jobs sort last
+COMPAT_DESC_LEFT_JOIN_KEYS = [("COALESCE(cs.Score, -1.0)", "DESC", "dec"), ("j.Id", "ASC", "guid")]
+
+_KEY_PLACEHOLDERS = {
+    "dt": "CONVERT(datetime2, ?, 126)",
+    "guid": "CONVERT(uniqueidentifier, ?)",
+    "str": "?",
+    "int": "?",
+    "dec": "CONVERT(decimal(4,1), ?)",
+}
+
+_DEC_KEY_RE = re.compile(r"^-?\d{1,3}(\.\d)?$")
+
+
+# One seek each on the RowVer indexes; a NULL user yields NULL maxima.
+LIST_VERSIONS_SQL = """
+SELECT
+    (SELECT MAX(RowVer) FROM dbo.JobOfferings),
+    (SELECT MAX(RowVer) FROM dbo.UserJobStatus WHERE UserId = ?),
+    (SELECT MAX(RowVer) FROM dbo.CompatibilityScores WHERE UserId = ?)
+"""
 
 
 def _parse_multi(req: func.HttpRequest, name: str) -> list[str]:
@@ -69,6 +129,33 @@ def _likeify(s: str) -> str:
     return f"%{s}%"
 
 
+def _key_select_sql(expr: str, kind: str) -> str:
+    # Datetimes travel as ISO-8601 text so DATETIME2(7) precision is not truncated by the driver
+    if kind == "dt":
+        return f"CONVERT(varchar(27), {expr}, 126)"
+    if kind == "guid":
+        return f"CONVERT(char(36), {expr})"
+    # Scores travel as text so the cursor stays exact (DECIMAL(4,1) is not JSON-native)
+    if kind == "dec":
+        return f"CONVERT(varchar(8), {expr})"
+    return expr
+
+
+def _validate_cursor_keys(keys: list, sort_keys: list) -> list:
+    for val, (_, _, kind) in zip(keys, sort_keys):
+        if kind == "int":
+            ok = isinstance(val, int) and not isinstance(val, bool)
+        elif kind == "guid":
+            ok = isinstance(val, str) and is_guid(val)
+        elif kind == "dec":
+            ok = isinstance(val, str) and bool(_DEC_KEY_RE.match(val))
+        else:
+            ok = isinstance(val, str)
+        if not ok:
+            raise InvalidCursorError("Invalid cursor")
+    return keys
+
+
 def register(app: func.FunctionApp):
 
     @app.route(route="jobs", methods=["GET"])
@@ -87,6 +174,11 @@ def register(app: func.FunctionApp):
             if search_field not in VALID_SEARCH_FIELDS:
                 return func.HttpResponse("Invalid 'search_field'", status_code=400)
 
+            # Full-text path for title_company/description; None keeps the LIKE path
+            ft_query = None
+            if q and search_field in FULLTEXT_SEARCH_COLUMNS and fulltext_search_enabled():
+                ft_query = build_fulltext_query(q)
+
             try:
                 limit = int(req.params.get("limit", 25))
                 offset = int(req.params.get("offset", 0))
@@ -97,6 +189,12 @@ def register(app: func.FunctionApp):
             except ValueError:
                 return func.HttpResponse("Invalid 'limit' or 'offset'", status_code=400)
 
+            # Keyset mode: when a cursor is given, 'offset' is ignored and we seek past the cursor row
+            cursor_token = (req.params.get("cursor") or "").strip()
+            count_mode = (req.params.get("count") or ("none" if cursor_token else "exact")).strip().lower()
+            if count_mode not in VALID_COUNT_MODES:
+                return func.HttpResponse("Invalid 'count'", status_code=400)
+
             modes = [m.lower() for m in _parse_multi(req, "mode")]
             cities = _parse_multi(req, "city")
             countries = _parse_multi(req, "country")
@@ -113,16 +211,37 @@ def register(app: func.FunctionApp):
             if date_to:
                 date_to = date_to + timedelta(days=1)
 
-            sort = (req.params.get("sort") or "created_desc").strip().lower()
+            default_sort = "compat_desc" if category == "open" else "created_desc"
+            sort = (req.params.get("sort") or default_sort).strip().lower()
             if sort not in VALID_SORTS:
                 return func.HttpResponse("Invalid 'sort'", status_code=400)
 
+            sort_keys = SORT_KEYS[sort]
+            if sort == "relevance" and not ft_query:
+                sort_keys = SORT_KEYS["created_desc"]
+            if sort == "compat_desc" and category != "open":
+                sort_keys = COMPAT_DESC_LEFT_JOIN_KEYS
+            cursor_keys = None
+            if cursor_token:
+                try:
+                    cursor_keys = _validate_cursor_keys(
+                        parse_list_cursor(cursor_token, sort, len(sort_keys)), sort_keys
+                    )
+                except InvalidCursorError as ce:
+                    return func.HttpResponse(str(ce), status_code=400)
+                offset = 0
+
             user_id = _require_user_if_needed(req, category, ignore_status, ignore_status_k)
             if category in {"my", "open"} and not user_id:
                 return func.HttpResponse(
                     "Missing user id (X-User-Id header) for category='my' or 'open'",
                     status_code=400
                 )
+            if sort == "compat_desc" and not user_id:
+                return func.HttpResponse(
+                    "Missing user id (X-User-Id header) for sort='compat_desc'",
+                    status_code=400
+                )
 
             # ----------------------------
             # Dynamic SQL assembly
@@ -130,6 +249,20 @@ def register(app: func.FunctionApp):
             conn = get_connection()
             cur = conn.cursor()
 
+            # ----------------------------
+            # ETag: the page can only change when one of these versions moves (schema 33)
+            # ----------------------------
+            cur.execute(LIST_VERSIONS_SQL, user_id, user_id)
+            versions = cur.fetchone()
+            etag = make_etag(
+                "jobs",
+                user_id or "",
+                sorted(parse_qsl(urlparse(req.url).query, keep_blank_values=True)),
+                *(rowversion_token(v) for v in versions),
+            )
+            if if_none_match(req, etag):
+                return not_modified(etag)
+
             joins: list[str] = []
             where = ["j.IsDeleted = 0"]
             params: list = []
@@ -155,6 +288,24 @@ def register(app: func.FunctionApp):
                 """)
                 params += [user_id, OPEN_MIN_COMPATIBILITY_SCORE]
                 params_count += [user_id, OPEN_MIN_COMPATIBILITY_SCORE]
+            elif sort == "compat_desc":
+                # (JobOfferingId, UserId) is unique, so this never multiplies rows
+                joins.append("""
+                    LEFT JOIN dbo.CompatibilityScores cs
+                      ON cs.JobOfferingId = j.Id
+                     AND cs.UserId = ?
+                """)
+                params.append(user_id)
+                params_count.append(user_id)
+
+            # Full-text match: seeks the full-text index instead of scanning with LIKE '%term%'
+            if ft_query:
+                joins.append(f"""
+                    INNER JOIN CONTAINSTABLE(dbo.JobOfferings, {FULLTEXT_SEARCH_COLUMNS[search_field]}, ?) ft
+                      ON ft.[KEY] = j.Id
+                """)
+                params.append(ft_query)
+                params_count.append(ft_query)
 
             # Category constraints
             if category == "my":
@@ -162,21 +313,15 @@ def register(app: func.FunctionApp):
                 #   - jobs created by me, if status is NULL or non-final
                 #   - OR jobs where I have a non-final status
                 # Exclude final statuses even if the job was created by me.
-                final_placeholders = ",".join(["?"] * len(FINAL_STATUSES))
-                status_sql = "LOWER(LTRIM(RTRIM(us.Status)))"
-
-                where.append(f"""
+                where.append("""
                     (
-                        (j.CreatedByUserId = ? OR us.Status IS NOT NULL)
+                        (j.CreatedByUserId = ? OR us.UserId IS NOT NULL)
                         AND
-                        (us.Status IS NULL OR {status_sql} NOT IN ({final_placeholders}))
+                        (us.UserId IS NULL OR us.IsFinal = 0)
                     )
                 """)
                 params.append(user_id)
                 params_count.append(user_id)
-                for s in FINAL_STATUSES:
-                    params.append(s.lower())
-                    params_count.append(s.lower())
 
             elif category == "open":
                 # For THIS user:
@@ -194,8 +339,8 @@ def register(app: func.FunctionApp):
 
             # category 'all' adds nothing beyond IsDeleted = 0
 
-            # Search
-            if q:
+            # Search (LIKE path when full-text is not in use)
+            if q and not ft_query:
                 if search_field == "title_company":
                     where.append("(j.Title LIKE ? OR j.HiringCompanyName LIKE ? OR j.PostingCompanyName LIKE ?)")
                     like = _likeify(q)
@@ -282,21 +427,14 @@ def register(app: func.FunctionApp):
                 mapped = [status_key(lbl) for lbl in ignore_status if lbl]
                 ignore_keys = [k for k in mapped if k]
 
-            if ignore_keys:
+            # (JobOfferingId, UserId) is unique, so the joined `us` row is the only candidate:
+            # no status row is never ignored, same as the former NOT EXISTS over UserJobStatus.
+            if ignore_keys and user_id:
                 ignore_keys = list(dict.fromkeys(ignore_keys))
-                key_sql = status_key_case_sql("us2.Status")
-                cmp = " OR ".join([f"{key_sql} = ?" for _ in ignore_keys])
-                where.append(f"""
-                    NOT EXISTS (
-                        SELECT 1
-                        FROM dbo.UserJobStatus us2
-                        WHERE us2.JobOfferingId = j.Id
-                          AND us2.UserId = ?
-                          AND ({cmp})
-                    )
-                """)
-                params += [user_id] + ignore_keys
-                params_count += [user_id] + ignore_keys
+                placeholders = ",".join(["?"] * len(ignore_keys))
+                where.append(f"(us.UserId IS NULL OR us.StatusKey NOT IN ({placeholders}))")
+                params += ignore_keys
+                params_count += ignore_keys
 
             # Date filters
             if date_kind == "updated":
@@ -322,55 +460,67 @@ def register(app: func.FunctionApp):
             where_sql = " AND ".join(where) if where else "1=1"
             join_sql = " ".join(joins)
 
-            # Sort ORDER BY
-            if sort == "created_desc":
-                order_sql = "ORDER BY j.CreatedAt DESC"
-            elif sort == "created_asc":
-                order_sql = "ORDER BY j.CreatedAt ASC"
-            elif sort == "updated_desc":
-                order_sql = "ORDER BY COALESCE(us.LastUpdated, j.UpdatedAt, j.CreatedAt) DESC"
-            elif sort == "updated_asc":
-                order_sql = "ORDER BY COALESCE(us.LastUpdated, j.UpdatedAt, j.CreatedAt) ASC"
-            elif sort == "location_az":
-                order_sql = """
-                    ORDER BY (
-                        SELECT TOP 1 CONCAT(COALESCE(l.CountryName,''),'|',COALESCE(l.CityName,''))
-                        FROM dbo.JobOfferingLocations l
-                        WHERE l.JobOfferingId = j.Id
-                        ORDER BY l.CountryName, l.CityName
-                    ) ASC, j.CreatedAt DESC
-                """
-            elif sort == "status_progression":
-                order_sql = """
-                    ORDER BY
-                      CASE LOWER(COALESCE(us.Status, ''))
-                        WHEN 'offer' THEN 6
-                        WHEN 'interview' THEN 5
-                        WHEN 'screening planned' THEN 4
-                        WHEN 'applied' THEN 3
-                        WHEN '' THEN 2
-                        ELSE 1
-                      END DESC,
-                      COALESCE(us.LastUpdated, j.UpdatedAt, j.CreatedAt) DESC
-                """
-            else:
-                order_sql = "ORDER BY j.CreatedAt DESC"
+            # Sort ORDER BY (always ends with j.Id so pages are deterministic)
+            order_sql = "ORDER BY " + ", ".join(f"{expr} {direction}" for expr, direction, _ in sort_keys)
+
+            # Seek predicate applies to the page query only, never to the count
+            select_where_sql = where_sql
+            params_seek: list = []
+            if cursor_keys is not None:
+                seek_sql, params_seek = keyset_seek_sql(
+                    [(expr, direction, _KEY_PLACEHOLDERS[kind]) for expr, direction, kind in sort_keys],
+                    cursor_keys,
+                )
+                select_where_sql = f"{where_sql} AND {seek_sql}"
 
             # ----------------------------
             # Total count
             # ----------------------------
-            count_sql = f"""
-                SELECT COUNT(*)
-                FROM dbo.JobOfferings j
-                {join_sql}
-                WHERE {where_sql}
-            """
-            cur.execute(count_sql, params_count)
-            total = int(cur.fetchone()[0] or 0)
+            total = None
+            total_capped = False
+            # Default totals of unfiltered pages come from maintained counters
+            # (helpers.counters / the JobRemoteTypeFacets view); an explicit count=exact still counts.
+            unfiltered = not (q or modes or cities or countries or ignore_keys or date_from or date_to)
+            use_counters = count_mode == "exact" and not req.params.get("count") and unfiltered
+            if use_counters and category in {"my", "open"}:
+                counts, rebuilt = read_user_counters(cur, user_id)
+                if rebuilt:
+                    conn.commit()
+                total = counts[category]
+            elif use_counters and category == "all":
+                cur.execute("SELECT COALESCE(SUM(JobCount), 0) FROM dbo.JobRemoteTypeFacets WITH (NOEXPAND)")
+                total = int(cur.fetchone()[0])
+            elif count_mode == "exact":
+                count_sql = f"""
+                    SELECT COUNT(*)
+                    FROM dbo.JobOfferings j
+                    {join_sql}
+                    WHERE {where_sql}
+                """
+                cur.execute(count_sql, params_count)
+                total = int(cur.fetchone()[0] or 0)
+            elif count_mode == "capped":
+                count_sql = f"""
+                    SELECT COUNT(*)
+                    FROM (
+                        SELECT TOP (?) 1 AS x
+                        FROM dbo.JobOfferings j
+                        {join_sql}
+                        WHERE {where_sql}
+                    ) c
+                """
+                cur.execute(count_sql, [COUNT_CAP + 1] + params_count)
+                seen = int(cur.fetchone()[0] or 0)
+                total_capped = seen > COUNT_CAP
+                total = min(seen, COUNT_CAP)
 
             # ----------------------------
             # Paged select
             # ----------------------------
+            key_select_sql = ",\n                  ".join(
+                f"{_key_select_sql(expr, kind)} AS _SortKey{i}"
+                for i, (expr, _, kind) in enumerate(sort_keys)
+            )
             select_sql = f"""
                 SELECT
                   j.Id,
@@ -385,33 +535,30 @@ def register(app: func.FunctionApp):
                   j.UpdatedAt,
                   us.Status AS UserStatus,
                   us.LastUpdated AS UserStatusLastUpdated,
-                  COALESCE(us.LastUpdated, j.UpdatedAt, j.CreatedAt) AS LastUpdateAt
+                  COALESCE(us.LastUpdated, j.UpdatedAt, j.CreatedAt) AS LastUpdateAt,
+                  {key_select_sql}
                 FROM dbo.JobOfferings j
                 {join_sql}
-                WHERE {where_sql}
+                WHERE {select_where_sql}
                 {order_sql}
                 OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
             """
-            params_select = params + [offset, limit]
+            # Fetch one extra row to know whether a next page exists
+            params_select = params + params_seek + [offset, limit + 1]
             cur.execute(select_sql, params_select)
             rows = cur.fetchall()
 
-            if not rows:
-                payload = {
-                    "category": category,
-                    "limit": limit,
-                    "offset": offset,
-                    "total": total,
-                    "sort": sort,
-                    "items": []
-                }
-                return func.HttpResponse(
-                    json.dumps(payload, cls=DatetimeEncoder),
-                    mimetype="application/json"
-                )
-
             cols = [c[0] for c in cur.description]
-            jobs = [dict(zip(cols, r)) for r in rows]
+            jobs = [dict(zip(cols, r)) for r in rows[:limit]]
+            key_cols = [f"_SortKey{i}" for i in range(len(sort_keys))]
+
+            next_cursor = None
+            if len(rows) > limit and jobs:
+                last = jobs[-1]
+                next_cursor = make_list_cursor(sort, [last[k] for k in key_cols])
+            for j in jobs:
+                for k in key_cols:
+                    j.pop(k, None)
 
             # Normalize Ids on the wire (canonical lowercase)
             norm_ids = []
@@ -447,12 +594,16 @@ def register(app: func.FunctionApp):
                 "limit": limit,
                 "offset": offset,
                 "total": total,
+                "totalCapped": total_capped,
+                "count": count_mode,
                 "sort": sort,
+                "nextCursor": next_cursor,
                 "items": jobs
             }
             return func.HttpResponse(
                 json.dumps(payload, cls=DatetimeEncoder),
-                mimetype="application/json"
+                mimetype="application/json",
+                headers={"ETag": etag},
             )
 
         except Exception as e:
@@ -7,7 +7,8 @@ import azure.functions as func
 
 from helpers.db import get_connection
 from helpers.auth import UnauthorizedError, get_current_user_id
-from helpers.ids import normalize_guid
+from helpers.ids import is_guid, normalize_guid
+from helpers.list_cursor import InvalidCursorError, keyset_seek_sql, make_list_cursor, parse_list_cursor
 
 
 ISO_LAYOUTS = [
@@ -39,44 +40,175 @@ def _parse_bool(value: Optional[str]) -> bool:
     return v in ("1", "true", "yes", "y", "on")
 
 
-def _extract_status(action: Optional[str], details: Optional[str]) -> Optional[str]:
+NDJSON_MIMETYPE = "application/x-ndjson"
+FETCH_BATCH_ROWS = 500
+# NDJSON responses are keyset pages of at most this many transition rows; X-Report-Next
+# carries the cursor (helpers/list_cursor.py) of the last row sent.
+REPORT_PAGE_ROWS = 2000
+
+# One range seek on (UserId, Timestamp); ToStatus is the label as written (schema 32).
+# Aggregate mode orders jobs by their first transition in the window (the order the
+# grouped JSON always had) so groups can be emitted as soon as the next job starts.
+# The trailing key columns travel as text so DATETIME2(7) precision survives the cursor.
+REPORT_SELECT_SQL = """
+SELECT {top}
+    j.Id,
+    ISNULL(j.Title, N'') AS Title,
+    ISNULL(j.PostingCompanyName, N'') AS PostingCompanyName,
+    ISNULL(j.HiringCompanyName, N'') AS HiringCompanyName,
+    ISNULL(j.Url, N'') AS Url,
+    t.Timestamp,
+    t.ToStatus,
+    CONVERT(varchar(27), t.FirstAt, 126) AS FirstAtKey,
+    CONVERT(char(36), t.JobOfferingId) AS JobKey,
+    CONVERT(varchar(27), t.Timestamp, 126) AS TimestampKey,
+    t.Id AS TransitionId
+FROM (
+    SELECT
+        JobOfferingId, Timestamp, ToStatus, Id,
+        MIN(Timestamp) OVER (PARTITION BY JobOfferingId) AS FirstAt
+    FROM dbo.UserStatusTransitions
+    WHERE UserId = ?
+      AND Timestamp >= ?
+      AND Timestamp <= ?
+) t
+INNER JOIN dbo.JobOfferings j ON j.Id = t.JobOfferingId
+{seek}
+"""
+
+FLAT_ORDER_SQL = "ORDER BY t.Timestamp ASC, t.Id ASC"
+AGGREGATE_ORDER_SQL = "ORDER BY t.FirstAt ASC, t.JobOfferingId ASC, t.Timestamp ASC, t.Id ASC"
+
+# (sql_expr, direction, placeholder, row index of the key) in ORDER BY order
+FLAT_SORT_KEYS = [
+    ("t.Timestamp", "ASC", "CONVERT(datetime2, ?, 126)", 9),
+    ("t.Id", "ASC", "?", 10),
+]
+AGGREGATE_SORT_KEYS = [
+    ("t.FirstAt", "ASC", "CONVERT(datetime2, ?, 126)", 7),
+    ("t.JobOfferingId", "ASC", "CONVERT(uniqueidentifier, ?)", 8),
+    ("t.Timestamp", "ASC", "CONVERT(datetime2, ?, 126)", 9),
+    ("t.Id", "ASC", "?", 10),
+]
+
+
+def _cursor_sort(aggregate: bool) -> str:
+    return "report:aggregate" if aggregate else "report:flat"
+
+
+def _sort_keys(aggregate: bool) -> list:
+    return AGGREGATE_SORT_KEYS if aggregate else FLAT_SORT_KEYS
+
+
+def _parse_report_cursor(token: str, aggregate: bool) -> list:
+    sort_keys = _sort_keys(aggregate)
+    keys = parse_list_cursor(token, _cursor_sort(aggregate), len(sort_keys))
+    for val, (expr, _, _, _) in zip(keys, sort_keys):
+        if expr == "t.Id":
+            ok = isinstance(val, int) and not isinstance(val, bool)
+        elif expr == "t.JobOfferingId":
+            ok = isinstance(val, str) and is_guid(val)
+        else:
+            ok = isinstance(val, str)
+        if not ok:
+            raise InvalidCursorError("Invalid cursor")
+    return keys
+
+
+def _report_query(user_id, start_dt, end_dt, aggregate: bool, page_rows=None, cursor_keys=None):
+    """SQL and params for the whole window, or for one keyset page when page_rows is set."""
+    params: list = []
+    top = ""
+    if page_rows:
+        top = "TOP (?)"
+        params.append(int(page_rows))
+    params.extend([user_id, start_dt, end_dt])
+
+    seek = ""
+    if cursor_keys is not None:
+        seek_sql, seek_params = keyset_seek_sql(
+            [(expr, direction, placeholder) for expr, direction, placeholder, _ in _sort_keys(aggregate)],
+            cursor_keys,
+        )
+        seek = f"WHERE {seek_sql}"
+        params.extend(seek_params)
+
+    sql = REPORT_SELECT_SQL.format(top=top, seek=seek)
+    sql += AGGREGATE_ORDER_SQL if aggregate else FLAT_ORDER_SQL
+    return sql, params
+
+
+def _page_rows(rows: list, aggregate: bool, page_rows: int):
     """
-    Supports:
-      - action like 'status:applied'
-      - action in {'status-changed','status_changed'} with Details JSON
-        * Either raw {"to":"applied"} / {"status":"applied"}
-        * Or wrapped {"v":1,"kind":"status_changed","data":{...}}
+    Trim one fetched page and build its continuation cursor (None on the last page).
+    Aggregate pages end on a job boundary: a trailing job that may continue past the
+    page is left for the next page, unless it is the only job on the page.
     """
-    if not action:
-        return None
+    if len(rows) < page_rows:
+        return rows, None
+    if aggregate:
+        last_job = rows[-1][0]
+        cut = len(rows)
+        while cut > 0 and rows[cut - 1][0] == last_job:
+            cut -= 1
+        if cut > 0:
+            rows = rows[:cut]
+    last = rows[-1]
+    return rows, make_list_cursor(_cursor_sort(aggregate), [last[i] for _, _, _, i in _sort_keys(aggregate)])
+
+
+def _iter_rows(cur):
+    while True:
+        rows = cur.fetchmany(FETCH_BATCH_ROWS)
+        if not rows:
+            return
+        yield from rows
+
+
+def _iter_report_items(rows, aggregate: bool):
+    """
+    Yield report items from REPORT_SELECT_SQL rows.
+    Flat: one item per transition. Aggregate: one item per job with its statuses;
+    relies on AGGREGATE_ORDER_SQL keeping each job's rows contiguous.
+    """
+    group = None
+    for job_id, title, posting_co, hiring_co, url, ts, status, *_keys in rows:
+        job_key = normalize_guid(job_id)
+        if not aggregate:
+            yield {
+                "jobId": job_key,
+                "jobTitle": title,
+                "postingCompanyName": posting_co,
+                "hiringCompanyName": hiring_co,
+                "url": url,
+                "status": status or "",
+                "timestamp": ts.isoformat()
+            }
+            continue
 
-    # Simple "status:<value>" form
-    if action.startswith("status:") and len(action) > 7:
-        return action[7:]
+        if group is None or group["jobId"] != job_key:
+            if group is not None:
+                yield group
+            group = {
+                "jobId": job_key,
+                "jobTitle": title,
+                "postingCompanyName": posting_co,
+                "hiringCompanyName": hiring_co,
+                "url": url,
+                "statuses": []  # list of {status, timestamp}
+            }
+        group["statuses"].append({
+            "status": status or "",
+            "timestamp": ts.isoformat()
+        })
 
-    # Generic forms: hyphen or underscore
-    if action in ("status-changed", "status_changed") and details:
-        try:
-            d = json.loads(details)
-            if isinstance(d, dict):
-                # Unwrapped (raw) variant
-                if "to" in d and isinstance(d["to"], str):
-                    return d["to"]
-                if "status" in d and isinstance(d["status"], str):
-                    return d["status"]
-
-                # Wrapped variant per your insert_history()
-                # {"v":1,"kind":"status_changed","data":{"userId":...,"from":"X","to":"Y"}}
-                data = d.get("data")
-                if isinstance(data, dict):
-                    if "to" in data and isinstance(data["to"], str):
-                        return data["to"]
-                    if "status" in data and isinstance(data["status"], str):
-                        return data["status"]
-        except Exception:
-            pass
+    if group is not None:
+        yield group
 
-    return None
+
+def _wants_ndjson(req: func.HttpRequest) -> bool:
+    accept = (req.headers.get("Accept") or "").lower()
+    return NDJSON_MIMETYPE in accept
 
 
 def register(app: func.FunctionApp):
@@ -88,6 +220,15 @@ def register(app: func.FunctionApp):
           - start: required ISO8601 date/datetime (e.g., 2025-08-01 or 2025-08-01T10:00)
           - end: optional ISO8601; if omitted -> 'now'
           - aggregate: optional bool; if true -> group by job with statuses list
+          - after: NDJSON only; cursor from a previous page's X-Report-Next
+          - limit: NDJSON only; rows per page, at most REPORT_PAGE_ROWS
+
+        With 'Accept: application/x-ndjson' the body is one item per line instead of
+        the JSON envelope, one keyset page at a time: at most `limit` transition rows,
+        and X-Report-Next is set when more follow. Callers pass it back as `after`
+        with the same start and X-Report-End as `end`. An aggregate page ends on a job
+        boundary unless one job fills the page; that job then continues as the first
+        item of the next page.
 
         Constraints:
           - (end - start) must be <= 6 months (~184 days)
@@ -114,94 +255,52 @@ def register(app: func.FunctionApp):
 
             aggregate = _parse_bool(aggregate_raw)
 
+            if _wants_ndjson(req):
+                try:
+                    page_rows = int(req.params.get("limit") or REPORT_PAGE_ROWS)
+                except ValueError:
+                    return func.HttpResponse("'limit' must be an integer", status_code=400)
+                page_rows = max(1, min(page_rows, REPORT_PAGE_ROWS))
+
+                cursor_keys = None
+                if req.params.get("after"):
+                    try:
+                        cursor_keys = _parse_report_cursor(req.params["after"], aggregate)
+                    except InvalidCursorError as ce:
+                        return func.HttpResponse(str(ce), status_code=400)
+
+                # The Functions HttpResponse takes a complete body, so each response is
+                # one bounded page; the caller follows X-Report-Next for the rest.
+                conn = get_connection()
+                cur = conn.cursor()
+                sql, params = _report_query(user_id, start_dt, end_dt, aggregate, page_rows, cursor_keys)
+                cur.execute(sql, params)
+                rows, next_after = _page_rows(cur.fetchall(), aggregate, page_rows)
+
+                headers = {
+                    "X-Report-Aggregate": "true" if aggregate else "false",
+                    "X-Report-Start": start_dt.isoformat(),
+                    "X-Report-End": end_dt.isoformat(),
+                }
+                if next_after is not None:
+                    headers["X-Report-Next"] = next_after
+                body = b"".join(
+                    json.dumps(item).encode("utf-8") + b"\n" for item in _iter_report_items(rows, aggregate)
+                )
+                return func.HttpResponse(body, mimetype=NDJSON_MIMETYPE, status_code=200, headers=headers)
+
             conn = get_connection()
             cur = conn.cursor()
-
-            # We pull all history rows for the user in the window where action denotes a user status change.
-            # Action filter covers both styles described above.
-            cur.execute(
-                """
-                SELECT
-                    j.Id,
-                    ISNULL(j.Title, N'') AS Title,
-                    ISNULL(j.PostingCompanyName, N'') AS PostingCompanyName,
-                    ISNULL(j.HiringCompanyName, N'') AS HiringCompanyName,
-                    ISNULL(j.Url, N'') AS Url,
-                    h.Timestamp,
-                    ISNULL(h.Action, N'') AS Action,
-                    ISNULL(h.Details, N'') AS Details
-                FROM dbo.JobOfferingHistory h
-                INNER JOIN dbo.JobOfferings j ON j.Id = h.JobOfferingId
-                WHERE
-                    h.ActorType = N'user'
-                    AND h.ActorId = ?
-                    AND h.Timestamp >= ?
-                    AND h.Timestamp <= ?
-                    AND (
-                        h.Action = N'status_changed'
-                        OR h.Action LIKE N'status:%'
-                    )
-                ORDER BY h.Timestamp ASC
-                """,
-                (user_id, start_dt, end_dt)
-            )
-
-            rows = cur.fetchall()
-
-            if not aggregate:
-                items = []
-                for r in rows:
-                    job_id, title, posting_co, hiring_co, url, ts, action, details = r
-                    status = _extract_status(action, details) or ""
-                    items.append({
-                        "jobId": normalize_guid(job_id),
-                        "jobTitle": title,
-                        "postingCompanyName": posting_co,
-                        "hiringCompanyName": hiring_co,
-                        "url": url,
-                        "status": status,
-                        "timestamp": ts.isoformat()
-                    })
-
-                payload = {
-                    "userId": normalize_guid(user_id),
-                    "aggregate": False,
-                    "start": start_dt.isoformat(),
-                    "end": end_dt.isoformat(),
-                    "items": items
-                }
-                return func.HttpResponse(json.dumps(payload), mimetype="application/json", status_code=200)
-
-            # aggregate == True
-            by_job = {}
-            for r in rows:
-                job_id, title, posting_co, hiring_co, url, ts, action, details = r
-                status = _extract_status(action, details) or ""
-                key = normalize_guid(job_id)
-                if key not in by_job:
-                    by_job[key] = {
-                        "jobId": key,
-                        "jobTitle": title,
-                        "postingCompanyName": posting_co,
-                        "hiringCompanyName": hiring_co,
-                        "url": url,
-                        "statuses": []  # list of {status, timestamp}
-                    }
-                by_job[key]["statuses"].append({
-                    "status": status,
-                    "timestamp": ts.isoformat()
-                })
-
-            # Ensure statuses per job are sorted (query already sorted, but keep it explicit)
-            for v in by_job.values():
-                v["statuses"].sort(key=lambda x: x["timestamp"])
+            sql, params = _report_query(user_id, start_dt, end_dt, aggregate)
+            cur.execute(sql, params)
+            items = _iter_report_items(_iter_rows(cur), aggregate)
 
             payload = {
                 "userId": normalize_guid(user_id),
-                "aggregate": True,
+                "aggregate": aggregate,
                 "start": start_dt.isoformat(),
                 "end": end_dt.isoformat(),
-                "items": list(by_job.values())
+                "items": list(items)
             }
             return func.HttpResponse(json.dumps(payload), mimetype="application/json", status_code=200)
 
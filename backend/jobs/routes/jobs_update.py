@@ -4,6 +4,7 @@ import azure.functions as func
 from helpers.db import get_connection
 from helpers.auth import detect_actor
 from helpers.history import insert_history
+from helpers.locations import refresh_primary_location_key
 from helpers.validation import validate_job_payload
 from typing import List, Dict, Any, Optional
 from helpers.analytics import emit_jobs_event
@@ -120,6 +121,7 @@ def register(app: func.FunctionApp):
                         (job_id, nl["countryName"], nl["countryCode"], nl["cityName"], nl["region"])
                         for nl in new_locs
                     ])
+                refresh_primary_location_key(cur, job_id)
                 # If only locations changed, still bump UpdatedAt
                 if locs_changed_flag and not sets:
                     cur.execute("UPDATE dbo.JobOfferings SET UpdatedAt = SYSDATETIME() WHERE Id = ?", job_id)
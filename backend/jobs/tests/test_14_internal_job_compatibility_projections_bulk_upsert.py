@@ -240,3 +240,42 @@ def test_internal_compatibility_bulk_upsert_invalid_datetime(base_url, system_he
     assert len(body["errors"]) >= 1
     assert any("calculatedAt must include timezone info" in err["error"] for err in body["errors"])
 
+
+def test_internal_compatibility_bulk_upsert_mixed_batch_reports_per_item(base_url, system_headers, shared_state, test_user_id):
+    assert "job_id" in shared_state, "Missing shared_state['job_id'] - ensure create test ran first"
+    assert "job_id_apply_url" in shared_state, "Missing shared_state['job_id_apply_url'] - ensure apply-by-url test ran first"
+    stale_job_id = shared_state["job_id"]
+    fresh_job_id = shared_state["job_id_apply_url"]
+
+    url = _url(base_url)
+    payload = {
+        "items": [
+            {
+                "jobId": stale_job_id,
+                "userId": test_user_id,
+                "score": 1.0,
+                "explanation": "Older than the stored score; must not overwrite it.",
+                "calculatedAt": _iso_z("2026-03-17T08:00:00Z"),
+            },
+            {
+                "jobId": fresh_job_id,
+                "userId": test_user_id,
+                "score": 6.0,
+                "explanation": "Fresh pair in the same batch.",
+                "calculatedAt": _iso_z("2026-03-17T13:00:00Z"),
+            },
+        ]
+    }
+
+    r = requests.post(url, headers=system_headers, json=payload)
+    print("MIXED BATCH Response:", r.status_code, r.text)
+    assert r.status_code == 200, r.text
+
+    body = r.json()
+    assert body["accepted"] == 2
+    assert body["upserted"] == 1
+    assert body["ignored"] == 1
+    assert body["results"][0]["jobId"].lower() == str(stale_job_id).lower()
+    assert body["results"][0]["status"] == "IgnoredStale"
+    assert body["results"][1]["jobId"].lower() == str(fresh_job_id).lower()
+    assert body["results"][1]["status"] in ("Inserted", "Updated")
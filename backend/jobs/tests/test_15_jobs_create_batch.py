@@ -0,0 +1,62 @@
+# tests/test_15_jobs_create_batch.py
+import uuid
+import requests
+
+
+def test_jobs_create_batch_reports_per_item(base_url, system_headers, shared_state, test_job_url):
+    assert "job_id" in shared_state, "Job not created"
+
+    external_id = f"batch-{uuid.uuid4()}"
+    new_job = {
+        "url": f"https://example.com/careers/{external_id}",
+        "provider": "corporate-site",
+        "providerTenant": "example.com",
+        "externalId": external_id,
+        "hiringCompanyName": "Batch Test GmbH",
+        "title": "Batch Import Engineer",
+        "locations": [
+            {"countryName": "Germany", "countryCode": "DE", "cityName": "Berlin"},
+        ],
+    }
+
+    r = requests.post(
+        f"{base_url}/api/jobs:batch",
+        headers=system_headers,
+        json={
+            "jobs": [
+                new_job,
+                {"url": test_job_url},
+                {"title": "no url"},
+                {**new_job, "locations": [{"countryName": "Germany", "cityName": "Munich"}]},
+            ]
+        },
+    )
+    print("POST /jobs:batch response:", r.text, " status:", r.status_code, end=" ")
+    assert r.status_code == 200, r.text
+
+    body = r.json()
+    statuses = [item["status"] for item in body["results"]]
+    assert statuses == ["created", "existing", "invalid", "existing"]
+    assert (body["created"], body["existing"], body["invalid"]) == (1, 2, 1)
+
+    new_id = body["results"][0]["id"]
+    assert body["results"][1]["id"] == shared_state["job_id"]
+    assert body["results"][3]["id"] == new_id
+    assert "url" in body["results"][2]["error"]
+
+    detail = requests.get(f"{base_url}/api/jobs/{new_id}", headers=system_headers)
+    assert detail.status_code == 200, detail.text
+    cities = sorted(loc["cityName"] for loc in detail.json()["locations"])
+    assert cities == ["Berlin", "Munich"]
+
+    # Re-sending the same payload is idempotent.
+    again = requests.post(f"{base_url}/api/jobs:batch", headers=system_headers, json={"jobs": [new_job]})
+    assert again.status_code == 200, again.text
+    assert again.json()["results"][0] == {"index": 0, "status": "existing", "id": new_id, "error": None}
+
+    requests.delete(f"{base_url}/api/jobs/{new_id}", headers=system_headers)
+
+
+def test_jobs_create_batch_rejects_missing_array(base_url, system_headers):
+    r = requests.post(f"{base_url}/api/jobs:batch", headers=system_headers, json={"items": []})
+    assert r.status_code == 400, r.text
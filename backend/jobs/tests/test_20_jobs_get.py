@@ -12,3 +12,22 @@ def test_jobs_get(base_url, auth_headers, shared_state):
     for key in ["Id","Url","FoundOn","Provider","ProviderTenant","ExternalId","HiringCompanyName","IsDeleted","CreatedAt","FirstSeenAt"]:
         assert key in job
     assert "locations" in job and isinstance(job["locations"], list)
+    assert "PrimaryLocationKey" not in job
+
+
+def test_jobs_get_etag_revalidation(base_url, auth_headers, shared_state):
+    assert "job_id" in shared_state, "Job not created"
+    url = f"{base_url}/api/jobs/{shared_state['job_id']}"
+    r = requests.get(url, headers=auth_headers)
+    assert r.status_code == 200, r.text
+    etag = r.headers.get("ETag")
+    assert etag and etag.startswith('"'), "Strong ETag expected"
+    assert "RowVer" not in r.json()
+
+    r304 = requests.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert r304.status_code == 304, r304.text
+    assert r304.headers.get("ETag") == etag
+    assert r304.content == b""
+
+    r_other = requests.get(url, headers={**auth_headers, "If-None-Match": '"stale"'})
+    assert r_other.status_code == 200, r_other.text
@@ -51,4 +51,97 @@ def test_jobs_list_my_returns_success_and_items_have_expected_shape(base_url, us
         first = items[0]
         assert "Id" in first
         assert "locations" in first
-        assert isinstance(first["locations"], list)
\ No newline at end of file
+        assert isinstance(first["locations"], list)
+
+def test_jobs_list_cursor_pages_do_not_overlap(base_url, user_headers):
+    url = f"{base_url}/api/jobs?category=all&sort=created_desc&limit=1&count=capped"
+    r = requests.get(url, headers=user_headers)
+
+    print("Response text:", r.text, " with status ", r.status_code, end=" ")
+    assert r.status_code == 200, r.text
+
+    first = r.json()
+    assert first.get("count") == "capped"
+    assert isinstance(first.get("total"), int)
+    assert "nextCursor" in first, "Envelope missing 'nextCursor'"
+
+    if not first.get("nextCursor"):
+        return
+
+    r2 = requests.get(
+        f"{base_url}/api/jobs",
+        headers=user_headers,
+        params={"category": "all", "sort": "created_desc", "limit": 1, "cursor": first["nextCursor"]},
+    )
+    assert r2.status_code == 200, r2.text
+
+    second = r2.json()
+    assert second.get("total") is None, "Cursor pages skip the count by default"
+    assert set(_extract_ids(first)).isdisjoint(_extract_ids(second))
+
+
+def test_jobs_list_cursor_for_other_sort_is_rejected(base_url, user_headers):
+    r = requests.get(
+        f"{base_url}/api/jobs?category=all&sort=created_desc&limit=1",
+        headers=user_headers,
+    )
+    assert r.status_code == 200, r.text
+    cursor = r.json().get("nextCursor")
+    if not cursor:
+        return
+
+    r2 = requests.get(
+        f"{base_url}/api/jobs",
+        headers=user_headers,
+        params={"category": "all", "sort": "updated_desc", "limit": 1, "cursor": cursor},
+    )
+    assert r2.status_code == 400, r2.text
+
+
+def test_jobs_list_compat_desc_cursor_pages_do_not_overlap(base_url, user_headers):
+    r = requests.get(
+        f"{base_url}/api/jobs?category=all&sort=compat_desc&limit=1&count=capped",
+        headers=user_headers,
+    )
+    print("Response text:", r.text, " with status ", r.status_code, end=" ")
+    assert r.status_code == 200, r.text
+
+    first = r.json()
+    assert first.get("sort") == "compat_desc"
+    if not first.get("nextCursor"):
+        return
+
+    r2 = requests.get(
+        f"{base_url}/api/jobs",
+        headers=user_headers,
+        params={"category": "all", "sort": "compat_desc", "limit": 1, "cursor": first["nextCursor"]},
+    )
+    assert r2.status_code == 200, r2.text
+    assert set(_extract_ids(first)).isdisjoint(_extract_ids(r2.json()))
+
+
+def test_jobs_list_open_defaults_to_compat_desc(base_url, user_headers):
+    r = requests.get(f"{base_url}/api/jobs?category=open&limit=5", headers=user_headers)
+    assert r.status_code == 200, r.text
+    assert r.json().get("sort") == "compat_desc"
+
+
+def test_jobs_list_compat_desc_requires_user(base_url, auth_headers):
+    r = requests.get(f"{base_url}/api/jobs?category=all&sort=compat_desc", headers=auth_headers)
+    assert r.status_code == 400, r.text
+
+
+def test_jobs_list_etag_revalidation(base_url, user_headers):
+    url = f"{base_url}/api/jobs?category=all&limit=5"
+    r = requests.get(url, headers=user_headers)
+    assert r.status_code == 200, r.text
+    etag = r.headers.get("ETag")
+    assert etag, "List responses carry an ETag"
+
+    r304 = requests.get(url, headers={**user_headers, "If-None-Match": etag})
+    assert r304.status_code == 304, r304.text
+
+    # Different query -> different representation
+    r_other = requests.get(f"{url}&sort=created_asc", headers={**user_headers, "If-None-Match": etag})
+    assert r_other.status_code == 200, r_other.text
+
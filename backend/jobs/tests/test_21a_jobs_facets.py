@@ -0,0 +1,43 @@
+# tests/test_21a_jobs_facets.py
+import requests
+
+
+def test_jobs_facets_counts_shared_job_location(base_url, auth_headers, shared_state):
+    assert "job_id" in shared_state, "Job not created"
+
+    r = requests.get(f"{base_url}/api/jobs/facets?country=DE", headers=auth_headers)
+    print("GET /jobs/facets response:", r.text, " status:", r.status_code, end=" ")
+    assert r.status_code == 200, r.text
+
+    body = r.json()
+    assert set(body) == {"countries", "cities", "remoteTypes"}
+
+    # The country facet ignores the country filter, so other countries stay visible
+    germany = [c for c in body["countries"] if c["countryName"] == "Germany"]
+    assert germany and germany[0]["count"] >= 1
+
+    berlin = [c for c in body["cities"] if c["cityName"] == "Berlin"]
+    assert berlin and berlin[0]["count"] >= 1
+    assert all(c["countryName"] == "Germany" for c in body["cities"])
+    assert sum(rt["count"] for rt in body["remoteTypes"]) >= 1
+
+
+def test_jobs_facets_rejects_bad_city_limit(base_url, auth_headers):
+    r = requests.get(f"{base_url}/api/jobs/facets?cityLimit=0", headers=auth_headers)
+    assert r.status_code == 400
+
+
+def test_jobs_list_location_az_pages_do_not_overlap(base_url, auth_headers):
+    r = requests.get(f"{base_url}/api/jobs?category=all&sort=location_az&limit=1", headers=auth_headers)
+    assert r.status_code == 200, r.text
+    first = r.json()
+    if not first.get("nextCursor"):
+        return
+
+    r2 = requests.get(
+        f"{base_url}/api/jobs",
+        headers=auth_headers,
+        params={"category": "all", "sort": "location_az", "limit": 1, "cursor": first["nextCursor"]},
+    )
+    assert r2.status_code == 200, r2.text
+    assert {j["Id"] for j in first["items"]}.isdisjoint({j["Id"] for j in r2.json()["items"]})
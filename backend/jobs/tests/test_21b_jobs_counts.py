@@ -0,0 +1,29 @@
+# tests/test_21b_jobs_counts.py
+import requests
+
+
+def test_jobs_counts_match_exact_totals(base_url, user_headers):
+    r = requests.get(f"{base_url}/api/jobs/counts", headers=user_headers)
+    print("GET /jobs/counts response:", r.text, " status:", r.status_code, end=" ")
+    assert r.status_code == 200, r.text
+
+    counts = r.json()
+    assert isinstance(counts["my"], int)
+    assert isinstance(counts["open"], int)
+    assert isinstance(counts["statuses"], dict)
+
+    for category in ("my", "open"):
+        # Default total of an unfiltered page is served from the counters...
+        default = requests.get(f"{base_url}/api/jobs?category={category}&limit=1", headers=user_headers)
+        assert default.status_code == 200, default.text
+        assert default.json()["total"] == counts[category]
+
+        # ...and agrees with an explicit COUNT(*)
+        exact = requests.get(f"{base_url}/api/jobs?category={category}&limit=1&count=exact", headers=user_headers)
+        assert exact.status_code == 200, exact.text
+        assert exact.json()["total"] == counts[category]
+
+
+def test_jobs_counts_requires_user(base_url, auth_headers):
+    r = requests.get(f"{base_url}/api/jobs/counts", headers=auth_headers)
+    assert r.status_code == 401
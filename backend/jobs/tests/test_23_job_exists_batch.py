@@ -0,0 +1,59 @@
+# tests/test_23_job_exists_batch.py
+import uuid
+import requests
+
+def test_jobs_exists_batch_mixed_items(base_url, auth_headers, shared_state):
+    assert "job_id" in shared_state, "Job not created"
+    job_id = shared_state["job_id"]
+
+    r = requests.get(f"{base_url}/api/jobs/{job_id}", headers=auth_headers)
+    assert r.status_code == 200, r.text
+    job = r.json()
+
+    items = [
+        {
+            "provider": job["Provider"],
+            "providerTenant": job["ProviderTenant"],
+            "externalId": job["ExternalId"],
+        },
+        {
+            "provider": job["Provider"],
+            "providerTenant": job["ProviderTenant"],
+            "externalId": str(uuid.uuid4()),
+        },
+        {
+            "url": (
+                "https://wlgore.jobs.hr.cloud.sap/job/"
+                "Maschinen-und-Anlagenf%C3%BChrer-%28wmd%29/1910-de_DE"
+            ),
+        },
+        {"provider": job["Provider"]},
+        {"provider": job["Provider"], "providerTenant": job["ProviderTenant"], "externalId": 12345},
+    ]
+
+    r = requests.post(f"{base_url}/api/jobs/exists:batch", json={"items": items}, headers=auth_headers)
+    print("POST /jobs/exists:batch response:", r.text, " status:", r.status_code, end=" ")
+    assert r.status_code == 200, r.text
+
+    results = r.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2, 3, 4]
+
+    assert results[0]["exists"] is True
+    assert results[0]["id"] == job_id
+    assert results[0]["identitySource"] == "explicit"
+
+    assert results[1]["exists"] is False
+    assert results[1]["id"] is None
+
+    assert results[2]["provider"] == "successfactors"
+    assert results[2]["externalId"] == "1910"
+    assert results[2]["identitySource"] == "url"
+
+    assert "error" in results[3]
+    assert results[4]["error"] == "'externalId' must be a string"
+
+def test_jobs_exists_batch_rejects_oversized_body(base_url, auth_headers):
+    items = [{"url": f"https://boards.greenhouse.io/example/jobs/{i}"} for i in range(501)]
+    r = requests.post(f"{base_url}/api/jobs/exists:batch", json={"items": items}, headers=auth_headers)
+    print("POST /jobs/exists:batch (oversized) status:", r.status_code, end=" ")
+    assert r.status_code == 400
@@ -1,3 +1,4 @@
+import json
 import time
 import requests
 from datetime import datetime, timedelta
@@ -79,4 +80,63 @@ def test_status_reports_aggregate_and_flat(base_url, user_headers, shared_state)
     assert ts_agg == sorted(ts_agg), "Aggregated statuses must be ascending by timestamp"
 
     # Final status in the block should match the recent PUT
-    assert block["statuses"][-1]["status"] in ("Rejected with Unfortunately", "Interviewed")
\ No newline at end of file
+    assert block["statuses"][-1]["status"] in ("Rejected with Unfortunately", "Interviewed")
+
+def test_status_reports_ndjson_matches_json(base_url, user_headers, shared_state):
+    """
+    'Accept: application/x-ndjson' returns the same items, one JSON object per line.
+    """
+    assert "job_id" in shared_state, "Job not created"
+    start = _iso(datetime.utcnow() - timedelta(minutes=30))
+    end = _iso(datetime.utcnow() + timedelta(minutes=1))
+    report_url = f"{base_url}/api/jobs/reports/status"
+
+    for aggregate in ("false", "true"):
+        params = {"start": start, "end": end, "aggregate": aggregate}
+        r_json = requests.get(report_url, headers=user_headers, params=params)
+        assert r_json.status_code == 200, r_json.text
+
+        r_nd = requests.get(report_url, headers={**user_headers, "Accept": "application/x-ndjson"}, params=params)
+        print("GET report ndjson:", r_nd.status_code, r_nd.text[:300])
+        assert r_nd.status_code == 200, r_nd.text
+        assert r_nd.headers.get("Content-Type", "").startswith("application/x-ndjson")
+        assert r_nd.headers.get("X-Report-Aggregate") == aggregate
+
+        lines = [json.loads(line) for line in r_nd.text.splitlines() if line.strip()]
+        assert lines == r_json.json()["items"]
+
+def test_status_reports_ndjson_pages_follow_cursor(base_url, user_headers, shared_state):
+    """
+    NDJSON is served in keyset pages; following X-Report-Next with 'after' yields the
+    same flat items as the JSON report, and a garbage cursor is rejected.
+    """
+    assert "job_id" in shared_state, "Job not created"
+    start = _iso(datetime.utcnow() - timedelta(minutes=30))
+    end = _iso(datetime.utcnow() + timedelta(minutes=1))
+    report_url = f"{base_url}/api/jobs/reports/status"
+    headers = {**user_headers, "Accept": "application/x-ndjson"}
+    params = {"start": start, "end": end, "aggregate": "false"}
+
+    r_json = requests.get(report_url, headers=user_headers, params=params)
+    assert r_json.status_code == 200, r_json.text
+    expected = r_json.json()["items"]
+    assert len(expected) >= 2, "Need at least two transitions to page"
+
+    paged = []
+    cursor = None
+    for _ in range(len(expected) + 1):
+        page_params = {**params, "limit": "1"}
+        if cursor:
+            page_params["after"] = cursor
+        r = requests.get(report_url, headers=headers, params=page_params)
+        assert r.status_code == 200, r.text
+        lines = [json.loads(line) for line in r.text.splitlines() if line.strip()]
+        assert len(lines) <= 1
+        paged.extend(lines)
+        cursor = r.headers.get("X-Report-Next")
+        if not cursor:
+            break
+    assert paged == expected
+
+    r_bad = requests.get(report_url, headers=headers, params={**params, "after": "not-a-cursor"})
+    assert r_bad.status_code == 400, r_bad.text
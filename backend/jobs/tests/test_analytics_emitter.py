@@ -0,0 +1,152 @@
+# tests/test_analytics_emitter.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from helpers.analytics_emitter import AnalyticsEmitter, post_events
+
+
+class RecordingSender:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.event = threading.Event()
+
+    def __call__(self, events):
+        self.batches.append([e["n"] for e in events])
+        self.event.set()
+        if self.fail:
+            raise RuntimeError("analytics down")
+        return len(events)
+
+
+def test_full_batch_is_sent_by_background_thread():
+    sender = RecordingSender()
+    emitter = AnalyticsEmitter(sender, batch_size=3, flush_interval=60)
+
+    for n in range(3):
+        assert emitter.enqueue({"n": n}) is True
+
+    assert sender.event.wait(2)
+    assert sender.batches == [[0, 1, 2]]
+    emitter.close(timeout=2)
+    assert emitter.stats["sent"] == 3
+
+
+def test_partial_batch_is_sent_after_flush_interval():
+    sender = RecordingSender()
+    emitter = AnalyticsEmitter(sender, batch_size=50, flush_interval=0.05)
+
+    started = time.monotonic()
+    emitter.enqueue({"n": 1})
+
+    assert sender.event.wait(2)
+    assert time.monotonic() - started >= 0.04
+    assert sender.batches == [[1]]
+    emitter.close(timeout=2)
+
+
+def test_overflow_drops_oldest_events():
+    sender = RecordingSender()
+    emitter = AnalyticsEmitter(sender, max_queue=3, batch_size=10, flush_interval=60)
+
+    for n in range(5):
+        emitter.enqueue({"n": n})
+
+    assert emitter.pending() == 3
+    assert emitter.stats["dropped"] == 2
+    emitter.close(timeout=2)
+    assert sender.batches == [[2, 3, 4]]
+
+
+def test_close_flushes_queue_and_rejects_new_events():
+    sender = RecordingSender()
+    emitter = AnalyticsEmitter(sender, batch_size=2, flush_interval=60)
+
+    for n in range(5):
+        emitter.enqueue({"n": n})
+    emitter.close(timeout=2)
+
+    assert [n for batch in sender.batches for n in batch] == [0, 1, 2, 3, 4]
+    assert emitter.pending() == 0
+    assert emitter.enqueue({"n": 5}) is False
+
+
+def test_sender_failure_is_counted_not_raised():
+    sender = RecordingSender(fail=True)
+    emitter = AnalyticsEmitter(sender, batch_size=2, flush_interval=60)
+
+    emitter.enqueue({"n": 1})
+    emitter.enqueue({"n": 2})
+    emitter.close(timeout=2)
+
+    assert emitter.stats["failed"] == 2
+    assert emitter.stats["sent"] == 0
+
+
+class FakeAnalytics(BaseHTTPRequestHandler):
+    batch_route = True
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append((self.path, body))
+        if self.path.endswith(":batch") and not type(self).batch_route:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.path.endswith(":batch"):
+            results = [
+                {"index": i, "status": "invalid", "error": "unknown_event_name"}
+                if e["eventName"] == "Bad" else {"index": i, "status": "accepted"}
+                for i, e in enumerate(body["events"])
+            ]
+            reply = {"results": results}
+        else:
+            reply = {"status": "accepted"}
+        raw = json.dumps(reply).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(monkeypatch, batch_route):
+    FakeAnalytics.batch_route = batch_route
+    FakeAnalytics.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAnalytics)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("ANALYTICS_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setenv("ANALYTICS_FUNCTION_KEY", "test-key")
+    return server
+
+
+def test_post_events_sends_one_batch_request(monkeypatch):
+    server = _serve(monkeypatch, batch_route=True)
+    try:
+        sent = post_events([{"eventName": "Job Created"}, {"eventName": "Bad"}], "analytics_test")
+    finally:
+        server.shutdown()
+
+    assert sent == 1
+    assert [path for path, _ in FakeAnalytics.requests] == ["/analytics/events:batch"]
+
+
+def test_post_events_falls_back_to_single_posts_without_batch_route(monkeypatch):
+    server = _serve(monkeypatch, batch_route=False)
+    try:
+        sent = post_events([{"eventName": "Job Created"}, {"eventName": "Job Updated"}], "analytics_test")
+    finally:
+        server.shutdown()
+
+    assert sent == 2
+    assert [path for path, _ in FakeAnalytics.requests] == [
+        "/analytics/events:batch",
+        "/analytics/events",
+        "/analytics/events",
+    ]
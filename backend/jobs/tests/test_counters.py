@@ -0,0 +1,165 @@
+# tests/test_counters.py
+import threading
+import time
+
+from helpers.counters import apply_counter_deltas, capture_membership, rebuild_user_counters
+
+JOB = "0f8fad5b-d9cb-469f-a165-70867728950e"
+USER = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+
+
+class FakeCursor:
+    """Answers the membership query from `membership`, the initialized-user query from `initialized`."""
+
+    def __init__(self, membership, initialized=(USER,)):
+        self.membership = membership
+        self.initialized = list(initialized)
+        self.executions = []
+        self._rows = []
+
+    def execute(self, sql, *params):
+        self.executions.append((sql, params[0] if params else ()))
+        if "AS InMy" in sql:
+            self._rows = [(JOB, USER, *self.membership)] if self.membership else []
+        elif "CounterKey = 'my'" in sql:
+            self._rows = [(u,) for u in self.initialized]
+        elif "sp_getapplock" in sql:
+            self._rows = [(0,)]
+        else:
+            self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+def _merge_rows(cur):
+    merges = [params for sql, params in cur.executions if "MERGE dbo.UserJobCounters" in sql]
+    return [tuple(p[i:i + 3]) for p in merges for i in range(0, len(p), 3)]
+
+
+def test_status_put_moves_job_from_open_to_my():
+    before = capture_membership(FakeCursor((0, 1, None)), [(JOB, USER)])
+    cur = FakeCursor((1, 0, "applied"))
+
+    apply_counter_deltas(cur, before, [(JOB, USER)])
+
+    assert sorted(_merge_rows(cur)) == sorted([
+        (USER, "my", 1),
+        (USER, "open", -1),
+        (USER, "status:applied", 1),
+    ])
+
+
+def test_unchanged_membership_writes_nothing():
+    before = capture_membership(FakeCursor((1, 0, "applied")), [(JOB, USER)])
+    cur = FakeCursor((1, 0, "applied"))
+
+    apply_counter_deltas(cur, before, [(JOB, USER)])
+
+    assert len(cur.executions) == 1  # only the membership read
+
+
+def test_uncounted_user_is_rebuilt_instead_of_receiving_deltas():
+    cur = FakeCursor((1, 0, None), initialized=())
+
+    apply_counter_deltas(cur, {}, [(JOB, USER)])
+
+    assert _merge_rows(cur) == []
+    assert any("DELETE FROM dbo.UserJobCounters" in sql for sql, _ in cur.executions)
+
+
+def test_membership_read_locks_status_and_score_rows():
+    cur = FakeCursor((0, 0, None))
+
+    capture_membership(cur, [(JOB, USER)])
+
+    sql = cur.executions[0][0]
+    assert "dbo.UserJobStatus us WITH (UPDLOCK, HOLDLOCK)" in sql
+    assert "dbo.CompatibilityScores cs WITH (UPDLOCK, HOLDLOCK)" in sql
+
+
+class PrimaryKeyViolation(Exception):
+    pass
+
+
+class FakeCountersDb:
+    """
+    dbo.UserJobCounters with READ COMMITTED-like visibility: DELETE removes committed
+    rows only, an INSERT of a key another open transaction inserted violates the PK,
+    and application locks are held until commit.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.committed = {}
+        self.pending = {}
+        self.applocks = {}
+
+
+class TxCursor:
+    def __init__(self, db):
+        self.db = db
+        self.inserted = {}
+        self.held = []
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        if "sp_getapplock" in sql:
+            with self.db.lock:
+                applock = self.db.applocks.setdefault(params[0], threading.Lock())
+            applock.acquire()
+            self.held.append(applock)
+            self._rows = [(0,)]
+            return
+        if "DELETE FROM dbo.UserJobCounters" in sql:
+            user_id = params[0]
+            time.sleep(0.05)  # widen the window between the delete and the insert
+            with self.db.lock:
+                for key in [k for k in self.db.committed if k[0] == user_id]:
+                    del self.db.committed[key]
+                for counter_key in ("my", "open"):
+                    key = (user_id, counter_key)
+                    if key in self.db.committed or key in self.db.pending:
+                        raise PrimaryKeyViolation(key)
+                    self.db.pending[key] = self
+                    self.inserted[key] = 0
+        self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def commit(self):
+        with self.db.lock:
+            for key, count in self.inserted.items():
+                self.db.pending.pop(key, None)
+                self.db.committed[key] = count
+        self.inserted = {}
+        for applock in self.held:
+            applock.release()
+        self.held = []
+
+
+def test_concurrent_rebuilds_of_one_user_serialize():
+    db = FakeCountersDb()
+    errors = []
+
+    def rebuild():
+        cur = TxCursor(db)
+        try:
+            rebuild_user_counters(cur, USER)
+            time.sleep(0.05)
+            cur.commit()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=rebuild) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert errors == []
+    assert sorted(db.committed) == [(USER, "my"), (USER, "open")]
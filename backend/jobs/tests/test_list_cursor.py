@@ -0,0 +1,46 @@
+# tests/test_list_cursor.py
+import pytest
+
+from helpers.list_cursor import (
+    InvalidCursorError,
+    keyset_seek_sql,
+    make_list_cursor,
+    parse_list_cursor,
+)
+
+
+def test_cursor_round_trips_sort_keys():
+    keys = ["2026-01-02T03:04:05.1234567", "0f8fad5b-d9cb-469f-a165-70867728950e"]
+    token = make_list_cursor("created_desc", keys)
+
+    assert "=" not in token
+    assert parse_list_cursor(token, "created_desc", 2) == keys
+
+
+def test_cursor_rejects_other_sort_and_garbage():
+    token = make_list_cursor("created_desc", ["2026-01-02T03:04:05", "0f8fad5b-d9cb-469f-a165-70867728950e"])
+
+    with pytest.raises(InvalidCursorError):
+        parse_list_cursor(token, "updated_desc", 2)
+    with pytest.raises(InvalidCursorError):
+        parse_list_cursor(token, "created_desc", 3)
+    with pytest.raises(InvalidCursorError):
+        parse_list_cursor("not-a-cursor!!", "created_desc", 2)
+
+
+def test_keyset_seek_sql_builds_lexicographic_predicate():
+    sql, params = keyset_seek_sql(
+        [
+            ("k", "ASC", "?"),
+            ("j.CreatedAt", "DESC", "CONVERT(datetime2, ?, 126)"),
+            ("j.Id", "DESC", "?"),
+        ],
+        ["a", "t", "id"],
+    )
+
+    assert sql == (
+        "((k > ?)"
+        " OR (k = ? AND j.CreatedAt < CONVERT(datetime2, ?, 126))"
+        " OR (k = ? AND j.CreatedAt = CONVERT(datetime2, ?, 126) AND j.Id < ?))"
+    )
+    assert params == ["a", "a", "t", "a", "t", "id"]
@@ -0,0 +1,21 @@
+# tests/test_search.py
+from helpers.search import build_fulltext_query
+
+
+def test_fulltext_query_requires_every_word_as_prefix():
+    assert build_fulltext_query("Product Manager (Test)") == '"Product*" AND "Manager*" AND "Test*"'
+
+
+def test_fulltext_query_drops_operators_and_quotes():
+    assert build_fulltext_query('"python" OR -java*') == '"python*" AND "OR*" AND "java*"'
+
+
+def test_fulltext_query_without_words_falls_back():
+    assert build_fulltext_query("  ()!  ") is None
+    assert build_fulltext_query("") is None
+
+
+def test_fulltext_query_dedupes_and_caps_terms():
+    query = build_fulltext_query("a a b c d e f g h i j")
+    assert query.count("AND") == 7
+    assert query.startswith('"a*" AND "b*"')
@@ -0,0 +1,47 @@
+# tests/test_shared_module_copies.py
+# Helper modules that every app carries its own copy of (each Function App deploys
+# only its own folder). The Jobs copy is canonical; these tests fail when another
+# app's copy drifts from it.
+import re
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2]
+
+# Analytics is a Flask app: its copy has its own header comment, imports and
+# request integration section; everything in between must match.
+_SHARED_START = re.compile(r"^def _env_float\(", re.MULTILINE)
+_INTEGRATION_BANNER = re.compile(r"^# -+\n# (Function App|Flask) integration\n", re.MULTILINE)
+
+
+def _read(rel_path: str) -> str:
+    return (BACKEND / rel_path).read_text(encoding="utf-8")
+
+
+def _shared_section(text: str) -> str:
+    start = _SHARED_START.search(text)
+    end = _INTEGRATION_BANNER.search(text)
+    assert start and end, "shared section markers not found"
+    return text[start.start():end.start()]
+
+
+def test_sql_instrumentation_function_app_copies_match_jobs():
+    canonical = _read("jobs/helpers/sql_instrumentation.py")
+    for app in ("users", "enrichers"):
+        assert _read(f"{app}/helpers/sql_instrumentation.py") == canonical, (
+            f"{app}/helpers/sql_instrumentation.py differs from the Jobs copy"
+        )
+
+
+def test_sql_instrumentation_analytics_copy_matches_jobs_outside_integration():
+    canonical = _shared_section(_read("jobs/helpers/sql_instrumentation.py"))
+    assert _shared_section(_read("analytics/app/sql_instrumentation.py")) == canonical, (
+        "analytics/app/sql_instrumentation.py differs from the Jobs copy outside its Flask integration"
+    )
+
+
+def test_analytics_emitter_copies_match_jobs():
+    canonical = _read("jobs/helpers/analytics_emitter.py")
+    for app in ("users", "enrichers", "core"):
+        assert _read(f"{app}/helpers/analytics_emitter.py") == canonical, (
+            f"{app}/helpers/analytics_emitter.py differs from the Jobs copy"
+        )
@@ -0,0 +1,102 @@
+# tests/test_sql_instrumentation.py
+import logging
+
+from helpers.sql_instrumentation import (
+    begin_request,
+    end_request,
+    instrument_connection,
+    normalize_sql,
+    sql_fingerprint,
+    track_request,
+)
+
+
+class FakeCursor:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.rowcount = -1
+        self.fast_executemany = False
+        self.executions = []
+
+    def execute(self, sql, *params):
+        self.executions.append((sql, params))
+        if sql.lstrip().upper().startswith("UPDATE"):
+            self.rowcount = 3
+        return self
+
+    def executemany(self, sql, seq):
+        self.executions.append((sql, list(seq)))
+        self.rowcount = -1
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.autocommit = False
+
+    def cursor(self):
+        return self._cursor
+
+
+class FakeResponse:
+    def __init__(self):
+        self.headers = {}
+
+
+def test_fingerprint_ignores_values_and_list_lengths():
+    a = "SELECT * FROM dbo.JobOfferings WHERE Id IN (?, ?, ?) AND Title = N'x' -- note"
+    b = "SELECT *   FROM dbo.JobOfferings\n WHERE Id IN (?) AND Title = N'other'"
+    assert sql_fingerprint(a) == sql_fingerprint(b)
+    assert normalize_sql("SELECT TOP (5000) _SortKey0 FROM t") == "SELECT TOP (?) _SortKey0 FROM t"
+    assert normalize_sql("VALUES (?, ?), (?, ?), (?, ?)") == "VALUES (?)"
+
+
+def test_request_summary_counts_statements_rows_and_sets_server_timing():
+    raw = FakeCursor(rows=[(1,), (2,)])
+    conn = instrument_connection(FakeConnection(raw))
+
+    @track_request
+    def handler(req):
+        cur = conn.cursor()
+        cur.fast_executemany = True
+        assert cur.execute("SELECT Id FROM dbo.JobOfferings WHERE UserId = ?", "u").fetchall() == [(1,), (2,)]
+        cur.execute("UPDATE dbo.UserJobCounters SET Value = Value + 1")
+        return FakeResponse()
+
+    resp = handler("req")
+
+    assert raw.fast_executemany is True
+    assert 'sql;dur=' in resp.headers["Server-Timing"]
+    assert '"2 statements"' in resp.headers["Server-Timing"]
+    assert handler.__name__ == "handler"
+
+
+def test_slow_statements_are_logged(monkeypatch, caplog):
+    monkeypatch.setenv("SQL_SLOW_QUERY_MS", "0.000001")
+    conn = instrument_connection(FakeConnection(FakeCursor(rows=[(1,)])))
+
+    token = begin_request("test")
+    with caplog.at_level(logging.INFO):
+        conn.cursor().execute("SELECT 1 WHERE 1 = ?", 1).fetchone()
+        stats = end_request(token)
+
+    assert stats.sql_count == 1
+    assert stats.records[0].rows == 1
+    assert any("sql_slow" in r.getMessage() for r in caplog.records)
+    assert any("sql_summary route=test sql_count=1" in r.getMessage() for r in caplog.records)
+
+
+def test_disabled_returns_plain_connection(monkeypatch):
+    monkeypatch.setenv("SQL_INSTRUMENTATION_ENABLED", "0")
+    raw = FakeConnection(FakeCursor())
+    assert instrument_connection(raw) is raw
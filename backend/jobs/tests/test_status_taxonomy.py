@@ -21,3 +21,22 @@ def test_ignored_status_taxonomy_is_consistent():
     assert "Ignored" in final_statuses
     assert status_key("Ignored") == "finished"
     assert status_key("  ignored  ") == "finished"
+
+
+def test_persisted_status_key_and_final_flag():
+    domain_constants = _load_module_globals("helpers/domain_constants.py")
+    status_normalize = _load_module_globals("helpers/status_normalize.py")
+
+    is_final_status = domain_constants["is_final_status"]
+    status_key = status_normalize["status_key"]
+
+    for label in domain_constants["FINAL_STATUSES"]:
+        assert is_final_status(label)
+        assert is_final_status(f"  {label.upper()}  ")
+    assert not is_final_status("Got Offer")
+    assert not is_final_status(None)
+
+    # Singular variants are accepted by the SQL backfill as well
+    assert status_key("More interview Booked") == "booked-more"
+    assert status_key("more interview done") == "done-more"
+    assert status_key("Accepted Offer") == "accepted"
@@ -0,0 +1,41 @@
+# tests/test_status_transitions.py
+from helpers.history import insert_history, insert_status_transition
+
+JOB = "0f8fad5b-d9cb-469f-a165-70867728950e"
+USER = "7c9e6679-7425-40de-944b-e07fc1f90ae7"
+HISTORY = "16fd2706-8baf-433b-82eb-8c7fada847da"
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executions = []
+
+    def execute(self, sql, *params):
+        self.executions.append((sql, params[0] if params else ()))
+
+
+def test_transition_copies_history_row_and_stores_keys():
+    cur = FakeCursor()
+
+    insert_history(cur, JOB, "status_changed", {"userId": USER, "from": "Unset", "to": "Screening Booked"},
+                   "user", USER, history_id=HISTORY)
+    insert_status_transition(cur, HISTORY, JOB, USER, "Unset", "Screening Booked")
+
+    history_sql, history_params = cur.executions[0]
+    assert "(Id, JobOfferingId" in history_sql
+    assert history_params[0] == HISTORY
+
+    sql, params = cur.executions[1]
+    assert "dbo.UserStatusTransitions" in sql
+    assert "h.Timestamp" in sql
+    assert params == (USER, JOB, "unset", "booked-screen", "Screening Booked", HISTORY)
+
+
+def test_history_without_id_keeps_server_default():
+    cur = FakeCursor()
+
+    insert_history(cur, JOB, "job_updated", {"title": "x"}, "user", USER)
+
+    sql, params = cur.executions[0]
+    assert "(JobOfferingId, ActorType" in sql
+    assert params[0] == JOB
@@ -1,8 +1,9 @@
 import azure.functions as func
 from routes import register_all
+from helpers.sql_instrumentation import instrument_http_routes
 
 
 app = func.FunctionApp()
 
 # Register all routes from the routes/ package
-register_all(app)
+register_all(instrument_http_routes(app))
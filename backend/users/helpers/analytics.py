@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
-import socket
 import uuid
 from datetime import datetime, timezone
 from typing import Any, Mapping
-from urllib import error, request
+
+from helpers.analytics_emitter import get_emitter
 
 
 _ALLOWED_SOURCE_SURFACES = {"web"}
@@ -53,7 +52,8 @@ def emit_users_event(
     Design rules:
     - no exception escapes to product route;
     - no retry;
-    - short timeout;
+    - never waits on Analytics: the payload is queued and sent in
+      batches by helpers.analytics_emitter; True means queued;
     - no function keys or full payload in logs;
     - only emits web-originated events in v1.
     """
@@ -101,90 +101,7 @@ def emit_users_event(
         "producerEventId": _optional_str(producer_event_id),
     }
 
-    body = json.dumps(payload).encode("utf-8")
-    timeout = _analytics_timeout_seconds()
-
-    analytics_req = request.Request(
-        f"{base_url}/analytics/events",
-        data=body,
-        method="POST",
-        headers={
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "x-functions-key": function_key,
-        },
-    )
-
-    try:
-        with request.urlopen(analytics_req, timeout=timeout) as response:
-            status = getattr(response, "status", 200)
-            if status >= 400:
-                logging.warning(
-                    "analytics_users_emit_failed event=%s status=%s subject_type=%s subject_id=%s",
-                    event_name,
-                    status,
-                    subject_type,
-                    subject_id,
-                )
-                return False
-            return True
-
-    except error.HTTPError as exc:
-        error_code = _try_read_error_code(exc)
-        logging.warning(
-            "analytics_users_emit_http_failed event=%s status=%s error=%s subject_type=%s subject_id=%s",
-            event_name,
-            exc.code,
-            error_code,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-    except (error.URLError, socket.timeout, TimeoutError) as exc:
-        logging.warning(
-            "analytics_users_emit_request_failed event=%s error_type=%s subject_type=%s subject_id=%s",
-            event_name,
-            type(exc).__name__,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-    except Exception as exc:
-        logging.warning(
-            "analytics_users_emit_unexpected_failed event=%s error_type=%s subject_type=%s subject_id=%s",
-            event_name,
-            type(exc).__name__,
-            subject_type,
-            subject_id,
-        )
-        return False
-
-
-def _try_read_error_code(exc: error.HTTPError) -> str | None:
-    try:
-        raw = exc.read(600).decode("utf-8", errors="replace")
-        data = json.loads(raw)
-        if isinstance(data, dict):
-            value = data.get("error")
-            return str(value) if value else None
-    except Exception:
-        return None
-    return None
-
-
-def _analytics_timeout_seconds() -> float:
-    raw = os.getenv("ANALYTICS_EMIT_TIMEOUT_SECONDS", "2").strip()
-    try:
-        value = float(raw)
-    except ValueError:
-        return 2.0
-
-    if value <= 0:
-        return 2.0
-
-    return min(value, 10.0)
+    return get_emitter("analytics_users").enqueue(payload)
 
 
 def _utc_now_iso() -> str:
@@ -1,18 +1,35 @@
-import logging
 import os
+import logging
+
 import pyodbc
 
+from helpers.sql_pool import ConnectionPool, pool_enabled, pool_settings_from_env
+from helpers.sql_instrumentation import instrument_connection
+
 SQL_CONN_STR = os.getenv("SQL_CONNECTION_STRING")
 
-def get_connection():
+def _connect():
     try:
-        return pyodbc.connect(SQL_CONN_STR, timeout=5)  # Optional: explicitly set timeout
+        return pyodbc.connect(SQL_CONN_STR, timeout=5)
     except pyodbc.InterfaceError as e:
         logging.error("SQL InterfaceError during connect: %s", e)
         raise Exception("Could not connect to the database: network issue or driver failure.")
     except pyodbc.OperationalError as e:
         logging.error("SQL OperationalError during connect: %s", e)
         raise Exception("Could not connect to the database: invalid credentials or timeout.")
-    except Exception as e:
+    except Exception:
         logging.exception("Unhandled database connection error")
         raise Exception("Unexpected error while connecting to the database.")
+
+_POOL = ConnectionPool(_connect, **pool_settings_from_env())
+
+def get_connection():
+    """
+    Returns a connection checked out from the process-wide pool.
+    conn.close() hands it back (after rollback) instead of closing the socket.
+    Set SQL_POOL_ENABLED=0 to get a fresh pyodbc connection every time.
+    Cursors are timed per statement (helpers/sql_instrumentation.py).
+    """
+    if not pool_enabled():
+        return instrument_connection(_connect())
+    return instrument_connection(_POOL.acquire())
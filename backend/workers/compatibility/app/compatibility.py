@@ -1,5 +1,6 @@
 # /app/compatibility.py
 from typing import Any, Dict, List, Optional
+import hashlib
 import json
 
 MAX_SUMMARY_LEN = 1800
@@ -264,11 +265,13 @@ def _normalize_scored_section(obj: Any, default_description: str = "") -> Dict[s
     }
 
 
-def build_prompt(*, job: Dict[str, Any], cv_text: str) -> str:
-    title = _safe_str(job.get("title") or job.get("jobName") or "")
-    desc = _safe_str(job.get("description") or job.get("jobDescription") or "")
-    cv_text = _safe_str(cv_text)
+PROMPT_LAYOUT_JOB_FIRST = "job_first"
+PROMPT_LAYOUT_CV_FIRST = "cv_first"
+PROMPT_LAYOUTS = (PROMPT_LAYOUT_JOB_FIRST, PROMPT_LAYOUT_CV_FIRST)
 
+
+def _response_contract() -> str:
+    """Output shape and interpretation rules; identical for every run."""
     shape = {
         "Description": "string, 1-2 short sentences explaining overall compatibility verdict",
         "Languages": {
@@ -299,17 +302,6 @@ def build_prompt(*, job: Dict[str, Any], cv_text: str) -> str:
     }
 
     return f"""
-Please evaluate the candidate CV versus the job.
-
-JOB_TITLE:
-{title}
-
-JOB_DESCRIPTION:
-{desc}
-
-CANDIDATE_CV_TEXT:
-{cv_text}
-
 Return ONLY a single JSON object with exactly this structure:
 {json.dumps(shape, ensure_ascii=False)}
 
@@ -346,7 +338,57 @@ Bad Description examples:
 - "Results-driven engineer with passion for technology."
 - "I am a hardworking person with excellent communication skills."
 
-No markdown. No extra keys. No extra text.
+No markdown. No extra keys. No extra text.""".strip()
+
+
+def cv_slot(cv_text: str, slots: int) -> int:
+    """Stable llama.cpp slot for a CV so runs sharing its prompt prefix land on one KV cache."""
+    digest = hashlib.sha256(_safe_str(cv_text).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % max(1, slots)
+
+
+def build_prompt(*, job: Dict[str, Any], cv_text: str, layout: str = PROMPT_LAYOUT_JOB_FIRST) -> str:
+    """
+    job_first: job, then CV, then the response contract (original layout).
+    cv_first:  response contract, then CV, then job. Everything before JOB_TITLE is
+               identical for all runs of one CV, so llama.cpp `cache_prompt` can reuse
+               the evaluated prefix when consecutive runs score one CV against many jobs.
+    """
+    title = _safe_str(job.get("title") or job.get("jobName") or "")
+    desc = _safe_str(job.get("description") or job.get("jobDescription") or "")
+    cv_text = _safe_str(cv_text)
+
+    if layout == PROMPT_LAYOUT_CV_FIRST:
+        return f"""
+Please evaluate the candidate CV versus the job given at the end.
+
+{_response_contract()}
+
+CANDIDATE_CV_TEXT:
+{cv_text}
+
+JOB_TITLE:
+{title}
+
+JOB_DESCRIPTION:
+{desc}
+
+Return only the JSON object described above, for this job.
+""".strip()
+
+    return f"""
+Please evaluate the candidate CV versus the job.
+
+JOB_TITLE:
+{title}
+
+JOB_DESCRIPTION:
+{desc}
+
+CANDIDATE_CV_TEXT:
+{cv_text}
+
+{_response_contract()}
 """.strip()
 
 
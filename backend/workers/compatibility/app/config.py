@@ -4,6 +4,8 @@ import yaml
 from dataclasses import dataclass
 from typing import Any, Optional
 
+from .compatibility import PROMPT_LAYOUT_JOB_FIRST, PROMPT_LAYOUTS
+
 
 def _req_env(name: str) -> str:
     v = os.getenv(name)
@@ -32,6 +34,13 @@ def _env_int(name: str, default: int, *, minimum: int, maximum: int) -> int:
     return value
 
 
+def _env_choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    value = (os.getenv(name) or default).strip().lower()
+    if value not in choices:
+        raise RuntimeError(f"{name} must be one of: {', '.join(choices)}")
+    return value
+
+
 def _env_int_tuple(
     name: str,
     default: str,
@@ -135,6 +144,11 @@ class Settings:
     inference_timeout_seconds: int
     inference_health_timeout_seconds: int
     message_lock_renewal_seconds: int
+    concurrency: int
+    sb_prefetch_count: int
+    shutdown_drain_seconds: int
+    prompt_layout: str
+    llama_cpp_slots: int
 
     # yaml-configured
     model: str
@@ -211,6 +225,36 @@ def load_settings(config_path: str = "/app/config.yaml") -> Settings:
             minimum=900,
             maximum=86400,
         ),
+        concurrency=_env_int(
+            "WORKER_CONCURRENCY",
+            1,
+            minimum=1,
+            maximum=16,
+        ),
+        sb_prefetch_count=_env_int(
+            "WORKER_SB_PREFETCH_COUNT",
+            1,
+            minimum=0,
+            maximum=64,
+        ),
+        shutdown_drain_seconds=_env_int(
+            "WORKER_SHUTDOWN_DRAIN_SECONDS",
+            300,
+            minimum=0,
+            maximum=3600,
+        ),
+        prompt_layout=_env_choice(
+            "WORKER_PROMPT_LAYOUT",
+            PROMPT_LAYOUT_JOB_FIRST,
+            PROMPT_LAYOUTS,
+        ),
+        # 0 = same as WORKER_CONCURRENCY
+        llama_cpp_slots=_env_int(
+            "WORKER_LLAMA_CPP_SLOTS",
+            0,
+            minimum=0,
+            maximum=64,
+        ),
 
         model=str(c.get("model", "llama3.1:8b")),
         temperature=float(c.get("temperature", 0.2)),
@@ -58,6 +58,7 @@ class LlamaCppClient:
                 "created": data.get("created"),
                 "finish_reason": choices0.get("finish_reason"),
                 "usage": data.get("usage"),
+                "timings": data.get("timings"),
                 "response_len": len(content_s),
             }
         }
@@ -455,6 +456,8 @@ class LlamaCppClient:
         thinking_budget_tokens: Optional[int] = None,
         reasoning_format: Optional[str] = None,
         format: Any = "json",
+        cache_prompt: Optional[bool] = None,
+        id_slot: Optional[int] = None,
     ) -> Dict[str, Any]:
         url = f"{self.base_url}/v1/chat/completions"
 
@@ -502,6 +505,14 @@ class LlamaCppClient:
         if reasoning_format:
             payload["reasoning_format"] = reasoning_format
 
+        # KV-cache reuse: keep the evaluated prompt in the slot and pin requests that
+        # share a prompt prefix to the same slot (llama-server -np N).
+        if cache_prompt is not None:
+            payload["cache_prompt"] = bool(cache_prompt)
+
+        if id_slot is not None:
+            payload["id_slot"] = int(id_slot)
+
         if use_reasoning_budget:
             # Use llama.cpp native per-request enforcement first. Keep streaming
             # control as a guard if the native reasoning budget does not stop.
@@ -553,7 +564,8 @@ class LlamaCppClient:
         self.log.info(
             "llama.cpp controls model=%s max_tokens=%s thinking_budget_tokens=%s "
             "reasoning_format=%s chat_template_kwargs=%s response_format=%s "
-            "reasoning_budget_tokens=%s reasoning_control=%s fallback_tokens=%s",
+            "reasoning_budget_tokens=%s reasoning_control=%s fallback_tokens=%s "
+            "cache_prompt=%s id_slot=%s",
             payload.get("model"),
             payload.get("max_tokens"),
             budget_tokens,
@@ -567,6 +579,8 @@ class LlamaCppClient:
                 if use_reasoning_budget
                 else None
             ),
+            payload.get("cache_prompt"),
+            payload.get("id_slot"),
         )
 
         try:
@@ -0,0 +1,161 @@
+# app/slots.py
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple, Optional
+
+
+@dataclass(frozen=True)
+class Settlement:
+    """
+    What to do with a Service Bus message once its run has been processed.
+
+    Settlement is always performed by the thread that owns the receiver;
+    slots only decide.
+    """
+    action: str  # "complete" | "abandon" | "dead_letter"
+    reason: Optional[str] = None
+    description: Optional[str] = None
+
+    @staticmethod
+    def complete() -> "Settlement":
+        return Settlement("complete")
+
+    @staticmethod
+    def abandon() -> "Settlement":
+        return Settlement("abandon")
+
+    @staticmethod
+    def dead_letter(reason: str, description: str) -> "Settlement":
+        return Settlement("dead_letter", reason=reason, description=description)
+
+
+class Finished(NamedTuple):
+    msg: Any
+    settlement: Settlement
+    # Receiver the message was received on; its lock cannot be settled through another one.
+    owner: Any
+
+
+def settle(receiver, msg, settlement: Settlement) -> None:
+    if settlement.action == "complete":
+        receiver.complete_message(msg)
+    elif settlement.action == "dead_letter":
+        receiver.dead_letter_message(
+            msg,
+            reason=settlement.reason,
+            error_description=settlement.description,
+        )
+    else:
+        receiver.abandon_message(msg)
+
+
+class SlotPool:
+    """
+    Runs up to `size` messages concurrently, one per slot thread.
+
+    Each slot maps onto one llama.cpp parallel slot (`llama-server -np N`), so
+    while one slot waits on Gateway lease/complete round-trips the others keep
+    inference busy.
+    """
+
+    def __init__(self, size: int, handler: Callable[[Any], Settlement]):
+        self.size = max(1, int(size))
+        self._handler = handler
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="compat-slot")
+        self._in_flight: dict[Future, tuple[Any, Any]] = {}
+        self._lock = threading.Lock()
+        self.log = logging.getLogger("compat-worker.slots")
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def free(self) -> int:
+        return self.size - self.in_flight()
+
+    def submit(self, msg: Any, owner: Any = None) -> None:
+        fut = self._executor.submit(self._handler, msg)
+        with self._lock:
+            self._in_flight[fut] = (msg, owner)
+
+    def wait_any(self, timeout: Optional[float]) -> None:
+        with self._lock:
+            pending = list(self._in_flight)
+        if pending:
+            wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+    def wait_all(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            pending = list(self._in_flight)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def pop_done(self) -> list[Finished]:
+        """Finished messages with their settlement; a slot that raised is abandoned."""
+        done: list[Finished] = []
+        with self._lock:
+            finished = [fut for fut in self._in_flight if fut.done()]
+            for fut in finished:
+                msg, owner = self._in_flight.pop(fut)
+                try:
+                    done.append(Finished(msg, fut.result(), owner))
+                except Exception:
+                    self.log.exception(
+                        "Slot failed without a settlement msgId=%s; abandoning",
+                        getattr(msg, "message_id", None),
+                    )
+                    done.append(Finished(msg, Settlement.abandon(), owner))
+        return done
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+class LlamaSlotAssigner:
+    """
+    Picks the llama.cpp slot (`id_slot`) for each running inference.
+
+    A CV's home slot (cv_slot) keeps its prompt prefix in one KV cache, but pinning
+    every run of a CV there would serialize a user's batch, which is usually one CV.
+    A run takes its home slot when no other run holds it, otherwise the next free slot
+    after it ((home + k) % slots), so same-CV runs spread over the slots instead of
+    queueing on one. Only when every slot is busy (more runs than slots) does a run
+    share its home slot.
+
+    Each worker thread holds at most one slot: acquire() on the slot thread before
+    inference, release() when the run is done.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = max(1, int(slots))
+        self._busy = [0] * self.slots
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def acquire(self, home: int) -> int:
+        self.release()
+        home %= self.slots
+        with self._lock:
+            slot = home
+            for k in range(self.slots):
+                candidate = (home + k) % self.slots
+                if not self._busy[candidate]:
+                    slot = candidate
+                    break
+            self._busy[slot] += 1
+        self._local.slot = slot
+        return slot
+
+    def release(self) -> None:
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            return
+        self._local.slot = None
+        with self._lock:
+            self._busy[slot] -= 1
+
+    def busy(self) -> list[int]:
+        with self._lock:
+            return list(self._busy)
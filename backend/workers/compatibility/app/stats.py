@@ -1,12 +1,17 @@
 # app/stats.py
 import json
 import os
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, asdict
 from typing import Optional
 
 STATS_PATH = os.getenv("WORKER_STATS_PATH", "/tmp/worker_stats.json")
 
+# Throughput is reported over this trailing window.
+THROUGHPUT_WINDOW_SECONDS = 600
+
 def _now() -> str:
     # ISO-ish, seconds resolution
     return time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime())
@@ -21,6 +26,12 @@ class WorkerStats:
     sb_messages: int = 0
     sb_messages_last_at: Optional[str] = None
 
+    sb_connects: int = 0
+    sb_connects_last_at: Optional[str] = None
+
+    sb_reconnects: int = 0
+    sb_reconnects_last_at: Optional[str] = None
+
     leases_ok: int = 0
     leases_ok_last_at: Optional[str] = None
 
@@ -51,31 +62,90 @@ class WorkerStats:
     completes_failed: int = 0
     completes_failed_last_at: Optional[str] = None
 
+    # Concurrency / throughput
+    concurrency: int = 1
+    in_flight: int = 0
+    runs_finished: int = 0
+    run_seconds_avg: Optional[float] = None
+    throughput_runs_per_minute: float = 0.0
+
+    # llama.cpp prompt cache (from response timings)
+    prompt_tokens_evaluated: int = 0
+    prompt_tokens_cached: int = 0
+    prompt_cache_hits: int = 0
+    prompt_cache_hits_last_at: Optional[str] = None
+
 class Stats:
     def __init__(self) -> None:
         self.s = WorkerStats(started_at=_now())
+        # Slots bump counters concurrently; flush must not interleave writes to the tmp file.
+        self._lock = threading.RLock()
+        self._started = time.monotonic()
+        self._finished_at: deque[float] = deque()
+        self._run_seconds_total = 0.0
         self.flush()
 
-    def bump(self, field: str, ts_field: str) -> None:
-        # Be resilient: don't crash the worker if a new stat name is used
-        # but wasn't added to WorkerStats yet.
-        cur = getattr(self.s, field, None)
-        if cur is None:
-            cur = 0
-            setattr(self.s, field, cur)
-        setattr(self.s, field, int(cur) + 1)
+    def set(self, field: str, value) -> None:
+        with self._lock:
+            setattr(self.s, field, value)
+
+    def record_prompt_timings(self, timings) -> None:
+        """
+        Account llama.cpp `timings`: prompt_n tokens were evaluated for this request,
+        cache_n tokens were reused from the slot's KV cache (prompt-eval saved).
+        """
+        if not isinstance(timings, dict):
+            return
+        try:
+            evaluated = int(timings.get("prompt_n") or 0)
+            cached = int(timings.get("cache_n") or 0)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self.s.prompt_tokens_evaluated += max(0, evaluated)
+            self.s.prompt_tokens_cached += max(0, cached)
+            if cached > 0:
+                self.bump("prompt_cache_hits", "prompt_cache_hits_last_at")
+
+    def record_run(self, seconds: float) -> None:
+        """One run finished (completed or failed) after `seconds` in a slot."""
+        with self._lock:
+            now = time.monotonic()
+            self._finished_at.append(now)
+            self._run_seconds_total += max(0.0, seconds)
+            self.s.runs_finished += 1
+            self.s.run_seconds_avg = round(self._run_seconds_total / self.s.runs_finished, 2)
+            self._update_throughput(now)
+
+    def _update_throughput(self, now: float) -> None:
+        while self._finished_at and now - self._finished_at[0] > THROUGHPUT_WINDOW_SECONDS:
+            self._finished_at.popleft()
+        window = min(THROUGHPUT_WINDOW_SECONDS, max(now - self._started, 1.0))
+        self.s.throughput_runs_per_minute = round(len(self._finished_at) * 60.0 / window, 2)
 
-        # Timestamp field may also be new/missing; set it unconditionally.
-        setattr(self.s, ts_field, _now())        
+    def bump(self, field: str, ts_field: str) -> None:
+        with self._lock:
+            # Be resilient: don't crash the worker if a new stat name is used
+            # but wasn't added to WorkerStats yet.
+            cur = getattr(self.s, field, None)
+            if cur is None:
+                cur = 0
+                setattr(self.s, field, cur)
+            setattr(self.s, field, int(cur) + 1)
+
+            # Timestamp field may also be new/missing; set it unconditionally.
+            setattr(self.s, ts_field, _now())
 
     def error(self) -> None:
         self.bump("errors", "errors_last_at")
 
     def flush(self) -> None:
-        tmp = STATS_PATH + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(asdict(self.s), f, indent=2)
-        os.replace(tmp, STATS_PATH)
+        with self._lock:
+            self._update_throughput(time.monotonic())
+            tmp = STATS_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(self.s), f, indent=2)
+            os.replace(tmp, STATS_PATH)
 
 def load_stats() -> dict:
     with open(STATS_PATH, "r", encoding="utf-8") as f:
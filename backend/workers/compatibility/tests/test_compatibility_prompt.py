@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+
+from app.compatibility import PROMPT_LAYOUT_CV_FIRST, build_prompt, cv_slot
+
+
+class PromptLayoutTests(unittest.TestCase):
+    def test_cv_first_prompts_for_one_cv_share_everything_before_the_job(self):
+        cv_text = "Senior Python engineer, 8 years Azure."
+        a = build_prompt(job={"title": "Data Engineer", "description": "Spark"}, cv_text=cv_text, layout=PROMPT_LAYOUT_CV_FIRST)
+        b = build_prompt(job={"title": "Backend Dev", "description": "Django"}, cv_text=cv_text, layout=PROMPT_LAYOUT_CV_FIRST)
+
+        prefix = a[: a.index("JOB_TITLE:")]
+        self.assertTrue(b.startswith(prefix))
+        self.assertIn(cv_text, prefix)
+        self.assertIn("Return ONLY a single JSON object", prefix)
+
+    def test_default_layout_keeps_job_before_cv(self):
+        prompt = build_prompt(job={"title": "Data Engineer", "description": "Spark"}, cv_text="CV body")
+
+        self.assertLess(prompt.index("JOB_TITLE:"), prompt.index("CANDIDATE_CV_TEXT:"))
+        self.assertLess(prompt.index("CANDIDATE_CV_TEXT:"), prompt.index("Return ONLY a single JSON object"))
+
+    def test_cv_slot_is_stable_and_within_range(self):
+        self.assertEqual(cv_slot("cv one", 4), cv_slot("cv one", 4))
+        self.assertTrue(all(0 <= cv_slot(f"cv {i}", 3) < 3 for i in range(20)))
+        self.assertEqual(cv_slot("anything", 0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -280,6 +280,38 @@ class LlamaCppClientTests(unittest.TestCase):
 
         self.assertTrue(stream_response.closed)
 
+    def test_prompt_cache_controls_are_sent_and_timings_surface_in_envelope(self):
+        self.client.session.post.return_value = FakeResponse(
+            json_data={
+                "id": "chatcmpl-cache",
+                "model": "model-a",
+                "created": 1,
+                "choices": [
+                    {
+                        "message": {"content": '{"score": 3}'},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "timings": {"prompt_n": 120, "cache_n": 2400},
+            }
+        )
+
+        result = self.client.generate_json(
+            model="model-a",
+            prompt="prompt",
+            system="system",
+            temperature=0.2,
+            top_p=0.95,
+            format=None,
+            cache_prompt=True,
+            id_slot=2,
+        )
+
+        _, kwargs = self.client.session.post.call_args
+        self.assertTrue(kwargs["json"]["cache_prompt"])
+        self.assertEqual(kwargs["json"]["id_slot"], 2)
+        self.assertEqual(result["__llama_cpp"]["timings"], {"prompt_n": 120, "cache_n": 2400})
+
 
 if __name__ == "__main__":
     unittest.main()
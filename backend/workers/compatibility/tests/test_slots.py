@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from app.slots import LlamaSlotAssigner, Settlement, SlotPool, settle
+
+
+class SlotPoolTests(unittest.TestCase):
+    def test_runs_up_to_size_messages_concurrently(self):
+        release = threading.Event()
+        started = []
+        lock = threading.Lock()
+
+        def handler(msg):
+            with lock:
+                started.append(msg)
+            release.wait(timeout=5)
+            return Settlement.complete()
+
+        pool = SlotPool(2, handler)
+        try:
+            pool.submit("m1")
+            pool.submit("m2")
+            self.assertEqual(pool.free(), 0)
+            self.assertEqual(pool.pop_done(), [])
+
+            release.set()
+            pool.wait_all(timeout=5)
+            done = pool.pop_done()
+        finally:
+            pool.shutdown()
+
+        self.assertEqual(sorted(f.msg for f in done), ["m1", "m2"])
+        self.assertTrue(all(f.settlement.action == "complete" for f in done))
+        self.assertEqual(pool.free(), 2)
+
+    def test_slot_that_raises_is_abandoned(self):
+        def handler(msg):
+            raise RuntimeError("boom")
+
+        pool = SlotPool(1, handler)
+        try:
+            pool.submit("m1", owner="receiver-1")
+            pool.wait_all(timeout=5)
+            done = pool.pop_done()
+        finally:
+            pool.shutdown()
+
+        self.assertEqual(done, [("m1", Settlement.abandon(), "receiver-1")])
+
+    def test_settle_maps_actions_to_receiver_calls(self):
+        receiver = Mock()
+
+        settle(receiver, "m1", Settlement.complete())
+        settle(receiver, "m2", Settlement.abandon())
+        settle(receiver, "m3", Settlement.dead_letter("BadMessage", "Missing runId"))
+
+        receiver.complete_message.assert_called_once_with("m1")
+        receiver.abandon_message.assert_called_once_with("m2")
+        receiver.dead_letter_message.assert_called_once_with(
+            "m3",
+            reason="BadMessage",
+            error_description="Missing runId",
+        )
+
+
+class LlamaSlotAssignerTests(unittest.TestCase):
+    def _acquire_on_threads(self, assigner, homes):
+        slots = []
+
+        def run(home):
+            slots.append(assigner.acquire(home))
+
+        for home in homes:
+            t = threading.Thread(target=run, args=(home,))
+            t.start()
+            t.join()
+        return slots
+
+    def test_same_cv_runs_spread_over_free_slots(self):
+        assigner = LlamaSlotAssigner(4)
+
+        slots = self._acquire_on_threads(assigner, [2, 2, 2, 2])
+
+        self.assertEqual(slots, [2, 3, 0, 1])
+
+    def test_home_slot_is_reused_once_released(self):
+        assigner = LlamaSlotAssigner(4)
+
+        self.assertEqual(assigner.acquire(1), 1)
+        assigner.release()
+        self.assertEqual(assigner.acquire(5), 1)
+        self.assertEqual(assigner.busy(), [0, 1, 0, 0])
+
+    def test_runs_share_home_slot_only_when_all_slots_are_busy(self):
+        assigner = LlamaSlotAssigner(2)
+
+        slots = self._acquire_on_threads(assigner, [0, 0, 1])
+
+        self.assertEqual(slots, [0, 1, 1])
+        self.assertEqual(assigner.busy(), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
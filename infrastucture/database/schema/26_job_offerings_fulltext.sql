@@ -0,0 +1,36 @@
+-- 26_job_offerings_fulltext.sql
+-- Full-text index backing GET /jobs search_field=title_company|description
+-- (enabled in the Jobs app with JOBS_FULLTEXT_SEARCH_ENABLED=1).
+--
+-- CHANGE_TRACKING = AUTO keeps the index in sync with inserts/updates from
+-- jobs_create / jobs_update without any application-side feeding.
+-- STOPLIST = OFF so that AND-ed prefix terms never silently drop noise words.
+--
+-- CREATE FULLTEXT CATALOG / INDEX cannot run inside a user transaction.
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.fulltext_catalogs WHERE name = N'FTC_Ehestifter'
+)
+BEGIN
+    CREATE FULLTEXT CATALOG FTC_Ehestifter;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.fulltext_indexes
+    WHERE object_id = OBJECT_ID(N'dbo.JobOfferings')
+)
+BEGIN
+    CREATE FULLTEXT INDEX ON dbo.JobOfferings
+    (
+        Title,
+        HiringCompanyName,
+        PostingCompanyName,
+        Description
+    )
+    KEY INDEX PK_JobOfferings
+    ON FTC_Ehestifter
+    WITH (CHANGE_TRACKING = AUTO, STOPLIST = OFF);
+END
+GO
@@ -0,0 +1,82 @@
+-- Enrichment result memoization.
+--
+-- A compatibility result is a function of the CV text (UserPreferences.CVVersionId
+-- is its sha256), the job fields the worker puts in the prompt (title + description,
+-- hashed into JobContentHash), the model and the prompt version. Runs record the key
+-- they were created under; successful completions store their result under that key
+-- and later run creation with the same key completes immediately from the cache.
+
+IF COL_LENGTH('dbo.EnrichmentRuns', 'JobContentHash') IS NULL
+BEGIN
+    ALTER TABLE dbo.EnrichmentRuns ADD JobContentHash NVARCHAR(64) NULL;   -- sha256 hex of prompt job fields
+END
+GO
+
+IF COL_LENGTH('dbo.EnrichmentRuns', 'ModelId') IS NULL
+BEGIN
+    ALTER TABLE dbo.EnrichmentRuns ADD ModelId NVARCHAR(128) NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.EnrichmentRuns', 'PromptVersion') IS NULL
+BEGIN
+    ALTER TABLE dbo.EnrichmentRuns ADD PromptVersion NVARCHAR(64) NULL;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.objects
+    WHERE object_id = OBJECT_ID(N'[dbo].[EnrichmentResultCache]') AND type = 'U'
+)
+BEGIN
+    CREATE TABLE dbo.EnrichmentResultCache
+    (
+        EnricherType   NVARCHAR(128) NOT NULL,
+        CVVersionId    NVARCHAR(64)  NOT NULL,
+        JobContentHash NVARCHAR(64)  NOT NULL,
+        ModelId        NVARCHAR(128) NOT NULL,
+        PromptVersion  NVARCHAR(64)  NOT NULL,
+
+        ResultJson NVARCHAR(MAX) NOT NULL,
+
+        -- Provenance: the run that actually ran inference, and its subject.
+        SourceRunId   UNIQUEIDENTIFIER NOT NULL,
+        JobOfferingId UNIQUEIDENTIFIER NOT NULL,
+        UserId        UNIQUEIDENTIFIER NOT NULL,
+
+        CreatedAt datetime2 NOT NULL,
+        LastHitAt datetime2 NULL,
+        HitCount  INT NOT NULL CONSTRAINT DF_EnrichmentResultCache_HitCount DEFAULT (0),
+
+        CONSTRAINT PK_EnrichmentResultCache PRIMARY KEY
+            (EnricherType, CVVersionId, JobContentHash, ModelId, PromptVersion),
+        CONSTRAINT CK_EnrichmentResultCache_Result_IsJson CHECK (ISJSON(ResultJson) = 1)
+    );
+END
+GO
+
+-- Invalidation on job edits: drop entries for a job whose content hash moved on
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_EnrichmentResultCache_Job'
+      AND object_id = OBJECT_ID(N'[dbo].[EnrichmentResultCache]')
+)
+BEGIN
+    CREATE INDEX IX_EnrichmentResultCache_Job
+    ON dbo.EnrichmentResultCache (JobOfferingId, EnricherType)
+    INCLUDE (JobContentHash);
+END
+GO
+
+-- Invalidation on CV edits: drop entries for a user whose CV version moved on
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'IX_EnrichmentResultCache_User'
+      AND object_id = OBJECT_ID(N'[dbo].[EnrichmentResultCache]')
+)
+BEGIN
+    CREATE INDEX IX_EnrichmentResultCache_User
+    ON dbo.EnrichmentResultCache (UserId, EnricherType)
+    INCLUDE (CVVersionId);
+END
+GO
@@ -0,0 +1,29 @@
+SET XACT_ABORT ON;
+BEGIN TRANSACTION;
+
+------------------------------------------------------------
+-- CompatibilityScores: per-user ranking for GET /jobs?sort=compat_desc
+-- and the category='open' feed (Score > threshold, best first).
+-- Key order matches the list ORDER BY (Score DESC, JobOfferingId ASC)
+-- so a page is one ordered range seek, and keyset paging on
+-- (Score, JobOfferingId) continues the same seek.
+------------------------------------------------------------
+IF OBJECT_ID(N'dbo.CompatibilityScores', N'U') IS NULL
+BEGIN
+    RAISERROR('dbo.CompatibilityScores does not exist.', 16, 1);
+    ROLLBACK TRANSACTION;
+    RETURN;
+END;
+
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE name = N'IX_CompatibilityScores_User_ScoreDesc'
+      AND object_id = OBJECT_ID(N'dbo.CompatibilityScores')
+)
+BEGIN
+    CREATE INDEX IX_CompatibilityScores_User_ScoreDesc
+        ON dbo.CompatibilityScores (UserId, Score DESC, JobOfferingId);
+END;
+
+COMMIT TRANSACTION;
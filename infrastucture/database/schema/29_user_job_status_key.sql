@@ -0,0 +1,108 @@
+-- UserJobStatus: persisted status key and final flag.
+--
+-- List filters (GET /jobs ignore_status_k, category='my', sort=status_progression,
+-- GET /jobs/with-statuses) used to normalize Status per row with LOWER/LTRIM/CASE,
+-- which no index can serve. Jobs now writes StatusKey (helpers.status_normalize.status_key)
+-- and IsFinal (helpers.domain_constants.is_final_status) with every status upsert;
+-- this script adds the columns, backfills existing rows and indexes them.
+
+IF COL_LENGTH('dbo.UserJobStatus', 'StatusKey') IS NULL
+BEGIN
+    ALTER TABLE dbo.UserJobStatus
+    ADD StatusKey VARCHAR(32) NOT NULL
+        CONSTRAINT DF_UserJobStatus_StatusKey DEFAULT ('default');
+END
+GO
+
+IF COL_LENGTH('dbo.UserJobStatus', 'IsFinal') IS NULL
+BEGIN
+    ALTER TABLE dbo.UserJobStatus
+    ADD IsFinal BIT NOT NULL
+        CONSTRAINT DF_UserJobStatus_IsFinal DEFAULT (0);
+END
+GO
+
+-- Backfill (idempotent: recomputes from Status; mirrors status_key_case_sql)
+UPDATE us
+SET StatusKey = k.StatusKey,
+    IsFinal = k.IsFinal
+FROM dbo.UserJobStatus us
+CROSS APPLY (
+    SELECT LOWER(LTRIM(RTRIM(us.Status))) AS Base
+) b
+CROSS APPLY (
+    SELECT
+        CASE
+          WHEN b.Base = 'unset' THEN 'unset'
+          WHEN b.Base = 'applied' THEN 'applied'
+          WHEN b.Base = 'screening booked' THEN 'booked-screen'
+          WHEN b.Base = 'hm interview booked' THEN 'booked-hm'
+          WHEN b.Base IN ('more interviews booked','more interview booked') THEN 'booked-more'
+          WHEN b.Base = 'screening done' THEN 'done-screen'
+          WHEN b.Base = 'hm interview done' THEN 'done-hm'
+          WHEN b.Base IN ('more interviews done','more interview done') THEN 'done-more'
+          WHEN b.Base = 'got offer' THEN 'offer'
+          WHEN b.Base = 'accepted offer' THEN 'accepted'
+          WHEN b.Base IN (
+            'rejected with filled',
+            'rejected with unfortunately',
+            'turned down offer',
+            'withdrew applications',
+            'ignored'
+          ) THEN 'finished'
+          ELSE 'default'
+        END AS StatusKey,
+        CASE
+          WHEN b.Base IN (
+            'rejected with filled',
+            'rejected with unfortunately',
+            'accepted offer',
+            'turned down offer',
+            'withdrew applications',
+            'ignored'
+          ) THEN CAST(1 AS BIT)
+          ELSE CAST(0 AS BIT)
+        END AS IsFinal
+) k
+WHERE us.StatusKey <> k.StatusKey
+   OR us.IsFinal <> k.IsFinal;
+GO
+
+-- category='my' and /jobs/with-statuses: this user's non-final statuses
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE name = N'IX_UserJobStatus_User_Final_Key'
+      AND object_id = OBJECT_ID(N'dbo.UserJobStatus')
+)
+BEGIN
+    CREATE INDEX IX_UserJobStatus_User_Final_Key
+        ON dbo.UserJobStatus (UserId, IsFinal, StatusKey)
+        INCLUDE (JobOfferingId, Status, LastUpdated);
+END
+GO
+
+-- Job-driven join in GET /jobs reads StatusKey/IsFinal: keep it covering
+IF EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE name = N'IX_UserJobStatus_JobUser_Incl'
+      AND object_id = OBJECT_ID(N'dbo.UserJobStatus')
+)
+AND NOT EXISTS (
+    SELECT 1
+    FROM sys.index_columns ic
+    JOIN sys.indexes i
+      ON i.object_id = ic.object_id
+     AND i.index_id = ic.index_id
+    WHERE i.name = N'IX_UserJobStatus_JobUser_Incl'
+      AND i.object_id = OBJECT_ID(N'dbo.UserJobStatus')
+      AND COL_NAME(ic.object_id, ic.column_id) = N'StatusKey'
+)
+BEGIN
+    CREATE INDEX IX_UserJobStatus_JobUser_Incl
+        ON dbo.UserJobStatus (JobOfferingId, UserId)
+        INCLUDE (Status, LastUpdated, StatusKey, IsFinal)
+        WITH (DROP_EXISTING = ON);
+END
+GO
@@ -0,0 +1,109 @@
+-- JobOfferings.PrimaryLocationKey and location facet aggregates.
+--
+-- PrimaryLocationKey = "<CountryName>|<CityName>" of the job's first location by
+-- (CountryName, CityName), '' without locations. Jobs maintains it on every
+-- location write (backend/jobs/helpers/locations.py); sort=location_az reads it
+-- through a filtered index instead of a correlated TOP 1 per candidate row.
+--
+-- Facet counts for GET /jobs/facets come from two indexed views, which SQL Server
+-- keeps up to date inside the writing transaction:
+--   dbo.JobLocationFacets   -- live job locations per (country, city, remote type)
+--   dbo.JobRemoteTypeFacets -- live jobs per remote type
+
+IF COL_LENGTH('dbo.JobOfferings', 'PrimaryLocationKey') IS NULL
+BEGIN
+    ALTER TABLE dbo.JobOfferings
+    ADD PrimaryLocationKey NVARCHAR(402) NOT NULL
+        CONSTRAINT DF_JobOfferings_PrimaryLocationKey DEFAULT (N'');
+END
+GO
+
+-- Backfill (idempotent)
+UPDATE j
+SET PrimaryLocationKey = k.LocationKey
+FROM dbo.JobOfferings j
+CROSS APPLY (
+    SELECT COALESCE((
+        SELECT TOP 1 CONCAT(COALESCE(l.CountryName, N''), N'|', COALESCE(l.CityName, N''))
+        FROM dbo.JobOfferingLocations l
+        WHERE l.JobOfferingId = j.Id
+        ORDER BY l.CountryName, l.CityName
+    ), N'') AS LocationKey
+) k
+WHERE j.PrimaryLocationKey <> k.LocationKey;
+GO
+
+-- sort=location_az: (PrimaryLocationKey ASC, CreatedAt DESC, Id DESC) on live jobs
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE name = N'IX_JobOfferings_Live_PrimaryLocationKey'
+      AND object_id = OBJECT_ID(N'dbo.JobOfferings')
+)
+BEGIN
+    CREATE INDEX IX_JobOfferings_Live_PrimaryLocationKey
+        ON dbo.JobOfferings (PrimaryLocationKey, CreatedAt DESC, Id DESC)
+        WHERE IsDeleted = 0;
+END
+GO
+
+IF OBJECT_ID(N'dbo.JobLocationFacets', N'V') IS NULL
+BEGIN
+    EXEC(N'
+    CREATE VIEW dbo.JobLocationFacets
+    WITH SCHEMABINDING
+    AS
+    SELECT
+        l.CountryName,
+        l.CountryCode,
+        l.CityName,
+        j.RemoteType,
+        COUNT_BIG(*) AS JobCount
+    FROM dbo.JobOfferingLocations l
+    JOIN dbo.JobOfferings j
+      ON j.Id = l.JobOfferingId
+    WHERE j.IsDeleted = 0
+    GROUP BY l.CountryName, l.CountryCode, l.CityName, j.RemoteType;
+    ');
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE name = N'UX_JobLocationFacets'
+      AND object_id = OBJECT_ID(N'dbo.JobLocationFacets')
+)
+BEGIN
+    CREATE UNIQUE CLUSTERED INDEX UX_JobLocationFacets
+        ON dbo.JobLocationFacets (CountryName, CityName, CountryCode, RemoteType);
+END
+GO
+
+IF OBJECT_ID(N'dbo.JobRemoteTypeFacets', N'V') IS NULL
+BEGIN
+    EXEC(N'
+    CREATE VIEW dbo.JobRemoteTypeFacets
+    WITH SCHEMABINDING
+    AS
+    SELECT
+        j.RemoteType,
+        COUNT_BIG(*) AS JobCount
+    FROM dbo.JobOfferings j
+    WHERE j.IsDeleted = 0
+    GROUP BY j.RemoteType;
+    ');
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1
+    FROM sys.indexes
+    WHERE name = N'UX_JobRemoteTypeFacets'
+      AND object_id = OBJECT_ID(N'dbo.JobRemoteTypeFacets')
+)
+BEGIN
+    CREATE UNIQUE CLUSTERED INDEX UX_JobRemoteTypeFacets
+        ON dbo.JobRemoteTypeFacets (RemoteType);
+END
+GO
@@ -0,0 +1,74 @@
+-- Per-user job list counters.
+--
+-- One row per (UserId, CounterKey): 'my', 'open' and 'status:<StatusKey>' (schema 29).
+-- Jobs keeps them current in the same transaction as status puts, job create/delete
+-- and compatibility projection upserts (backend/jobs/helpers/counters.py) and serves
+-- them from GET /jobs/counts and as the default total of unfiltered GET /jobs pages.
+-- A user without a 'my' row is recounted from the base tables on first read.
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.objects
+    WHERE object_id = OBJECT_ID(N'[dbo].[UserJobCounters]') AND type = 'U'
+)
+BEGIN
+    CREATE TABLE dbo.UserJobCounters
+    (
+        UserId     UNIQUEIDENTIFIER NOT NULL,
+        CounterKey VARCHAR(40)      NOT NULL,
+        JobCount   INT              NOT NULL,
+        UpdatedAt  DATETIME2        NOT NULL
+            CONSTRAINT DF_UserJobCounters_UpdatedAt DEFAULT SYSDATETIME(),
+
+        CONSTRAINT PK_UserJobCounters PRIMARY KEY (UserId, CounterKey)
+    );
+END
+GO
+
+-- Initial counts for every user with any list membership (only when the table is empty)
+IF NOT EXISTS (SELECT 1 FROM dbo.UserJobCounters)
+BEGIN
+    ;WITH MyParts AS (
+        SELECT us.UserId, COUNT(*) AS JobCount
+        FROM dbo.UserJobStatus us
+        JOIN dbo.JobOfferings j ON j.Id = us.JobOfferingId AND j.IsDeleted = 0
+        WHERE us.IsFinal = 0
+        GROUP BY us.UserId
+        UNION ALL
+        SELECT j.CreatedByUserId, COUNT(*)
+        FROM dbo.JobOfferings j
+        WHERE j.CreatedByUserId IS NOT NULL AND j.IsDeleted = 0
+          AND NOT EXISTS (
+              SELECT 1 FROM dbo.UserJobStatus us
+              WHERE us.JobOfferingId = j.Id AND us.UserId = j.CreatedByUserId
+          )
+        GROUP BY j.CreatedByUserId
+    ),
+    OpenCounts AS (
+        SELECT cs.UserId, COUNT(*) AS JobCount
+        FROM dbo.CompatibilityScores cs
+        JOIN dbo.JobOfferings j ON j.Id = cs.JobOfferingId AND j.IsDeleted = 0
+        LEFT JOIN dbo.UserJobStatus us ON us.JobOfferingId = cs.JobOfferingId AND us.UserId = cs.UserId
+        WHERE cs.Score > 5.0
+          AND us.UserId IS NULL
+          AND (j.CreatedByUserId IS NULL OR j.CreatedByUserId <> cs.UserId)
+        GROUP BY cs.UserId
+    ),
+    Users AS (
+        SELECT UserId FROM MyParts
+        UNION
+        SELECT UserId FROM OpenCounts
+    )
+    INSERT INTO dbo.UserJobCounters (UserId, CounterKey, JobCount)
+    SELECT u.UserId, 'my', COALESCE((SELECT SUM(m.JobCount) FROM MyParts m WHERE m.UserId = u.UserId), 0)
+    FROM Users u
+    UNION ALL
+    SELECT u.UserId, 'open', COALESCE((SELECT o.JobCount FROM OpenCounts o WHERE o.UserId = u.UserId), 0)
+    FROM Users u
+    UNION ALL
+    SELECT us.UserId, CONCAT('status:', us.StatusKey), COUNT(*)
+    FROM dbo.UserJobStatus us
+    JOIN dbo.JobOfferings j ON j.Id = us.JobOfferingId AND j.IsDeleted = 0
+    WHERE us.UserId IN (SELECT UserId FROM Users)
+    GROUP BY us.UserId, us.StatusKey;
+END
+GO
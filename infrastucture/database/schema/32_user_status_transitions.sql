@@ -0,0 +1,191 @@
+-- UserStatusTransitions: narrow event table for status reports.
+--
+-- GET /jobs/reports/status used to scan this user's JobOfferingHistory rows and
+-- parse Details JSON per row to find the new status. Jobs now writes one row here
+-- next to every 'status_changed' history entry (helpers.history.insert_status_transition),
+-- so a report is a single (UserId, Timestamp) range seek.
+--
+-- FromKey/ToKey are helpers.status_normalize.status_key values; ToStatus keeps the
+-- label the user picked because reports show labels and keys are lossy ('finished').
+-- HistoryId links a row to the history entry it mirrors and makes the backfill below
+-- safe to re-run.
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.objects
+    WHERE object_id = OBJECT_ID(N'[dbo].[UserStatusTransitions]') AND type = 'U'
+)
+BEGIN
+    CREATE TABLE dbo.UserStatusTransitions
+    (
+        Id            BIGINT IDENTITY(1,1) NOT NULL,
+        UserId        UNIQUEIDENTIFIER NOT NULL,
+        Timestamp     DATETIME2 NOT NULL,
+        JobOfferingId UNIQUEIDENTIFIER NOT NULL,
+        FromKey       VARCHAR(32) NOT NULL,
+        ToKey         VARCHAR(32) NOT NULL,
+        ToStatus      NVARCHAR(100) NOT NULL,
+        HistoryId     UNIQUEIDENTIFIER NULL,
+
+        CONSTRAINT PK_UserStatusTransitions PRIMARY KEY NONCLUSTERED (Id)
+    );
+END
+GO
+
+-- Reports read one user's transitions in a time window
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = N'CIX_UserStatusTransitions_User_Timestamp'
+      AND object_id = OBJECT_ID(N'dbo.UserStatusTransitions')
+)
+BEGIN
+    CREATE CLUSTERED INDEX CIX_UserStatusTransitions_User_Timestamp
+        ON dbo.UserStatusTransitions (UserId, Timestamp, Id);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = N'UX_UserStatusTransitions_HistoryId'
+      AND object_id = OBJECT_ID(N'dbo.UserStatusTransitions')
+)
+BEGIN
+    CREATE UNIQUE INDEX UX_UserStatusTransitions_HistoryId
+        ON dbo.UserStatusTransitions (HistoryId)
+        WHERE HistoryId IS NOT NULL;
+END
+GO
+
+-- One-off backfill from existing history (idempotent: skips history rows already mirrored).
+-- Understands the same formats the report used to parse:
+--   Action 'status:<label>', or Action 'status_changed'/'status-changed' with Details
+--   {"to"|"status": ...} or wrapped {"v":1,"kind":...,"data":{"from":...,"to":...}}.
+-- FromKey uses the recorded 'from' label, else the previous transition of the same
+-- (user, job), else 'unset'. Rows are staged once, then inserted in batches to keep
+-- the transaction log small.
+IF OBJECT_ID('tempdb..#StatusHistory') IS NOT NULL
+    DROP TABLE #StatusHistory;
+
+SELECT
+    h.Id AS HistoryId,
+    h.ActorId AS UserId,
+    h.Timestamp,
+    h.JobOfferingId,
+    CAST(s.FromStatus AS NVARCHAR(100)) AS FromStatus,
+    CAST(s.ToStatus AS NVARCHAR(100)) AS ToStatus
+INTO #StatusHistory
+FROM dbo.JobOfferingHistory h
+CROSS APPLY (
+    SELECT
+        CASE WHEN ISJSON(h.Details) = 1 THEN
+            COALESCE(JSON_VALUE(h.Details, '$.data.from'), JSON_VALUE(h.Details, '$.from'))
+        END AS FromStatus,
+        CASE
+          WHEN h.Action LIKE N'status:_%' THEN SUBSTRING(h.Action, 8, 100)
+          WHEN ISJSON(h.Details) = 1 THEN
+            COALESCE(
+                JSON_VALUE(h.Details, '$.to'),
+                JSON_VALUE(h.Details, '$.status'),
+                JSON_VALUE(h.Details, '$.data.to'),
+                JSON_VALUE(h.Details, '$.data.status')
+            )
+        END AS ToStatus
+) s
+WHERE h.ActorType = N'user'
+  AND h.ActorId IS NOT NULL
+  AND h.JobOfferingId IS NOT NULL
+  AND h.Timestamp IS NOT NULL
+  AND (
+        h.Action IN (N'status_changed', N'status-changed')
+     OR h.Action LIKE N'status:%'
+  )
+  AND s.ToStatus IS NOT NULL
+  AND NOT EXISTS (
+      SELECT 1 FROM dbo.UserStatusTransitions t
+      WHERE t.HistoryId = h.Id
+  );
+
+UPDATE sh
+SET FromStatus = ISNULL(p.PrevStatus, N'Unset')
+FROM #StatusHistory sh
+JOIN (
+    SELECT
+        HistoryId,
+        LAG(ToStatus) OVER (
+            PARTITION BY UserId, JobOfferingId
+            ORDER BY Timestamp, HistoryId
+        ) AS PrevStatus
+    FROM #StatusHistory
+) p ON p.HistoryId = sh.HistoryId
+WHERE sh.FromStatus IS NULL;
+
+CREATE CLUSTERED INDEX CIX_StatusHistory ON #StatusHistory (HistoryId);
+
+DECLARE @batch INT = 5000;
+DECLARE @rows INT = 1;
+
+WHILE @rows > 0
+BEGIN
+    INSERT INTO dbo.UserStatusTransitions (UserId, Timestamp, JobOfferingId, FromKey, ToKey, ToStatus, HistoryId)
+    SELECT TOP (@batch)
+        sh.UserId, sh.Timestamp, sh.JobOfferingId, f.StatusKey, t.StatusKey, sh.ToStatus, sh.HistoryId
+    FROM #StatusHistory sh
+    -- Mirrors helpers.status_normalize.status_key_case_sql
+    CROSS APPLY (
+        SELECT
+            CASE
+              WHEN b.Base IS NULL OR b.Base = '' OR b.Base = 'unset' THEN 'unset'
+              WHEN b.Base = 'applied' THEN 'applied'
+              WHEN b.Base = 'screening booked' THEN 'booked-screen'
+              WHEN b.Base = 'hm interview booked' THEN 'booked-hm'
+              WHEN b.Base IN ('more interviews booked','more interview booked') THEN 'booked-more'
+              WHEN b.Base = 'screening done' THEN 'done-screen'
+              WHEN b.Base = 'hm interview done' THEN 'done-hm'
+              WHEN b.Base IN ('more interviews done','more interview done') THEN 'done-more'
+              WHEN b.Base = 'got offer' THEN 'offer'
+              WHEN b.Base = 'accepted offer' THEN 'accepted'
+              WHEN b.Base IN (
+                'rejected with filled',
+                'rejected with unfortunately',
+                'turned down offer',
+                'withdrew applications',
+                'ignored'
+              ) THEN 'finished'
+              ELSE 'default'
+            END AS StatusKey
+        FROM (SELECT LOWER(LTRIM(RTRIM(sh.FromStatus))) AS Base) b
+    ) f
+    CROSS APPLY (
+        SELECT
+            CASE
+              WHEN b.Base IS NULL OR b.Base = '' OR b.Base = 'unset' THEN 'unset'
+              WHEN b.Base = 'applied' THEN 'applied'
+              WHEN b.Base = 'screening booked' THEN 'booked-screen'
+              WHEN b.Base = 'hm interview booked' THEN 'booked-hm'
+              WHEN b.Base IN ('more interviews booked','more interview booked') THEN 'booked-more'
+              WHEN b.Base = 'screening done' THEN 'done-screen'
+              WHEN b.Base = 'hm interview done' THEN 'done-hm'
+              WHEN b.Base IN ('more interviews done','more interview done') THEN 'done-more'
+              WHEN b.Base = 'got offer' THEN 'offer'
+              WHEN b.Base = 'accepted offer' THEN 'accepted'
+              WHEN b.Base IN (
+                'rejected with filled',
+                'rejected with unfortunately',
+                'turned down offer',
+                'withdrew applications',
+                'ignored'
+              ) THEN 'finished'
+              ELSE 'default'
+            END AS StatusKey
+        FROM (SELECT LOWER(LTRIM(RTRIM(sh.ToStatus))) AS Base) b
+    ) t
+    WHERE NOT EXISTS (
+        SELECT 1 FROM dbo.UserStatusTransitions x
+        WHERE x.HistoryId = sh.HistoryId
+    )
+    ORDER BY sh.HistoryId;
+
+    SET @rows = @@ROWCOUNT;
+END
+
+DROP TABLE #StatusHistory;
+GO
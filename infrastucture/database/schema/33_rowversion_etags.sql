@@ -0,0 +1,60 @@
+-- Row versions for conditional GETs (ETag / If-None-Match) on Jobs endpoints.
+--
+-- GET /jobs/{id} derives its ETag from JobOfferings.RowVer; location writes always
+-- touch the job row (PrimaryLocationKey refresh), so they move it as well.
+-- GET /jobs derives its ETag from the query plus the highest RowVer of JobOfferings,
+-- of the caller's UserJobStatus rows and of the caller's CompatibilityScores rows
+-- (scores decide category=open and sort=compat_desc). None of these rows are ever
+-- physically deleted, so the maxima only grow. The indexes below make each MAX a
+-- single seek.
+
+IF COL_LENGTH('dbo.JobOfferings', 'RowVer') IS NULL
+BEGIN
+    ALTER TABLE dbo.JobOfferings ADD RowVer ROWVERSION NOT NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.UserJobStatus', 'RowVer') IS NULL
+BEGIN
+    ALTER TABLE dbo.UserJobStatus ADD RowVer ROWVERSION NOT NULL;
+END
+GO
+
+IF COL_LENGTH('dbo.CompatibilityScores', 'RowVer') IS NULL
+BEGIN
+    ALTER TABLE dbo.CompatibilityScores ADD RowVer ROWVERSION NOT NULL;
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = N'IX_JobOfferings_RowVer'
+      AND object_id = OBJECT_ID(N'dbo.JobOfferings')
+)
+BEGIN
+    CREATE INDEX IX_JobOfferings_RowVer
+        ON dbo.JobOfferings (RowVer);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = N'IX_UserJobStatus_User_RowVer'
+      AND object_id = OBJECT_ID(N'dbo.UserJobStatus')
+)
+BEGIN
+    CREATE INDEX IX_UserJobStatus_User_RowVer
+        ON dbo.UserJobStatus (UserId, RowVer);
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = N'IX_CompatibilityScores_User_RowVer'
+      AND object_id = OBJECT_ID(N'dbo.CompatibilityScores')
+)
+BEGIN
+    CREATE INDEX IX_CompatibilityScores_User_RowVer
+        ON dbo.CompatibilityScores (UserId, RowVer);
+END
+GO
@@ -0,0 +1,16 @@
+-- Claim leases for the Analytics Mixpanel dispatcher.
+--
+-- A dispatcher run claims due rows in one statement (UPDATE of a TOP(n) READPAST/UPDLOCK
+-- CTE): Status becomes 'sending', ClaimToken identifies the run and NextAttemptAtUtc is
+-- pushed to the lease expiry. 'sending' rows whose lease passed are due again, so the
+-- existing (Sink, Status, NextAttemptAtUtc) index serves both due and stale rows.
+-- Final updates (sent/retry/dead) only apply while the row still carries the run's
+-- ClaimToken; a run whose lease was taken over cannot overwrite the new owner.
+-- Rows left in 'sending' by the pre-claim dispatcher were claimed while due, so their
+-- NextAttemptAtUtc is already in the past and the next run reclaims them.
+
+IF COL_LENGTH('dbo.AnalyticsDispatch', 'ClaimToken') IS NULL
+BEGIN
+    ALTER TABLE dbo.AnalyticsDispatch ADD ClaimToken uniqueidentifier NULL;
+END
+GO
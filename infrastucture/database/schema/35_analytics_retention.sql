@@ -0,0 +1,48 @@
+-- Analytics retention: daily rollups and the purge of exported raw events.
+--
+-- dbo.AnalyticsEventDailyRollups keeps per-day counts by EventName/SourceDomain/
+-- SourceSurface (day = OccurredAtUtc in UTC). The retention run recomputes the most
+-- recent days from dbo.AnalyticsEvents, then deletes raw events older than the
+-- retention window whose dispatch rows are finished ('sent' or 'dead'), in small
+-- batches. Long-range reporting reads the rollups; the raw tables stay a hot set.
+
+IF OBJECT_ID(N'dbo.AnalyticsEventDailyRollups', N'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.AnalyticsEventDailyRollups (
+        Day date NOT NULL,
+        EventName nvarchar(80) NOT NULL,
+        SourceDomain nvarchar(40) NOT NULL,
+        SourceSurface nvarchar(40) NOT NULL,
+        EventCount bigint NOT NULL,
+        UserCount int NOT NULL,
+        UpdatedAtUtc datetime2(3) NOT NULL
+            CONSTRAINT DF_AnalyticsEventDailyRollups_UpdatedAtUtc DEFAULT SYSUTCDATETIME(),
+
+        CONSTRAINT PK_AnalyticsEventDailyRollups
+            PRIMARY KEY (Day, EventName, SourceDomain, SourceSurface)
+    );
+END
+GO
+
+-- Purge batches check "no unfinished dispatch row" per event and delete dispatch rows
+-- by EventId; UX_AnalyticsDispatch_Sink_EventId leads with Sink.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = N'IX_AnalyticsDispatch_EventId'
+      AND object_id = OBJECT_ID(N'dbo.AnalyticsDispatch')
+)
+BEGIN
+    CREATE INDEX IX_AnalyticsDispatch_EventId
+        ON dbo.AnalyticsDispatch (EventId)
+        INCLUDE (Status);
+END
+GO
+
+-- The restricted runtime user gains DELETE on the raw tables for the purge only.
+IF DATABASE_PRINCIPAL_ID(N'analytics_runtime_user') IS NOT NULL
+BEGIN
+    GRANT SELECT, INSERT, UPDATE ON dbo.AnalyticsEventDailyRollups TO analytics_runtime_user;
+    GRANT DELETE ON dbo.AnalyticsEvents TO analytics_runtime_user;
+    GRANT DELETE ON dbo.AnalyticsDispatch TO analytics_runtime_user;
+END
+GO
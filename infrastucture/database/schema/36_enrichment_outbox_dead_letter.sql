@@ -0,0 +1,12 @@
+-- EnrichmentOutbox dead-letter state.
+--
+-- A row whose message can never be published (larger than an empty Service Bus batch)
+-- gets DeadLetteredAt and is no longer selected by the outbox publisher. Such rows stay
+-- in the table for inspection; PublishedAt remains NULL.
+
+IF COL_LENGTH(N'dbo.EnrichmentOutbox', N'DeadLetteredAt') IS NULL
+BEGIN
+    ALTER TABLE dbo.EnrichmentOutbox
+        ADD DeadLetteredAt DATETIMEOFFSET(7) NULL;
+END
+GO
@@ -288,6 +288,7 @@ async function runScan(args) {
         config.scan.jobsApiConcurrency,
         {
           onProgress: (event) => progress.update(event),
+          batchSize: config.scan.preflightBatchSize,
         },
       );
     }
@@ -348,6 +349,7 @@ async function runScan(args) {
       importResults = await importCandidates(locationResults, client, {
         maxCreates: args.maxCreate,
         requireDescription: config.scan.requireDescriptionForCreate,
+        batchSize: config.imports.batchSize,
         onProgress: (event) => progress.update(event),
       });
     }
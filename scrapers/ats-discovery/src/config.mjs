@@ -195,6 +195,12 @@ export async function loadRuntimeConfig({
         3,
         'scan.jobsApiConcurrency',
       ),
+      preflightBatchSize: positiveInteger(
+        scan.preflightBatchSize,
+        100,
+        'scan.preflightBatchSize',
+        { max: 500 },
+      ),
       maxCandidatesPerRun: positiveInteger(
         scan.maxCandidatesPerRun,
         100,
@@ -351,6 +357,12 @@ export async function loadRuntimeConfig({
         5,
         'imports.maxCreatesPerRun',
       ),
+      batchSize: positiveInteger(
+        imports.batchSize,
+        100,
+        'imports.batchSize',
+        { max: 500 },
+      ),
     },
   };
 
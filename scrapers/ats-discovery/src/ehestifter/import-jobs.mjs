@@ -9,17 +9,78 @@ function safeProgress(onProgress, current, total) {
   }
 }
 
+async function createOne(client, candidate, payload) {
+  try {
+    const result = await client.createJob(
+      payload,
+      { reconcileUrl: candidate.url },
+    );
+    return {
+      ...candidate,
+      existingJobId: result.id,
+      import: {
+        status: result.disposition,
+        jobId: result.id,
+        reconciled: result.reconciled,
+        responseStatus: result.responseStatus,
+        payload,
+      },
+    };
+  } catch (error) {
+    return {
+      ...candidate,
+      import: {
+        status: 'error',
+        jobId: null,
+        payload,
+        error: error instanceof Error ? error.message : String(error),
+      },
+    };
+  }
+}
+
+function batchOutput({ candidate, payload }, outcome) {
+  if (outcome?.status === 'created' || outcome?.status === 'existing') {
+    /* Same disposition as a single POST /jobs, which also answers existing identities. */
+    return {
+      ...candidate,
+      existingJobId: outcome.id,
+      import: {
+        status: 'submitted',
+        jobId: outcome.id,
+        outcome: outcome.status,
+        reconciled: false,
+        responseStatus: 200,
+        payload,
+      },
+    };
+  }
+  return {
+    ...candidate,
+    import: {
+      status: 'error',
+      jobId: null,
+      payload,
+      error: outcome?.error ?? 'Jobs batch create returned no outcome',
+    },
+  };
+}
+
 export async function importCandidates(
   candidates,
   client,
   {
     maxCreates,
     requireDescription,
+    batchSize = 0,
     onProgress = null,
   },
 ) {
   const results = [];
+  const pendingCreates = [];
+  const batched = batchSize > 0 && typeof client.createJobsBatch === 'function';
   let createAttempts = 0;
+  let settled = 0;
   for (let index = 0; index < candidates.length; index += 1) {
     const candidate = candidates[index];
     let output;
@@ -96,37 +157,44 @@ export async function importCandidates(
       }
       if (!output) {
         createAttempts += 1;
-        try {
-          const result = await client.createJob(
-            payload,
-            { reconcileUrl: candidate.url },
-          );
-          output = {
-            ...candidate,
-            existingJobId: result.id,
-            import: {
-              status: result.disposition,
-              jobId: result.id,
-              reconciled: result.reconciled,
-              responseStatus: result.responseStatus,
-              payload,
-            },
-          };
-        } catch (error) {
-          output = {
-            ...candidate,
-            import: {
-              status: 'error',
-              jobId: null,
-              payload,
-              error: error instanceof Error ? error.message : String(error),
-            },
-          };
+        if (batched) {
+          pendingCreates.push({ index, candidate, payload });
+          results.push(null);
+          continue;
         }
+        output = await createOne(client, candidate, payload);
       }
     }
     results.push(output);
-    safeProgress(onProgress, index + 1, candidates.length);
+    settled += 1;
+    safeProgress(onProgress, settled, candidates.length);
+  }
+
+  /* Creates are sent last, in POST /jobs:batch chunks; progress completes with them. */
+  for (let start = 0; start < pendingCreates.length; start += batchSize) {
+    const chunk = pendingCreates.slice(start, start + batchSize);
+    let batch = null;
+    let batchError = null;
+    try {
+      batch = await client.createJobsBatch(chunk.map((item) => item.payload));
+    } catch (error) {
+      batchError = error instanceof Error ? error.message : String(error);
+    }
+    chunk.forEach((item, position) => {
+      results[item.index] = batch
+        ? batchOutput(item, batch[position])
+        : {
+          ...item.candidate,
+          import: {
+            status: 'error',
+            jobId: null,
+            payload: item.payload,
+            error: batchError,
+          },
+        };
+    });
+    settled += chunk.length;
+    safeProgress(onProgress, settled, candidates.length);
   }
 
   return results;
@@ -242,7 +242,136 @@ export function createJobsClient(config, { fetchImpl = fetch } = {}) {
     throw lastError ?? new Error('Jobs create failed without an error');
   }
 
-  return { existsByUrl, getJob, updateJobDescription, createJob };
+  /*
+   * POST /jobs:batch. Creates are idempotent on canonical identity, so an
+   * ambiguous failure is simply retried: rows committed by the lost attempt
+   * come back as `existing`.
+   */
+  async function createJobsBatch(payloads) {
+    if (!Array.isArray(payloads) || payloads.length === 0) {
+      throw new Error('payloads must be a non-empty array');
+    }
+    const endpoint = new URL(`${config.baseUrl}/jobs:batch`);
+    let lastError = null;
+    for (let attempt = 0; attempt <= config.retryCount; attempt += 1) {
+      let response = null;
+      try {
+        response = await fetchWithTimeout(
+          fetchImpl,
+          endpoint,
+          {
+            method: 'POST',
+            headers: {
+              ...headers,
+              'content-type': 'application/json',
+            },
+            body: JSON.stringify({ jobs: payloads }),
+          },
+          config.timeoutMs,
+        );
+      } catch (error) {
+        lastError = error;
+      }
+
+      if (response?.ok) {
+        const body = await response.json();
+        if (!Array.isArray(body?.results) || body.results.length !== payloads.length) {
+          throw new Error('Jobs batch response does not match the request size');
+        }
+        return body.results;
+      }
+      if (response) {
+        const body = await response.text().catch(() => '');
+        const error = new Error(
+          `Jobs API returned ${response.status}: ${body.slice(0, 500)}`,
+        );
+        error.status = response.status;
+        lastError = error;
+        if (!isRetryable(null, response)) throw error;
+      }
+      if (attempt === config.retryCount) {
+        throw lastError ?? new Error('Jobs batch create failed without an error');
+      }
+      await sleep(Math.min(500 * 2 ** attempt, 4000));
+    }
+    throw lastError ?? new Error('Jobs batch create failed without an error');
+  }
+
+  /*
+   * POST /jobs/exists:batch. Read-only, so any retryable failure is retried
+   * as a whole. Items are returned in request order; an item Jobs could not
+   * resolve to an identity carries `error` instead of `identity`.
+   */
+  async function existsBatch(jobUrls) {
+    if (!Array.isArray(jobUrls) || jobUrls.length === 0) {
+      throw new Error('jobUrls must be a non-empty array');
+    }
+    const endpoint = new URL(`${config.baseUrl}/jobs/exists:batch`);
+    let lastError = null;
+    for (let attempt = 0; attempt <= config.retryCount; attempt += 1) {
+      let response = null;
+      try {
+        response = await fetchWithTimeout(
+          fetchImpl,
+          endpoint,
+          {
+            method: 'POST',
+            headers: {
+              ...headers,
+              'content-type': 'application/json',
+            },
+            body: JSON.stringify({ items: jobUrls.map((url) => ({ url })) }),
+          },
+          config.timeoutMs,
+        );
+      } catch (error) {
+        lastError = error;
+      }
+
+      if (response?.ok) {
+        const body = await response.json();
+        if (!Array.isArray(body?.results) || body.results.length !== jobUrls.length) {
+          throw new Error('Jobs exists batch response does not match the request size');
+        }
+        return body.results.map((item) => {
+          if (item?.error) return { error: String(item.error) };
+          try {
+            return {
+              exists: item.exists === true,
+              id: typeof item.id === 'string' ? item.id : null,
+              identity: validateIdentity(item),
+              urlInference: extractUrlInference(item),
+            };
+          } catch (error) {
+            return { error: error.message };
+          }
+        });
+      }
+      if (response) {
+        const body = await response.text().catch(() => '');
+        const error = new Error(
+          `Jobs API returned ${response.status}: ${body.slice(0, 500)}`,
+        );
+        error.status = response.status;
+        lastError = error;
+        if (!isRetryable(null, response)) throw error;
+      }
+      if (attempt === config.retryCount) {
+        throw lastError ?? new Error('Jobs exists batch failed without an error');
+      }
+      await sleep(Math.min(500 * 2 ** attempt, 4000));
+    }
+    throw lastError ?? new Error('Jobs exists batch failed without an error');
+  }
+
+  return {
+    existsByUrl,
+    existsBatch,
+    getJob,
+    updateJobDescription,
+    createJob,
+    createJobsBatch,
+  };
 }
 
 function safeProgress(onProgress, value) {
@@ -278,37 +407,73 @@ async function mapLimit(items, limit, worker, onProgress) {
   return results;
 }
 
+function preflightOk(candidate, result) {
+  return {
+    ...candidate,
+    canonicalIdentity: result.identity,
+    urlInference: result.urlInference,
+    existingJobId: result.id,
+    preflight: {
+      status: 'ok',
+      exists: result.exists,
+    },
+  };
+}
+
+function preflightError(candidate, error) {
+  return {
+    ...candidate,
+    preflight: {
+      status: 'error',
+      exists: null,
+      error: error instanceof Error ? error.message : String(error),
+    },
+  };
+}
+
 export async function preflightCandidates(
   candidates,
   client,
   concurrency,
-  { onProgress = null } = {},
+  { onProgress = null, batchSize = 0 } = {},
 ) {
+  if (batchSize > 0 && typeof client.existsBatch === 'function') {
+    const chunks = [];
+    for (let start = 0; start < candidates.length; start += batchSize) {
+      chunks.push(candidates.slice(start, start + batchSize));
+    }
+    let settled = 0;
+    const chunkResults = await mapLimit(chunks, concurrency, async (chunk) => {
+      let results;
+      try {
+        const outcomes = await client.existsBatch(chunk.map((candidate) => candidate.url));
+        results = chunk.map((candidate, index) => (
+          outcomes[index].error
+            ? preflightError(candidate, outcomes[index].error)
+            : preflightOk(candidate, outcomes[index])
+        ));
+      } catch (error) {
+        results = chunk.map((candidate) => preflightError(candidate, error));
+      }
+      settled += chunk.length;
+      safeProgress(onProgress, {
+        stage: 'preflight',
+        current: settled,
+        total: candidates.length,
+      });
+      return results;
+    });
+    return chunkResults.flat();
+  }
+
   return mapLimit(
     candidates,
     concurrency,
     async (candidate) => {
       try {
-        const result = await client.existsByUrl(candidate.url);
-        return {
-          ...candidate,
-          canonicalIdentity: result.identity,
-          urlInference: result.urlInference,
-          existingJobId: result.id,
-          preflight: {
-            status: 'ok',
-            exists: result.exists,
-          },
-        };
+        return preflightOk(candidate, await client.existsByUrl(candidate.url));
       } catch (error) {
-        return {
-          ...candidate,
-          preflight: {
-            status: 'error',
-            exists: null,
-            error: error instanceof Error ? error.message : String(error),
-          },
-        };
+        return preflightError(candidate, error);
       }
     },
     onProgress,
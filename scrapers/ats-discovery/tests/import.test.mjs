@@ -254,3 +254,92 @@ test('importCandidates safely skips detail-unavailable postings before descripti
   assert.equal(result.import.status, 'skipped_detail_unavailable');
   assert.equal(result.import.responseStatus, 404);
 });
+
+test('importCandidates sends creates through POST /jobs:batch in chunks', async () => {
+  const batches = [];
+  const progress = [];
+  const client = {
+    async createJob() {
+      throw new Error('createJob must not be called when batching');
+    },
+    async createJobsBatch(payloads) {
+      batches.push(payloads.map((payload) => payload.externalId));
+      return payloads.map((payload, index) => (
+        payload.externalId === '789'
+          ? { index, status: 'invalid', id: null, error: 'Missing required field: url' }
+          : {
+            index,
+            status: payload.externalId === '456' ? 'existing' : 'created',
+            id: `job-${payload.externalId}`,
+            error: null,
+          }
+      ));
+    },
+  };
+  const other = (externalId) => candidate({
+    url: `https://job-boards.greenhouse.io/example/jobs/${externalId}`,
+    canonicalIdentity: {
+      provider: 'greenhouse',
+      providerTenant: 'example',
+      externalId,
+      identitySource: 'url',
+    },
+  });
+
+  const results = await importCandidates(
+    [candidate(), other('456'), other('789')],
+    client,
+    {
+      maxCreates: 3,
+      requireDescription: true,
+      batchSize: 2,
+      onProgress: (event) => progress.push(event.current),
+    },
+  );
+
+  assert.deepEqual(batches, [['123', '456'], ['789']]);
+  assert.equal(results[0].import.status, 'submitted');
+  assert.equal(results[0].import.outcome, 'created');
+  assert.equal(results[1].import.outcome, 'existing');
+  assert.equal(results[1].existingJobId, 'job-456');
+  assert.equal(results[2].import.status, 'error');
+  assert.match(results[2].import.error, /url/);
+  assert.deepEqual(progress, [2, 3]);
+});
+
+test('createJobsBatch retries a failed batch POST', async () => {
+  let posts = 0;
+  const fetchImpl = async (url, options) => {
+    posts += 1;
+    assert.equal(String(url), 'https://jobs.example/api/jobs:batch');
+    if (posts === 1) {
+      return new Response('busy', { status: 503 });
+    }
+    const { jobs } = JSON.parse(options.body);
+    return new Response(
+      JSON.stringify({
+        created: 0,
+        existing: jobs.length,
+        invalid: 0,
+        results: jobs.map((_job, index) => ({
+          index, status: 'existing', id: `job-${index}`, error: null,
+        })),
+      }),
+      { status: 200, headers: { 'content-type': 'application/json' } },
+    );
+  };
+  const client = createJobsClient(
+    {
+      baseUrl: 'https://jobs.example/api',
+      functionKey: 'secret',
+      timeoutMs: 1000,
+      retryCount: 1,
+    },
+    { fetchImpl },
+  );
+
+  const results = await client.createJobsBatch([buildCreatePayload(candidate())]);
+
+  assert.equal(posts, 2);
+  assert.equal(results[0].id, 'job-0');
+});
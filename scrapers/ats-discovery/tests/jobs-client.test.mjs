@@ -158,3 +158,105 @@ test('getJob and updateJobDescription use authenticated system requests', async
     description: '<p>New</p>',
   });
 });
+
+test('existsBatch posts every URL once and maps per-item outcomes', async () => {
+  const calls = [];
+  const fetchImpl = async (url, options) => {
+    calls.push({ url: String(url), options });
+    return new Response(JSON.stringify({
+      results: [
+        {
+          index: 0,
+          exists: true,
+          id: 'job-guid',
+          provider: 'greenhouse',
+          providerTenant: 'example',
+          externalId: '123',
+          identitySource: 'url',
+          foundOn: 'corporate-site',
+          hiringCompanyName: 'example',
+          postingCompanyName: null,
+        },
+        { index: 1, error: 'Could not deduce provider/externalId from url' },
+      ],
+    }), {
+      status: 200,
+      headers: { 'content-type': 'application/json' },
+    });
+  };
+  const client = createJobsClient({
+    baseUrl: 'https://jobs.example/api',
+    functionKey: 'secret',
+    timeoutMs: 1000,
+    retryCount: 0,
+  }, { fetchImpl });
+
+  const [found, unknown] = await client.existsBatch([
+    'https://boards.greenhouse.io/example/jobs/123',
+    'https://example.com/careers',
+  ]);
+
+  assert.equal(calls.length, 1);
+  assert.equal(calls[0].url, 'https://jobs.example/api/jobs/exists:batch');
+  assert.equal(calls[0].options.method, 'POST');
+  assert.deepEqual(JSON.parse(calls[0].options.body), {
+    items: [
+      { url: 'https://boards.greenhouse.io/example/jobs/123' },
+      { url: 'https://example.com/careers' },
+    ],
+  });
+  assert.equal(found.exists, true);
+  assert.equal(found.id, 'job-guid');
+  assert.equal(found.identity.externalId, '123');
+  assert.match(unknown.error, /Could not deduce/);
+});
+
+test('preflightCandidates resolves candidates in existsBatch chunks', async () => {
+  const chunks = [];
+  const progress = [];
+  const client = {
+    async existsByUrl() {
+      throw new Error('single-URL preflight should not be used');
+    },
+    async existsBatch(urls) {
+      chunks.push(urls);
+      return urls.map((url) => (
+        url.endsWith('/bad')
+          ? { error: 'Could not deduce provider/externalId from url' }
+          : {
+            exists: false,
+            id: null,
+            identity: {
+              provider: 'greenhouse',
+              providerTenant: 'example',
+              externalId: url.split('/').pop(),
+              identitySource: 'url',
+            },
+            urlInference: {
+              foundOn: 'corporate-site',
+              hiringCompanyName: 'example',
+              postingCompanyName: null,
+            },
+          }
+      ));
+    },
+  };
+  const candidates = ['1', '2', 'bad', '4', '5'].map((id) => ({
+    url: `https://boards.greenhouse.io/example/jobs/${id}`,
+    foundOn: 'ats-discovery',
+  }));
+
+  const results = await preflightCandidates(candidates, client, 2, {
+    batchSize: 2,
+    onProgress: (event) => progress.push(event.current),
+  });
+
+  assert.deepEqual(chunks.map((chunk) => chunk.length), [2, 2, 1]);
+  assert.deepEqual(
+    results.map((result) => result.preflight.status),
+    ['ok', 'ok', 'error', 'ok', 'ok'],
+  );
+  assert.equal(results[4].canonicalIdentity.externalId, '5');
+  assert.equal(results[2].foundOn, 'ats-discovery');
+  assert.equal(progress.at(-1), 5);
+});